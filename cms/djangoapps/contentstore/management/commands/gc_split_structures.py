@@ -0,0 +1,73 @@
+"""
+Script for removing unreachable split modulestore structures and orphan definitions
+"""
+import datetime
+
+from django.core.management.base import BaseCommand
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.split_mongo.structure_gc import (
+    StructureGarbageCollector, DEFAULT_BATCH_SIZE, DEFAULT_KEEP_VERSIONS
+)
+
+from .prompt import query_yes_no
+
+# To run from command line: ./manage.py cms gc_split_structures --keep-versions 5 --commit
+
+
+class Command(BaseCommand):
+    """Garbage collect split modulestore structures"""
+    help = '''
+    Remove the split modulestore structures which are not reachable from any course or library
+    index, and the definitions which are no longer referenced by a reachable structure.
+
+    The head of every branch, --keep-versions of its previous versions and all library versions
+    referenced by those are kept.
+
+    If you do not specify '--commit', the command will only report what would be removed.
+    '''
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-versions', type=int, default=DEFAULT_KEEP_VERSIONS,
+            help="Number of previous versions of each branch head to keep"
+        )
+        parser.add_argument(
+            '--min-age-days', type=int, default=1,
+            help="Never remove structures or definitions edited less than this many days ago"
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help="Number of documents to read or remove per query"
+        )
+        parser.add_argument(
+            '--batch-delay', type=float, default=0,
+            help="Seconds to sleep between removal batches"
+        )
+        parser.add_argument(
+            '--archive', action='store_true',
+            help="Copy removed documents to the structures_archive and definitions_archive collections"
+        )
+        parser.add_argument('--commit', action='store_true', help="Remove the unreachable documents")
+
+    def handle(self, *args, **options):
+        """Execute the command"""
+        split_store = modulestore()._get_modulestore_by_type(  # pylint: disable=protected-access
+            ModuleStoreEnum.Type.split
+        )
+        collector = StructureGarbageCollector(
+            split_store.db_connection,
+            keep_versions=options['keep_versions'],
+            min_age=datetime.timedelta(days=options['min_age_days']),
+            batch_size=options['batch_size'],
+            batch_delay=options['batch_delay'],
+            archive=options['archive'],
+        )
+
+        report = collector.collect(dry_run=True)
+        print unicode(report)
+
+        if options['commit'] and (report.unreachable_structures or report.orphan_definitions):
+            if query_yes_no("Are you sure you want to remove these documents?", default="no"):
+                report = collector.collect(dry_run=False)
+                print unicode(report)
@@ -9,11 +9,12 @@ from datetime import datetime
 from pytz import UTC
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 
 from contentstore.courseware_index import CoursewareSearchIndexer, LibrarySearchIndexer, SearchIndexingError
 from contentstore.utils import initialize_permissions
 from course_action_state.models import CourseRerunState
-from opaque_keys.edx.keys import CourseKey
+from opaque_keys.edx.keys import CourseKey, UsageKey
 from xmodule.course_module import CourseFields
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import DuplicateCourseError, ItemNotFoundError
@@ -21,6 +22,9 @@ from xmodule.modulestore.exceptions import DuplicateCourseError, ItemNotFoundErr
 LOGGER = get_task_logger(__name__)
 FULL_COURSE_REINDEX_THRESHOLD = 1
 
+DUPLICATE_STATUS_CACHE_KEY = u'contentstore.duplicate_status.{}'
+DUPLICATE_STATUS_TIMEOUT = 60 * 60
+
 
 @task()
 def rerun_course(source_course_key_string, destination_course_key_string, user_id, fields=None):
@@ -125,3 +129,45 @@ def push_course_update_task(course_key_string, course_subscription_id, course_di
     # TODO Use edx-notifications library instead (MA-638).
     from .push_notification import send_push_course_update
     send_push_course_update(course_key_string, course_subscription_id, course_display_name)
+
+
+def get_duplicate_status(task_id):
+    """
+    Returns the status dict of the duplicate task `task_id`, or None if it is unknown or expired.
+    """
+    return cache.get(DUPLICATE_STATUS_CACHE_KEY.format(task_id))
+
+
+def set_duplicate_status(task_id, user_id, state, locator=None):
+    """
+    Records the status of the duplicate task `task_id`, started by `user_id`.
+    """
+    cache.set(
+        DUPLICATE_STATUS_CACHE_KEY.format(task_id),
+        {'user_id': user_id, 'state': state, 'locator': locator},
+        DUPLICATE_STATUS_TIMEOUT
+    )
+
+
+@task()
+def duplicate_item_task(task_id, parent_usage_key_string, source_usage_key_string, user_id, display_name=None):
+    """
+    Duplicates an xblock subtree in a celery task, recording its status for polling.
+    """
+    # import here, at top level this import prevents the celery workers from starting up correctly
+    from contentstore.views.item import _duplicate_item
+
+    try:
+        dest_usage_key = _duplicate_item(
+            UsageKey.from_string(parent_usage_key_string),
+            UsageKey.from_string(source_usage_key_string),
+            User.objects.get(id=user_id),
+            display_name,
+        )
+    except Exception:  # pylint: disable=broad-except
+        LOGGER.exception(u'Error duplicating %s into %s', source_usage_key_string, parent_usage_key_string)
+        set_duplicate_status(task_id, user_id, 'failed')
+        return 'failed'
+
+    set_duplicate_status(task_id, user_id, 'succeeded', unicode(dest_usage_key))
+    return 'succeeded'
@@ -15,6 +15,7 @@ from student.roles import (
     OrgStaffRole, OrgInstructorRole, OrgLibraryUserRole,
 )
 from xblock.reference.user_service import XBlockUser
+from xmodule.library_content_module import LibraryContentDescriptor
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
@@ -915,6 +916,26 @@ class TestOverrides(LibraryTestCase):
         problem2_in_course = store.get_item(duplicate.children[0])
         self.assertEqual(problem2_in_course.display_name, self.original_display_name)
 
+    def test_duplicate_parent_post_duplicate(self):
+        """
+        Test that a LibraryContent block handles its own duplication when an
+        ancestor of it is duplicated.
+        """
+        store = modulestore()
+        vertical = ItemFactory.create(category="vertical", parent_location=self.course.location, user_id=self.user.id)
+        lc_block = self._add_library_content_block(vertical, self.lib_key)
+        self._refresh_children(lc_block)
+
+        with patch.object(
+            LibraryContentDescriptor, 'studio_post_duplicate', autospec=True,
+            side_effect=LibraryContentDescriptor.studio_post_duplicate
+        ) as mock_post_duplicate:
+            duplicate = store.get_item(_duplicate_item(self.course.location, vertical.location, self.user))
+        self.assertEqual(mock_post_duplicate.call_count, 1)
+        lc_duplicate = store.get_item(duplicate.children[0])
+        self.assertEqual(len(lc_duplicate.children), 1)
+        self.assertEqual(store.get_item(lc_duplicate.children[0]).display_name, self.original_display_name)
+
 
 class TestIncompatibleModuleStore(LibraryTestCase):
     """
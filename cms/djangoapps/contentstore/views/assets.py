@@ -1,7 +1,9 @@
+import base64
 import logging
 from functools import partial
 import math
 import json
+import re
 
 from django.http import HttpResponseBadRequest
 from django.contrib.auth.decorators import login_required
@@ -21,6 +23,7 @@ from contentstore.views.exception import AssetNotFoundException
 from django.core.exceptions import PermissionDenied
 from opaque_keys.edx.keys import CourseKey, AssetKey
 
+from bson import json_util
 from util.date_utils import get_default_time_display
 from util.json_request import JsonResponse
 from django.http import HttpResponseNotFound
@@ -50,6 +53,10 @@ def assets_handler(request, course_key_string=None, asset_key_string=None):
             page_size: the number of items per page (defaults to 50)
             sort: the asset field to sort by (defaults to "date_added")
             direction: the sort direction (defaults to "descending")
+            asset_type: the file type filter (see FILES_AND_UPLOAD_TYPE_FILTERS, or "OTHER")
+            text_search: only return assets whose display name contains these words
+            cursor: the nextCursor of the previous page. When requesting the page after that one,
+                this avoids skipping over all the preceding assets.
     POST
         json: create (or update?) an asset. The only updating that can be done is changing the lock state.
     PUT
@@ -101,27 +108,8 @@ def _assets_json(request, course_key):
     requested_page_size = int(request.GET.get('page_size', 50))
     requested_sort = request.GET.get('sort', 'date_added')
     requested_filter = request.GET.get('asset_type', '')
-    requested_file_types = settings.FILES_AND_UPLOAD_TYPE_FILTERS.get(
-        requested_filter, None)
-    filter_params = None
-    if requested_filter:
-        if requested_filter == 'OTHER':
-            all_filters = settings.FILES_AND_UPLOAD_TYPE_FILTERS
-            where = []
-            for all_filter in all_filters:
-                extension_filters = all_filters[all_filter]
-                where.extend(
-                    ["JSON.stringify(this.contentType).toUpperCase() != JSON.stringify('{}').toUpperCase()".format(
-                        extension_filter) for extension_filter in extension_filters])
-            filter_params = {
-                "$where": ' && '.join(where),
-            }
-        else:
-            where = ["JSON.stringify(this.contentType).toUpperCase() == JSON.stringify('{}').toUpperCase()".format(
-                req_filter) for req_filter in requested_file_types]
-            filter_params = {
-                "$where": ' || '.join(where),
-            }
+    requested_text_search = request.GET.get('text_search', '').strip()
+    filter_params = _get_content_type_filter(requested_filter)
 
     sort_direction = DESCENDING
     if request.GET.get('direction', '').lower() == 'asc':
@@ -140,7 +128,9 @@ def _assets_json(request, course_key):
         'current_page': current_page,
         'page_size': requested_page_size,
         'sort': sort,
-        'filter_params': filter_params
+        'filter_params': filter_params,
+        'after': _decode_asset_cursor(request.GET.get('cursor'), sort),
+        'text_search': requested_text_search or None,
     }
     assets, total_count = _get_assets_for_page(request, course_key, options)
     end = start + len(assets)
@@ -148,6 +138,7 @@ def _assets_json(request, course_key):
     # If the query is beyond the final page, then re-query the final page so
     # that at least one asset is returned
     if requested_page > 0 and start >= total_count:
+        options['after'] = None
         options['current_page'] = current_page = int(math.floor((total_count - 1) / requested_page_size))
         start = current_page * requested_page_size
         assets, total_count = _get_assets_for_page(request, course_key, options)
@@ -181,9 +172,59 @@ def _assets_json(request, course_key):
         'totalCount': total_count,
         'assets': asset_json,
         'sort': requested_sort,
+        'nextCursor': _encode_asset_cursor(assets[-1], sort) if len(assets) == requested_page_size else None,
     })
 
 
+def _get_content_type_filter(requested_filter):
+    """
+    Returns the filter_params selecting the assets of the requested file type, or None for all assets.
+
+    Content types are matched case-insensitively using anchored regular expressions rather
+    than a javascript $where clause, which Mongo would have to evaluate for every asset.
+    """
+    if not requested_filter:
+        return None
+
+    def content_type_patterns(content_types):
+        """
+        Returns case-insensitive regular expressions matching exactly the given content types.
+        """
+        return [re.compile(u'^{}$'.format(re.escape(content_type)), re.IGNORECASE) for content_type in content_types]
+
+    all_filters = settings.FILES_AND_UPLOAD_TYPE_FILTERS
+    if requested_filter == 'OTHER':
+        other_content_types = []
+        for content_types in all_filters.values():
+            other_content_types.extend(content_types)
+        return {'contentType': {'$nin': content_type_patterns(other_content_types)}}
+    return {'contentType': {'$in': content_type_patterns(all_filters.get(requested_filter, []))}}
+
+
+def _encode_asset_cursor(asset, sort):
+    """
+    Returns an opaque cursor locating the given asset in the given sort order.
+    """
+    sort_field = sort[0][0]
+    return base64.urlsafe_b64encode(json_util.dumps([sort, asset.get(sort_field), asset['_id']]))
+
+
+def _decode_asset_cursor(cursor, sort):
+    """
+    Returns the (sort field value, _id) of the asset located by the cursor, or None if there isn't
+    a valid cursor for the given sort order.
+    """
+    if not cursor:
+        return None
+    try:
+        cursor_sort, after_value, after_id = json_util.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (TypeError, ValueError):
+        return None
+    if [list(sort_item) for sort_item in sort] != cursor_sort:
+        return None
+    return after_value, after_id
+
+
 def _get_assets_for_page(request, course_key, options):
     """
     Returns the list of assets for the specified page and page size.
@@ -195,7 +236,8 @@ def _get_assets_for_page(request, course_key, options):
     start = current_page * page_size
 
     return contentstore().get_all_content_for_course(
-        course_key, start=start, maxresults=page_size, sort=sort, filter_params=filter_params
+        course_key, start=start, maxresults=page_size, sort=sort, filter_params=filter_params,
+        after=options.get('after'), text_search=options.get('text_search')
     )
 
 
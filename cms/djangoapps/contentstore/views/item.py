@@ -13,14 +13,17 @@ from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.core.exceptions import PermissionDenied
+from django.core.urlresolvers import reverse
 from django.http import HttpResponseBadRequest, HttpResponse, Http404
 from django.utils.translation import ugettext as _
 from django.views.decorators.http import require_http_methods
 from opaque_keys.edx.keys import CourseKey
 from opaque_keys.edx.locator import LibraryUsageLocator
 from pytz import UTC
+from xblock.core import XBlock
 from xblock.fields import Scope
 from xblock.fragment import Fragment
+from xblock.plugin import PluginMissingError
 
 from cms.lib.xblock.authoring_mixin import VISIBILITY_VIEW
 from contentstore.utils import (
@@ -31,6 +34,7 @@ from contentstore.utils import (
 from contentstore.views.helpers import is_unit, xblock_studio_url, xblock_primary_child_category, \
     xblock_type_display_name, get_parent_xblock, create_xblock, usage_key_with_run
 from contentstore.views.preview import get_preview_fragment
+from contentstore.tasks import duplicate_item_task, get_duplicate_status, set_duplicate_status
 from contentstore.utils import is_self_paced
 
 from openedx.core.lib.gating import api as gating_api
@@ -52,7 +56,8 @@ from xmodule.tabs import CourseTabList
 from xmodule.x_module import PREVIEW_VIEWS, STUDIO_VIEW, STUDENT_VIEW, DEPRECATION_VSCOMPAT_EVENT
 
 __all__ = [
-    'orphan_handler', 'xblock_handler', 'xblock_view_handler', 'xblock_outline_handler', 'xblock_container_handler'
+    'orphan_handler', 'xblock_handler', 'xblock_view_handler', 'xblock_outline_handler', 'xblock_container_handler',
+    'duplicate_status_handler',
 ]
 
 log = logging.getLogger(__name__)
@@ -128,6 +133,8 @@ def xblock_handler(request, usage_key_string):
                 :boilerplate: template name for populating fields, optional and only used
                      if duplicate_source_locator is not present
               The locator (unicode representation of a UsageKey) for the created xblock (minus children) is returned.
+              Xblocks with at least settings.DUPLICATE_ASYNC_MIN_BLOCKS blocks are duplicated in a background
+              task: a 202 with the task id and the url to poll for its status is returned instead.
     """
     if usage_key_string:
         usage_key = usage_key_with_run(usage_key_string)
@@ -181,6 +188,24 @@ def xblock_handler(request, usage_key_string):
             ):
                 raise PermissionDenied()
 
+            if _has_min_blocks(duplicate_source_usage_key, settings.DUPLICATE_ASYNC_MIN_BLOCKS):
+                task_id = uuid4().hex
+                set_duplicate_status(task_id, request.user.id, 'pending')
+                duplicate_item_task.delay(
+                    task_id,
+                    unicode(parent_usage_key),
+                    unicode(duplicate_source_usage_key),
+                    request.user.id,
+                    request.json.get('display_name'),
+                )
+                return JsonResponse(
+                    {
+                        "task_id": task_id,
+                        "status_url": reverse('contentstore.views.duplicate_status_handler', args=[task_id]),
+                    },
+                    status=202
+                )
+
             dest_usage_key = _duplicate_item(
                 parent_usage_key,
                 duplicate_source_usage_key,
@@ -198,6 +223,24 @@ def xblock_handler(request, usage_key_string):
         )
 
 
+@require_http_methods(("GET"))
+@login_required
+def duplicate_status_handler(request, task_id):
+    """
+    Returns the status of an async duplicate started through xblock_handler:
+        :state: one of 'pending', 'succeeded' or 'failed'
+        :locator: the locator of the duplicate, once it has succeeded
+    """
+    status = get_duplicate_status(task_id)
+    if status is None or status['user_id'] != request.user.id:
+        raise Http404
+    response = {"state": status['state']}
+    if status['locator'] is not None:
+        response['locator'] = status['locator']
+        response['courseKey'] = unicode(usage_key_with_run(status['locator']).course_key)
+    return JsonResponse(response)
+
+
 @require_http_methods(("GET"))
 @login_required
 @expect_json
@@ -572,6 +615,97 @@ def _create_item(request):
 def _duplicate_item(parent_usage_key, duplicate_source_usage_key, user, display_name=None):
     """
     Duplicate an existing xblock as a child of the supplied parent_usage_key.
+
+    If the modulestores of both courses support it, the whole subtree is copied in memory and
+    written as a single new version of the destination course, after which the copies of blocks
+    with their own duplication handling (`studio_post_duplicate`) are given the chance to update
+    their children. Otherwise each block is duplicated separately.
+    """
+    store = modulestore()
+    if (
+            store.check_supports(parent_usage_key.course_key, 'duplicate_subtree') and
+            store.check_supports(duplicate_source_usage_key.course_key, 'duplicate_subtree')
+    ):
+        with store.bulk_operations(parent_usage_key.course_key):
+            source_item = store.get_item(duplicate_source_usage_key)
+            dest_usage_key = store.duplicate_subtree(
+                duplicate_source_usage_key,
+                parent_usage_key,
+                user.id,
+                fields={'display_name': _duplicate_display_name(source_item, display_name)},
+            )
+            _post_duplicate_subtree(store, duplicate_source_usage_key, dest_usage_key)
+            return dest_usage_key
+    return _duplicate_item_per_block(parent_usage_key, duplicate_source_usage_key, user, display_name)
+
+
+def _post_duplicate_subtree(store, source_usage_key, dest_usage_key):
+    """
+    Calls `studio_post_duplicate` on the blocks of the copy of a subtree made by duplicate_subtree
+    which define it. Their children have already been copied, so the value it returns is ignored.
+    """
+    source_keys = store.get_subtree_usage_keys(source_usage_key)
+    post_duplicate_types = set(
+        block_type for block_type in set(key.block_type for key in source_keys) if _has_post_duplicate(block_type)
+    )
+    if not post_duplicate_types:
+        return
+    for source_key, dest_key in zip(source_keys, store.get_subtree_usage_keys(dest_usage_key)):
+        if source_key.block_type in post_duplicate_types:
+            store.get_item(dest_key).studio_post_duplicate(store, store.get_item(source_key))
+
+
+def _has_post_duplicate(block_type):
+    """
+    Returns whether the blocks of block_type handle their own duplication with `studio_post_duplicate`.
+    """
+    try:
+        block_class = XBlock.load_class(block_type, select=settings.XBLOCK_SELECT_FUNCTION)
+    except PluginMissingError:
+        return False
+    return hasattr(block_class, 'studio_post_duplicate')
+
+
+def _has_min_blocks(usage_key, min_blocks):
+    """
+    Returns whether the subtree of the xblock at usage_key has at least min_blocks blocks.
+    The blocks are counted from the course structure if the modulestore supports it, otherwise
+    at most min_blocks - 1 of them are loaded.
+    """
+    store = modulestore()
+    if store.check_supports(usage_key.course_key, 'get_subtree_usage_keys'):
+        return len(store.get_subtree_usage_keys(usage_key)) >= min_blocks
+    with store.bulk_operations(usage_key.course_key):
+        keys_to_load = [usage_key]
+        num_blocks = 0
+        while keys_to_load:
+            num_blocks += 1
+            if num_blocks >= min_blocks:
+                return True
+            xblock = store.get_item(keys_to_load.pop())
+            if xblock.has_children:
+                keys_to_load.extend(xblock.children)
+    return False
+
+
+def _duplicate_display_name(source_item, display_name=None):
+    """
+    Returns the display name for a duplicate of source_item: display_name if provided,
+    otherwise one indicating this is a duplicate.
+    """
+    if display_name is not None:
+        return display_name
+    elif source_item.display_name is None:
+        return _("Duplicate of {0}").format(source_item.category)
+    else:
+        return _("Duplicate of '{0}'").format(source_item.display_name)
+
+
+def _duplicate_item_per_block(parent_usage_key, duplicate_source_usage_key, user, display_name=None, is_child=False):
+    """
+    Duplicate an existing xblock as a child of the supplied parent_usage_key, creating
+    each block of the copied subtree separately. Like duplicate_subtree, only the root of
+    the copy (is_child=False) gets a new display name.
     """
     store = modulestore()
     with store.bulk_operations(duplicate_source_usage_key.course_key):
@@ -580,20 +714,15 @@ def _duplicate_item(parent_usage_key, duplicate_source_usage_key, user, display_
         dest_usage_key = source_item.location.replace(name=uuid4().hex)
         category = dest_usage_key.block_type
 
-        # Update the display name to indicate this is a duplicate (unless display name provided).
         # Can't use own_metadata(), b/c it converts data for JSON serialization -
         # not suitable for setting metadata of the new block
         duplicate_metadata = {}
         for field in source_item.fields.values():
             if field.scope == Scope.settings and field.is_set_on(source_item):
                 duplicate_metadata[field.name] = field.read_from(source_item)
-        if display_name is not None:
-            duplicate_metadata['display_name'] = display_name
-        else:
-            if source_item.display_name is None:
-                duplicate_metadata['display_name'] = _("Duplicate of {0}").format(source_item.category)
-            else:
-                duplicate_metadata['display_name'] = _("Duplicate of '{0}'").format(source_item.display_name)
+        if not is_child:
+            # Update the display name to indicate this is a duplicate (unless display name provided).
+            duplicate_metadata['display_name'] = _duplicate_display_name(source_item, display_name)
 
         dest_module = store.create_item(
             user.id,
@@ -618,7 +747,7 @@ def _duplicate_item(parent_usage_key, duplicate_source_usage_key, user, display_
         if source_item.has_children and not children_handled:
             dest_module.children = dest_module.children or []
             for child in source_item.children:
-                dupe = _duplicate_item(dest_module.location, child, user=user)
+                dupe = _duplicate_item_per_block(dest_module.location, child, user=user, is_child=True)
                 if dupe not in dest_module.children:  # _duplicate_item may add the child for us.
                     dest_module.children.append(dupe)
             store.update_item(dest_module, user.id)
@@ -182,6 +182,52 @@ class PaginationTestCase(AssetsTestCase):
         self.assert_correct_asset_response(
             self.url + "?page_size=3&page=1", 3, 1, 4)
 
+    def test_cursor_responses(self):
+        """
+        Test paging through the assets using the cursor of the previous page
+        """
+        for index in xrange(5):
+            self.upload_asset("asset-{}".format(index))
+
+        def get_page(page_size, page=0, cursor=''):
+            """
+            Returns the json response for the given page of assets sorted by name
+            """
+            url = self.url + "?sort=display_name&direction=asc&page_size={}&page={}&cursor={}".format(
+                page_size, page, cursor
+            )
+            return json.loads(self.client.get(url, HTTP_ACCEPT='application/json').content)
+
+        def display_names(json_response):
+            """
+            Returns the display names of the assets in the json response
+            """
+            return [asset['display_name'] for asset in json_response['assets']]
+
+        expected = display_names(get_page(5))
+        first = get_page(2)
+        second = get_page(2, 1, first['nextCursor'])
+        third = get_page(2, 2, second['nextCursor'])
+        self.assertEqual(display_names(first) + display_names(second) + display_names(third), expected)
+        self.assertEqual(third['totalCount'], 5)
+        self.assertIsNone(third['nextCursor'])
+
+        # Invalid cursors are ignored
+        self.assertEqual(display_names(get_page(2, 1, 'invalid')), expected[2:4])
+
+    def test_text_search_response(self):
+        """
+        Test searching the display names of the assets
+        """
+        contentstore().ensure_indexes()
+        self.upload_asset("lecture")
+        self.upload_asset("homework")
+        json_response = json.loads(
+            self.client.get(self.url + "?text_search=lecture", HTTP_ACCEPT='application/json').content
+        )
+        self.assertEqual(json_response['totalCount'], 1)
+        self.assertEqual(json_response['assets'][0]['display_name'], 'lecture.txt')
+
     @mock.patch('xmodule.contentstore.mongo.MongoContentStore.get_all_content_for_course')
     def test_mocked_filtered_response(self, mock_get_all_content_for_course):
         """
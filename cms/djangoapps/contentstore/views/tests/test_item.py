@@ -11,6 +11,7 @@ from webob import Response
 from django.http import Http404
 from django.test import TestCase
 from django.test.client import RequestFactory
+from django.test.utils import override_settings
 from django.core.urlresolvers import reverse
 from contentstore.utils import reverse_usage_url, reverse_course_url
 
@@ -20,7 +21,8 @@ from contentstore.views.component import (
 )
 
 from contentstore.views.item import (
-    create_xblock_info, ALWAYS, VisibilityState, _xblock_type_and_display_name, add_container_page_publishing_info
+    create_xblock_info, ALWAYS, VisibilityState, _xblock_type_and_display_name, add_container_page_publishing_info,
+    _has_min_blocks, _duplicate_item, _duplicate_item_per_block
 )
 from contentstore.tests.utils import CourseTestCase
 from student.tests.factories import UserFactory
@@ -599,6 +601,85 @@ class TestDuplicateItem(ItemTest):
         # Now send a custom display name for the duplicate.
         verify_name(self.seq_usage_key, self.chapter_usage_key, "customized name", display_name="customized name")
 
+    def test_display_name_of_children(self):
+        """
+        Tests that only the root of a duplicate gets a new display name, whether the blocks are
+        copied together or one at a time.
+        """
+        for duplicate in (_duplicate_item, _duplicate_item_per_block):
+            usage_key = duplicate(self.chapter_usage_key, self.seq_usage_key, self.user)
+            duplicated_item = self.get_item_from_modulestore(usage_key)
+            self.assertEqual(duplicated_item.display_name, "Duplicate of sequential")
+            self.assertEqual(
+                [self.get_item_from_modulestore(child).display_name for child in duplicated_item.children],
+                ["Multiple Choice", "Text"],
+            )
+
+    @override_settings(DUPLICATE_ASYNC_MIN_BLOCKS=3)
+    def test_async_duplicate(self):
+        """
+        Tests that a large xblock is duplicated asynchronously, returning a status url which reports
+        the duplicate's locator.
+        """
+        data = {
+            'parent_locator': unicode(self.chapter_usage_key),
+            'duplicate_source_locator': unicode(self.seq_usage_key),
+        }
+        resp = self.client.ajax_post(reverse('contentstore.views.xblock_handler'), json.dumps(data))
+        self.assertEqual(resp.status_code, 202)
+
+        status_resp = self.client.get(json.loads(resp.content)['status_url'])
+        self.assertEqual(json.loads(status_resp.content)['state'], 'succeeded')
+        usage_key = self.response_usage_key(status_resp)
+        duplicated_item = self.get_item_from_modulestore(usage_key)
+        self.assertEqual(duplicated_item.display_name, "Duplicate of sequential")
+        self.assertEqual(len(duplicated_item.children), 2)
+
+    @override_settings(DUPLICATE_ASYNC_MIN_BLOCKS=3)
+    def test_small_duplicate_not_async(self):
+        """
+        Tests that an xblock with fewer blocks than the threshold is duplicated in the request.
+        """
+        data = {
+            'parent_locator': unicode(self.seq_usage_key),
+            'duplicate_source_locator': unicode(self.html_usage_key),
+        }
+        resp = self.client.ajax_post(reverse('contentstore.views.xblock_handler'), json.dumps(data))
+        self.assertEqual(resp.status_code, 200)
+        self.get_item_from_modulestore(self.response_usage_key(resp))
+
+    @override_settings(DUPLICATE_ASYNC_MIN_BLOCKS=1)
+    def test_async_duplicate_status_other_user(self):
+        """
+        Tests that the status of an async duplicate is not visible to other users.
+        """
+        data = {
+            'parent_locator': unicode(self.seq_usage_key),
+            'duplicate_source_locator': unicode(self.html_usage_key),
+        }
+        resp = self.client.ajax_post(reverse('contentstore.views.xblock_handler'), json.dumps(data))
+        status_url = json.loads(resp.content)['status_url']
+
+        self.client.logout()
+        other_user = UserFactory(is_staff=True)
+        self.client.login(username=other_user.username, password='test')
+        self.assertEqual(self.client.get(status_url).status_code, 404)
+
+    def test_has_min_blocks_from_structure(self):
+        """
+        Tests that the blocks of a split course are counted without loading them.
+        """
+        with self.store.default_store(ModuleStoreEnum.Type.split):
+            course = CourseFactory.create()
+            chapter = ItemFactory.create(parent_location=course.location, category='chapter')
+            sequential = ItemFactory.create(parent_location=chapter.location, category='sequential')
+            ItemFactory.create(parent_location=sequential.location, category='vertical')
+
+        with patch('xmodule.modulestore.mixed.MixedModuleStore.get_item') as mock_get_item:
+            self.assertTrue(_has_min_blocks(chapter.location, 3))
+            self.assertFalse(_has_min_blocks(chapter.location, 4))
+        self.assertFalse(mock_get_item.called)
+
     def _duplicate_item(self, parent_usage_key, source_usage_key, display_name=None):
         data = {
             'parent_locator': unicode(parent_usage_key),
@@ -1017,6 +1017,9 @@ MAX_ASSET_UPLOAD_FILE_SIZE_IN_MB = 10
 # a file that exceeds the above size
 MAX_ASSET_UPLOAD_FILE_SIZE_URL = ""
 
+### Xblocks with at least this many blocks in their subtree are duplicated in a background task
+DUPLICATE_ASYNC_MIN_BLOCKS = 100
+
 ### Default value for entrance exam minimum score
 ENTRANCE_EXAM_MIN_SCORE_PCT = 50
 
@@ -1132,6 +1135,15 @@ MICROSITE_DATABASE_TEMPLATE_CACHE_TTL = 5 * 60
 # by the branding API.
 FOOTER_CACHE_TIMEOUT = 30 * 60
 
+# Seconds for which ConfigurationModel values are also kept in a process-local cache
+# in front of the 'configuration' cache. Saving any configuration invalidates the local
+# copies in all processes from their next request. Set to 0 to disable the local cache.
+CONFIGURATION_MODEL_LOCAL_CACHE_TIMEOUT = 60
+
+# Log the hit/miss/size statistics of the functions memoized in the request cache
+# for each request, and report them in the X-Request-Cache-Stats response header.
+REQUEST_CACHE_STATS_ENABLED = False
+
 ############################### PROCTORING CONFIGURATION DEFAULTS ##############
 PROCTORING_BACKEND_PROVIDER = {
     'class': 'edx_proctoring.backends.null.NullBackendProvider',
@@ -1143,6 +1155,7 @@ PROCTORING_SETTINGS = {}
 
 DATABASE_ROUTERS = [
     'openedx.core.lib.django_courseware_routers.StudentModuleHistoryExtendedRouter',
+    'util.query.ReadReplicaRouter',
 ]
 
 ############################ OAUTH2 Provider ###################################
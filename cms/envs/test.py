@@ -176,6 +176,9 @@ CACHES = {
     },
 }
 
+# The process-local configuration cache would outlive the database rollback between tests
+CONFIGURATION_MODEL_LOCAL_CACHE_TIMEOUT = 0
+
 # hide ratelimit warnings while running tests
 filterwarnings('ignore', message='No request passed to the backend, unable to rate-limit')
 
@@ -19,6 +19,8 @@ define(["backbone.paginator", "js/models/asset"], function(BackbonePaginator, As
             'sort': function() { return this.sortField; },
             'direction': function() { return this.sortDirection; },
             'asset_type': function() { return this.assetType; },
+            // The server can only use the cursor to fetch the page following the one it was returned with
+            'cursor': function() { return this.currentPage === this.cursorPage ? this.nextCursor : ''; },
             'format': 'json'
         },
 
@@ -32,6 +34,8 @@ define(["backbone.paginator", "js/models/asset"], function(BackbonePaginator, As
             this.totalPages = Math.max(totalPages, 1); // Treat an empty collection as having 1 page...
             this.currentPage = currentPage;
             this.start = start;
+            this.nextCursor = response.nextCursor || '';
+            this.cursorPage = currentPage + 1;
             return response.assets;
         },
 
@@ -501,6 +501,47 @@ define(["jquery", "underscore", "underscore.string", "common/js/spec_helpers/aja
                             EditHelpers.verifyNotificationHidden(notificationSpy);
                         });
 
+                        it('waits for an xblock duplicated in the background', function () {
+                            var notificationSpy = EditHelpers.createNotificationSpy();
+                            renderContainerPage(this, mockContainerXBlockHtml);
+                            refreshXBlockSpies = spyOn(containerPage, "refreshXBlock");
+                            spyOn(window, 'setTimeout').andCallFake(function(callback) {
+                                callback();
+                            });
+                            clickDuplicate(0);
+                            // Large xblocks are duplicated in the background, with a 202 response
+                            AjaxHelpers.respondWithError(requests, 202, {
+                                'task_id': 'task-id',
+                                'status_url': '/xblock/duplicate_status/task-id'
+                            });
+                            AjaxHelpers.expectRequestURL(requests, '/xblock/duplicate_status/task-id', {});
+                            AjaxHelpers.respondWithJson(requests, {'state': 'pending'});
+                            expect(refreshXBlockSpies).not.toHaveBeenCalled();
+                            EditHelpers.verifyNotificationShowing(notificationSpy, /Duplicating/);
+
+                            AjaxHelpers.expectRequestURL(requests, '/xblock/duplicate_status/task-id', {});
+                            AjaxHelpers.respondWithJson(requests, {
+                                'state': 'succeeded',
+                                'locator': 'locator-duplicated-component'
+                            });
+                            expect(refreshXBlockSpies).toHaveBeenCalled();
+                            EditHelpers.verifyNotificationHidden(notificationSpy);
+                        });
+
+                        it('does not duplicate an xblock upon failure in the background', function () {
+                            renderContainerPage(this, mockContainerXBlockHtml);
+                            refreshXBlockSpies = spyOn(containerPage, "refreshXBlock");
+                            clickDuplicate(0);
+                            AjaxHelpers.respondWithError(requests, 202, {
+                                'task_id': 'task-id',
+                                'status_url': '/xblock/duplicate_status/task-id'
+                            });
+                            AjaxHelpers.expectRequestURL(requests, '/xblock/duplicate_status/task-id', {});
+                            AjaxHelpers.respondWithJson(requests, {'state': 'failed'});
+                            expectComponents(getGroupElement(), allComponentsInGroup);
+                            expect(refreshXBlockSpies).not.toHaveBeenCalled();
+                        });
+
                         it('does not duplicate an xblock upon failure', function () {
                             var notificationSpy = EditHelpers.createNotificationSpy();
                             renderContainerPage(this, mockContainerXBlockHtml);
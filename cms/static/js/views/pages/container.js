@@ -5,10 +5,10 @@
 define(["jquery", "underscore", "gettext", "js/views/pages/base_page", "common/js/components/utils/view_utils",
         "js/views/container", "js/views/xblock", "js/views/components/add_xblock", "js/views/modals/edit_xblock",
         "js/models/xblock_info", "js/views/xblock_string_field_editor", "js/views/pages/container_subviews",
-        "js/views/unit_outline", "js/views/utils/xblock_utils"],
+        "js/views/unit_outline", "js/views/utils/xblock_utils", "common/js/components/views/feedback_notification"],
     function ($, _, gettext, BasePage, ViewUtils, ContainerView, XBlockView, AddXBlockComponent,
               EditXBlockModal, XBlockInfo, XBlockStringFieldEditor, ContainerSubviews, UnitOutlineView,
-              XBlockUtils) {
+              XBlockUtils, NotificationView) {
         'use strict';
         var XBlockContainerPage = BasePage.extend({
             // takes XBlockInfo as a model
@@ -28,6 +28,9 @@ define(["jquery", "underscore", "gettext", "js/views/pages/base_page", "common/j
 
             view: 'container_preview',
 
+            // Milliseconds between polls of the status of a duplicate running in the background
+            duplicateStatusInterval: 1000,
+
             defaultViewClass: ContainerView,
 
             // Overridable by subclasses-- determines whether the XBlock component
@@ -235,9 +238,20 @@ define(["jquery", "underscore", "gettext", "js/views/pages/base_page", "common/j
                             requestData = {
                                 duplicate_source_locator: xblockElement.data('locator'),
                                 parent_locator: parentElement.data('locator')
-                            };
-                        return $.postJSON(self.getURLRoot() + '/', requestData,
-                            _.bind(self.onNewXBlock, self, placeholderElement, scrollOffset, true))
+                            },
+                            duplicated = $.Deferred();
+                        $.postJSON(self.getURLRoot() + '/', requestData, function(data, textStatus, jqXHR) {
+                            if (jqXHR.status === 202) {
+                                // Large xblocks are duplicated in the background
+                                self.waitForDuplicate(data.status_url, duplicated);
+                            } else {
+                                duplicated.resolve(data);
+                            }
+                        }).fail(function() {
+                            duplicated.reject();
+                        });
+                        return duplicated
+                            .done(_.bind(self.onNewXBlock, self, placeholderElement, scrollOffset, true))
                             .fail(function() {
                                 // Remove the placeholder if the update failed
                                 placeholderElement.remove();
@@ -245,6 +259,33 @@ define(["jquery", "underscore", "gettext", "js/views/pages/base_page", "common/j
                     });
             },
 
+            /**
+             * Polls the status of a duplicate running in the background until it is done.
+             * @param statusUrl The url of the status of the duplicate.
+             * @param duplicated A deferred resolved with the status of the duplicate, including
+             * its locator, once it has succeeded, and rejected if it failed.
+             */
+            waitForDuplicate: function(statusUrl, duplicated) {
+                var self = this;
+                $.getJSON(statusUrl, function(status) {
+                    if (status.state === 'succeeded') {
+                        duplicated.resolve(status);
+                    } else if (status.state === 'failed') {
+                        new NotificationView.Error({
+                            title: gettext("Studio's having trouble saving your work"),
+                            message: gettext('The component could not be duplicated.')
+                        }).show();
+                        duplicated.reject();
+                    } else {
+                        setTimeout(function() {
+                            self.waitForDuplicate(statusUrl, duplicated);
+                        }, self.duplicateStatusInterval);
+                    }
+                }).fail(function() {
+                    duplicated.reject();
+                });
+            },
+
             deleteComponent: function(xblockElement) {
                 var self = this,
                     xblockInfo = new XBlockInfo({
@@ -1,6 +1,11 @@
 """
 Django Model baseclass for database-backed configuration.
 """
+import copy
+import time
+from uuid import uuid4
+
+from django.conf import settings
 from django.db import connection, models
 from django.contrib.auth.models import User
 from django.core.cache import caches, InvalidCacheBackendError
@@ -11,6 +16,117 @@ try:
 except InvalidCacheBackendError:
     from django.core.cache import cache
 
+import request_cache
+
+# Changed whenever any configuration is saved, invalidating the process-local copies of all configurations
+GENERATION_CACHE_KEY = 'configuration/generation'
+GENERATION_REQUEST_CACHE_NAME = 'config_models.generation'
+
+# Process-local copies of cached configuration values, mapping their cache keys
+# to (expiration time, generation, value)
+_local_cache = {}  # pylint: disable=invalid-name
+# Time at which the expired copies are next pruned from the process-local cache
+_local_cache_next_prune = [0]  # pylint: disable=invalid-name
+
+
+def _local_cache_timeout():
+    """
+    Return the number of seconds configuration values are kept in the process-local cache,
+    or 0 if the local cache is disabled.
+    """
+    return getattr(settings, 'CONFIGURATION_MODEL_LOCAL_CACHE_TIMEOUT', 0)
+
+
+def _read_generation():
+    """
+    Return the configuration generation from the shared cache, seeding it if it is missing.
+    Returns None if the shared cache doesn't hold it, e.g. if it is unavailable.
+    """
+    generation = cache.get(GENERATION_CACHE_KEY)
+    if generation is None:
+        # Unless another process just seeded it
+        cache.add(GENERATION_CACHE_KEY, uuid4().hex, None)
+        generation = cache.get(GENERATION_CACHE_KEY)
+    return generation
+
+
+def _current_generation():
+    """
+    Return the current configuration generation, or None if it is unknown. It is only read
+    from the shared cache once per request, so that checking the local copies doesn't need a
+    round trip each time.
+    """
+    if request_cache.get_request() is None:
+        return _read_generation()
+    generation_cache = request_cache.get_cache(GENERATION_REQUEST_CACHE_NAME)
+    if 'generation' not in generation_cache:
+        generation_cache['generation'] = _read_generation()
+    return generation_cache['generation']
+
+
+def _set_local(cache_key, value, timeout):
+    """
+    Keep a copy of value in the process-local cache for timeout seconds, unless the current
+    generation is unknown, and prune the expired copies every local cache timeout.
+    """
+    generation = _current_generation()
+    if generation is None:
+        # A copy stored under an unknown generation could never be invalidated
+        return
+    now = time.time()
+    _local_cache[cache_key] = (now + timeout, generation, copy.deepcopy(value))
+    if now >= _local_cache_next_prune[0]:
+        for key, (expiration, __, __) in _local_cache.items():
+            if expiration <= now:
+                _local_cache.pop(key, None)
+        _local_cache_next_prune[0] = now + _local_cache_timeout()
+
+
+def _get_cached(cache_key):
+    """
+    Return the cached value of cache_key, from the process-local cache if it holds a valid
+    copy or else from the shared cache. Returns None if it isn't cached.
+
+    The value returned is the caller's own copy, as with values read from the shared cache,
+    so that changes made to it aren't seen by other callers.
+    """
+    timeout = _local_cache_timeout()
+    if not timeout:
+        return cache.get(cache_key)
+
+    generation = _current_generation()
+    entry = _local_cache.get(cache_key)
+    if entry is not None:
+        expiration, entry_generation, value = entry
+        if generation is not None and entry_generation == generation and expiration > time.time():
+            return copy.deepcopy(value)
+        _local_cache.pop(cache_key, None)
+
+    value = cache.get(cache_key)
+    if value is not None:
+        _set_local(cache_key, value, timeout)
+    return value
+
+
+def _set_cached(cache_key, value, timeout):
+    """
+    Cache value under cache_key in the shared cache, and in the process-local cache if it is enabled.
+    """
+    cache.set(cache_key, value, timeout)
+    local_timeout = _local_cache_timeout()
+    if local_timeout:
+        _set_local(cache_key, value, min(local_timeout, timeout))
+
+
+def _invalidate_local_caches():
+    """
+    Invalidate the process-local copies of all configurations, in all processes.
+    """
+    _local_cache.clear()
+    request_cache.get_cache(GENERATION_REQUEST_CACHE_NAME).clear()
+    if _local_cache_timeout():
+        cache.set(GENERATION_CACHE_KEY, uuid4().hex, None)
+
 
 class ConfigurationModelManager(models.Manager):
     """
@@ -99,6 +215,7 @@ class ConfigurationModel(models.Model):
         cache.delete(self.cache_key_name(*[getattr(self, key) for key in self.KEY_FIELDS]))
         if self.KEY_FIELDS:
             cache.delete(self.key_values_cache_key_name())
+        _invalidate_local_caches()
 
     @classmethod
     def cache_key_name(cls, *args):
@@ -119,7 +236,7 @@ class ConfigurationModel(models.Model):
         from the database, or by creating a new empty entry (which is not
         persisted).
         """
-        cached = cache.get(cls.cache_key_name(*args))
+        cached = _get_cached(cls.cache_key_name(*args))
         if cached is not None:
             return cached
 
@@ -129,7 +246,7 @@ class ConfigurationModel(models.Model):
         except IndexError:
             current = cls(**key_dict)
 
-        cache.set(cls.cache_key_name(*args), current, cls.cache_timeout)
+        _set_cached(cls.cache_key_name(*args), current, cls.cache_timeout)
         return current
 
     @classmethod
@@ -170,9 +287,9 @@ class ConfigurationModel(models.Model):
         assert not kwargs, "'flat' is the only kwarg accepted"
         key_fields = key_fields or cls.KEY_FIELDS
         cache_key = cls.key_values_cache_key_name(*key_fields)
-        cached = cache.get(cache_key)
+        cached = _get_cached(cache_key)
         if cached is not None:
             return cached
         values = list(cls.objects.values_list(*key_fields, flat=flat).order_by().distinct())
-        cache.set(cache_key, values, cls.cache_timeout)
+        _set_cached(cache_key, values, cls.cache_timeout)
         return values
@@ -5,14 +5,17 @@ Tests of ConfigurationModel
 
 import ddt
 from django.contrib.auth.models import User
+from django.core.cache.backends.locmem import LocMemCache
 from django.db import models
 from django.test import TestCase
+from django.test.utils import override_settings
 from rest_framework.test import APIRequestFactory
 
 from freezegun import freeze_time
 
 from mock import patch, Mock
-from config_models.models import ConfigurationModel
+from request_cache.middleware import RequestCache
+from config_models.models import ConfigurationModel, GENERATION_CACHE_KEY, _local_cache, _local_cache_next_prune
 from config_models.views import ConfigurationModelCurrentAPIView
 
 
@@ -295,6 +298,92 @@ class KeyedConfigurationModelTests(TestCase):
         self.assertEquals(ExampleKeyedConfig.key_values(), fake_result)
 
 
+@override_settings(CONFIGURATION_MODEL_LOCAL_CACHE_TIMEOUT=60)
+class LocalCacheConfigurationModelTests(TestCase):
+    """
+    Tests of the process-local cache of ConfigurationModel values
+    """
+    def setUp(self):
+        super(LocalCacheConfigurationModelTests, self).setUp()
+        self.user = User()
+        self.user.save()
+        self.cache = LocMemCache('config_models_tests', {})
+        patcher = patch('config_models.models.cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(_local_cache.clear)
+        _local_cache.clear()
+        _local_cache_next_prune[0] = 0
+
+    def start_request(self):
+        """
+        Make the request cache behave as it does while handling a request.
+        """
+        RequestCache().process_request(APIRequestFactory().get('/'))
+        self.addCleanup(RequestCache.clear_request_cache)
+
+    def test_no_shared_cache_reads(self):
+        ExampleConfig(changed_by=self.user, string_field='first').save()
+        self.start_request()
+        self.assertEqual(ExampleConfig.current().string_field, 'first')
+
+        with patch.object(self.cache, 'get') as mock_get:
+            with self.assertNumQueries(0):
+                self.assertEqual(ExampleConfig.current().string_field, 'first')
+            self.assertFalse(mock_get.called)
+
+    def test_save_invalidates(self):
+        ExampleConfig(changed_by=self.user, string_field='first').save()
+        self.assertEqual(ExampleConfig.current().string_field, 'first')
+        ExampleConfig(changed_by=self.user, string_field='second').save()
+        self.assertEqual(ExampleConfig.current().string_field, 'second')
+
+    def test_other_process_save_invalidates(self):
+        ExampleConfig(changed_by=self.user, string_field='first').save()
+        self.assertEqual(ExampleConfig.current().string_field, 'first')
+
+        # Another process saving a configuration changes the generation and the shared cache
+        self.cache.set(GENERATION_CACHE_KEY, 'other')
+        self.cache.set(ExampleConfig.cache_key_name(), ExampleConfig(string_field='second'))
+        self.assertEqual(ExampleConfig.current().string_field, 'second')
+
+    def test_expiration(self):
+        with freeze_time('2015-01-01 00:00:00'):
+            self.assertEqual(ExampleConfig.current().string_field, '')
+        self.cache.set(ExampleConfig.cache_key_name(), ExampleConfig(string_field='second'))
+        with freeze_time('2015-01-01 00:00:30'):
+            self.assertEqual(ExampleConfig.current().string_field, '')
+        with freeze_time('2015-01-01 00:02:00'):
+            self.assertEqual(ExampleConfig.current().string_field, 'second')
+
+    def test_copies_returned(self):
+        ExampleConfig(changed_by=self.user, string_field='first').save()
+        ExampleConfig.current().string_field = 'changed'
+        self.assertEqual(ExampleConfig.current().string_field, 'first')
+
+    def test_expired_copies_pruned(self):
+        with freeze_time('2015-01-01 00:00:00'):
+            ExampleKeyedConfig.current('left', 'right')
+        with freeze_time('2015-01-01 00:02:00'):
+            ExampleConfig.current()
+        self.assertEqual(_local_cache.keys(), [ExampleConfig.cache_key_name()])
+
+    def test_missing_generation(self):
+        self.assertEqual(ExampleConfig.current().string_field, '')
+
+        # The generation is evicted from the shared cache, and a configuration saved meanwhile
+        self.cache.delete(GENERATION_CACHE_KEY)
+        self.cache.set(ExampleConfig.cache_key_name(), ExampleConfig(string_field='second'))
+        self.assertEqual(ExampleConfig.current().string_field, 'second')
+
+    def test_unavailable_generation(self):
+        with patch.object(self.cache, 'add'):
+            self.assertEqual(ExampleConfig.current().string_field, '')
+            self.assertEqual(_local_cache, {})
+            self.cache.set(ExampleConfig.cache_key_name(), ExampleConfig(string_field='second'))
+            self.assertEqual(ExampleConfig.current().string_field, 'second')
+
+
 @ddt.ddt
 class ConfigurationModelAPITests(TestCase):
     """
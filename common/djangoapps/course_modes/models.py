@@ -9,9 +9,12 @@ from config_models.models import ConfigurationModel
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import Q
+from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 from xmodule_django.models import CourseKeyField
 
+from student.dashboard_cache import invalidate_course_dashboard_snapshots
+
 Mode = namedtuple('Mode',
                   [
                       'slug',
@@ -632,6 +635,13 @@ class CourseMode(models.Model):
         )
 
 
+@receiver(models.signals.post_save, sender=CourseMode)
+@receiver(models.signals.post_delete, sender=CourseMode)
+def invalidate_course_mode_dashboard_snapshots(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Invalidate the dashboard snapshots of the users enrolled in the course, which depend on its modes. """
+    invalidate_course_dashboard_snapshots(instance.course_id)
+
+
 class CourseModesArchive(models.Model):
     """
     Store the past values of course_mode that a course had in the past. We decided on having
@@ -5,6 +5,7 @@ This module requires that :class:`request_cache.middleware.RequestCache`
 is installed in order to clear the cache after each request.
 """
 
+import functools
 import logging
 from urlparse import urlparse
 
@@ -36,6 +37,76 @@ def get_request():
     return middleware.RequestCache.get_current_request()
 
 
+def get_stats():
+    """
+    Return the hit, miss and size statistics of the namespaces of the functions memoized with
+    :func:`request_cached` during the current request, as a dict mapping each namespace to a
+    dict with 'hits', 'misses' and 'size' keys.
+    """
+    return middleware.RequestCache.get_request_cache(middleware.STATS_CACHE_NAME)
+
+
+def _hashable(value):
+    """
+    Return a hashable equivalent of value for use in a memoization key, converting
+    lists, dicts and sets. Raises TypeError if value can't be hashed.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    elif isinstance(value, dict):
+        return frozenset((key, _hashable(item)) for key, item in value.iteritems())
+    elif isinstance(value, set):
+        return frozenset(value)
+    hash(value)
+    return value
+
+
+def request_cached(namespace=None):
+    """
+    Memoize a function or method in the request cache, so that it is only called once per
+    request for each combination of arguments. Methods are memoized per instance.
+
+    The arguments are part of the memoization key, so they must be hashable or lists, dicts
+    and sets of hashable values. Calls with other arguments are not memoized.
+
+    Hits, misses and the number of memoized results are recorded per namespace, see
+    :func:`get_stats`.
+
+    Arguments:
+        namespace (str): The name of the request cache holding the results, which defaults
+            to the module and name of the function. Functions can share a namespace if their
+            arguments don't overlap.
+    """
+    def _decorator(func):
+        """Decorate func."""
+        cache_name = namespace or u"{}.{}".format(func.__module__, func.__name__)
+
+        @functools.wraps(func)
+        def _wrapper(*args, **kwargs):
+            """
+            Return the memoized result of func, calling it on a miss.
+            """
+            stats = get_stats().setdefault(cache_name, {'hits': 0, 'misses': 0, 'size': 0})
+            try:
+                key = (func, _hashable(args), _hashable(kwargs))
+            except TypeError:
+                stats['misses'] += 1
+                return func(*args, **kwargs)
+
+            cache = get_cache(cache_name)
+            if key in cache:
+                stats['hits'] += 1
+                return cache[key]
+
+            stats['misses'] += 1
+            result = func(*args, **kwargs)
+            cache[key] = result
+            stats['size'] = len(cache)
+            return result
+        return _wrapper
+    return _decorator
+
+
 def get_request_or_stub():
     """
     Return the current request or a stub request.
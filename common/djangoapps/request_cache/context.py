@@ -0,0 +1,122 @@
+"""
+Context variables: state which belongs to the request being handled rather than to the thread
+handling it, such as the request cache and the tracking context.
+
+The values of the context variables are stored in the current :class:`Context`, which is
+thread-local (and so greenlet-local when gevent has patched the threading module). Work that is
+handed off to other threads or greenlets during a request, e.g. to make concurrent calls, must
+be wrapped with :func:`propagate_context` to run with the context of the request:
+
+    pool.map(propagate_context(fetch), urls)
+    gevent.spawn(propagate_context(fetch), url)
+
+The helpers then see the request cache and tracking context of the request, rather than
+nothing or the leftovers of an unrelated request handled earlier by the same worker.
+"""
+import functools
+import threading
+
+
+class _ContextStorage(threading.local):
+    """
+    A thread-local holding the current context.
+    """
+    def __init__(self):
+        super(_ContextStorage, self).__init__()
+        self.context = None
+
+
+_STORAGE = _ContextStorage()
+
+
+class Context(object):
+    """
+    A mapping of context variables to their values.
+    """
+    def __init__(self, values=None):
+        self._values = values or {}
+
+    def copy(self):
+        """
+        Return a copy of this context, in which each variable holds a copy of its value
+        made as specified by the variable.
+        """
+        return Context({var: var.copy_value(value) for var, value in self._values.iteritems()})
+
+    def run(self, func, *args, **kwargs):
+        """
+        Call func with this context as the current context, and restore the previous one after.
+        """
+        previous = _STORAGE.context
+        _STORAGE.context = self
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _STORAGE.context = previous
+
+
+def get_context():
+    """
+    Return the current context.
+    """
+    if _STORAGE.context is None:
+        _STORAGE.context = Context()
+    return _STORAGE.context
+
+
+def copy_context():
+    """
+    Return a copy of the current context, which can be used to run functions elsewhere with
+    the context variables they would see here.
+    """
+    return get_context().copy()
+
+
+def propagate_context(func):
+    """
+    Return a function which calls func in a copy of the current context, for running func in
+    another thread or greenlet.
+    """
+    context = copy_context()
+
+    @functools.wraps(func)
+    def _wrapper(*args, **kwargs):
+        """
+        Call func in the captured context.
+        """
+        return context.run(func, *args, **kwargs)
+    return _wrapper
+
+
+class ContextVar(object):
+    """
+    A variable whose value belongs to the current context.
+
+    Arguments:
+        name (str): The name of the variable, for debugging.
+        default: A function returning the value of the variable in contexts where it wasn't set.
+        copy: A function copying the value of the variable when a context is copied. By default
+            the copies share the value, so e.g. helpers of a request share its request cache.
+    """
+    def __init__(self, name, default=lambda: None, copy=lambda value: value):
+        self.name = name
+        self._default = default
+        self.copy_value = copy
+
+    def __repr__(self):
+        return '<ContextVar {}>'.format(self.name)
+
+    def get(self):
+        """
+        Return the value of the variable in the current context, setting it to the default if unset.
+        """
+        values = get_context()._values  # pylint: disable=protected-access
+        if self not in values:
+            values[self] = self._default()
+        return values[self]
+
+    def set(self, value):
+        """
+        Set the value of the variable in the current context.
+        """
+        get_context()._values[self] = value  # pylint: disable=protected-access
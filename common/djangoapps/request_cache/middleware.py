@@ -1,14 +1,48 @@
-import threading
+import logging
 
+from django.conf import settings
 
-class _RequestCache(threading.local):
+from request_cache.context import ContextVar
+
+
+log = logging.getLogger(__name__)
+
+# Name of the request cache holding the statistics of the functions memoized with request_cache.request_cached
+STATS_CACHE_NAME = 'request_cache.stats'
+
+# Response header reporting the statistics when settings.REQUEST_CACHE_STATS_ENABLED is set
+STATS_HEADER = 'X-Request-Cache-Stats'
+
+
+class _RequestCache(object):
     """
-    A thread-local for storing the per-request cache.
+    The per-request cache, stored in context variables so that the helpers a request runs
+    with request_cache.context.propagate_context share it.
     """
-    def __init__(self):
-        super(_RequestCache, self).__init__()
-        self.data = {}
-        self.request = None
+    _data = ContextVar('request_cache.data', default=dict)
+    _request = ContextVar('request_cache.request')
+
+    @property
+    def data(self):
+        """
+        The dict of named caches of the current request.
+        """
+        return self._data.get()
+
+    @data.setter
+    def data(self, value):
+        self._data.set(value)
+
+    @property
+    def request(self):
+        """
+        The current request, or None outside of requests.
+        """
+        return self._request.get()
+
+    @request.setter
+    def request(self, value):
+        self._request.set(value)
 
 
 REQUEST_CACHE = _RequestCache()
@@ -46,5 +80,23 @@ class RequestCache(object):
         return None
 
     def process_response(self, request, response):
+        if getattr(settings, 'REQUEST_CACHE_STATS_ENABLED', False):
+            self.report_stats(request, response)
         self.clear_request_cache()
         return response
+
+    @classmethod
+    def report_stats(cls, request, response):
+        """
+        Log the hit, miss and size statistics of the memoized functions of the request, and report
+        them in a response header, to find redundant work per endpoint.
+        """
+        stats = REQUEST_CACHE.data.get(STATS_CACHE_NAME)
+        if not stats:
+            return
+        summary = u';'.join(
+            u"{}={hits}/{misses}/{size}".format(namespace, **namespace_stats)
+            for namespace, namespace_stats in sorted(stats.iteritems())
+        )
+        log.info(u"Request cache stats (hits/misses/size) for %s %s: %s", request.method, request.path, summary)
+        response[STATS_HEADER] = summary
@@ -1,10 +1,18 @@
 """
 Tests for the request cache.
 """
+import threading
+
 from django.conf import settings
+from django.http import HttpResponse
 from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+from mock import Mock
 
-from request_cache import get_request_or_stub
+from request_cache import get_cache, get_request_or_stub, get_stats, request_cached
+from request_cache.context import ContextVar, Context, copy_context, propagate_context
+from request_cache.middleware import RequestCache, STATS_HEADER
 
 
 class TestRequestCache(TestCase):
@@ -18,3 +26,108 @@ class TestRequestCache(TestCase):
         stub = get_request_or_stub()
         expected_url = "http://{site_name}/foobar".format(site_name=settings.SITE_NAME)
         self.assertEqual(stub.build_absolute_uri("foobar"), expected_url)
+
+
+class Unhashable(object):
+    """
+    An argument which can't be part of a memoization key.
+    """
+    __hash__ = None
+
+
+class TestRequestCached(TestCase):
+    """
+    Tests for the request_cached decorator.
+    """
+    def setUp(self):
+        super(TestRequestCached, self).setUp()
+        RequestCache.clear_request_cache()
+        self.addCleanup(RequestCache.clear_request_cache)
+        self.func_to_count = Mock(side_effect=lambda *args, **kwargs: len(args) + len(kwargs))
+
+    @request_cached(namespace='request_cache.tests')
+    def method_to_memoize(self, *args, **kwargs):
+        """
+        A test method whose results are memoized in the request cache.
+        """
+        return self.func_to_count(*args, **kwargs)
+
+    def test_memoized(self):
+        for __ in range(3):
+            self.assertEqual(self.method_to_memoize('foo'), 1)
+            self.assertEqual(self.method_to_memoize('foo', bar=['baz']), 2)
+            self.assertEqual(self.method_to_memoize({'foo': [1, 2]}), 1)
+        self.assertEqual(self.func_to_count.call_count, 3)
+        self.assertEqual(get_stats()['request_cache.tests'], {'hits': 6, 'misses': 3, 'size': 3})
+
+    def test_unhashable_arguments(self):
+        unhashable = Unhashable()
+        self.method_to_memoize(unhashable)
+        self.method_to_memoize(unhashable)
+        self.assertEqual(self.func_to_count.call_count, 2)
+        self.assertEqual(get_stats()['request_cache.tests'], {'hits': 0, 'misses': 2, 'size': 0})
+
+    def test_cleared_after_request(self):
+        self.method_to_memoize('foo')
+        RequestCache().process_response(RequestFactory().get('/'), HttpResponse())
+        self.method_to_memoize('foo')
+        self.assertEqual(self.func_to_count.call_count, 2)
+        self.assertEqual(len(get_cache('request_cache.tests')), 1)
+
+    @override_settings(REQUEST_CACHE_STATS_ENABLED=True)
+    def test_stats_header(self):
+        request = RequestFactory().get('/')
+        RequestCache().process_request(request)
+        self.method_to_memoize('foo')
+        self.method_to_memoize('foo')
+        response = RequestCache().process_response(request, HttpResponse())
+        self.assertEqual(response[STATS_HEADER], 'request_cache.tests=1/1/1')
+
+
+class TestContext(TestCase):
+    """
+    Tests for context variables and their propagation.
+    """
+    def setUp(self):
+        super(TestContext, self).setUp()
+        self.var = ContextVar('request_cache.tests', default=list, copy=list)
+
+    def run_in_thread(self, func):
+        """
+        Run func in another thread, wait for it and return its result.
+        """
+        result = []
+        thread = threading.Thread(target=lambda: result.append(func()))
+        thread.start()
+        thread.join()
+        return result[0]
+
+    def test_default(self):
+        self.assertEqual(Context().run(self.var.get), [])
+
+    def test_contexts_isolated(self):
+        Context().run(self.var.set, ['first'])
+        self.assertEqual(Context().run(self.var.get), [])
+
+    def test_copy(self):
+        def _copy_and_change():
+            """
+            Set the variable, copy the context and change the value in the copy.
+            """
+            self.var.set(['value'])
+            copy_context().run(lambda: self.var.get().append('copy'))
+            return self.var.get()
+        self.assertEqual(Context().run(_copy_and_change), ['value'])
+
+    def test_propagate_to_thread(self):
+        def _request():
+            """
+            Fill the request cache and read it from helper threads.
+            """
+            RequestCache().process_request(RequestFactory().get('/'))
+            get_cache('request_cache.tests')['key'] = 'value'
+            return (
+                self.run_in_thread(propagate_context(lambda: get_cache('request_cache.tests').get('key'))),
+                self.run_in_thread(lambda: get_cache('request_cache.tests').get('key')),
+            )
+        self.assertEqual(Context().run(_request), ('value', None))
@@ -0,0 +1,104 @@
+"""
+Caching of the per-user parts of the learner dashboard.
+
+The dashboard snapshot holds the parts of the dashboard context which are expensive to compute
+for users with many enrollments (credit statuses, programs and email opt-outs). It is cached per
+user and must be invalidated whenever the data it was built from changes:
+
+* the user's enrollments, credit eligibilities and requests, and email opt-outs
+  invalidate the user's snapshot, by calling `invalidate_dashboard_snapshot`.
+* the modes of a course invalidate the snapshots of all users enrolled in it, by calling
+  `invalidate_course_dashboard_snapshots`. Rather than finding those users, each course has a
+  version token which is recorded in the snapshots and changed on invalidation.
+
+This module only depends on the cache, so that the models of other apps can import it to
+invalidate snapshots from their signal receivers.
+
+Certificate statuses aren't part of the snapshot, as they depend on the current time (whether the
+course may certify yet) and on the course overviews, which change when courses are published.
+"""
+import logging
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+log = logging.getLogger(__name__)
+
+DASHBOARD_SNAPSHOT_CACHE_KEY = u"student.dashboard_snapshot.{username}"
+DASHBOARD_COURSE_VERSION_CACHE_KEY = u"student.dashboard_snapshot.course_version.{course_id}"
+
+
+def _snapshot_cache_key(username):
+    """
+    Returns the cache key of the dashboard snapshot of the user.
+    """
+    return DASHBOARD_SNAPSHOT_CACHE_KEY.format(username=username)
+
+
+def _course_version_cache_keys(course_ids):
+    """
+    Returns a dict mapping the version cache keys of the courses to the course ids.
+    """
+    return {
+        DASHBOARD_COURSE_VERSION_CACHE_KEY.format(course_id=unicode(course_id)): course_id
+        for course_id in course_ids
+    }
+
+
+def _enrollments_signature(course_enrollments):
+    """
+    Returns a value identifying the enrollments a snapshot was built from, so that a snapshot
+    isn't reused for another set of enrollments (e.g. in a microsite).
+    """
+    return sorted((unicode(enrollment.course_id), enrollment.mode) for enrollment in course_enrollments)
+
+
+def get_dashboard_snapshot(user, course_enrollments, build_snapshot):
+    """
+    Returns the dashboard snapshot of the user for the given enrollments, calling
+    `build_snapshot(user, course_enrollments)` to build it if there is no valid cached snapshot.
+
+    Snapshots are only cached if settings.DASHBOARD_SNAPSHOT_CACHE_TIMEOUT is set.
+    """
+    timeout = getattr(settings, 'DASHBOARD_SNAPSHOT_CACHE_TIMEOUT', 0)
+    if not timeout:
+        return build_snapshot(user, course_enrollments)
+
+    version_keys = _course_version_cache_keys(enrollment.course_id for enrollment in course_enrollments)
+    # A single round trip gets the snapshot and the current versions of its courses
+    cached = cache.get_many([_snapshot_cache_key(user.username)] + version_keys.keys())
+    course_versions = {
+        unicode(course_id): cached.get(version_key) for version_key, course_id in version_keys.iteritems()
+    }
+    signature = _enrollments_signature(course_enrollments)
+
+    entry = cached.get(_snapshot_cache_key(user.username))
+    if entry is not None and entry['signature'] == signature and entry['course_versions'] == course_versions:
+        return entry['snapshot']
+
+    snapshot = build_snapshot(user, course_enrollments)
+    cache.set(
+        _snapshot_cache_key(user.username),
+        {'signature': signature, 'course_versions': course_versions, 'snapshot': snapshot},
+        timeout
+    )
+    return snapshot
+
+
+def invalidate_dashboard_snapshot(username):
+    """
+    Invalidates the dashboard snapshot of the user.
+    """
+    cache.delete(_snapshot_cache_key(username))
+
+
+def invalidate_course_dashboard_snapshots(course_id):
+    """
+    Invalidates the dashboard snapshots of all the users enrolled in the course.
+    """
+    version_key = DASHBOARD_COURSE_VERSION_CACHE_KEY.format(course_id=unicode(course_id))
+    # The version must outlive the snapshots which recorded the previous one
+    cache.set(version_key, uuid4().hex, None)
+    log.info(u"Invalidated the dashboard snapshots of course %s", course_id)
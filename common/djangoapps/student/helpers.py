@@ -8,6 +8,8 @@ from django.core.urlresolvers import reverse, NoReverseMatch
 import third_party_auth
 from lms.djangoapps.verify_student.models import VerificationDeadline, SoftwareSecurePhotoVerification
 from course_modes.models import CourseMode
+from student.models import CourseEnrollment
+from student.roles import RoleCache
 
 
 # Enumeration of per-course verification statuses
@@ -164,6 +166,20 @@ def check_verify_status_by_course(user, course_enrollments):
     return status_by_course
 
 
+def preload_course_access(user, course_keys):
+    """
+    Load the enrollments of the user in the given courses and all of the user's course access roles
+    with two queries, so that checking them for each course doesn't query them again during the
+    current request.
+
+    Does nothing for anonymous users or outside of a request.
+    """
+    if not user.is_authenticated():
+        return
+    CourseEnrollment.preload_enrollments(user, course_keys)
+    RoleCache.preload(user)
+
+
 def auth_pipeline_urls(auth_entry, redirect_url=None):
     """Retrieve URLs for each enabled third-party auth provider.
 
@@ -0,0 +1,36 @@
+""" Command line script to recompute the enrollment counts of courses. """
+
+from util.counters import RebuildCountsCommand
+
+from student.models import CourseEnrollment, CourseEnrollmentCount
+
+
+class Command(RebuildCountsCommand):
+
+    help = """
+    Recomputes the counts of active enrollments per course and mode from the
+    enrollments, starting to count the courses which aren't counted yet and
+    correcting any drift of the counts maintained as enrollments change. Meant
+    to be run periodically, e.g. from cron.
+
+    Example:
+
+        Reconcile the counts of all courses:
+
+          $ ... reconcile_enrollment_counts
+
+        Reconcile the counts of a single course:
+
+          $ ... reconcile_enrollment_counts -c course-v1:edX+DemoX+Demo_Course
+
+    """
+
+    def get_course_ids(self):
+        return set(
+            CourseEnrollment.objects.values_list('course_id', flat=True).distinct()
+        ) | set(
+            CourseEnrollmentCount.objects.values_list('course_id', flat=True).distinct()
+        )
+
+    def rebuild(self, course_id):
+        return CourseEnrollmentCount.rebuild(course_id)
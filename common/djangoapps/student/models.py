@@ -30,7 +30,7 @@ from django.contrib.auth.models import User
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.signals import user_logged_in, user_logged_out
 from django.db import models, IntegrityError, transaction
-from django.db.models import Count
+from django.db.models import Count, Sum
 from django.db.models.signals import pre_save, post_save
 from django.dispatch import receiver, Signal
 from django.core.exceptions import ObjectDoesNotExist
@@ -47,11 +47,14 @@ from xmodule_django.models import CourseKeyField, NoneToEmptyManager
 
 from certificates.models import GeneratedCertificate
 from course_modes.models import CourseMode
+from student.dashboard_cache import invalidate_dashboard_snapshot
 from enrollment.api import _default_course_mode
 from microsite_configuration import microsite
 import lms.lib.comment_client as cc
+import request_cache
 from openedx.core.djangoapps.commerce.utils import ecommerce_api_client, ECOMMERCE_DATE_FORMAT
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from util.counters import CourseCounterMixin
 from util.model_utils import emit_field_changed_events, get_changed_fields_dict
 from util.query import use_read_replica_if_available
 from util.milestones_helpers import is_entrance_exams_enabled
@@ -869,6 +872,9 @@ class CourseEnrollmentManager(models.Manager):
 
         'course_id' is the course_id to return enrollments
         """
+        counts = CourseEnrollmentCount.objects.filter(course_id=course_id)
+        if counts.exists():
+            return counts.aggregate(total=Sum('count'))['total']
 
         enrollment_number = super(CourseEnrollmentManager, self).get_queryset().filter(
             course_id=course_id,
@@ -899,6 +905,15 @@ class CourseEnrollmentManager(models.Manager):
         Returns a dictionary that stores the total enrollment count for a course, as well as the
         enrollment count for each individual mode.
         """
+        counts = CourseEnrollmentCount.objects.filter(course_id=course_id)
+        if counts.exists():
+            enroll_dict = defaultdict(int)
+            for counter in counts:
+                if counter.count:
+                    enroll_dict[counter.mode] = counter.count
+            enroll_dict['total'] = sum(enroll_dict.values())
+            return enroll_dict
+
         # Unfortunately, Django's "group by"-style queries look super-awkward
         query = use_read_replica_if_available(
             super(CourseEnrollmentManager, self).get_queryset().filter(course_id=course_id, is_active=True).values(
@@ -952,6 +967,10 @@ class CourseEnrollment(models.Model):
     # cache key format e.g enrollment.<username>.<course_key>.mode = 'honor'
     COURSE_ENROLLMENT_CACHE_KEY = u"enrollment.{}.{}.mode"
 
+    # Name of the request cache holding the enrollments loaded by preload_enrollments
+    # keyed by (user id, course key), with None for the courses the user isn't enrolled in
+    ENROLLMENTS_REQUEST_CACHE_NAME = u"student.CourseEnrollment.preloaded"
+
     class Meta(object):
         unique_together = (('user', 'course_id'),)
         ordering = ('user', 'course_id')
@@ -963,6 +982,10 @@ class CourseEnrollment(models.Model):
         # When the property .course_overview is accessed for the first time, this variable will be set.
         self._course_overview = None
 
+        # The mode this enrollment is counted in by CourseEnrollmentCount, or None if it isn't
+        # counted because it is inactive. Updated whenever the enrollment is saved.
+        self._counted_mode = self.mode if self.pk is not None and self.is_active else None
+
     def __unicode__(self):
         return (
             "[CourseEnrollment] {}: {} ({}); active: ({})"
@@ -1021,6 +1044,10 @@ class CourseEnrollment(models.Model):
         Returns:
             Course enrollment object or None
         """
+        try:
+            return cls._get_preloaded_enrollment(user, course_key)
+        except KeyError:
+            pass
         try:
             return cls.objects.get(
                 user=user,
@@ -1029,6 +1056,36 @@ class CourseEnrollment(models.Model):
         except cls.DoesNotExist:
             return None
 
+    @classmethod
+    def preload_enrollments(cls, user, course_keys):
+        """
+        Loads the enrollments of the user in all of the given courses with a single query, so that
+        get_enrollment, is_enrolled and enrollment_mode_for_user don't query them for the rest of
+        the request. Does nothing outside of a request, since nothing would clear the cache.
+
+        Args:
+            user (User): The user whose enrollments to load.
+            course_keys (iterable of CourseKey): The courses whose enrollments to load.
+        """
+        if request_cache.get_request() is None or not user.is_authenticated():
+            return
+        preloaded = request_cache.get_cache(cls.ENROLLMENTS_REQUEST_CACHE_NAME)
+        course_keys = set(course_keys)
+        for course_key in course_keys:
+            preloaded[(user.id, course_key)] = None
+        for enrollment in cls.objects.filter(user=user, course_id__in=course_keys):
+            preloaded[(user.id, enrollment.course_id)] = enrollment
+
+    @classmethod
+    def _get_preloaded_enrollment(cls, user, course_key):
+        """
+        Returns the enrollment of the user in the course loaded by preload_enrollments, or None if
+        the user isn't enrolled in it. Raises KeyError if it wasn't preloaded.
+        """
+        if request_cache.get_request() is None:
+            raise KeyError(course_key)
+        return request_cache.get_cache(cls.ENROLLMENTS_REQUEST_CACHE_NAME)[(getattr(user, 'id', None), course_key)]
+
     @classmethod
     def is_enrollment_closed(cls, user, course):
         """
@@ -1065,7 +1122,12 @@ class CourseEnrollment(models.Model):
             mode_changed = True
 
         if activation_changed or mode_changed:
-            self.save()
+            with transaction.atomic():
+                if self.pk is not None:
+                    # Count the change from the state of the enrollment in the database rather than
+                    # from this instance, which may be stale, e.g. if the enrollment is submitted twice
+                    self._counted_mode = self._lock_counted_mode()
+                self.save()
 
         if activation_changed:
             if self.is_active:
@@ -1094,6 +1156,16 @@ class CourseEnrollment(models.Model):
             # mode has changed from its previous setting
             self.emit_event(EVENT_NAME_ENROLLMENT_MODE_CHANGED)
 
+    def _lock_counted_mode(self):
+        """
+        Locks the row of this enrollment until the end of the transaction, and returns the mode it
+        is counted in according to the database, or None if it isn't counted.
+        """
+        rows = CourseEnrollment.objects.select_for_update().filter(pk=self.pk).values_list('mode', 'is_active')
+        for mode, is_active in rows:
+            return mode if is_active else None
+        return None
+
     def emit_event(self, event_name):
         """
         Emits an event to explicitly track course enrollment and unenrollment.
@@ -1313,6 +1385,11 @@ class CourseEnrollment(models.Model):
         if not user.is_authenticated():
             return False
 
+        try:
+            record = cls._get_preloaded_enrollment(user, course_key)
+            return record is not None and record.is_active
+        except KeyError:
+            pass
         try:
             record = cls.objects.get(user=user, course_id=course_key)
             return record.is_active
@@ -1359,6 +1436,11 @@ class CourseEnrollment(models.Model):
             and is_active is whether the enrollment is active.
         Returns (None, None) if the courseenrollment record does not exist.
         """
+        try:
+            record = cls._get_preloaded_enrollment(user, course_id)
+            return (record.mode, record.is_active) if record is not None else (None, None)
+        except KeyError:
+            pass
         try:
             record = cls.objects.get(user=user, course_id=course_id)
             return (record.mode, record.is_active)
@@ -1520,6 +1602,77 @@ def invalidate_enrollment_mode_cache(sender, instance, **kwargs):  # pylint: dis
     cache.delete(cache_key)
 
 
+@receiver(models.signals.post_save, sender=CourseEnrollment)
+@receiver(models.signals.post_delete, sender=CourseEnrollment)
+def invalidate_enrollment_dashboard_snapshot(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Invalidate the dashboard snapshot of the enrolled user. """
+    invalidate_dashboard_snapshot(instance.user.username)
+
+
+@receiver(models.signals.post_save, sender=CourseEnrollment)
+@receiver(models.signals.post_delete, sender=CourseEnrollment)
+def invalidate_preloaded_enrollment(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Forget the enrollment loaded by CourseEnrollment.preload_enrollments. """
+    preloaded = request_cache.get_cache(CourseEnrollment.ENROLLMENTS_REQUEST_CACHE_NAME)
+    preloaded.pop((instance.user_id, instance.course_id), None)
+
+
+class CourseEnrollmentCount(CourseCounterMixin, models.Model):
+    """
+    The number of active enrollments in a course in each enrollment mode.
+
+    The counts are maintained as enrollments are saved and deleted, so that enrollment_counts and
+    is_course_full don't have to count the enrollments of the course. A course is counted once its
+    counts have been built by the `reconcile_enrollment_counts` management command, which is meant
+    to be run periodically to correct any drift, e.g. from bulk updates which don't send signals.
+    Until then, its enrollments are counted when read.
+    """
+    KEY_FIELDS = ('mode',)
+
+    course_id = CourseKeyField(max_length=255)
+    mode = models.CharField(max_length=100)
+    count = models.IntegerField(default=0)
+
+    class Meta(object):
+        unique_together = (('course_id', 'mode'),)
+
+    def __unicode__(self):
+        return u"[CourseEnrollmentCount] {}: {} ({})".format(self.course_id, self.count, self.mode)
+
+    @classmethod
+    def actual_counts(cls, course_id):
+        return {
+            (item['mode'],): item['mode__count']
+            for item in CourseEnrollment.objects.filter(
+                course_id=course_id, is_active=True
+            ).values('mode').order_by().annotate(Count('mode'))
+        }
+
+
+@receiver(models.signals.post_save, sender=CourseEnrollment)
+def update_enrollment_count(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Update the count of the enrollment's mode when it is activated, deactivated or changes mode. """
+    new_mode = instance.mode if instance.is_active else None
+    old_mode = instance._counted_mode  # pylint: disable=protected-access
+    if new_mode == old_mode:
+        return
+    deltas = {}
+    if old_mode is not None:
+        deltas[(old_mode,)] = -1
+    if new_mode is not None:
+        deltas[(new_mode,)] = 1
+    CourseEnrollmentCount.add(instance.course_id, deltas)
+    instance._counted_mode = new_mode  # pylint: disable=protected-access
+
+
+@receiver(models.signals.post_delete, sender=CourseEnrollment)
+def remove_enrollment_count(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Remove a deleted enrollment from the count of its mode. """
+    counted_mode = instance._counted_mode  # pylint: disable=protected-access
+    if counted_mode is not None:
+        CourseEnrollmentCount.add(instance.course_id, {(counted_mode,): -1})
+
+
 class ManualEnrollmentAudit(models.Model):
     """
     Table for tracking which enrollments were performed through manual enrollment.
@@ -1647,6 +1800,14 @@ class CourseAccessRole(models.Model):
         return "[CourseAccessRole] user: {}   role: {}   org: {}   course: {}".format(self.user.username, self.role, self.org, self.course_id)
 
 
+@receiver(models.signals.post_save, sender=CourseAccessRole)
+@receiver(models.signals.post_delete, sender=CourseAccessRole)
+def invalidate_role_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Forget the roles of the user shared by the RoleCaches of the request. """
+    from student.roles import RoleCache
+    RoleCache.invalidate(instance.user_id)
+
+
 #### Helper methods for use from python manage.py shell and other classes.
 
 
@@ -2086,6 +2247,13 @@ class CourseEnrollmentAttribute(models.Model):
         ]
 
 
+@receiver(models.signals.post_save, sender=CourseEnrollmentAttribute)
+@receiver(models.signals.post_delete, sender=CourseEnrollmentAttribute)
+def invalidate_attribute_dashboard_snapshot(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Invalidate the dashboard snapshot of the enrolled user, which shows their credit provider. """
+    invalidate_dashboard_snapshot(instance.enrollment.user.username)
+
+
 class EnrollmentRefundConfiguration(ConfigurationModel):
     """
     Configuration for course enrollment refunds.
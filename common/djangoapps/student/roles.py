@@ -8,6 +8,7 @@ from abc import ABCMeta, abstractmethod
 from django.contrib.auth.models import User
 import logging
 
+import request_cache
 from student.models import CourseAccessRole
 from xmodule_django.models import CourseKeyField
 
@@ -37,11 +38,42 @@ def register_access_role(cls):
 class RoleCache(object):
     """
     A cache of the CourseAccessRoles held by a particular user
+
+    During a request, the roles are loaded once per user and shared by all of the RoleCaches of
+    that user, so that checking roles on different User objects doesn't query them again.
     """
+    # Name of the request cache holding the roles of each user, keyed by user id
+    CACHE_NAMESPACE = u"student.roles.RoleCache"
+
     def __init__(self, user):
-        self._roles = set(
-            CourseAccessRole.objects.filter(user=user).all()
-        )
+        self._roles = self._load_roles(user)
+
+    @classmethod
+    def _load_roles(cls, user):
+        """
+        Return the set of CourseAccessRoles of the user, shared within the current request.
+        """
+        if request_cache.get_request() is None:
+            return set(CourseAccessRole.objects.filter(user=user).all())
+        roles_by_user = request_cache.get_cache(cls.CACHE_NAMESPACE)
+        if user.id not in roles_by_user:
+            roles_by_user[user.id] = set(CourseAccessRole.objects.filter(user=user).all())
+        return roles_by_user[user.id]
+
+    @classmethod
+    def preload(cls, user):
+        """
+        Load all of the CourseAccessRoles of the user with a single query, for the rest of the
+        current request.
+        """
+        user._roles = cls(user)  # pylint: disable=protected-access
+
+    @classmethod
+    def invalidate(cls, user_id):
+        """
+        Forget the roles of the user loaded during the current request.
+        """
+        request_cache.get_cache(cls.CACHE_NAMESPACE).pop(user_id, None)
 
     def has_role(self, role, course_id, org):
         """
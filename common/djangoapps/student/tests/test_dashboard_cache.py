@@ -0,0 +1,83 @@
+"""
+Tests for the caching of the learner dashboard snapshot.
+"""
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.utils import override_settings
+from mock import Mock
+from opaque_keys.edx.locator import CourseLocator
+
+from bulk_email.models import Optout
+from course_modes.tests.factories import CourseModeFactory
+from student.dashboard_cache import get_dashboard_snapshot
+from student.models import CourseEnrollment
+from student.tests.factories import UserFactory, CourseEnrollmentFactory
+
+
+@override_settings(DASHBOARD_SNAPSHOT_CACHE_TIMEOUT=60)
+class DashboardSnapshotCacheTest(TestCase):
+    """
+    Tests for get_dashboard_snapshot and its invalidation.
+    """
+    def setUp(self):
+        super(DashboardSnapshotCacheTest, self).setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = UserFactory.create()
+        self.course_key = CourseLocator('edX', 'dashboard', 'cache')
+        self.enrollment = CourseEnrollmentFactory.create(user=self.user, course_id=self.course_key)
+        self.build_snapshot = Mock(return_value={'credit_statuses': {}})
+
+    def get_snapshot(self):
+        """
+        Returns the user's snapshot, building it with the mock if needed.
+        """
+        enrollments = list(CourseEnrollment.enrollments_for_user(self.user))
+        return get_dashboard_snapshot(self.user, enrollments, self.build_snapshot)
+
+    def assert_snapshot_rebuilt(self, rebuilt):
+        """
+        Asserts whether getting the snapshot again rebuilds it.
+        """
+        self.build_snapshot.reset_mock()
+        self.assertEqual(self.get_snapshot(), {'credit_statuses': {}})
+        self.assertEqual(self.build_snapshot.called, rebuilt)
+
+    def test_cached(self):
+        self.get_snapshot()
+        self.assert_snapshot_rebuilt(False)
+
+    @override_settings(DASHBOARD_SNAPSHOT_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        self.get_snapshot()
+        self.assert_snapshot_rebuilt(True)
+
+    def test_enrollment_invalidates(self):
+        self.get_snapshot()
+        self.enrollment.update_enrollment(mode='verified')
+        self.assert_snapshot_rebuilt(True)
+
+    def test_new_enrollment_invalidates(self):
+        self.get_snapshot()
+        CourseEnrollmentFactory.create(user=self.user, course_id=CourseLocator('edX', 'other', 'course'))
+        self.assert_snapshot_rebuilt(True)
+
+    def test_optout_invalidates(self):
+        self.get_snapshot()
+        Optout.objects.create(user=self.user, course_id=self.course_key)
+        self.assert_snapshot_rebuilt(True)
+
+    def test_course_mode_invalidates(self):
+        self.get_snapshot()
+        CourseModeFactory.create(course_id=self.course_key, mode_slug='verified')
+        self.assert_snapshot_rebuilt(True)
+
+    def test_other_course_mode_does_not_invalidate(self):
+        self.get_snapshot()
+        CourseModeFactory.create(course_id=CourseLocator('edX', 'other', 'course'), mode_slug='verified')
+        self.assert_snapshot_rebuilt(False)
+
+    def test_other_user_does_not_invalidate(self):
+        self.get_snapshot()
+        CourseEnrollmentFactory.create(user=UserFactory.create(), course_id=self.course_key)
+        self.assert_snapshot_rebuilt(False)
@@ -0,0 +1,146 @@
+"""
+Tests for the enrollment counts maintained by CourseEnrollmentCount.
+"""
+from django.core.management import call_command
+from django.test import TestCase
+from mock import Mock, patch
+from opaque_keys.edx.locator import CourseLocator
+
+from request_cache.middleware import RequestCache
+from student.models import CourseEnrollment, CourseEnrollmentCount
+from student.tests.factories import UserFactory, CourseEnrollmentFactory
+
+
+class CourseEnrollmentCountTest(TestCase):
+    """
+    Tests for the enrollment counts and the CourseEnrollmentManager methods reading them.
+    """
+    def setUp(self):
+        super(CourseEnrollmentCountTest, self).setUp()
+        # is_counted() is memoized in the request cache
+        RequestCache.clear_request_cache()
+        self.addCleanup(RequestCache.clear_request_cache)
+        self.course_key = CourseLocator('edX', 'counts', 'course')
+        self.users = [UserFactory.create() for __ in range(3)]
+
+    def enroll(self, user, mode='audit'):
+        """
+        Enrolls the user in the course.
+        """
+        return CourseEnrollmentFactory.create(user=user, course_id=self.course_key, mode=mode)
+
+    def start_counting(self):
+        """
+        Builds the counts of the course, as the reconcile_enrollment_counts command does.
+        """
+        call_command('reconcile_enrollment_counts', course_id=unicode(self.course_key))
+        self.assertTrue(CourseEnrollmentCount.is_counted(self.course_key))
+
+    def assert_counts(self, expected):
+        """
+        Asserts the counts of the course by mode, as read from the counters and counted from the enrollments.
+        """
+        with self.assertNumQueries(2):
+            counts = CourseEnrollment.objects.enrollment_counts(self.course_key)
+        self.assertEqual(dict(counts), dict(expected, total=sum(expected.values())))
+        self.assertEqual(CourseEnrollment.objects.num_enrolled_in(self.course_key), sum(expected.values()))
+        self.assertFalse(CourseEnrollmentCount.rebuild(self.course_key))
+
+    def test_enroll_and_unenroll(self):
+        self.enroll(self.users[0], 'audit')
+        self.start_counting()
+        enrollment = self.enroll(self.users[1], 'verified')
+        self.enroll(self.users[2], 'verified')
+        self.assert_counts({'audit': 1, 'verified': 2})
+
+        enrollment.update_enrollment(is_active=False)
+        self.assert_counts({'audit': 1, 'verified': 1})
+
+        enrollment.update_enrollment(is_active=True)
+        self.assert_counts({'audit': 1, 'verified': 2})
+
+    def test_activate_from_stale_instances(self):
+        enrollment = self.enroll(self.users[0], 'audit')
+        enrollment.update_enrollment(is_active=False)
+        self.start_counting()
+        # e.g. an enrollment submitted twice
+        stale_enrollments = [CourseEnrollment.objects.get(id=enrollment.id) for __ in range(2)]
+        for stale_enrollment in stale_enrollments:
+            stale_enrollment.update_enrollment(is_active=True)
+        self.assert_counts({'audit': 1})
+
+    def test_change_mode(self):
+        enrollment = self.enroll(self.users[0], 'audit')
+        self.start_counting()
+        enrollment.update_enrollment(mode='verified')
+        self.assert_counts({'verified': 1})
+
+    def test_delete(self):
+        enrollment = self.enroll(self.users[0], 'audit')
+        self.enroll(self.users[1], 'audit')
+        self.start_counting()
+        enrollment.delete()
+        self.assert_counts({'audit': 1})
+
+    def test_uncounted_course(self):
+        self.enroll(self.users[0], 'audit')
+        self.enroll(self.users[1], 'audit')
+        CourseEnrollment.objects.get(user=self.users[0]).update_enrollment(mode='verified')
+
+        # The enrollments of the course aren't counted until the counts are built
+        self.assertFalse(CourseEnrollmentCount.is_counted(self.course_key))
+        counts = CourseEnrollment.objects.enrollment_counts(self.course_key)
+        self.assertEqual(dict(counts), {'audit': 1, 'verified': 1, 'total': 2})
+        self.assertEqual(CourseEnrollment.objects.num_enrolled_in(self.course_key), 2)
+
+        self.start_counting()
+        self.assert_counts({'audit': 1, 'verified': 1})
+
+    def test_counter_created_concurrently(self):
+        self.enroll(self.users[0], 'audit')
+        self.start_counting()
+
+        def create_counter(course_id):
+            """
+            Creates the verified counter, as a concurrent enrollment would, right before it is created.
+            """
+            CourseEnrollmentCount.objects.create(course_id=course_id, mode='verified', count=1)
+            return True
+
+        with patch.object(CourseEnrollmentCount, 'is_counted', side_effect=create_counter):
+            self.enroll(self.users[1], 'verified')
+        # The enrollment is added to the count of the concurrent one
+        self.assertEqual(CourseEnrollmentCount.objects.get(course_id=self.course_key, mode='verified').count, 2)
+
+    def test_rebuild_with_counter_created_concurrently(self):
+        self.enroll(self.users[0], 'audit')
+        counter_filter = CourseEnrollmentCount._counter_filter  # pylint: disable=protected-access
+
+        def create_counter(course_id, key):
+            """
+            Creates the counter, as a concurrent enrollment would, right before it is created.
+            """
+            CourseEnrollmentCount.objects.create(course_id=course_id, mode=key[0], count=5)
+            return counter_filter(course_id, key)
+
+        with patch.object(CourseEnrollmentCount, '_counter_filter', side_effect=create_counter):
+            self.start_counting()
+        self.assert_counts({'audit': 1})
+
+    def test_reconcile_drift(self):
+        self.enroll(self.users[0], 'audit')
+        self.enroll(self.users[1], 'audit')
+        self.start_counting()
+        # Bulk updates don't send signals
+        CourseEnrollment.objects.filter(user=self.users[1]).update(is_active=False)
+
+        call_command('reconcile_enrollment_counts', course_id=unicode(self.course_key))
+        self.assert_counts({'audit': 1})
+
+    def test_is_course_full(self):
+        course = Mock(id=self.course_key, max_student_enrollments_allowed=2)
+        self.enroll(self.users[0])
+        self.start_counting()
+        self.assertFalse(CourseEnrollment.objects.is_course_full(course))
+        self.enroll(self.users[1])
+        self.assertTrue(CourseEnrollment.objects.is_course_full(course))
@@ -0,0 +1,149 @@
+"""
+Tests for preloading the enrollments and access roles of a user within a request.
+"""
+import re
+import unittest
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from opaque_keys.edx.locator import CourseLocator
+
+from request_cache.middleware import RequestCache
+from student.helpers import preload_course_access
+from student.models import CourseEnrollment
+from student.roles import CourseStaffRole
+from student.tests.factories import UserFactory, CourseEnrollmentFactory
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+
+# The tables whose rows preload_course_access loads
+COURSE_ACCESS_TABLES = ('student_courseenrollment', 'student_courseaccessrole')
+
+
+class PreloadCourseAccessTest(TestCase):
+    """
+    Tests for preload_course_access.
+    """
+    def setUp(self):
+        super(PreloadCourseAccessTest, self).setUp()
+        self.user = UserFactory.create()
+        self.enrolled_key = CourseLocator('edX', 'enrolled', 'course')
+        self.other_key = CourseLocator('edX', 'other', 'course')
+        CourseEnrollmentFactory.create(user=self.user, course_id=self.enrolled_key, mode='verified')
+        CourseStaffRole(self.enrolled_key).add_users(self.user)
+        self.start_request()
+
+    def start_request(self):
+        """
+        Make the request cache behave as it does while handling a request.
+        """
+        RequestCache().process_request(RequestFactory().get('/'))
+        self.addCleanup(RequestCache.clear_request_cache)
+
+    def test_preloaded_checks(self):
+        with self.assertNumQueries(2):
+            preload_course_access(self.user, [self.enrolled_key, self.other_key])
+
+        with self.assertNumQueries(0):
+            self.assertTrue(CourseEnrollment.is_enrolled(self.user, self.enrolled_key))
+            self.assertFalse(CourseEnrollment.is_enrolled(self.user, self.other_key))
+            self.assertEqual(
+                CourseEnrollment.enrollment_mode_for_user(self.user, self.enrolled_key), ('verified', True)
+            )
+            self.assertEqual(CourseEnrollment.enrollment_mode_for_user(self.user, self.other_key), (None, None))
+            self.assertIsNone(CourseEnrollment.get_enrollment(self.user, self.other_key))
+            self.assertTrue(CourseStaffRole(self.enrolled_key).has_user(self.user))
+            self.assertFalse(CourseStaffRole(self.other_key).has_user(self.user))
+
+    def test_roles_shared_between_user_objects(self):
+        preload_course_access(self.user, [self.enrolled_key])
+        user = User.objects.get(id=self.user.id)
+        with self.assertNumQueries(0):
+            self.assertTrue(CourseStaffRole(self.enrolled_key).has_user(user))
+
+    def test_not_preloaded_course(self):
+        preload_course_access(self.user, [self.other_key])
+        with self.assertNumQueries(1):
+            self.assertTrue(CourseEnrollment.is_enrolled(self.user, self.enrolled_key))
+
+    def test_enrollment_change(self):
+        preload_course_access(self.user, [self.enrolled_key, self.other_key])
+        CourseEnrollment.enroll(self.user, self.other_key)
+        CourseEnrollment.unenroll(self.user, self.enrolled_key)
+        self.assertTrue(CourseEnrollment.is_enrolled(self.user, self.other_key))
+        self.assertFalse(CourseEnrollment.is_enrolled(self.user, self.enrolled_key))
+
+    def test_role_change(self):
+        preload_course_access(self.user, [self.enrolled_key])
+        CourseStaffRole(self.other_key).add_users(self.user)
+        user = User.objects.get(id=self.user.id)
+        self.assertTrue(CourseStaffRole(self.other_key).has_user(user))
+
+    def test_outside_request(self):
+        RequestCache.clear_request_cache()
+        preload_course_access(self.user, [self.enrolled_key])
+        with self.assertNumQueries(1):
+            self.assertTrue(CourseEnrollment.is_enrolled(self.user, self.enrolled_key))
+
+    def test_anonymous_user(self):
+        with self.assertNumQueries(0):
+            preload_course_access(AnonymousUser(), [self.enrolled_key])
+
+
+class CourseAccessQueriesMixin(object):
+    """
+    Counts the queries of the enrollments and access roles made by views, which don't grow
+    with the number of courses shown when the courses are preloaded.
+    """
+    def get_course_access_queries(self, url):
+        """
+        Get url, and return the number of queries of each of COURSE_ACCESS_TABLES made meanwhile.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return {
+            table: len([
+                query for query in context.captured_queries
+                if re.search(r'\b{}\b'.format(table), query['sql'])
+            ])
+            for table in COURSE_ACCESS_TABLES
+        }
+
+    def assert_course_access_queries_constant(self, url, add_courses):
+        """
+        Assert that getting url makes as many queries of the enrollments and access roles
+        before and after add_courses() adds courses to the page.
+        """
+        queries = self.get_course_access_queries(url)
+        add_courses()
+        self.assertEqual(self.get_course_access_queries(url), queries)
+
+
+@unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+class DashboardCourseAccessQueriesTest(CourseAccessQueriesMixin, ModuleStoreTestCase):
+    """
+    Tests that the dashboard checks the enrollments and access roles of the user with a fixed
+    number of queries.
+    """
+    def setUp(self):
+        super(DashboardCourseAccessQueriesTest, self).setUp()
+        self.student = UserFactory.create()
+        self.client.login(username=self.student.username, password='test')
+
+    def enroll_in_new_courses(self, num_courses):
+        """
+        Enroll the student in num_courses new courses.
+        """
+        for __ in range(num_courses):
+            course = CourseFactory.create()
+            CourseEnrollmentFactory.create(user=self.student, course_id=course.id)
+
+    def test_dashboard(self):
+        self.enroll_in_new_courses(2)
+        self.assert_course_access_queries_constant(reverse('dashboard'), lambda: self.enroll_in_new_courses(3))
@@ -6,8 +6,10 @@ import unittest
 from mock import patch
 from pyquery import PyQuery as pq
 
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.conf import settings
+from django.test.utils import override_settings
 
 from student.tests.factories import UserFactory, CourseEnrollmentFactory
 from student.models import CourseEnrollment
@@ -40,7 +42,7 @@ class TestStudentDashboardUnenrollments(SharedModuleStoreTestCase):
         self.cert_status = None
         self.client.login(username=self.USERNAME, password=self.PASSWORD)
 
-    def mock_cert(self, _user, _course_overview, _course_mode):
+    def mock_cert(self, _user, _course_overview, _course_mode, _cert_status=None):
         """ Return a preset certificate status. """
         if self.cert_status is not None:
             return {
@@ -94,6 +96,20 @@ class TestStudentDashboardUnenrollments(SharedModuleStoreTestCase):
             else:
                 course_enrollment.assert_not_called()
 
+    @override_settings(DASHBOARD_SNAPSHOT_CACHE_TIMEOUT=60)
+    def test_cert_status_not_cached(self):
+        """ Assert that the cert status is current while the rest of the dashboard is cached."""
+        cache.clear()
+        self.addCleanup(cache.clear)
+        with patch('student.views.cert_info', side_effect=self.mock_cert):
+            response = self.client.get(reverse('dashboard'))
+            self.assertEqual(pq(response.content)(self.UNENROLL_ELEMENT_ID).length, 1)
+
+            # e.g. the course became certifiable, which doesn't invalidate the snapshot
+            self.cert_status = 'ready'
+            response = self.client.get(reverse('dashboard'))
+            self.assertEqual(pq(response.content)(self.UNENROLL_ELEMENT_ID).length, 0)
+
     def test_no_cert_status(self):
         """ Assert that the dashboard loads when cert_status is None."""
         with patch('student.views.cert_info', return_value=None):
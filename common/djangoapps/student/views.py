@@ -56,7 +56,9 @@ from student.models import (
 from student.forms import AccountCreationForm, PasswordResetFormNoActive, get_registration_extension_form
 from lms.djangoapps.commerce.utils import EcommerceService  # pylint: disable=import-error
 from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification  # pylint: disable=import-error
-from certificates.models import CertificateStatuses, certificate_status_for_student
+from certificates.models import (
+    CertificateStatuses, certificate_status_for_student, certificate_statuses_for_student
+)
 from certificates.api import (  # pylint: disable=import-error
     get_certificate_url,
     has_html_certificates_enabled,
@@ -105,8 +107,10 @@ from util.password_policy_validators import (
 
 import third_party_auth
 from third_party_auth import pipeline, provider
+from student.dashboard_cache import get_dashboard_snapshot
 from student.helpers import (
     check_verify_status_by_course,
+    preload_course_access,
     auth_pipeline_urls, get_next_url_for_login_page,
     DISABLE_UNENROLL_CERT_STATES,
 )
@@ -202,7 +206,7 @@ def process_survey_link(survey_link, user):
     return survey_link.format(UNIQUE_ID=unique_id_for_user(user))
 
 
-def cert_info(user, course_overview, course_mode):
+def cert_info(user, course_overview, course_mode, cert_status=None):
     """
     Get the certificate info needed to render the dashboard section for the given
     student and course.
@@ -211,6 +215,8 @@ def cert_info(user, course_overview, course_mode):
         user (User): A user.
         course_overview (CourseOverview): A course.
         course_mode (str): The enrollment mode (honor, verified, audit, etc.)
+        cert_status (dict): The status of the user's certificate in the course, as
+            returned by certificate_status_for_student. Loaded if not given.
 
     Returns:
         dict: Empty dict if certificates are disabled or hidden, or a dictionary with keys:
@@ -225,12 +231,9 @@ def cert_info(user, course_overview, course_mode):
     """
     if not course_overview.may_certify():
         return {}
-    return _cert_info(
-        user,
-        course_overview,
-        certificate_status_for_student(user, course_overview.id),
-        course_mode
-    )
+    if cert_status is None:
+        cert_status = certificate_status_for_student(user, course_overview.id)
+    return _cert_info(user, course_overview, cert_status, course_mode)
 
 
 def reverification_info(statuses):
@@ -569,6 +572,7 @@ def dashboard(request):
 
     # Retrieve the course modes for each course
     enrolled_course_ids = [enrollment.course_id for enrollment in course_enrollments]
+    preload_course_access(user, enrolled_course_ids)
     __, unexpired_course_modes = CourseMode.all_and_unexpired_modes_for_courses(enrolled_course_ids)
     course_modes_by_course = {
         course_id: {
@@ -584,7 +588,7 @@ def dashboard(request):
         course_enrollments, course_modes_by_course
     )
 
-    course_optouts = Optout.objects.filter(user=user).values_list('course_id', flat=True)
+    snapshot = get_dashboard_snapshot(user, course_enrollments, _build_dashboard_snapshot)
 
     message = ""
     if not user.is_active:
@@ -607,10 +611,6 @@ def dashboard(request):
         and has_access(request.user, 'view_courseware_with_prerequisites', enrollment.course_overview)
     )
 
-    # Get any programs associated with courses being displayed.
-    # This is passed along in the template context to allow rendering of
-    # program-related information on the dashboard.
-    course_programs = _get_course_programs(user, [enrollment.course_id for enrollment in course_enrollments])
     xseries_credentials = _get_xseries_credentials(user)
 
     # Construct a dictionary of course mode information
@@ -639,8 +639,12 @@ def dashboard(request):
     # If a course is not included in this dictionary,
     # there is no verification messaging to display.
     verify_status_by_course = check_verify_status_by_course(user, course_enrollments)
+    # Certificate statuses aren't part of the snapshot, see student.dashboard_cache
+    certificate_statuses = certificate_statuses_for_student(request.user, enrolled_course_ids)
     cert_statuses = {
-        enrollment.course_id: cert_info(request.user, enrollment.course_overview, enrollment.mode)
+        enrollment.course_id: cert_info(
+            request.user, enrollment.course_overview, enrollment.mode, certificate_statuses[enrollment.course_id]
+        )
         for enrollment in course_enrollments
     }
 
@@ -712,14 +716,14 @@ def dashboard(request):
         'enrollment_message': enrollment_message,
         'redirect_message': redirect_message,
         'course_enrollments': course_enrollments,
-        'course_optouts': course_optouts,
+        'course_optouts': snapshot['course_optouts'],
         'message': message,
         'staff_access': staff_access,
         'errored_courses': errored_courses,
         'show_courseware_links_for': show_courseware_links_for,
         'all_course_modes': course_mode_info,
         'cert_statuses': cert_statuses,
-        'credit_statuses': _credit_statuses(user, course_enrollments),
+        'credit_statuses': snapshot['credit_statuses'],
         'show_email_settings_for': show_email_settings_for,
         'reverifications': reverifications,
         'verification_status': verification_status,
@@ -737,7 +741,7 @@ def dashboard(request):
         'order_history_list': order_history_list,
         'courses_requirements_not_met': courses_requirements_not_met,
         'nav_hidden': True,
-        'course_programs': course_programs,
+        'course_programs': snapshot['course_programs'],
         'disable_courseware_js': True,
         'xseries_credentials': xseries_credentials,
     }
@@ -752,6 +756,27 @@ def dashboard(request):
     return render_to_response('dashboard.html', context)
 
 
+def _build_dashboard_snapshot(user, course_enrollments):
+    """
+    Builds the parts of the dashboard context which are cached per user by `get_dashboard_snapshot`.
+
+    Arguments:
+        user (User): The user whose dashboard is displayed.
+        course_enrollments (list[CourseEnrollment]): The enrollments displayed on the dashboard.
+
+    Returns:
+        dict: with the keys course_optouts, credit_statuses and course_programs.
+    """
+    return {
+        'course_optouts': list(Optout.objects.filter(user=user).values_list('course_id', flat=True)),
+        'credit_statuses': _credit_statuses(user, course_enrollments),
+        # Get any programs associated with courses being displayed.
+        # This is passed along in the template context to allow rendering of
+        # program-related information on the dashboard.
+        'course_programs': _get_course_programs(user, [enrollment.course_id for enrollment in course_enrollments]),
+    }
+
+
 def _create_recent_enrollment_message(course_enrollments, course_modes):  # pylint: disable=invalid-name
     """
     Builds a recent course enrollment message.
@@ -0,0 +1,23 @@
+"""
+Storage of the tracking context in a context variable.
+"""
+from collections import OrderedDict
+
+from request_cache.context import ContextVar
+
+
+class ContextVarLocator(object):
+    """
+    An eventtracking context locator which stores the tracking context in a context variable
+    rather than a thread-local, so that the helpers a request runs in other threads or
+    greenlets with `request_cache.context.propagate_context` emit events in its context.
+
+    Helpers get a copy of the context, so that the contexts they enter don't leak into the
+    events of the request.
+    """
+    def __init__(self):
+        self.context = ContextVar('track.context', default=OrderedDict, copy=OrderedDict)
+
+    def get(self):
+        """Return the current tracking context. """
+        return self.context.get()
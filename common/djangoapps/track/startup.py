@@ -0,0 +1,13 @@
+"""
+Store the tracking context in a context variable on startup.
+"""
+from eventtracking import tracker
+
+from track.locator import ContextVarLocator
+
+
+def run():
+    """
+    Replace the thread-local context locator of the default tracker.
+    """
+    tracker.get_tracker().context_locator = ContextVarLocator()
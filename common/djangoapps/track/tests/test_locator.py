@@ -0,0 +1,61 @@
+"""
+Tests for storing the tracking context in a context variable.
+"""
+import threading
+
+from track.locator import ContextVarLocator
+from track.tests import EventTrackingTestCase
+from request_cache.context import Context, propagate_context
+
+
+class ContextVarLocatorTest(EventTrackingTestCase):
+    """
+    Tests for ContextVarLocator.
+    """
+    def setUp(self):
+        super(ContextVarLocatorTest, self).setUp()
+        self.tracker.context_locator = ContextVarLocator()
+
+    def run_in_thread(self, func):
+        """
+        Run func in another thread and wait for it.
+        """
+        thread = threading.Thread(target=func)
+        thread.start()
+        thread.join()
+
+    def emit_in_context(self, func):
+        """
+        Call func in a new context in which the tracking context of the request is entered.
+        """
+        def _emit():
+            """
+            Emit events from func within the request context.
+            """
+            with self.tracker.context('edx.request', {'user_id': 1}):
+                func()
+        Context().run(_emit)
+
+    def test_propagated_to_helper(self):
+        self.emit_in_context(lambda: self.run_in_thread(propagate_context(lambda: self.tracker.emit('helper'))))
+        self.assertEqual(self.get_event()['context']['user_id'], 1)
+
+    def test_not_propagated(self):
+        self.emit_in_context(lambda: self.run_in_thread(lambda: self.tracker.emit('helper')))
+        self.assertNotIn('user_id', self.get_event()['context'])
+
+    def test_helper_context_isolated(self):
+        def _helper():
+            """
+            Enter a context in the helper without leaving it.
+            """
+            self.tracker.enter_context('helper', {'helper_field': 1})
+
+        def _request():
+            """
+            Run the helper and emit an event of the request after it.
+            """
+            propagate_context(_helper)()
+            self.tracker.emit('request')
+        self.emit_in_context(_request)
+        self.assertNotIn('helper_field', self.get_event()['context'])
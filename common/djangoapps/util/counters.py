@@ -0,0 +1,205 @@
+"""
+Counters of the rows of a course, maintained as the rows change.
+
+Aggregating the rows of large courses on each read, e.g. to show enrollment counts or grade
+distributions, is slow. Models mixing in :class:`CourseCounterMixin` hold counters instead,
+identified by a course and the values of their KEY_FIELDS, which are adjusted with F() updates
+as the counted rows change:
+
+    class CourseEnrollmentCount(CourseCounterMixin, models.Model):
+        KEY_FIELDS = ('mode',)
+        ...
+
+    CourseEnrollmentCount.add(course_id, {('honor',): 1})
+
+The counters of a course are rebuilt from its rows by a management command subclassing
+:class:`RebuildCountsCommand`, which is meant to be run periodically to correct any drift, e.g.
+from bulk updates which don't send signals.
+"""
+import logging
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from request_cache import get_cache, request_cached
+
+log = logging.getLogger(__name__)
+
+IS_COUNTED_CACHE_NAME = 'util.counters.is_counted'
+
+
+class CourseCounterMixin(object):
+    """
+    Mixin of the models of counters of the rows of a course.
+
+    Subclasses define:
+        KEY_FIELDS (tuple): The fields identifying a counter of a course, besides course_id.
+        COUNT_FIELD (str): The field holding the count.
+        COUNTS_ALL_COURSES (bool): Whether the changes of all courses are counted. Otherwise, a
+            course is only counted once its counters have been built by rebuild(), and the
+            readers of the counters aggregate the rows of the courses which aren't counted.
+        actual_counts(course_id): Returns the actual counts of the course, aggregated from the
+            counted rows, as a dict mapping the tuples of the values of KEY_FIELDS to the counts.
+    """
+    KEY_FIELDS = ()
+    COUNT_FIELD = 'count'
+    COUNTS_ALL_COURSES = False
+
+    @classmethod
+    def actual_counts(cls, course_id):
+        """
+        Returns the actual counts of the course, aggregated from the counted rows.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    @request_cached(namespace=IS_COUNTED_CACHE_NAME)
+    def is_counted(cls, course_id):
+        """
+        Returns whether the counts of the course are maintained. Memoized for the request, so
+        that the changes of a course which isn't counted cost no queries after the first one.
+        """
+        return cls.objects.filter(course_id=course_id).exists()
+
+    @classmethod
+    def _clear_is_counted(cls):
+        """
+        Forgets the memoized results of is_counted(), once counters may have been created.
+        """
+        get_cache(IS_COUNTED_CACHE_NAME).clear()
+
+    @classmethod
+    def _counter_filter(cls, course_id, key):
+        """
+        Returns the filter of the counter of the course identified by key, whose values may have
+        been read from the database.
+        """
+        counter_filter = {
+            field: cls._meta.get_field(field).to_python(value)  # pylint: disable=protected-access
+            for field, value in zip(cls.KEY_FIELDS, key)
+        }
+        counter_filter['course_id'] = course_id
+        return counter_filter
+
+    @classmethod
+    def add(cls, course_id, deltas):
+        """
+        Adds the deltas, a dict mapping counter keys to changes, to the counters of the course if
+        it is counted.
+        """
+        if not cls.COUNTS_ALL_COURSES and not cls.is_counted(course_id):
+            return
+        for key, delta in deltas.iteritems():
+            cls._increment(course_id, key, delta)
+
+    @classmethod
+    def _increment(cls, course_id, key, delta):
+        """
+        Adds delta to the counter of the course identified by key, creating it if needed.
+        """
+        counter_filter = cls._counter_filter(course_id, key)
+        increment = {cls.COUNT_FIELD: F(cls.COUNT_FIELD) + delta}
+        if cls.objects.filter(**counter_filter).update(**increment):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(**dict(counter_filter, **{cls.COUNT_FIELD: delta}))
+        except IntegrityError:
+            # The counter was created concurrently
+            cls.objects.filter(**counter_filter).update(**increment)
+
+    @classmethod
+    def rebuild(cls, course_id):
+        """
+        Recomputes the counts of the course from its rows, and returns whether they had drifted.
+
+        The counters of the course are locked before its rows are aggregated, in the same
+        transaction, so that add() either completes before the aggregate, whose rows then include
+        its change, or waits and applies its change on top of the rebuilt count. The aggregate
+        must see the rows committed up to the lock, so this isn't meant to be called from a
+        transaction which has already read the counted rows.
+        """
+        with transaction.atomic():
+            counters = {
+                tuple(row[:-2]): row[-2:]
+                for row in cls.objects.select_for_update().filter(
+                    course_id=course_id
+                ).values_list(*(cls.KEY_FIELDS + ('id', cls.COUNT_FIELD)))
+            }
+            actual = cls.actual_counts(course_id)
+            drifted = 0
+            for key in set(counters) | set(actual):
+                count = actual.get(key, 0)
+                if key in counters:
+                    counter_id, counter_count = counters[key]
+                    if counter_count != count:
+                        cls.objects.filter(id=counter_id).update(**{cls.COUNT_FIELD: count})
+                        drifted += 1
+                    continue
+
+                counter_filter = cls._counter_filter(course_id, key)
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(**dict(counter_filter, **{cls.COUNT_FIELD: count}))
+                except IntegrityError:
+                    # The counter was created concurrently by add(), whose change is in count
+                    # unless it was committed after the aggregate. That is then off until the
+                    # next rebuild.
+                    cls.objects.filter(**counter_filter).update(**{cls.COUNT_FIELD: count})
+                drifted += 1
+        cls._clear_is_counted()
+        if drifted:
+            log.info(u"Rebuilt %s of course %s: %d counters had drifted", cls.__name__, course_id, drifted)
+        return bool(drifted)
+
+
+class RebuildCountsCommand(BaseCommand):
+    """
+    Base of the management commands rebuilding the counters of courses, those of a single
+    course if the -c/--course option is given.
+
+    Subclasses define:
+        get_course_ids(): Returns the ids of the courses to rebuild when no course is given.
+        rebuild(course_id): Rebuilds the counters of the course, and returns whether they had
+            drifted.
+    """
+    option_list = BaseCommand.option_list + (
+        make_option('-c', '--course',
+                    metavar='COURSE_ID',
+                    dest='course_id',
+                    default=None,
+                    help="course id whose counts to rebuild"),
+    )
+
+    def get_course_ids(self):
+        """
+        Returns the ids of the courses whose counters to rebuild.
+        """
+        raise NotImplementedError
+
+    def rebuild(self, course_id):
+        """
+        Rebuilds the counters of the course, and returns whether they had drifted.
+        """
+        raise NotImplementedError
+
+    def handle(self, *args, **options):
+        if options['course_id']:
+            try:
+                course_ids = [CourseKey.from_string(options['course_id'])]
+            except InvalidKeyError:
+                raise CommandError("Invalid course id: {}".format(options['course_id']))
+        else:
+            course_ids = self.get_course_ids()
+
+        drifted = 0
+        for course_id in course_ids:
+            if self.rebuild(course_id):
+                drifted += 1
+        log.info(
+            "%s rebuilt the counts of %d courses, %d had drifted", self.__module__, len(course_ids), drifted
+        )
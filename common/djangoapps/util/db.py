@@ -4,13 +4,21 @@ Utility functions related to databases.
 # TransactionManagementError used below actually *does* derive from the standard "Exception" class.
 # pylint: disable=nonstandard-exception
 from functools import wraps
+import logging
 import random
 
 from django.db import DEFAULT_DB_ALIAS, DatabaseError, Error, transaction
 
+from request_cache import get_cache
+
+
+log = logging.getLogger(__name__)
 
 MYSQL_MAX_INT = (2 ** 31) - 1
 
+# Name of the request cache holding the functions to call once the request's transaction commits
+AFTER_COMMIT_CACHE_NAME = 'util.db.after_commit'
+
 
 class CommitOnSuccessManager(object):
     """
@@ -218,6 +226,60 @@ def outer_atomic(using=None, savepoint=True, read_committed=False):
         return OuterAtomic(using, savepoint, read_committed)
 
 
+def run_after_commit(func, using=None):
+    """
+    Call func once the changes made so far are committed, e.g. to queue a task reading them.
+
+    Django 1.8 has no transaction.on_commit. Within the atomic block of a request, which is
+    committed once the view returns (ATOMIC_REQUESTS), func is called by AfterCommitMiddleware
+    at the end of the request, and dropped if the view raises. Otherwise, func is called right
+    away.
+
+    Arguments:
+        func (callable): called without arguments.
+        using (str): the name of the database.
+    """
+    callbacks = get_cache(AFTER_COMMIT_CACHE_NAME).get('callbacks')
+    if callbacks is not None and transaction.get_connection(using).in_atomic_block:
+        callbacks.append(func)
+    else:
+        func()
+
+
+class AfterCommitMiddleware(object):
+    """
+    Call the functions passed to run_after_commit during the request once its transaction is
+    committed.
+
+    Response middleware runs after the atomic block of the view is committed. This middleware
+    must come after any middleware returning a response from process_exception, so that it
+    drops the functions of failed requests.
+    """
+    def process_request(self, request):  # pylint: disable=unused-argument
+        """
+        Start collecting the functions to call after commit.
+        """
+        get_cache(AFTER_COMMIT_CACHE_NAME)['callbacks'] = []
+
+    def process_exception(self, request, exception):  # pylint: disable=unused-argument
+        """
+        Drop the functions, as the transaction is rolled back.
+        """
+        get_cache(AFTER_COMMIT_CACHE_NAME).pop('callbacks', None)
+
+    def process_response(self, request, response):  # pylint: disable=unused-argument
+        """
+        Call the functions, the transaction being committed.
+        """
+        for func in get_cache(AFTER_COMMIT_CACHE_NAME).pop('callbacks', None) or []:
+            try:
+                func()
+            except Exception:  # pylint: disable=broad-except
+                # The changes are committed, so the response stands
+                log.exception(u"Error calling %r after commit", func)
+        return response
+
+
 def generate_int_id(minimum=0, maximum=MYSQL_MAX_INT, used_ids=None):
     """
     Return a unique integer in the range [minimum, maximum], inclusive.
@@ -1,9 +1,132 @@
 """ Utility functions related to database queries """
+from functools import wraps
+
 from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+import request_cache
+from request_cache.context import ContextVar
+
+
+READ_REPLICA_DB = 'read_replica'
+
+# Name of the request cache recording the models written to during the current request
+WRITTEN_MODELS_CACHE_NAME = 'util.query.written_models'
+
+# Number of nested read_replica blocks being run
+_READ_REPLICA_DEPTH = ContextVar('util.query.read_replica_depth', default=lambda: 0)
+
+
+def read_replica_available():
+    """
+    Return whether there is a database called 'read_replica'.
+    """
+    return READ_REPLICA_DB in settings.DATABASES
 
 
 def use_read_replica_if_available(queryset):
     """
     If there is a database called 'read_replica', use that database for the queryset.
     """
-    return queryset.using("read_replica") if "read_replica" in settings.DATABASES else queryset
+    return queryset.using(READ_REPLICA_DB) if read_replica_available() else queryset
+
+
+def _model_table(model):
+    """
+    Return the table of model, which identifies it in the written models along with the models
+    sharing its table.
+    """
+    return model._meta.db_table  # pylint: disable=protected-access
+
+
+def _written_models():
+    """
+    Return the dict whose keys are the tables of the models written to during the current request.
+    """
+    return request_cache.get_cache(WRITTEN_MODELS_CACHE_NAME)
+
+
+class ReadReplicaManager(object):
+    """
+    Routes the reads made in the wrapped block to the read replica, using
+    :class:`ReadReplicaRouter`. An instance can be used either as a decorator or as a
+    context manager, and can be nested.
+
+    Once a model has been written to during a request, its reads go to the primary database
+    for the rest of the request, so that the request reads its own writes. Outside of
+    requests, e.g. in celery tasks, the outermost block starts with no written models.
+    """
+    def __enter__(self):
+        depth = _READ_REPLICA_DEPTH.get()
+        if depth == 0 and request_cache.get_request() is None:
+            _written_models().clear()
+        _READ_REPLICA_DEPTH.set(depth + 1)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _READ_REPLICA_DEPTH.set(_READ_REPLICA_DEPTH.get() - 1)
+
+    def __call__(self, func):
+        @wraps(func)
+        def decorated(*args, **kwds):       # pylint: disable=missing-docstring
+            with self:
+                return func(*args, **kwds)
+        return decorated
+
+
+def read_replica(func=None):
+    """
+    Send the reads of the wrapped view, function or block to the read replica, if there is one.
+
+    It can be used either as a decorator or as a context manager:
+
+        @read_replica
+        def grade_distribution(course_key):
+            ...
+
+        with read_replica():
+            ...
+
+    Only wrap code which can tolerate the replication lag of the replica, such as reports.
+    Reads of models which were written to earlier in the request still go to the primary
+    database. Requires ReadReplicaRouter to be in settings.DATABASE_ROUTERS.
+    """
+    if callable(func):
+        return ReadReplicaManager()(func)
+    # Decorator: @read_replica() or context manager: with read_replica(): ...
+    else:
+        return ReadReplicaManager()
+
+
+class ReadReplicaRouter(object):
+    """
+    A Database Router that sends the reads made in read_replica blocks to the read replica,
+    and records the models written to, so that their reads stick to the primary database
+    for the rest of the request.
+    """
+    def db_for_read(self, model, **hints):  # pylint: disable=unused-argument
+        """
+        Use the read replica inside read_replica blocks, unless the model was written to.
+        """
+        if _READ_REPLICA_DEPTH.get() > 0 and read_replica_available():
+            if _model_table(model) not in _written_models():
+                return READ_REPLICA_DB
+        return None
+
+    def db_for_write(self, model, **hints):
+        """
+        Record the write, and write instances read from the read replica to the primary database.
+        """
+        _written_models()[_model_table(model)] = True
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db == READ_REPLICA_DB:  # pylint: disable=protected-access
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):  # pylint: disable=unused-argument
+        """
+        Allow relations between instances read from the primary database and the read replica.
+        """
+        databases = (DEFAULT_DB_ALIAS, READ_REPLICA_DB)
+        if obj1._state.db in databases and obj2._state.db in databases:  # pylint: disable=protected-access
+            return True
+        return None
@@ -9,8 +9,10 @@ from django.contrib.auth.models import User
 from django.db import connection, IntegrityError
 from django.db.transaction import atomic, TransactionManagementError
 from django.test import TestCase, TransactionTestCase
+from django.test.client import RequestFactory
+from mock import Mock
 
-from util.db import commit_on_success, generate_int_id, outer_atomic
+from util.db import AfterCommitMiddleware, commit_on_success, generate_int_id, outer_atomic, run_after_commit
 
 
 @ddt.ddt
@@ -161,3 +163,32 @@ class GenerateIntIdTestCase(TestCase):
         for i in range(times):
             int_id = generate_int_id(minimum, maximum, used_ids)
             self.assertIn(int_id, list(set(range(minimum, maximum + 1)) - used_ids))
+
+
+class RunAfterCommitTestCase(TestCase):
+    """
+    Tests for run_after_commit and AfterCommitMiddleware.
+    """
+    def setUp(self):
+        super(RunAfterCommitTestCase, self).setUp()
+        self.middleware = AfterCommitMiddleware()
+        self.request = RequestFactory().get('/')
+        self.func = Mock()
+
+    def test_outside_request(self):
+        run_after_commit(self.func)
+        self.func.assert_called_once_with()
+
+    def test_called_after_response(self):
+        self.middleware.process_request(self.request)
+        run_after_commit(self.func)
+        self.assertFalse(self.func.called)
+        self.middleware.process_response(self.request, None)
+        self.func.assert_called_once_with()
+
+    def test_dropped_on_exception(self):
+        self.middleware.process_request(self.request)
+        run_after_commit(self.func)
+        self.middleware.process_exception(self.request, Exception())
+        self.middleware.process_response(self.request, None)
+        self.assertFalse(self.func.called)
@@ -0,0 +1,72 @@
+"""Tests for util.query module."""
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+
+from request_cache.middleware import RequestCache
+from student.models import UserProfile
+from util.query import READ_REPLICA_DB, ReadReplicaRouter, read_replica
+
+
+DATABASES_WITH_REPLICA = dict(settings.DATABASES, **{READ_REPLICA_DB: settings.DATABASES[DEFAULT_DB_ALIAS]})
+
+
+@override_settings(DATABASES=DATABASES_WITH_REPLICA)
+class ReadReplicaRouterTestCase(TestCase):
+    """
+    Tests ReadReplicaRouter and read_replica.
+    """
+    def setUp(self):
+        super(ReadReplicaRouterTestCase, self).setUp()
+        self.router = ReadReplicaRouter()
+        RequestCache().process_request(RequestFactory().get('/'))
+        self.addCleanup(RequestCache.clear_request_cache)
+
+    def test_outside_block(self):
+        self.assertIsNone(self.router.db_for_read(User))
+
+    def test_decorator(self):
+        @read_replica
+        def db_for_read():  # pylint: disable=missing-docstring
+            return self.router.db_for_read(User)
+        self.assertEqual(db_for_read(), READ_REPLICA_DB)
+        self.assertIsNone(self.router.db_for_read(User))
+
+    def test_nested(self):
+        with read_replica():
+            with read_replica():
+                self.assertEqual(self.router.db_for_read(User), READ_REPLICA_DB)
+            self.assertEqual(self.router.db_for_read(User), READ_REPLICA_DB)
+        self.assertIsNone(self.router.db_for_read(User))
+
+    @override_settings(DATABASES={DEFAULT_DB_ALIAS: settings.DATABASES[DEFAULT_DB_ALIAS]})
+    def test_no_replica(self):
+        with read_replica():
+            self.assertIsNone(self.router.db_for_read(User))
+
+    def test_reads_own_writes(self):
+        with read_replica():
+            self.assertIsNone(self.router.db_for_write(User))
+            self.assertIsNone(self.router.db_for_read(User))
+            self.assertEqual(self.router.db_for_read(UserProfile), READ_REPLICA_DB)
+
+    def test_writes_forgotten_after_request(self):
+        self.router.db_for_write(User)
+        RequestCache.clear_request_cache()
+        with read_replica():
+            self.assertEqual(self.router.db_for_read(User), READ_REPLICA_DB)
+
+    def test_write_replica_instance(self):
+        user = User(username='replica')
+        user._state.db = READ_REPLICA_DB  # pylint: disable=protected-access
+        self.assertEqual(self.router.db_for_write(User, instance=user), DEFAULT_DB_ALIAS)
+
+    def test_allow_relation(self):
+        user = User(username='replica')
+        user._state.db = READ_REPLICA_DB  # pylint: disable=protected-access
+        profile = UserProfile()
+        profile._state.db = DEFAULT_DB_ALIAS  # pylint: disable=protected-access
+        self.assertTrue(self.router.allow_relation(user, profile))
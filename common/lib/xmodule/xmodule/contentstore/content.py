@@ -287,10 +287,14 @@ class ContentStore(object):
     def find(self, filename):
         raise NotImplementedError
 
-    def get_all_content_for_course(self, course_key, start=0, maxresults=-1, sort=None, filter_params=None):
+    def get_all_content_for_course(
+            self, course_key, start=0, maxresults=-1, sort=None, filter_params=None, after=None, text_search=None
+    ):
         '''
         Returns a list of static assets for a course, followed by the total number of assets.
         By default all assets are returned, but start and maxresults can be provided to limit the query.
+        Instead of start, after can be the (sort field value, _id) of the last asset of the previous page.
+        text_search limits the assets to those whose display name contains its words.
 
         The return format is a list of asset data dictionaries.
         The asset data dictionaries have the following keys:
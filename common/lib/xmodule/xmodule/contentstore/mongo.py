@@ -1,13 +1,23 @@
 """
 MongoDB/GridFS-level code for the contentstore.
+
+Copies of an asset made by `copy_all_course_assets` don't duplicate the asset's data. Instead,
+their files document has a `blob_id` referring to the GridFS file whose chunks hold the data,
+whose `refcount` counts the files referring to it. Deleting a file which other files refer to
+hands its chunks over to one of them.
 """
 import os
 import json
+import logging
+import re
+from datetime import datetime
 import pymongo
 import gridfs
+from pymongo.errors import OperationFailure
 from gridfs.errors import NoFile
 from fs.osfs import OSFS
 from bson.son import SON
+from pytz import UTC
 
 from mongodb_proxy import autoretry_read
 from opaque_keys.edx.keys import AssetKey
@@ -18,6 +28,8 @@ from xmodule.util.misc import escape_invalid_characters
 from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
 from .content import StaticContent, ContentStore, StaticContentStream
 
+log = logging.getLogger(__name__)
+
 
 class MongoContentStore(ContentStore):
     """
@@ -45,6 +57,7 @@ class MongoContentStore(ContentStore):
         self.fs = gridfs.GridFS(mongo_db, bucket)  # pylint: disable=invalid-name
 
         self.fs_files = mongo_db[bucket + ".files"]  # the underlying collection GridFS uses
+        self.fs_chunks = mongo_db[bucket + ".chunks"]
 
     def close_connections(self):
         """
@@ -89,16 +102,73 @@ class MongoContentStore(ContentStore):
         """
         if isinstance(location_or_id, AssetKey):
             location_or_id, _ = self.asset_db_key(location_or_id)
+        asset = self.fs_files.find_one({'_id': location_or_id}, {'blob_id': 1})
+        if asset is not None and 'blob_id' in asset:
+            # A copy has no chunks of its own
+            self.fs_files.delete_one({'_id': location_or_id})
+            self._release_blob(asset['blob_id'])
+            return
+        # Only delete the files document if no copy refers to its chunks, in a single operation, so that
+        # a copy can't take a reference in between
+        if asset is not None and not self.fs_files.delete_one(
+                {'_id': location_or_id, 'refcount': {'$not': {'$gt': 0}}}
+        ).deleted_count:
+            self._hand_over_blob(location_or_id)
         # Deletes of non-existent files are considered successful
         self.fs.delete(location_or_id)
 
+    def _reference_blob(self, asset):
+        """
+        Take a reference to the chunks of `asset`, a files document, for a copy of it, and return the
+        id of the file holding them, or None if the asset was deleted.
+        """
+        for __ in xrange(3):
+            blob_id = asset.get('blob_id', asset['_id'])
+            if self.fs_files.find_one_and_update({'_id': blob_id}, {'$inc': {'refcount': 1}}, {'_id': 1}):
+                return blob_id
+            # The file holding the chunks was deleted, and they may have been handed over to another file
+            asset = self.fs_files.find_one({'_id': asset['_id']}, {'blob_id': 1})
+            if asset is None:
+                return None
+        return None
+
+    def _release_blob(self, blob_id):
+        """
+        Drop the reference of a deleted copy to the chunks of the file `blob_id`.
+        """
+        self.fs_files.update_one({'_id': blob_id}, {'$inc': {'refcount': -1}})
+
+    def _hand_over_blob(self, file_id):
+        """
+        Hand the chunks of the file `file_id`, which other files refer to, over to one of them so that
+        deleting `file_id` leaves their data in place.
+        """
+        new_owner = self.fs_files.find_one_and_update({'blob_id': file_id}, {'$unset': {'blob_id': ''}}, {'_id': 1})
+        if new_owner is None:
+            return
+        new_owner_id = new_owner['_id']
+        self.fs_chunks.update_many({'files_id': file_id}, {'$set': {'files_id': new_owner_id}})
+        referrers = self.fs_files.update_many({'blob_id': file_id}, {'$set': {'blob_id': new_owner_id}})
+        self.fs_files.update_one({'_id': new_owner_id}, {'$inc': {'refcount': referrers.modified_count}})
+
+    def _get_file(self, content_id):
+        """
+        Returns the GridOut holding the metadata of the file `content_id` and the GridOut holding
+        its data. These are the same unless the file is a copy referring to another file's chunks.
+        """
+        fp = self.fs.get(content_id)
+        blob_id = getattr(fp, 'blob_id', None)
+        if blob_id is None:
+            return fp, fp
+        return fp, self.fs.get(blob_id)
+
     @autoretry_read()
     def find(self, location, throw_on_not_found=True, as_stream=False):
         content_id, __ = self.asset_db_key(location)
 
         try:
             if as_stream:
-                fp = self.fs.get(content_id)
+                fp, data_fp = self._get_file(content_id)
                 thumbnail_location = getattr(fp, 'thumbnail_location', None)
                 if thumbnail_location:
                     thumbnail_location = location.course_key.make_asset_key(
@@ -106,13 +176,14 @@ class MongoContentStore(ContentStore):
                         thumbnail_location[4]
                     )
                 return StaticContentStream(
-                    location, fp.displayname, fp.content_type, fp, last_modified_at=fp.uploadDate,
+                    location, fp.displayname, fp.content_type, data_fp, last_modified_at=fp.uploadDate,
                     thumbnail_location=thumbnail_location,
                     import_path=getattr(fp, 'import_path', None),
                     length=fp.length, locked=getattr(fp, 'locked', False)
                 )
             else:
-                with self.fs.get(content_id) as fp:
+                fp, data_fp = self._get_file(content_id)
+                with data_fp:
                     thumbnail_location = getattr(fp, 'thumbnail_location', None)
                     if thumbnail_location:
                         thumbnail_location = location.course_key.make_asset_key(
@@ -120,7 +191,7 @@ class MongoContentStore(ContentStore):
                             thumbnail_location[4]
                         )
                     return StaticContent(
-                        location, fp.displayname, fp.content_type, fp.read(), last_modified_at=fp.uploadDate,
+                        location, fp.displayname, fp.content_type, data_fp.read(), last_modified_at=fp.uploadDate,
                         thumbnail_location=thumbnail_location,
                         import_path=getattr(fp, 'import_path', None),
                         length=fp.length, locked=getattr(fp, 'locked', False)
@@ -174,7 +245,7 @@ class MongoContentStore(ContentStore):
             # to look. -- pmitros
             self.export(asset['asset_key'], output_directory)
             for attr, value in asset.iteritems():
-                if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
+                if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key', 'blob_id', 'refcount']:
                     policy.setdefault(asset['asset_key'].name, {})[attr] = value
 
         with open(assets_policy_file, 'w') as f:
@@ -183,9 +254,12 @@ class MongoContentStore(ContentStore):
     def get_all_content_thumbnails_for_course(self, course_key):
         return self._get_all_content_for_course(course_key, get_thumbnails=True)[0]
 
-    def get_all_content_for_course(self, course_key, start=0, maxresults=-1, sort=None, filter_params=None):
+    def get_all_content_for_course(
+            self, course_key, start=0, maxresults=-1, sort=None, filter_params=None, after=None, text_search=None
+    ):
         return self._get_all_content_for_course(
-            course_key, start=start, maxresults=maxresults, get_thumbnails=False, sort=sort, filter_params=filter_params
+            course_key, start=start, maxresults=maxresults, get_thumbnails=False, sort=sort,
+            filter_params=filter_params, after=after, text_search=text_search
         )
 
     def remove_redundant_content_for_courses(self):
@@ -203,7 +277,7 @@ class MongoContentStore(ContentStore):
             items = self.fs_files.find(query)
             assets_to_delete = assets_to_delete + items.count()
             for asset in items:
-                self.fs.delete(asset[prefix])
+                self.delete(self.make_id_son(asset))
 
             self.fs_files.remove(query)
         return assets_to_delete
@@ -215,7 +289,9 @@ class MongoContentStore(ContentStore):
                                     start=0,
                                     maxresults=-1,
                                     sort=None,
-                                    filter_params=None):
+                                    filter_params=None,
+                                    after=None,
+                                    text_search=None):
         '''
         Returns a list of all static assets for a course. The return format is a list of asset data dictionary elements.
 
@@ -225,19 +301,63 @@ class MongoContentStore(ContentStore):
             uploadDate (datetime.datetime): The date and time that the file was uploadDate
             contentType: The mimetype string of the asset
             md5: An md5 hash of the asset content
+
+        If `after` is given, it must be the (sort field value, `_id`) of the last asset of the previous page,
+        `sort` must be on a single field, and the page starting after that asset is returned instead of
+        skipping `start` assets. This keeps deep pages as cheap as the first one. The count is still the
+        total number of matching assets.
+
+        If `text_search` is given, only assets whose display name contains its words are returned.
+        The text index only covers the assets of courses with non-deprecated keys, so other courses,
+        and deployments missing the index, are searched with a (slower) regular expression instead.
         '''
         query = query_for_course(course_key, "asset" if not get_thumbnails else "thumbnail")
+        if filter_params:
+            query.update(filter_params)
+        if not text_search:
+            return self._find_all_content(course_key, query, start, maxresults, sort, after)
+
+        if not getattr(course_key, 'deprecated', False):
+            text_query = SON(query)
+            text_query['$text'] = {'$search': text_search}
+            try:
+                return self._find_all_content(course_key, text_query, start, maxresults, sort, after)
+            except OperationFailure as exc:
+                log.warning("Searching the assets of %s without the text index: %s", course_key, exc)
+        # Kept in `$and` so that a keyset query on `displayname` doesn't replace it
+        query['$and'] = query.get('$and', []) + [
+            {'displayname': {'$regex': re.escape(text_search), '$options': 'i'}}
+        ]
+        return self._find_all_content(course_key, query, start, maxresults, sort, after)
+
+    def _find_all_content(self, course_key, query, start, maxresults, sort, after):
+        """
+        Returns the page of the assets of `course_key` matching `query` and the total number of
+        matching assets, as described by `_get_all_content_for_course`.
+        """
+        if sort:
+            # Break ties on `_id` so that every asset has a stable place in the order
+            sort = list(sort)
+            if sort[-1][0] != '_id':
+                sort.append(('_id', sort[-1][1]))
+        elif after is not None:
+            sort = [('_id', pymongo.ASCENDING)]
         find_args = {"sort": sort}
+        if after is not None:
+            count = self.fs_files.find(query).count()
+            # Mongo compares embedded documents field by field, so restore the order of deprecated ids
+            after_value, after_id = after
+            query = _keyset_query(query, sort, (after_value, self.make_id_son({'_id': after_id})))
+            start = 0
         if maxresults > 0:
             find_args.update({
                 "skip": start,
                 "limit": maxresults,
             })
-        if filter_params:
-            query.update(filter_params)
 
         items = self.fs_files.find(query, **find_args)
-        count = items.count()
+        if after is None:
+            count = items.count()
         assets = list(items)
 
         # We're constructing the asset key immediately after retrieval from the database so that
@@ -312,17 +432,18 @@ class MongoContentStore(ContentStore):
         """
         See :meth:`.ContentStore.copy_all_course_assets`
 
-        This implementation fairly expensively copies all of the data
+        This implementation only copies the files documents: the copies refer to the chunks of
+        the source files, so the cost doesn't depend on the size of the assets.
         """
         source_query = query_for_course(source_course_key)
-        # it'd be great to figure out how to do all of this on the db server and not pull the bits over
         for asset in self.fs_files.find(source_query):
-            asset_key = self.make_id_son(asset)
-            # don't convert from string until fs access
-            source_content = self.fs.get(asset_key)
+            source_id = self.make_id_son(asset)
+            asset_key = source_id
             if isinstance(asset_key, basestring):
                 asset_key = AssetKey.from_string(asset_key)
                 __, asset_key = self.asset_db_key(asset_key)
+            else:
+                asset_key = SON(asset_key)
             asset_key['org'] = dest_course_key.org
             asset_key['course'] = dest_course_key.course
             if getattr(dest_course_key, 'deprecated', False):  # remove the run if exists
@@ -335,29 +456,40 @@ class MongoContentStore(ContentStore):
                     dest_course_key.make_asset_key(asset_key['category'], asset_key['name']).for_branch(None)
                 )
 
-            self.fs.put(
-                source_content.read(),
-                _id=asset_id, filename=asset['filename'], content_type=asset['contentType'],
-                displayname=asset['displayname'], content_son=asset_key,
+            blob_id = self._reference_blob(asset)
+            if blob_id is None:
+                log.warning(u"Asset %s was deleted while it was copied", source_id)
+                continue
+            self.fs_files.insert({
+                '_id': asset_id,
+                'blob_id': blob_id,
+                'length': asset['length'],
+                'chunkSize': asset['chunkSize'],
+                'md5': asset.get('md5'),
+                'uploadDate': datetime.now(UTC),
+                'filename': asset['filename'],
+                'contentType': asset['contentType'],
+                'displayname': asset['displayname'],
+                'content_son': asset_key,
                 # thumbnail is not technically correct but will be functionally correct as the code
                 # only looks at the name which is not course relative.
-                thumbnail_location=asset['thumbnail_location'],
-                import_path=asset['import_path'],
+                'thumbnail_location': asset['thumbnail_location'],
+                'import_path': asset['import_path'],
                 # getattr b/c caching may mean some pickled instances don't have attr
-                locked=asset.get('locked', False)
-            )
+                'locked': asset.get('locked', False),
+            })
 
     def delete_all_course_assets(self, course_key):
         """
-        Delete all assets identified via this course_key. Dangerous operation which may remove assets
-        referenced by other runs or other courses.
+        Delete all assets identified via this course_key. The data of any assets which were copied
+        to other runs or courses is handed over to the copies, so that they remain usable.
         :param course_key:
         """
         course_query = query_for_course(course_key)
         matching_assets = self.fs_files.find(course_query)
         for asset in matching_assets:
             asset_key = self.make_id_son(asset)
-            self.fs.delete(asset_key)
+            self.delete(asset_key)
 
     # codifying the original order which pymongo used for the dicts coming out of location_to_dict
     # stability of order is more important than sanity of order as any changes to order make things
@@ -480,6 +612,59 @@ class MongoContentStore(ContentStore):
             sparse=True,
             background=True
         )
+        # Needed by `_get_all_content_for_course` to filter a course's assets by category and sort them
+        # by upload date or display name without scanning, including for keyset pagination (which
+        # uses `_id` as a tie-breaker). Mongo walks these backwards for ascending sorts.
+        for sort_field in ('uploadDate', 'displayname'):
+            create_collection_index(
+                self.fs_files,
+                [
+                    ('_id.org', pymongo.ASCENDING),
+                    ('_id.course', pymongo.ASCENDING),
+                    ('_id.category', pymongo.ASCENDING),
+                    (sort_field, pymongo.DESCENDING),
+                    ('_id', pymongo.DESCENDING),
+                ],
+                sparse=True,
+                background=True
+            )
+            create_collection_index(
+                self.fs_files,
+                [
+                    ('content_son.org', pymongo.ASCENDING),
+                    ('content_son.course', pymongo.ASCENDING),
+                    ('content_son.run', pymongo.ASCENDING),
+                    ('content_son.category', pymongo.ASCENDING),
+                    (sort_field, pymongo.DESCENDING),
+                    ('_id', pymongo.DESCENDING),
+                ],
+                sparse=True,
+                background=True
+            )
+        # Needed by the `text_search` of `_get_all_content_for_course`. File names aren't
+        # natural language, so don't stem them. The course fields come first so that a search
+        # only scans the course's own assets. Mongo allows one text index per collection, so
+        # the assets of courses with deprecated keys are searched without it.
+        create_collection_index(
+            self.fs_files,
+            [
+                ('content_son.org', pymongo.ASCENDING),
+                ('content_son.course', pymongo.ASCENDING),
+                ('content_son.run', pymongo.ASCENDING),
+                ('displayname', pymongo.TEXT),
+            ],
+            default_language='none',
+            background=True
+        )
+        # Needed to find the copies referring to a file's chunks when it is deleted
+        create_collection_index(
+            self.fs_files,
+            [
+                ('blob_id', pymongo.ASCENDING),
+            ],
+            sparse=True,
+            background=True
+        )
 
 
 def query_for_course(course_key, category=None):
@@ -503,3 +688,23 @@ def query_for_course(course_key, category=None):
     else:
         dbkey['{}.run'.format(prefix)] = course_key.run
     return dbkey
+
+
+def _keyset_query(query, sort, after):
+    """
+    Restrict `query` to the documents which come after `after`, the (sort field value, `_id`) of a
+    document, in the order given by `sort`: a single field followed by the `_id` tie-breaker, or `_id` alone.
+    """
+    sort_field, direction = sort[0]
+    after_value, after_id = after
+    past, past_or_equal = ('$gt', '$gte') if direction == pymongo.ASCENDING else ('$lt', '$lte')
+    keyset_query = SON(query)
+    if sort_field == '_id':
+        keyset_query['_id'] = {past: after_id}
+    else:
+        # The range on the sort field alone lets Mongo bound the index scan
+        keyset_query[sort_field] = {past_or_equal: after_value}
+        keyset_query['$and'] = query.get('$and', []) + [
+            {'$or': [{sort_field: {past: after_value}}, {'_id': {past: after_id}}]}
+        ]
+    return keyset_query
@@ -781,6 +781,22 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._verify_modulestore_support(dest_key.course_key, 'copy_from_template')
         return store.copy_from_template(source_keys, dest_key, user_id)
 
+    @strip_key
+    def duplicate_subtree(self, source_usage_key, parent_usage_key, user_id, fields=None, **kwargs):
+        """
+        See :py:meth `SplitMongoModuleStore.duplicate_subtree`
+        """
+        store = self._verify_modulestore_support(parent_usage_key.course_key, 'duplicate_subtree')
+        return store.duplicate_subtree(source_usage_key, parent_usage_key, user_id, fields=fields, **kwargs)
+
+    @strip_key
+    def get_subtree_usage_keys(self, usage_key, **kwargs):
+        """
+        See :py:meth `SplitMongoModuleStore.get_subtree_usage_keys`
+        """
+        store = self._verify_modulestore_support(usage_key.course_key, 'get_subtree_usage_keys')
+        return store.get_subtree_usage_keys(usage_key, **kwargs)
+
     @strip_key
     @prepare_asides
     def update_item(self, xblock, user_id, allow_not_found=False, **kwargs):
@@ -0,0 +1,127 @@
+"""
+Performance test for listing the assets of a course in the contentstore, as done by the
+Studio "Files & Uploads" page.
+"""
+import datetime
+import itertools
+import unittest
+from uuid import uuid4
+
+import ddt
+from nose.plugins.skip import SkipTest
+from opaque_keys.edx.locator import CourseLocator
+from pytz import UTC
+
+from xmodule.contentstore.mongo import MongoContentStore
+from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
+
+# The dependency below needs to be installed manually from the development.txt file, which doesn't
+# get installed during unit tests!
+try:
+    from code_block_timer import CodeBlockTimer
+except ImportError:
+    CodeBlockTimer = None
+
+# Number of assets in the course per test run.
+ASSET_AMOUNT_PER_TEST = (1000, 10000, 100000)
+
+ALL_SORTS = (
+    ('displayname', 1),
+    ('displayname', -1),
+    ('uploadDate', 1),
+    ('uploadDate', -1),
+)
+
+# That's how many assets are displayed on the Studio "Files & Uploads" page.
+PAGE_SIZE = 50
+
+
+@ddt.ddt
+# Eventually, exclude this attribute from regular unittests while running *only* tests
+# with this attribute during regular performance tests.
+# @attr("perf_test")
+@unittest.skip
+class AssetListingTest(unittest.TestCase):
+    """
+    This class exists to time offset and keyset pagination and name search of a course's assets
+    with different amounts of assets.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super(AssetListingTest, self).setUp()
+        self.contentstore = MongoContentStore(
+            MONGO_HOST, 'test_asset_listing_{}'.format(uuid4().hex[:5]), port=MONGO_PORT_NUM
+        )
+        self.addCleanup(self.contentstore._drop_database)  # pylint: disable=protected-access
+        self.contentstore.ensure_indexes()
+        self.course_key = CourseLocator('a', 'course', 'course')
+
+    def make_assets(self, num_assets):
+        """
+        Insert the files documents of num_assets assets. The listing never reads the asset data,
+        so no chunks are written.
+        """
+        upload_date = datetime.datetime(2015, 1, 1, tzinfo=UTC)
+        batch = []
+        for index in xrange(num_assets):
+            asset_key = self.course_key.make_asset_key('asset', 'asset_{}.png'.format(index))
+            content_id, content_son = self.contentstore.asset_db_key(asset_key)
+            batch.append({
+                '_id': content_id,
+                'content_son': content_son,
+                'filename': unicode(asset_key),
+                'displayname': 'asset {} {}.png'.format(index % 100, index),
+                'contentType': 'image/png',
+                'uploadDate': upload_date + datetime.timedelta(seconds=index),
+                'length': 0,
+                'chunkSize': 255 * 1024,
+                'thumbnail_location': None,
+                'import_path': None,
+                'locked': False,
+            })
+            if len(batch) == 1000:
+                self.contentstore.fs_files.insert(batch)
+                batch = []
+        if batch:
+            self.contentstore.fs_files.insert(batch)
+
+    @ddt.data(*itertools.product(ASSET_AMOUNT_PER_TEST, ALL_SORTS))
+    @ddt.unpack
+    def test_generate_listing_timings(self, num_assets, sort):
+        """
+        Generate timings for getting the first and the last page of assets, and for searching them.
+        """
+        if CodeBlockTimer is None:
+            raise SkipTest("CodeBlockTimer undefined.")
+
+        self.make_assets(num_assets)
+        sort_field = sort[0]
+        last_page_start = num_assets - PAGE_SIZE
+
+        with CodeBlockTimer("AssetListing:{}:{}-{}".format(num_assets, sort_field, 'asc' if sort[1] == 1 else 'desc')):
+            with CodeBlockTimer("first_page"):
+                __ = self.contentstore.get_all_content_for_course(
+                    self.course_key, start=0, maxresults=PAGE_SIZE, sort=[sort]
+                )
+
+            with CodeBlockTimer("last_page_offset"):
+                __ = self.contentstore.get_all_content_for_course(
+                    self.course_key, start=last_page_start, maxresults=PAGE_SIZE, sort=[sort]
+                )
+
+            previous_page, __ = self.contentstore.get_all_content_for_course(
+                self.course_key, start=last_page_start - PAGE_SIZE, maxresults=PAGE_SIZE, sort=[sort]
+            )
+            last = previous_page[-1]
+            with CodeBlockTimer("last_page_keyset"):
+                __ = self.contentstore.get_all_content_for_course(
+                    self.course_key, maxresults=PAGE_SIZE, sort=[sort], after=(last[sort_field], last['_id'])
+                )
+
+            with CodeBlockTimer("text_search"):
+                __ = self.contentstore.get_all_content_for_course(
+                    self.course_key, maxresults=PAGE_SIZE, sort=[sort], text_search='42'
+                )
@@ -2,9 +2,7 @@
 Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
 """
 import datetime
-import cPickle as pickle
 import math
-import zlib
 import pymongo
 import pytz
 import re
@@ -28,6 +26,8 @@ from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore import BlockData
 from xmodule.modulestore.split_mongo import BlockKey
 from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
+from xmodule.util.cache_envelope import get_cache_envelope
+from xmodule.util.cache_fill import get_or_fill
 
 
 new_contract('BlockData', BlockData)
@@ -226,7 +226,8 @@ def structure_to_mongo(structure, course_context=None):
 class CourseStructureCache(object):
     """
     Wrapper around django cache object to cache course structure objects.
-    The course structures are pickled and compressed when cached.
+    The course structures are pickled and compressed in a cache envelope when
+    cached, which also chunks the structures too large for a single cache item.
 
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
@@ -238,6 +239,8 @@ class CourseStructureCache(object):
                 self.cache = get_cache('course_structure_cache')
             except InvalidCacheBackendError:
                 pass
+        # 1 = Fastest (slightly larger results)
+        self.envelope = get_cache_envelope('course_structure', codec='zlib', level=1)
 
     def get(self, key, course_context=None):
         """Pull the compressed, pickled struct data from cache and deserialize."""
@@ -245,36 +248,41 @@ class CourseStructureCache(object):
             return None
 
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
-            compressed_pickled_data = self.cache.get(key)
-            tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
+            structure = self.envelope.get(self.cache, key)
+            tagger.tag(from_cache=str(structure is not None).lower())
 
-            if compressed_pickled_data is None:
+            if structure is None:
                 # Always log cache misses, because they are unexpected
                 tagger.sample_rate = 1
-                return None
 
-            tagger.measure('compressed_size', len(compressed_pickled_data))
-
-            pickled_data = zlib.decompress(compressed_pickled_data)
-            tagger.measure('uncompressed_size', len(pickled_data))
-
-            return pickle.loads(pickled_data)
+            return structure
 
     def set(self, key, structure, course_context=None):
         """Given a structure, will pickle, compress, and write to cache."""
         if self.cache is None:
             return None
 
-        with TIMER.timer("CourseStructureCache.set", course_context) as tagger:
-            pickled_data = pickle.dumps(structure, pickle.HIGHEST_PROTOCOL)
-            tagger.measure('uncompressed_size', len(pickled_data))
+        with TIMER.timer("CourseStructureCache.set", course_context):
+            # Stuctures are immutable, so we set a timeout of "never"
+            self.envelope.set(self.cache, key, structure, None)
 
-            # 1 = Fastest (slightly larger results)
-            compressed_pickled_data = zlib.compress(pickled_data, 1)
-            tagger.measure('compressed_size', len(compressed_pickled_data))
+    def get_or_fill(self, key, fill, course_context=None):
+        """
+        Return the cached structure, or the structure returned by fill() on a miss. Only one
+        worker at a time fills a given structure, the others wait for it to be cached.
+        """
+        if self.cache is None:
+            return fill()
+
+        def _fill():
+            """
+            Load the structure and cache it.
+            """
+            structure = fill()
+            self.set(key, structure, course_context)
+            return structure
 
-            # Stuctures are immutable, so we set a timeout of "never"
-            self.cache.set(key, compressed_pickled_data, None)
+        return get_or_fill(self.cache, 'course_structure', unicode(key), lambda: self.get(key, course_context), _fill)
 
 
 class MongoConnection(object):
@@ -283,11 +291,18 @@ class MongoConnection(object):
     """
     def __init__(
         self, db, collection, host, port=27017, tz_aware=True, user=None, password=None,
-        asset_collection=None, retry_wait_time=0.1, **kwargs
+        asset_collection=None, retry_wait_time=0.1, structure_snapshot_interval=None, **kwargs
     ):
         """
         Create & open the connection, authenticate, and provide pointers to the collections
+
+        Arguments:
+            structure_snapshot_interval (int): If set, new structures are stored as a delta
+                against their previous version, with a full snapshot every
+                ``structure_snapshot_interval`` versions. If None, every structure is stored in full.
         """
+        self.structure_snapshot_interval = structure_snapshot_interval
+
         # Set a write concern of 1, which makes writes complete successfully to the primary
         # only before returning. Also makes pymongo report write errors.
         kwargs['w'] = 1
@@ -301,6 +316,8 @@ class MongoConnection(object):
         self.course_index = self.database[collection + '.active_versions']
         self.structures = self.database[collection + '.structures']
         self.definitions = self.database[collection + '.definitions']
+        self.structures_archive = self.database[collection + '.structures_archive']
+        self.definitions_archive = self.database[collection + '.definitions_archive']
 
     def heartbeat(self):
         """
@@ -319,20 +336,24 @@ class MongoConnection(object):
         """
         with TIMER.timer("get_structure", course_context) as tagger_get_structure:
             cache = CourseStructureCache()
+            loaded = []
 
-            structure = cache.get(key, course_context)
-            tagger_get_structure.tag(from_cache=str(bool(structure)).lower())
-            if not structure:
-                # Always log cache misses, because they are unexpected
-                tagger_get_structure.sample_rate = 1
-
+            def _load_structure():
+                """
+                Load the structure from mongo.
+                """
                 with TIMER.timer("get_structure.find_one", course_context) as tagger_find_one:
                     doc = self.structures.find_one({'_id': key})
                     tagger_find_one.measure("blocks", len(doc['blocks']))
-                    structure = structure_from_mongo(doc, course_context)
                     tagger_find_one.sample_rate = 1
+                    loaded.append(True)
+                    return self._structure_from_mongo(doc, course_context)
 
-                cache.set(key, structure, course_context)
+            structure = cache.get_or_fill(key, _load_structure, course_context)
+            tagger_get_structure.tag(from_cache=str(not loaded).lower())
+            if loaded:
+                # Always log cache misses, because they are unexpected
+                tagger_get_structure.sample_rate = 1
 
             return structure
 
@@ -347,7 +368,7 @@ class MongoConnection(object):
         with TIMER.timer("find_structures_by_id", course_context) as tagger:
             tagger.measure("requested_ids", len(ids))
             docs = [
-                structure_from_mongo(structure, course_context)
+                self._structure_from_mongo(structure, course_context)
                 for structure in self.structures.find({'_id': {'$in': ids}})
             ]
             tagger.measure("structures", len(docs))
@@ -364,12 +385,19 @@ class MongoConnection(object):
         with TIMER.timer("find_course_blocks_by_id", course_context) as tagger:
             tagger.measure("requested_ids", len(ids))
             docs = [
-                structure_from_mongo(structure, course_context)
+                self._structure_from_mongo(structure, course_context)
                 for structure in self.structures.find(
                     {'_id': {'$in': ids}},
-                    {'blocks': {'$elemMatch': {'block_type': 'course'}}, 'root': 1}
+                    {'blocks': {'$elemMatch': {'block_type': 'course'}}, 'root': 1, 'delta_base': 1}
                 )
             ]
+            for doc in docs:
+                # Delta-encoded structures are reconstructed with all of their blocks
+                doc['blocks'] = {
+                    block_key: block
+                    for block_key, block in doc['blocks'].iteritems()
+                    if block_key.type == 'course'
+                }
             tagger.measure("structures", len(docs))
             return docs
 
@@ -384,7 +412,7 @@ class MongoConnection(object):
         with TIMER.timer("find_structures_derived_from", course_context) as tagger:
             tagger.measure("base_ids", len(ids))
             docs = [
-                structure_from_mongo(structure, course_context)
+                self._structure_from_mongo(structure, course_context)
                 for structure in self.structures.find({'previous_version': {'$in': ids}})
             ]
             tagger.measure("structures", len(docs))
@@ -401,7 +429,7 @@ class MongoConnection(object):
         """
         with TIMER.timer("find_ancestor_structures", course_context) as tagger:
             docs = [
-                structure_from_mongo(structure, course_context)
+                self._structure_from_mongo(structure, course_context)
                 for structure in self.structures.find({
                     'original_version': original_version,
                     'blocks': {
@@ -418,13 +446,171 @@ class MongoConnection(object):
             tagger.measure("structures", len(docs))
             return docs
 
+    @autoretry_read()
+    def find_structure_version_links(self, ids, course_context=None):
+        """
+        Return the version history links of the structures specified in ``ids``.
+
+        Unlike :meth:`find_structures_by_id`, the blocks are not loaded: each returned
+        document only contains ``_id``, ``previous_version``, ``original_version``,
+        ``edited_on`` and, for delta-encoded structures, ``delta_base``.
+
+        Arguments:
+            ids (list): A list of structure ids
+        """
+        with TIMER.timer("find_structure_version_links", course_context) as tagger:
+            tagger.measure("requested_ids", len(ids))
+            docs = list(self.structures.find(
+                {'_id': {'$in': ids}},
+                {'previous_version': 1, 'original_version': 1, 'edited_on': 1, 'delta_base': 1}
+            ))
+            tagger.measure("structures", len(docs))
+            return docs
+
+    @autoretry_read()
+    def find_structure_references(self, ids, course_context=None):
+        """
+        Return the block references of the structures specified in ``ids``.
+
+        Each returned document contains the ``definition`` and the ``source_library_version``
+        setting (if any) of each block, and nothing else.
+
+        Arguments:
+            ids (list): A list of structure ids
+        """
+        with TIMER.timer("find_structure_references", course_context) as tagger:
+            tagger.measure("requested_ids", len(ids))
+            docs = list(self.structures.find(
+                {'_id': {'$in': ids}},
+                {'blocks.definition': 1, 'blocks.fields.source_library_version': 1}
+            ))
+            tagger.measure("structures", len(docs))
+            return docs
+
+    def iter_structure_ages(self):
+        """
+        Return a cursor over the ``_id`` and ``edited_on`` of every structure in the database.
+        """
+        return self.structures.find({}, {'edited_on': 1})
+
+    def iter_definition_ages(self):
+        """
+        Return a cursor over the ``_id`` and ``edit_info.edited_on`` of every definition in the database.
+        """
+        return self.definitions.find({}, {'edit_info.edited_on': 1})
+
+    def _structure_from_mongo(self, structure, course_context=None):
+        """
+        Convert a structure document with :func:`structure_from_mongo`, reconstructing
+        the full set of blocks if the document was stored as a delta.
+        """
+        delta_base = structure.pop('delta_base', None)
+        deleted_blocks = structure.pop('deleted_blocks', [])
+        structure.pop('snapshot_distance', None)
+        if delta_base is None:
+            return structure_from_mongo(structure, course_context)
+
+        # An unchanged block list is omitted from projected delta documents
+        structure.setdefault('blocks', [])
+        structure = structure_from_mongo(structure, course_context)
+        # Copy the blocks of the base, which may be shared with other readers of its structure
+        blocks = dict(self.get_structure(delta_base, course_context)['blocks'])
+        for block_key in deleted_blocks:
+            blocks.pop(BlockKey(*block_key), None)
+        blocks.update(structure['blocks'])
+        structure['blocks'] = blocks
+        return structure
+
+    def _structure_to_delta(self, structure, document, course_context=None):
+        """
+        Return ``document`` (the mongo representation of ``structure``) reduced to a delta
+        against the previous version of ``structure``, or unchanged if a full snapshot is due.
+        """
+        base_id = structure.get('previous_version')
+        if base_id is None:
+            return document
+
+        base_document = self.structures.find_one({'_id': base_id}, {'snapshot_distance': 1})
+        if base_document is None:
+            return document
+
+        snapshot_distance = base_document.get('snapshot_distance', 0) + 1
+        if snapshot_distance >= self.structure_snapshot_interval:
+            return document
+
+        base_blocks = self.get_structure(base_id, course_context)['blocks']
+        changed_blocks = set(
+            block_key
+            for block_key, block in structure['blocks'].iteritems()
+            if block_key not in base_blocks or not block == base_blocks[block_key]
+        )
+
+        delta = dict(document)
+        delta['blocks'] = [
+            block for block in document['blocks']
+            if BlockKey(block['block_type'], block['block_id']) in changed_blocks
+        ]
+        delta['deleted_blocks'] = [
+            [block_key.type, block_key.id]
+            for block_key in base_blocks
+            if block_key not in structure['blocks']
+        ]
+        delta['delta_base'] = base_id
+        delta['snapshot_distance'] = snapshot_distance
+        return delta
+
     def insert_structure(self, structure, course_context=None):
         """
         Insert a new structure into the database.
+
+        If ``structure_snapshot_interval`` is set, the structure is stored as a delta
+        against its previous version unless a full snapshot is due.
         """
         with TIMER.timer("insert_structure", course_context) as tagger:
             tagger.measure("blocks", len(structure["blocks"]))
-            self.structures.insert(structure_to_mongo(structure, course_context))
+            document = structure_to_mongo(structure, course_context)
+            if self.structure_snapshot_interval:
+                document = self._structure_to_delta(structure, document, course_context)
+                tagger.measure("stored_blocks", len(document["blocks"]))
+            self.structures.insert(document)
+
+    def delete_structures(self, ids, archive=False, course_context=None):
+        """
+        Remove the structures specified in ``ids`` from the database.
+
+        Arguments:
+            ids (list): A list of structure ids
+            archive (bool): If True, copy the structures into the ``structures_archive``
+                collection before removing them.
+        """
+        with TIMER.timer("delete_structures", course_context) as tagger:
+            tagger.measure("requested_ids", len(ids))
+            if archive:
+                self._archive_documents(self.structures, self.structures_archive, ids)
+            self.structures.remove({'_id': {'$in': ids}})
+
+    def delete_definitions(self, ids, archive=False, course_context=None):
+        """
+        Remove the definitions specified in ``ids`` from the database.
+
+        Arguments:
+            ids (list): A list of definition ids
+            archive (bool): If True, copy the definitions into the ``definitions_archive``
+                collection before removing them.
+        """
+        with TIMER.timer("delete_definitions", course_context) as tagger:
+            tagger.measure("requested_ids", len(ids))
+            if archive:
+                self._archive_documents(self.definitions, self.definitions_archive, ids)
+            self.definitions.remove({'_id': {'$in': ids}})
+
+    def _archive_documents(self, collection, archive_collection, ids):
+        """
+        Copy the documents specified in ``ids`` from ``collection`` into ``archive_collection``.
+        Documents which were already archived are replaced.
+        """
+        for document in collection.find({'_id': {'$in': ids}}):
+            archive_collection.save(document)
 
     def get_course_index(self, key, ignore_case=False):
         """
@@ -57,6 +57,7 @@ import copy
 import datetime
 import hashlib
 import logging
+from uuid import uuid4
 from contracts import contract, new_contract
 from importlib import import_module
 from mongodb_proxy import autoretry_read
@@ -70,7 +71,7 @@ from xmodule.course_module import CourseSummary
 from xmodule.errortracker import null_error_tracker
 from opaque_keys.edx.keys import CourseKey
 from opaque_keys.edx.locator import (
-    BlockUsageLocator, DefinitionLocator, CourseLocator, LibraryLocator, VersionTree, LocalId,
+    BlockUsageLocator, DefinitionLocator, CourseLocator, LibraryLocator, LibraryUsageLocator, VersionTree, LocalId,
 )
 from ccx_keys.locator import CCXLocator, CCXBlockUsageLocator
 from xmodule.modulestore.exceptions import InsufficientSpecificationError, VersionConflictError, DuplicateItemError, \
@@ -2537,6 +2538,129 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         return new_blocks
 
+    def duplicate_subtree(self, source_usage_key, parent_usage_key, user_id, fields=None, **kwargs):
+        """
+        Copy the block at `source_usage_key` and all of its descendants so that the copy becomes a
+        child of `parent_usage_key`, writing a single new version of the destination structure.
+
+        Unlike creating each copy with `create_item`, all of the new blocks are built in memory from
+        the source structure. The copies share the (immutable) definitions of their sources and are
+        given new random block ids, except for blocks which were inherited from a library using
+        `copy_from_template`: these get the same block id that `copy_from_template` would give them
+        under their new parent, so that refreshing the copied library content preserves its overrides.
+
+        If the source block is already a child of the parent, the copy is inserted immediately after
+        it, otherwise it is appended to the parent's children. Detached blocks are not added to the
+        parent's children.
+
+        :param fields: settings field values to set on the copy of the source block (e.g. display_name)
+
+        Returns the usage key of the copy of the source block.
+        """
+        source_course = source_usage_key.course_key
+        dest_course = parent_usage_key.course_key
+        with self.bulk_operations(source_course):
+            source_structure = self._lookup_course(source_course).structure
+
+        with self.bulk_operations(dest_course):
+            index_entry = self._get_index_if_valid(dest_course)
+            dest_structure = self._lookup_course(dest_course).structure
+            dest_structure = self.version_structure(dest_course, dest_structure, user_id)
+
+            source_block_key = BlockKey.from_usage_key(source_usage_key)
+            parent_block_key = BlockKey.from_usage_key(parent_usage_key)
+            if source_block_key not in source_structure['blocks']:
+                raise ItemNotFoundError(source_usage_key)
+            if parent_block_key not in dest_structure['blocks']:
+                raise ItemNotFoundError(parent_usage_key)
+
+            new_block_key = self._duplicate_subdag(
+                user_id, source_structure['blocks'], source_block_key, dest_structure, parent_block_key
+            )
+            if fields:
+                dest_structure['blocks'][new_block_key].fields.update(
+                    self._serialize_fields(new_block_key.type, fields)
+                )
+
+            if new_block_key.type not in DETACHED_XBLOCK_TYPES:
+                parent = dest_structure['blocks'][parent_block_key]
+                children = parent.fields.setdefault('children', [])
+                same_course = source_course.version_agnostic() == dest_course.version_agnostic()
+                if same_course and source_block_key in children:
+                    children.insert(children.index(source_block_key) + 1, new_block_key)
+                else:
+                    children.append(new_block_key)
+                self.version_block(parent, user_id, dest_structure['_id'])
+                self.decache_block(dest_course, dest_structure['_id'], parent_block_key)
+
+            self.update_structure(dest_course, dest_structure)
+            if index_entry is not None:
+                self._update_head(dest_course, index_entry, dest_course.branch, dest_structure['_id'])
+
+        return dest_course.make_usage_key(new_block_key.type, new_block_key.id)
+
+    def get_subtree_usage_keys(self, usage_key, **kwargs):
+        """
+        Returns the usage keys of the block at `usage_key` and of all of its descendants, in depth-first
+        order, read from the children lists of the course structure without loading any block.
+
+        duplicate_subtree() keeps the order of the children it copies, so the usage keys of a subtree
+        and of its copy correspond by position.
+        """
+        course_key = usage_key.course_key
+        with self.bulk_operations(course_key):
+            blocks = self._lookup_course(course_key).structure['blocks']
+        root_block_key = BlockKey.from_usage_key(usage_key)
+        if root_block_key not in blocks:
+            raise ItemNotFoundError(usage_key)
+        usage_keys = []
+        block_keys = [root_block_key]
+        while block_keys:
+            block_key = block_keys.pop()
+            usage_keys.append(course_key.make_usage_key(block_key.type, block_key.id))
+            children = blocks[block_key].fields.get('children', [])
+            block_keys.extend(reversed([child_key for child_key in children if child_key in blocks]))
+        return usage_keys
+
+    def _duplicate_subdag(self, user_id, source_blocks, source_block_key, dest_structure, new_parent_block_key):
+        """
+        Internal recursive implementation of duplicate_subtree()
+
+        Copies source_block_key and its descendants from source_blocks into dest_structure, and
+        returns the BlockKey of the copy of source_block_key. Does not add the copy to its parent.
+        """
+        source_block = source_blocks[source_block_key]
+        new_block_key = BlockKey(source_block_key.type, uuid4().hex)
+        original_usage = source_block.edit_info.original_usage
+        if original_usage:
+            original_usage = BlockUsageLocator.from_string(original_usage)
+            if isinstance(original_usage, LibraryUsageLocator):
+                # Use the block id copy_from_template() would compute, unless a copy already has it
+                unique_data = "{}:{}:{}".format(
+                    unicode(original_usage.library_key.for_branch(ModuleStoreEnum.BranchName.library)).encode("utf-8"),
+                    original_usage.block_id,
+                    new_parent_block_key.id,
+                )
+                template_block_key = BlockKey(source_block_key.type, hashlib.sha1(unique_data).hexdigest()[:20])
+                if template_block_key not in dest_structure['blocks']:
+                    new_block_key = template_block_key
+
+        new_block = copy.deepcopy(source_block)
+        new_block.edit_info.previous_version = None
+        new_block.edit_info.update_version = dest_structure['_id']
+        new_block.edit_info.source_version = None
+        new_block.edit_info.edited_by = user_id
+        new_block.edit_info.edited_on = datetime.datetime.now(UTC)
+        dest_structure['blocks'][new_block_key] = new_block
+
+        if 'children' in source_block.fields:
+            new_block.fields['children'] = [
+                self._duplicate_subdag(user_id, source_blocks, child_key, dest_structure, new_block_key)
+                for child_key in source_block.fields['children']
+                if child_key in source_blocks
+            ]
+        return new_block_key
+
     def delete_item(self, usage_locator, user_id, force=False):
         """
         Delete the block or tree rooted at block (if delete_children) and any references w/in the course to the block
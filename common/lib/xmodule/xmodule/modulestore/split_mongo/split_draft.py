@@ -137,6 +137,34 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
                         keys_to_check.extend(children)
         return new_keys
 
+    def duplicate_subtree(self, source_usage_key, parent_usage_key, user_id, fields=None, **kwargs):
+        """
+        See :py:meth `SplitMongoModuleStore.duplicate_subtree`
+        """
+        source_usage_key = self._map_revision_to_branch(source_usage_key)
+        parent_usage_key = self._map_revision_to_branch(parent_usage_key)
+        with self.bulk_operations(parent_usage_key.course_key):
+            new_key = super(DraftVersioningModuleStore, self).duplicate_subtree(
+                source_usage_key, parent_usage_key, user_id, fields=fields, **kwargs
+            )
+            if parent_usage_key.branch == ModuleStoreEnum.BranchName.draft:
+                # Publish the copies of any direct-only blocks, and the parent if it is one.
+                self._auto_publish_no_children(parent_usage_key, parent_usage_key.category, user_id, **kwargs)
+                keys_to_check = [new_key]
+                while keys_to_check:
+                    usage_key = keys_to_check.pop()
+                    if usage_key.category in DIRECT_ONLY_CATEGORIES:
+                        self.publish(usage_key.version_agnostic(), user_id, blacklist=EXCLUDE_ALL, **kwargs)
+                        keys_to_check.extend(getattr(self.get_item(usage_key, **kwargs), "children", []))
+        return new_key
+
+    def get_subtree_usage_keys(self, usage_key, revision=None, **kwargs):
+        """
+        See :py:meth `SplitMongoModuleStore.get_subtree_usage_keys`
+        """
+        usage_key = self._map_revision_to_branch(usage_key, revision=revision)
+        return super(DraftVersioningModuleStore, self).get_subtree_usage_keys(usage_key, **kwargs)
+
     def update_item(self, descriptor, user_id, allow_not_found=False, force=False, asides=None, **kwargs):
         old_descriptor_locn = descriptor.location
         descriptor.location = self._map_revision_to_branch(old_descriptor_locn)
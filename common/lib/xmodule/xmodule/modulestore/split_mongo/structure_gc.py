@@ -0,0 +1,226 @@
+"""
+Garbage collection of unreachable split modulestore structures and definitions.
+
+Every edit in split creates a new, immutable structure document, and nothing ever
+removes the old ones. This module finds the structures which can no longer be reached
+from any course index and removes (or archives) them, along with any definitions which
+are no longer referenced by a live structure.
+
+A structure is live if it is:
+
+* the head of any branch of any course or library index,
+* one of the ``keep_versions`` previous versions of such a head,
+* a library version referenced (via ``source_library_version``) by a block of a live structure, or
+* the base of a live delta-encoded structure.
+
+Everything else which is older than ``min_age`` is garbage. The age cutoff protects
+structures and definitions which were written by an in-flight edit whose course index
+hasn't been updated yet.
+"""
+import datetime
+import logging
+import time
+
+from bson.objectid import ObjectId
+from pytz import UTC
+
+
+log = logging.getLogger(__name__)
+
+DEFAULT_KEEP_VERSIONS = 10
+DEFAULT_MIN_AGE = datetime.timedelta(days=1)
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _chunks(items, size):
+    """
+    Yield successive lists of at most ``size`` elements from ``items``.
+    """
+    items = list(items)
+    for start in xrange(0, len(items), size):
+        yield items[start:start + size]
+
+
+class GarbageCollectionReport(object):
+    """
+    The result of a (possibly dry) garbage collection run.
+    """
+    def __init__(self, dry_run):
+        self.dry_run = dry_run
+        self.heads = 0
+        self.live_structures = 0
+        self.live_definitions = 0
+        self.unreachable_structures = []
+        self.orphan_definitions = []
+
+    def __unicode__(self):
+        return (
+            u"{mode}: {heads} heads, {live_structures} live structures, {live_definitions} live definitions, "
+            u"{structures} unreachable structures, {definitions} orphan definitions"
+        ).format(
+            mode=u"Dry run" if self.dry_run else u"Collected",
+            heads=self.heads,
+            live_structures=self.live_structures,
+            live_definitions=self.live_definitions,
+            structures=len(self.unreachable_structures),
+            definitions=len(self.orphan_definitions),
+        )
+
+
+class StructureGarbageCollector(object):
+    """
+    Find and remove unreachable structures and orphan definitions in a split modulestore.
+    """
+    def __init__(
+        self, db_connection, keep_versions=DEFAULT_KEEP_VERSIONS, min_age=DEFAULT_MIN_AGE,
+        batch_size=DEFAULT_BATCH_SIZE, batch_delay=0, archive=False,
+    ):
+        """
+        Arguments:
+            db_connection (MongoConnection): The connection of the split modulestore to collect.
+            keep_versions (int): The number of previous versions of each branch head to keep.
+            min_age (timedelta): Never remove documents which were edited more recently than this.
+            batch_size (int): The number of documents read or removed per query.
+            batch_delay (float): The number of seconds to sleep between removal batches,
+                to throttle the load on the database.
+            archive (bool): If True, copy the removed documents into the archive collections.
+        """
+        self.db_connection = db_connection
+        self.keep_versions = keep_versions
+        self.min_age = min_age
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.archive = archive
+
+    def collect(self, dry_run=True):
+        """
+        Find the unreachable structures and orphan definitions and, unless ``dry_run``
+        is set, remove them.
+
+        Returns:
+            GarbageCollectionReport
+        """
+        report = GarbageCollectionReport(dry_run)
+        cutoff = datetime.datetime.now(UTC) - self.min_age
+
+        heads = self.find_heads()
+        report.heads = len(heads)
+        live_structures = self.find_live_structures(heads)
+        live_definitions = self.find_live_definitions(live_structures)
+        report.live_structures = len(live_structures)
+        report.live_definitions = len(live_definitions)
+
+        report.unreachable_structures = [
+            structure['_id']
+            for structure in self.db_connection.iter_structure_ages()
+            if structure['_id'] not in live_structures and self._is_older(structure.get('edited_on'), cutoff)
+        ]
+        report.orphan_definitions = [
+            definition['_id']
+            for definition in self.db_connection.iter_definition_ages()
+            if definition['_id'] not in live_definitions and
+            self._is_older(definition.get('edit_info', {}).get('edited_on'), cutoff)
+        ]
+
+        log.info(unicode(report))
+        if not dry_run:
+            self._remove(self.db_connection.delete_structures, report.unreachable_structures)
+            self._remove(self.db_connection.delete_definitions, report.orphan_definitions)
+
+        return report
+
+    def find_heads(self):
+        """
+        Return the set of the head versions of all branches of all course and library indexes.
+        """
+        heads = set()
+        for index in self.db_connection.find_matching_course_indexes():
+            heads.update(index.get('versions', {}).values())
+        return heads
+
+    def find_live_structures(self, heads):
+        """
+        Return the set of ids of the structures reachable from ``heads``: the heads themselves,
+        ``keep_versions`` of their previous versions, and all library versions referenced
+        by any of those.
+        """
+        live = set()
+        requested = set()
+        frontier = set(heads)
+        while frontier:
+            requested.update(frontier)
+            live.update(self._walk_history(frontier, live))
+            frontier = self._find_library_versions(live) - live - requested
+        return live
+
+    def find_live_definitions(self, live_structures):
+        """
+        Return the set of ids of the definitions referenced by the blocks of ``live_structures``.
+        """
+        definitions = set()
+        for chunk in _chunks(live_structures, self.batch_size):
+            for structure in self.db_connection.find_structure_references(chunk):
+                definitions.update(
+                    block['definition']
+                    for block in structure.get('blocks', [])
+                    if 'definition' in block
+                )
+        return definitions
+
+    def _walk_history(self, heads, seen):
+        """
+        Return the ids of ``heads``, of ``keep_versions`` of their previous versions and
+        of every structure needed to reconstruct a delta-encoded one among those,
+        skipping any structures in ``seen``.
+        """
+        found = set()
+        delta_bases = set()
+        frontier = set(heads) - seen
+        depth = 0
+        while frontier:
+            previous_versions = set()
+            for chunk in _chunks(frontier, self.batch_size):
+                for structure in self.db_connection.find_structure_version_links(chunk):
+                    found.add(structure['_id'])
+                    if structure.get('delta_base') is not None:
+                        delta_bases.add(structure['delta_base'])
+                    if depth < self.keep_versions and structure.get('previous_version') is not None:
+                        previous_versions.add(structure['previous_version'])
+            depth += 1
+            frontier = (previous_versions | delta_bases) - found - seen
+        return found
+
+    def _find_library_versions(self, structure_ids):
+        """
+        Return the set of library versions referenced by the blocks of the specified structures.
+        """
+        versions = set()
+        for chunk in _chunks(structure_ids, self.batch_size):
+            for structure in self.db_connection.find_structure_references(chunk):
+                for block in structure.get('blocks', []):
+                    version = block.get('fields', {}).get('source_library_version')
+                    if version and ObjectId.is_valid(version):
+                        versions.add(ObjectId(version))
+        return versions
+
+    def _remove(self, delete_method, ids):
+        """
+        Remove ``ids`` in throttled batches using ``delete_method``.
+        """
+        for chunk in _chunks(ids, self.batch_size):
+            delete_method(chunk, archive=self.archive)
+            log.info(u"Removed %d documents using %s", len(chunk), delete_method.__name__)
+            if self.batch_delay:
+                time.sleep(self.batch_delay)
+
+    @staticmethod
+    def _is_older(edited_on, cutoff):
+        """
+        Return whether ``edited_on`` is before ``cutoff``. Documents with no edit time are
+        considered old, since only legacy documents lack one.
+        """
+        if edited_on is None:
+            return True
+        if edited_on.tzinfo is None:
+            edited_on = edited_on.replace(tzinfo=UTC)
+        return edited_on < cutoff
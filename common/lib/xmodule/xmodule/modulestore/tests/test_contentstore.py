@@ -1,6 +1,8 @@
 """
  Test contentstore.mongo functionality
 """
+import itertools
+import json
 import logging
 from uuid import uuid4
 import unittest
@@ -166,6 +168,60 @@ class TestContentstore(unittest.TestCase):
         self.assertEqual(count, 0)
         self.assertEqual(course_assets, [])
 
+    @ddt.data(*itertools.product((True, False), ('uploadDate', 'displayname'), (1, -1)))
+    @ddt.unpack
+    def test_get_all_content_after(self, deprecated, sort_field, direction):
+        """
+        Test paging through get_all_content_for_course using the last asset of each page
+        """
+        self.set_up_assets(deprecated)
+        sort = [(sort_field, direction)]
+        expected, __ = self.contentstore.get_all_content_for_course(self.course1_key, sort=sort)
+
+        paged = []
+        page, count = self.contentstore.get_all_content_for_course(self.course1_key, maxresults=2, sort=sort)
+        while page:
+            paged.extend(page)
+            self.assertEqual(count, len(self.course1_files))
+            last = page[-1]
+            page, count = self.contentstore.get_all_content_for_course(
+                self.course1_key, maxresults=2, sort=sort, after=(last[sort_field], last['_id'])
+            )
+        self.assertEqual([asset['_id'] for asset in paged], [asset['_id'] for asset in expected])
+
+    @ddt.data(True, False)
+    def test_get_all_content_text_search(self, deprecated):
+        """
+        Test searching the display names of get_all_content_for_course
+        """
+        self.set_up_assets(deprecated)
+        self.contentstore.ensure_indexes()
+        assets, count = self.contentstore.get_all_content_for_course(self.course1_key, text_search='picture1')
+        self.assertEqual(count, 1)
+        self.assertEqual(assets[0]['displayname'], 'picture1.jpg')
+
+    @ddt.data(True, False)
+    def test_get_all_content_text_search_without_index(self, deprecated):
+        """
+        Test that searching the display names works before the text index is created
+        """
+        self.set_up_assets(deprecated)
+        assets, count = self.contentstore.get_all_content_for_course(self.course1_key, text_search='Picture1')
+        self.assertEqual(count, 1)
+        self.assertEqual(assets[0]['displayname'], 'picture1.jpg')
+
+        # The search still applies when paging on the display name
+        sort = [('displayname', 1)]
+        first, __ = self.contentstore.get_all_content_for_course(
+            self.course1_key, maxresults=1, sort=sort, text_search='picture'
+        )
+        second, count = self.contentstore.get_all_content_for_course(
+            self.course1_key, maxresults=1, sort=sort, text_search='picture',
+            after=(first[0]['displayname'], first[0]['_id'])
+        )
+        self.assertEqual(count, 2)
+        self.assertEqual([asset['displayname'] for asset in first + second], ['picture1.jpg', 'picture2.jpg'])
+
     @ddt.data(True, False)
     def test_attrs(self, deprecated):
         """
@@ -209,3 +265,88 @@ class TestContentstore(unittest.TestCase):
         # ensure it didn't remove any from other course
         __, count = self.contentstore.get_all_content_for_course(self.course2_key)
         self.assertEqual(count, len(self.course2_files))
+
+    @ddt.data(True, False)
+    def test_copy_assets_shares_data(self, deprecated):
+        """
+        copy_all_course_assets doesn't duplicate the data of the assets
+        """
+        self.set_up_assets(deprecated)
+        chunks = self.contentstore.fs_chunks.count()
+        dest_course = CourseLocator('test', 'destination', 'copy')
+        self.contentstore.copy_all_course_assets(self.course1_key, dest_course)
+        self.assertEqual(self.contentstore.fs_chunks.count(), chunks)
+        for filename in self.course1_files:
+            source = self.contentstore.find(self.course1_key.make_asset_key('asset', filename))
+            copied = self.contentstore.find(dest_course.make_asset_key('asset', filename))
+            self.assertEqual(source.data, copied.data)
+
+    @ddt.data(True, False)
+    def test_export_copied_assets(self, deprecated):
+        """
+        The reference of copied assets to the data of their source isn't exported
+        """
+        self.set_up_assets(deprecated)
+        dest_course = CourseLocator('test', 'destination', 'copy')
+        self.contentstore.copy_all_course_assets(self.course1_key, dest_course)
+        root_dir = path.Path(mkdtemp())
+        try:
+            policy_file = path.Path(root_dir / "policy.json")
+            self.contentstore.export_all_for_course(dest_course, root_dir, policy_file)
+            with open(policy_file) as f:
+                policy = json.load(f)
+            self.assertItemsEqual(policy.keys(), self.course1_files)
+            for attrs in policy.itervalues():
+                self.assertNotIn('blob_id', attrs)
+        finally:
+            shutil.rmtree(root_dir)
+
+    @ddt.data(True, False)
+    def test_delete_copied_assets(self, deprecated):
+        """
+        Deleting the source of copied assets leaves the copies usable
+        """
+        self.set_up_assets(deprecated)
+        copy_course = CourseLocator('test', 'destination', 'copy')
+        other_copy_course = CourseLocator('test', 'destination', 'other_copy')
+        self.contentstore.copy_all_course_assets(self.course1_key, copy_course)
+        self.contentstore.copy_all_course_assets(self.course1_key, other_copy_course)
+        data = {
+            filename: self.contentstore.find(self.course1_key.make_asset_key('asset', filename)).data
+            for filename in self.course1_files
+        }
+
+        self.contentstore.delete_all_course_assets(self.course1_key)
+        for filename in self.course1_files:
+            self.assertEqual(self.contentstore.find(copy_course.make_asset_key('asset', filename)).data, data[filename])
+
+        self.contentstore.delete_all_course_assets(copy_course)
+        for filename in self.course1_files:
+            copied = self.contentstore.find(other_copy_course.make_asset_key('asset', filename))
+            self.assertEqual(copied.data, data[filename])
+
+    @ddt.data(True, False)
+    def test_copied_assets_refcount(self, deprecated):
+        """
+        The source of copied assets counts the copies referring to its data
+        """
+        self.set_up_assets(deprecated)
+        copy_course = CourseLocator('test', 'destination', 'copy')
+        self.contentstore.copy_all_course_assets(self.course1_key, copy_course)
+        self.contentstore.copy_all_course_assets(copy_course, CourseLocator('test', 'destination', 'other_copy'))
+        source_ids = [
+            self.contentstore.asset_db_key(self.course1_key.make_asset_key('asset', filename))[0]
+            for filename in self.course1_files
+        ]
+        for source_id in source_ids:
+            self.assertEqual(self.contentstore.fs_files.find_one({'_id': source_id})['refcount'], 2)
+
+        self.contentstore.delete_all_course_assets(copy_course)
+        for source_id in source_ids:
+            self.assertEqual(self.contentstore.fs_files.find_one({'_id': source_id})['refcount'], 1)
+
+        self.contentstore.delete_all_course_assets(CourseLocator('test', 'destination', 'other_copy'))
+        self.contentstore.delete_all_course_assets(self.course1_key)
+        for source_id in source_ids:
+            self.assertIsNone(self.contentstore.fs_files.find_one({'_id': source_id}))
+            self.assertIsNone(self.contentstore.fs_chunks.find_one({'files_id': source_id}))
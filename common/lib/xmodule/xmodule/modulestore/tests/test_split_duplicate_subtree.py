@@ -0,0 +1,101 @@
+"""
+Tests for split's duplicate_subtree method.
+"""
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.exceptions import ItemNotFoundError
+from xmodule.modulestore.tests.factories import CourseFactory, LibraryFactory
+from xmodule.modulestore.tests.utils import MixedSplitTestCase
+
+
+class TestSplitDuplicateSubtree(MixedSplitTestCase):
+    """
+    Tests for split's duplicate_subtree method.
+    """
+    def setUp(self):
+        super(TestSplitDuplicateSubtree, self).setUp()
+        self.course = CourseFactory.create(modulestore=self.store)
+        self.chapter = self.make_block("chapter", self.course)
+        self.sequential = self.make_block("sequential", self.chapter)
+        self.vertical = self.make_block("vertical", self.sequential)
+        self.html = self.make_block("html", self.vertical, display_name="HTML", data="<p>Hello</p>")
+        self.problem = self.make_block("problem", self.vertical, display_name="Problem")
+
+    def _get_structure(self):
+        """
+        Returns the current draft structure of the course.
+        """
+        split_store = self.store._get_modulestore_by_type(  # pylint: disable=protected-access
+            ModuleStoreEnum.Type.split
+        )
+        course_key = self.course.id.for_branch(ModuleStoreEnum.BranchName.draft)
+        return split_store._lookup_course(course_key).structure  # pylint: disable=protected-access
+
+    def test_duplicate_subtree(self):
+        version_before = self._get_structure()['_id']
+        new_key = self.store.duplicate_subtree(
+            self.sequential.location, self.chapter.location, self.user_id, fields={'display_name': "Copy"}
+        )
+        structure = self._get_structure()
+        # All of the blocks were written in a single new version
+        self.assertEqual(structure['previous_version'], version_before)
+
+        chapter = self.store.get_item(self.chapter.location)
+        self.assertEqual(chapter.children, [self.sequential.location, new_key])
+        sequential = self.store.get_item(new_key)
+        self.assertEqual(sequential.display_name, "Copy")
+
+        vertical = self.store.get_item(sequential.children[0])
+        self.assertNotEqual(vertical.location, self.vertical.location)
+        html, problem = [self.store.get_item(child) for child in vertical.children]
+        self.assertEqual(html.display_name, "HTML")
+        self.assertEqual(html.data, "<p>Hello</p>")
+        self.assertEqual(problem.display_name, "Problem")
+
+    def test_duplicate_to_other_parent(self):
+        new_key = self.store.duplicate_subtree(self.html.location, self.sequential.location, self.user_id)
+        sequential = self.store.get_item(self.sequential.location)
+        self.assertEqual(sequential.children, [self.vertical.location, new_key])
+
+    def test_duplicate_not_found(self):
+        with self.assertRaises(ItemNotFoundError):
+            self.store.duplicate_subtree(
+                self.course.id.make_usage_key("html", "missing"), self.vertical.location, self.user_id
+            )
+
+    def test_get_subtree_usage_keys(self):
+        self.assertEqual(
+            self.store.get_subtree_usage_keys(self.sequential.location),
+            [self.sequential.location, self.vertical.location, self.html.location, self.problem.location],
+        )
+        with self.assertRaises(ItemNotFoundError):
+            self.store.get_subtree_usage_keys(self.course.id.make_usage_key("html", "missing"))
+
+    def test_get_subtree_usage_keys_of_duplicate(self):
+        new_key = self.store.duplicate_subtree(self.sequential.location, self.chapter.location, self.user_id)
+        source_keys = self.store.get_subtree_usage_keys(self.sequential.location)
+        new_keys = self.store.get_subtree_usage_keys(new_key)
+        self.assertEqual(new_keys[0], new_key)
+        self.assertEqual(
+            [usage_key.block_type for usage_key in new_keys],
+            [usage_key.block_type for usage_key in source_keys],
+        )
+        self.assertEqual(self.store.get_item(new_keys[2]).display_name, "HTML")
+
+    def test_duplicate_library_content(self):
+        library = LibraryFactory.create(modulestore=self.store)
+        self.make_block("html", library, display_name="Library HTML")
+        library = self.store.get_library(library.location.library_key, remove_version=False, remove_branch=False)
+        self.store.copy_from_template(library.children, dest_key=self.vertical.location, user_id=self.user_id)
+        vertical = self.store.get_item(self.vertical.location)
+        library_html = self.store.get_item(vertical.children[-1])
+
+        new_vertical_key = self.store.duplicate_subtree(self.vertical.location, self.sequential.location, self.user_id)
+        new_vertical = self.store.get_item(new_vertical_key)
+        new_library_html = self.store.get_item(new_vertical.children[-1])
+        self.assertEqual(new_library_html.display_name, library_html.display_name)
+
+        # Copying from the template again must find the same blocks rather than creating new ones
+        self.assertEqual(
+            self.store.copy_from_template(library.children, dest_key=new_vertical_key, user_id=self.user_id),
+            [new_library_html.location],
+        )
@@ -0,0 +1,73 @@
+"""
+Tests for delta-encoded structure storage in split modulestore.
+"""
+from mock import patch
+
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.tests.factories import CourseFactory
+from xmodule.modulestore.tests.utils import MixedSplitTestCase
+
+
+class TestStructureDeltas(MixedSplitTestCase):
+    """
+    Tests that structures stored as deltas are transparently reconstructed.
+    """
+    SNAPSHOT_INTERVAL = 3
+    DOC_STORE_CONFIG = dict(MixedSplitTestCase.DOC_STORE_CONFIG, structure_snapshot_interval=SNAPSHOT_INTERVAL)
+    MIXED_OPTIONS = {
+        'stores': [
+            dict(MixedSplitTestCase.MIXED_OPTIONS['stores'][0], DOC_STORE_CONFIG=DOC_STORE_CONFIG),
+        ]
+    }
+
+    def setUp(self):
+        super(TestStructureDeltas, self).setUp()
+        split_store = self.store._get_modulestore_by_type(  # pylint: disable=protected-access
+            ModuleStoreEnum.Type.split
+        )
+        self.db_connection = split_store.db_connection
+        self.course = CourseFactory.create(modulestore=self.store)
+        self.html_blocks = [
+            self.make_block("html", self.course, display_name="html {}".format(index))
+            for index in xrange(5)
+        ]
+
+    def test_deltas_are_stored(self):
+        documents = list(self.db_connection.structures.find())
+        deltas = [document for document in documents if 'delta_base' in document]
+        self.assertTrue(deltas)
+        for document in deltas:
+            self.assertLess(document['snapshot_distance'], self.SNAPSHOT_INTERVAL)
+            self.assertEqual(document['delta_base'], document['previous_version'])
+            self.assertLess(len(document['blocks']), len(self.html_blocks) + 1)
+
+    def test_structures_are_reconstructed(self):
+        documents = list(self.db_connection.structures.find({'delta_base': {'$exists': True}}))
+        structures = self.db_connection.find_structures_by_id([document['_id'] for document in documents])
+        for structure in structures:
+            self.assertNotIn('delta_base', structure)
+            self.assertIn(structure['root'], structure['blocks'])
+            root = structure['blocks'][structure['root']]
+            for child in root.fields.get('children', []):
+                self.assertIn(child, structure['blocks'])
+
+    def test_course_is_readable(self):
+        self.store.delete_item(self.html_blocks[0].location, self.user_id)
+        course = self.store.get_course(self.course.id)
+        self.assertEqual(len(course.children), len(self.html_blocks) - 1)
+        self.assertEqual(
+            [self.store.get_item(child).display_name for child in course.children],
+            [block.display_name for block in self.html_blocks[1:]],
+        )
+
+    def test_base_structure_is_not_modified(self):
+        document = self.db_connection.structures.find_one(
+            {'delta_base': {'$exists': True}, 'blocks.0': {'$exists': True}}
+        )
+        base_structure = self.db_connection.get_structure(document['delta_base'])
+        base_blocks = dict(base_structure['blocks'])
+        # e.g. a cache returning the same structure to all of its readers
+        with patch.object(self.db_connection, 'get_structure', return_value=base_structure):
+            structure = self.db_connection._structure_from_mongo(document)  # pylint: disable=protected-access
+        self.assertEqual(base_structure['blocks'], base_blocks)
+        self.assertNotEqual(structure['blocks'], base_blocks)
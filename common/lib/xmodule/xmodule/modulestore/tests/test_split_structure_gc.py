@@ -0,0 +1,106 @@
+"""
+Tests for garbage collection of split modulestore structures.
+"""
+import datetime
+
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.split_mongo.structure_gc import StructureGarbageCollector
+from xmodule.modulestore.tests.factories import CourseFactory
+from xmodule.modulestore.tests.utils import MixedSplitTestCase
+
+
+class TestStructureGarbageCollector(MixedSplitTestCase):
+    """
+    Tests for StructureGarbageCollector.
+    """
+    def setUp(self):
+        super(TestStructureGarbageCollector, self).setUp()
+        self.split_store = self.store._get_modulestore_by_type(  # pylint: disable=protected-access
+            ModuleStoreEnum.Type.split
+        )
+        self.db_connection = self.split_store.db_connection
+        self.course = CourseFactory.create(modulestore=self.store)
+        for index in xrange(3):
+            self.make_block("html", self.course, display_name="html {}".format(index))
+        self.heads = set(self.db_connection.get_course_index(self.course.id)['versions'].values())
+
+    def _collector(self, **kwargs):
+        """
+        Return a collector which doesn't keep any history and has no age cutoff.
+        """
+        kwargs.setdefault('keep_versions', 0)
+        kwargs.setdefault('min_age', datetime.timedelta(0))
+        return StructureGarbageCollector(self.db_connection, **kwargs)
+
+    def _structure_ids(self):
+        """
+        Return the ids of all structures in the database.
+        """
+        return set(structure['_id'] for structure in self.db_connection.iter_structure_ages())
+
+    def test_dry_run(self):
+        all_structures = self._structure_ids()
+        report = self._collector().collect(dry_run=True)
+
+        self.assertEqual(set(report.unreachable_structures), all_structures - self.heads)
+        self.assertEqual(self._structure_ids(), all_structures)
+
+    def test_collect(self):
+        report = self._collector().collect(dry_run=False)
+
+        self.assertTrue(report.unreachable_structures)
+        self.assertEqual(self._structure_ids(), self.heads)
+        course = self.store.get_course(self.course.id)
+        self.assertEqual(len(course.children), 3)
+
+    def test_keep_versions(self):
+        report = self._collector(keep_versions=1).collect(dry_run=False)
+
+        remaining = self._structure_ids()
+        self.assertTrue(self.heads < remaining)
+        self.assertFalse(remaining & set(report.unreachable_structures))
+
+    def test_min_age(self):
+        report = self._collector(min_age=datetime.timedelta(days=1)).collect(dry_run=False)
+
+        self.assertEqual(report.unreachable_structures, [])
+        self.assertEqual(report.orphan_definitions, [])
+
+    def test_archive(self):
+        report = self._collector(archive=True).collect(dry_run=False)
+
+        archived = set(structure['_id'] for structure in self.db_connection.structures_archive.find())
+        self.assertEqual(archived, set(report.unreachable_structures))
+
+    def test_orphan_definitions(self):
+        self.store.delete_course(self.course.id, self.user_id)
+        report = self._collector().collect(dry_run=False)
+
+        self.assertEqual(self._structure_ids(), set())
+        self.assertTrue(report.orphan_definitions)
+        self.assertEqual(self.db_connection.definitions.find().count(), 0)
+
+
+class TestDeltaStructureGarbageCollector(TestStructureGarbageCollector):
+    """
+    Tests for StructureGarbageCollector with delta-encoded structures.
+    """
+    DOC_STORE_CONFIG = dict(MixedSplitTestCase.DOC_STORE_CONFIG, structure_snapshot_interval=3)
+    MIXED_OPTIONS = {
+        'stores': [
+            dict(MixedSplitTestCase.MIXED_OPTIONS['stores'][0], DOC_STORE_CONFIG=DOC_STORE_CONFIG),
+        ]
+    }
+
+    def test_dry_run(self):
+        report = self._collector().collect(dry_run=True)
+
+        self.assertFalse(self.heads & set(report.unreachable_structures))
+
+    def test_collect(self):
+        self._collector().collect(dry_run=False)
+
+        for structure in self.db_connection.structures.find({'delta_base': {'$exists': True}}):
+            self.assertEqual(self.db_connection.structures.find({'_id': structure['delta_base']}).count(), 1)
+        course = self.store.get_course(self.course.id)
+        self.assertEqual(len(course.children), 3)
@@ -0,0 +1,107 @@
+"""
+Tests for xmodule.util.cache_envelope.
+"""
+import zlib
+from unittest import TestCase
+
+import ddt
+
+from xmodule.util.cache_envelope import CacheEnvelope, EnvelopeError, HEADER
+
+
+class DictCache(object):
+    """
+    A cache storing values in a dict, like the Django cache API.
+    """
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):  # pylint: disable=missing-docstring
+        return self.data.get(key)
+
+    def set(self, key, value, timeout=None):  # pylint: disable=missing-docstring, unused-argument
+        self.data[key] = value
+
+    def get_many(self, keys):  # pylint: disable=missing-docstring
+        return {key: self.data[key] for key in keys if key in self.data}
+
+    def set_many(self, values, timeout=None):  # pylint: disable=missing-docstring, unused-argument
+        self.data.update(values)
+
+    def delete(self, key):  # pylint: disable=missing-docstring
+        self.data.pop(key, None)
+
+
+@ddt.ddt
+class CacheEnvelopeTest(TestCase):
+    """
+    Tests for CacheEnvelope.
+    """
+    VALUE = {'blocks': [{'id': index, 'fields': {'display_name': 'Block {}'.format(index)}} for index in range(100)]}
+
+    def setUp(self):
+        super(CacheEnvelopeTest, self).setUp()
+        self.cache = DictCache()
+
+    @ddt.data(('none', None), ('zlib', None), ('zlib', 1), ('zlib', 9))
+    @ddt.unpack
+    def test_round_trip(self, codec, level):
+        envelope = CacheEnvelope('test', codec=codec, level=level)
+        self.assertEqual(envelope.loads(envelope.dumps(self.VALUE)), self.VALUE)
+
+    def test_compressed(self):
+        self.assertLess(
+            len(CacheEnvelope('test', codec='zlib').dumps(self.VALUE)),
+            len(CacheEnvelope('test', codec='none').dumps(self.VALUE)),
+        )
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            CacheEnvelope('test', codec='unknown')
+
+    def test_other_codec_readable(self):
+        data = CacheEnvelope('test', codec='none').dumps(self.VALUE)
+        self.assertEqual(CacheEnvelope('test', codec='zlib').loads(data), self.VALUE)
+
+    def test_schema_version_mismatch(self):
+        self.cache.set('key', CacheEnvelope('test', schema_version=1).dumps(self.VALUE))
+        with self.assertRaises(EnvelopeError):
+            CacheEnvelope('test', schema_version=2).loads(self.cache.get('key'))
+        self.assertIsNone(CacheEnvelope('test', schema_version=2).get(self.cache, 'key'))
+
+    @ddt.data('', 'not an envelope', zlib.compress('legacy value'))
+    def test_unreadable(self, data):
+        self.cache.set('key', data)
+        self.assertIsNone(CacheEnvelope('test').get(self.cache, 'key'))
+
+    def test_corrupt_payload(self):
+        data = CacheEnvelope('test').dumps(self.VALUE)
+        self.cache.set('key', data[:HEADER.size + 10])
+        self.assertIsNone(CacheEnvelope('test').get(self.cache, 'key'))
+
+    def test_get_set(self):
+        envelope = CacheEnvelope('test')
+        self.assertIsNone(envelope.get(self.cache, 'key'))
+        envelope.set(self.cache, 'key', self.VALUE)
+        self.assertEqual(envelope.get(self.cache, 'key'), self.VALUE)
+        self.assertEqual(self.cache.data.keys(), ['key'])
+
+    def test_chunked(self):
+        envelope = CacheEnvelope('test', codec='none', chunk_size=100)
+        envelope.set(self.cache, 'key', self.VALUE)
+        self.assertGreater(len(self.cache.data), 2)
+        self.assertTrue(all(len(value) <= 100 for value in self.cache.data.values()))
+        self.assertEqual(envelope.get(self.cache, 'key'), self.VALUE)
+
+    def test_chunked_head_copied(self):
+        envelope = CacheEnvelope('test', codec='none', chunk_size=100)
+        envelope.set(self.cache, 'key', self.VALUE)
+        self.cache.set('other_key', self.cache.get('key'))
+        self.cache.delete('key')
+        self.assertEqual(envelope.get(self.cache, 'other_key'), self.VALUE)
+
+    def test_missing_chunk(self):
+        envelope = CacheEnvelope('test', codec='none', chunk_size=100)
+        envelope.set(self.cache, 'key', self.VALUE)
+        del self.cache.data[next(key for key in self.cache.data if key != 'key')]
+        self.assertIsNone(envelope.get(self.cache, 'key'))
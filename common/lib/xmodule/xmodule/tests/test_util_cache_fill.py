@@ -0,0 +1,116 @@
+"""
+Tests for xmodule.util.cache_fill.
+"""
+from unittest import TestCase
+
+from mock import Mock, patch
+
+from xmodule.util.cache_fill import get_or_fill, mark_stale, stale_key
+
+
+class DictCache(object):
+    """
+    A cache storing values in a dict, like the Django cache API.
+    """
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):  # pylint: disable=missing-docstring
+        return self.data.get(key)
+
+    def set(self, key, value, timeout=None):  # pylint: disable=missing-docstring, unused-argument
+        self.data[key] = value
+
+    def add(self, key, value, timeout=None):  # pylint: disable=missing-docstring, unused-argument
+        if key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    def delete(self, key):  # pylint: disable=missing-docstring
+        self.data.pop(key, None)
+
+
+class GetOrFillTest(TestCase):
+    """
+    Tests for get_or_fill and mark_stale.
+    """
+    def setUp(self):
+        super(GetOrFillTest, self).setUp()
+        self.cache = DictCache()
+        self.fill = Mock(side_effect=lambda: self.cache.set('value', 'new') or 'new')
+
+    def get_or_fill(self, **kwargs):
+        """
+        Get the value cached under 'value', filling it with self.fill.
+        """
+        return get_or_fill(
+            self.cache, 'test', 'value', lambda: self.cache.get('value'), self.fill,
+            read_stale=lambda: self.cache.get(stale_key('value')), **kwargs
+        )
+
+    def hold_lock(self):
+        """
+        Make the fill lock held by another worker.
+        """
+        self.cache.add(u"fill_lock/test/value", 'other')
+
+    def test_hit(self):
+        self.cache.set('value', 'cached')
+        self.assertEqual(self.get_or_fill(), 'cached')
+        self.assertFalse(self.fill.called)
+
+    def test_fill(self):
+        self.assertEqual(self.get_or_fill(), 'new')
+        self.assertEqual(self.fill.call_count, 1)
+        self.assertEqual(self.cache.data, {'value': 'new'})
+
+    def test_fill_error_releases_lock(self):
+        self.fill.side_effect = IOError
+        with self.assertRaises(IOError):
+            self.get_or_fill()
+        self.assertEqual(self.cache.data, {})
+
+    def test_expired_lock_not_released(self):
+        def fill_past_lock_timeout():
+            """
+            Fill the value while the lock expires and is taken by another worker.
+            """
+            self.cache.set(u"fill_lock/test/value", 'other')
+            return 'new'
+
+        self.fill.side_effect = fill_past_lock_timeout
+        self.assertEqual(self.get_or_fill(), 'new')
+        self.assertEqual(self.cache.get(u"fill_lock/test/value"), 'other')
+
+    def test_stale_while_filling(self):
+        self.cache.set('value', 'old')
+        mark_stale(self.cache, 'value')
+        self.hold_lock()
+        self.assertEqual(self.get_or_fill(), 'old')
+        self.assertFalse(self.fill.called)
+
+    @patch('xmodule.util.cache_fill.sleep')
+    def test_wait_for_fill(self, mock_sleep):
+        self.hold_lock()
+        mock_sleep.side_effect = lambda seconds: self.cache.set('value', 'filled')
+        self.assertEqual(self.get_or_fill(), 'filled')
+        self.assertFalse(self.fill.called)
+
+    @patch('xmodule.util.cache_fill.sleep')
+    def test_wait_for_shared_fill(self, mock_sleep):
+        # The filled value isn't visible to read() yet, but is shared
+        self.hold_lock()
+        mock_sleep.side_effect = lambda seconds: self.cache.set('shared', 'filled')
+        value = self.get_or_fill(read_filled=lambda: self.cache.get('shared'))
+        self.assertEqual(value, 'filled')
+        self.assertFalse(self.fill.called)
+
+    def test_wait_timeout(self):
+        self.hold_lock()
+        self.assertEqual(self.get_or_fill(wait_timeout=0.2, poll_interval=0.05), 'new')
+        self.assertEqual(self.fill.call_count, 1)
+
+    def test_mark_stale_missing(self):
+        mark_stale(self.cache, 'value')
+        self.assertEqual(self.cache.data, {})
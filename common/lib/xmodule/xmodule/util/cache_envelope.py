@@ -0,0 +1,225 @@
+"""
+Envelope for pickled values stored in a cache.
+
+Each cached value is prefixed with a header recording the envelope format, the codec it was
+compressed with and the schema version of the value. Values which can't be read any more,
+because the reader uses another schema version, lacks the codec, or can't unpickle them (e.g.
+after classes moved), are treated as cache misses rather than errors, so that such changes
+don't break warm caches.
+
+Values larger than the chunk size, which memcached would silently refuse to store, are split
+into chunks stored under their own keys.
+"""
+import cPickle as pickle
+import logging
+import struct
+import zlib
+from time import time
+from uuid import uuid4
+
+import dogstats_wrapper as dog_stats_api
+
+try:
+    from django.conf import settings
+    DJANGO_AVAILABLE = True
+except ImportError:
+    DJANGO_AVAILABLE = False
+
+try:
+    import lz4
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+
+log = logging.getLogger(__name__)
+
+MAGIC = 'EDXC'
+FORMAT_VERSION = 1
+# magic, format version, codec id, schema version, flags
+HEADER = struct.Struct('!4sBBHB')
+
+FLAG_CHUNKED = 1
+
+# Stay below memcached's default item size limit of 1MB, leaving room for the key and overhead
+DEFAULT_CHUNK_SIZE = 1000 * 1000
+
+# Marks the timeout argument as not given, to use the cache's default timeout
+DEFAULT_TIMEOUT = object()
+
+
+class _Codec(object):
+    """
+    A compression codec, identified in envelope headers by its id.
+    """
+    def __init__(self, codec_id, compress, decompress):
+        self.codec_id = codec_id
+        self.compress = compress
+        self.decompress = decompress
+
+
+CODECS = {
+    'none': _Codec(0, lambda data, level: data, lambda data: data),
+    'zlib': _Codec(
+        1,
+        lambda data, level: zlib.compress(data, zlib.Z_DEFAULT_COMPRESSION if level is None else level),
+        zlib.decompress
+    ),
+}
+if LZ4_AVAILABLE:
+    CODECS['lz4'] = _Codec(
+        2,
+        lambda data, level: lz4.compressHC(data) if level else lz4.compress(data),
+        lz4.decompress
+    )
+CODECS_BY_ID = {codec.codec_id: name for name, codec in CODECS.iteritems()}
+
+
+class EnvelopeError(Exception):
+    """
+    Raised when an envelope can't be read by this CacheEnvelope.
+    """
+    pass
+
+
+class CacheEnvelope(object):
+    """
+    Pickles, compresses and wraps values in an envelope to store them in a cache.
+
+    Arguments:
+        name (str): The name of the cached values, used to tag metrics.
+        schema_version (int): The version of the structure of the cached values. Changing it
+            makes the values cached with the previous version misses.
+        codec (str): The compression codec: 'none', 'zlib' or, if installed, 'lz4'.
+        level (int): The compression level, or None for the codec's default.
+        chunk_size (int): The maximum number of bytes stored under one cache key, or None
+            to never chunk values.
+    """
+    def __init__(self, name, schema_version=1, codec='zlib', level=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        if codec not in CODECS:
+            raise ValueError(u"Unknown cache envelope codec {}".format(codec))
+        self.name = name
+        self.schema_version = schema_version
+        self.codec = codec
+        self.level = level
+        self.chunk_size = chunk_size
+
+    def _tags(self):
+        """
+        Return the tags of the metrics of this envelope.
+        """
+        return [u"name:{}".format(self.name), u"codec:{}".format(self.codec)]
+
+    def dumps(self, value, flags=0):
+        """
+        Return value pickled, compressed and wrapped in an envelope.
+        """
+        start = time()
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        codec = CODECS[self.codec]
+        data = HEADER.pack(MAGIC, FORMAT_VERSION, codec.codec_id, self.schema_version, flags)
+        data += codec.compress(pickled, self.level)
+        dog_stats_api.histogram('cache_envelope.uncompressed_size', len(pickled), tags=self._tags())
+        dog_stats_api.histogram('cache_envelope.compressed_size', len(data), tags=self._tags())
+        dog_stats_api.histogram('cache_envelope.dumps_time', time() - start, tags=self._tags())
+        return data
+
+    def loads(self, data):
+        """
+        Return the value in the envelope.
+
+        Raises:
+            EnvelopeError: if the envelope wasn't written by a compatible CacheEnvelope.
+        """
+        value, __ = self._loads(data)
+        return value
+
+    def _loads(self, data):
+        """
+        Return the value in the envelope and its flags.
+        """
+        start = time()
+        try:
+            magic, format_version, codec_id, schema_version, flags = HEADER.unpack_from(data)
+        except struct.error:
+            raise EnvelopeError(u"Missing envelope header")
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            raise EnvelopeError(u"Unknown envelope format")
+        if schema_version != self.schema_version:
+            raise EnvelopeError(u"Schema version {} instead of {}".format(schema_version, self.schema_version))
+        if codec_id not in CODECS_BY_ID:
+            raise EnvelopeError(u"Unavailable codec {}".format(codec_id))
+
+        try:
+            pickled = CODECS[CODECS_BY_ID[codec_id]].decompress(data[HEADER.size:])
+            value = pickle.loads(pickled)
+        except Exception as exc:  # pylint: disable=broad-except
+            raise EnvelopeError(u"Unreadable value: {!r}".format(exc))
+        dog_stats_api.histogram('cache_envelope.loads_time', time() - start, tags=self._tags())
+        return value, flags
+
+    def set(self, cache, key, value, timeout=DEFAULT_TIMEOUT):
+        """
+        Store value in the cache under key, splitting it into chunks if needed.
+
+        The timeout has the meaning given to it by the cache: None stores the value forever,
+        and the cache's default timeout is used if it isn't given.
+        """
+        timeout_args = () if timeout is DEFAULT_TIMEOUT else (timeout,)
+        data = self.dumps(value)
+        if self.chunk_size is None or len(data) <= self.chunk_size:
+            cache.set(key, data, *timeout_args)
+            return
+
+        # The chunks of each write get their own keys, so that readers never mix the chunks of two writes.
+        # These don't depend on key, so that the head of the value can be copied to another key, see mark_stale.
+        token = uuid4().hex
+        chunks = {
+            self._chunk_key(token, index): data[offset:offset + self.chunk_size]
+            for index, offset in enumerate(xrange(0, len(data), self.chunk_size))
+        }
+        dog_stats_api.histogram('cache_envelope.chunks', len(chunks), tags=self._tags())
+        cache.set_many(chunks, *timeout_args)
+        cache.set(key, self.dumps((token, len(chunks)), flags=FLAG_CHUNKED), *timeout_args)
+
+    def get(self, cache, key):
+        """
+        Return the value stored in the cache under key, or None if it's missing or can't be read.
+        """
+        data = cache.get(key)
+        if data is None:
+            return None
+        try:
+            value, flags = self._loads(data)
+            if flags & FLAG_CHUNKED:
+                token, num_chunks = value
+                chunk_keys = [self._chunk_key(token, index) for index in xrange(num_chunks)]
+                chunks = cache.get_many(chunk_keys)
+                if len(chunks) != num_chunks:
+                    log.info(u"Missing chunks of cached %s %s", self.name, key)
+                    return None
+                value = self.loads(''.join(chunks[chunk_key] for chunk_key in chunk_keys))
+            return value
+        except EnvelopeError as exc:
+            log.info(u"Ignoring cached %s %s: %s", self.name, key, exc)
+            dog_stats_api.increment('cache_envelope.unreadable', tags=self._tags())
+            return None
+
+    def _chunk_key(self, token, index):
+        """
+        Return the key of a chunk of the value written with the given token.
+        """
+        return u"cache_envelope/{}/chunk/{}/{}".format(self.name, token, index)
+
+
+def get_cache_envelope(name, **defaults):
+    """
+    Return the CacheEnvelope of the named values, created with the given defaults overridden by
+    the options in the Django setting CACHE_ENVELOPES[name], if any. For example:
+
+        CACHE_ENVELOPES = {'course_structure': {'codec': 'zlib', 'level': 1}}
+    """
+    options = dict(defaults)
+    if DJANGO_AVAILABLE and settings.configured:
+        options.update(getattr(settings, 'CACHE_ENVELOPES', {}).get(name, {}))
+    return CacheEnvelope(name, **options)
@@ -0,0 +1,102 @@
+"""
+Stampede protection for expensive cache fills.
+
+When a popular value misses, e.g. right after a course is published, every worker asking for it
+would recompute it at once. :func:`get_or_fill` lets a single worker recompute the value, while the
+others get the previous (stale) value if there is one, or briefly wait for the new value.
+
+Invalidating a value with :func:`mark_stale` rather than deleting it keeps the previous value
+available to the waiters until the new one is filled.
+"""
+import logging
+from time import sleep, time
+from uuid import uuid4
+
+import dogstats_wrapper as dog_stats_api
+
+
+log = logging.getLogger(__name__)
+
+# Number of seconds after which the lock of a fill expires, in case its worker died
+DEFAULT_LOCK_TIMEOUT = 60
+# Number of seconds waiters wait for the value before computing it themselves
+DEFAULT_WAIT_TIMEOUT = 5
+# Number of seconds between the checks of waiters for the value
+DEFAULT_POLL_INTERVAL = 0.1
+# Number of seconds stale values are kept for
+DEFAULT_STALE_TIMEOUT = 60 * 60
+
+
+def stale_key(key):
+    """
+    Return the cache key under which the stale value of key is kept.
+    """
+    return u"{}/stale".format(key)
+
+
+def mark_stale(cache, key, timeout=DEFAULT_STALE_TIMEOUT):
+    """
+    Invalidate the value cached under key, keeping it under stale_key(key) for the waiters of
+    the next fill. The cached data is copied as is, so this works for values in envelopes,
+    including chunked ones, whose chunk keys don't depend on the key of the value.
+    """
+    data = cache.get(key)
+    if data is None:
+        return
+    cache.set(stale_key(key), data, timeout)
+    cache.delete(key)
+
+
+def get_or_fill(cache, kind, key, read, fill, read_stale=None, read_filled=None, lock_timeout=DEFAULT_LOCK_TIMEOUT,
+                wait_timeout=DEFAULT_WAIT_TIMEOUT, poll_interval=DEFAULT_POLL_INTERVAL):
+    """
+    Return the value read by read(), or, if it returns None, fill the value with fill() in a
+    single worker at a time.
+
+    Arguments:
+        cache: The cache holding the fill locks, shared by all workers.
+        kind (str): The kind of value to fill, used to tag metrics.
+        key (unicode): Identifies the value to fill among the values of its kind.
+        read: Returns the current value, or None if it must be filled.
+        fill: Computes, stores and returns the value.
+        read_stale: Returns the stale value, or None if there is none. Workers which don't
+            get the lock return the stale value if there is one, instead of waiting.
+        read_filled: Returns the value shared by the last fill, or None if there is none. For
+            values which fill() stores where the other workers can't see them right away, e.g.
+            rows saved in a transaction which is still open, fill() also shares them, e.g. in
+            the cache, and the workers waiting for the fill read them with this instead of read().
+        lock_timeout: Seconds after which the lock expires, which should be longer than the
+            slowest fills: once it expires, another worker starts filling the value too.
+        wait_timeout: Seconds to wait for the value before filling it regardless.
+        poll_interval: Seconds between checks for the value while waiting.
+    """
+    value = read()
+    if value is not None:
+        return value
+
+    lock_key = u"fill_lock/{}/{}".format(kind, key)
+    lock_token = uuid4().hex
+    if cache.add(lock_key, lock_token, lock_timeout):
+        try:
+            return fill()
+        finally:
+            # If the fill outlasted lock_timeout, the lock may now be held by another worker
+            if cache.get(lock_key) == lock_token:
+                cache.delete(lock_key)
+
+    if read_stale is not None:
+        value = read_stale()
+        if value is not None:
+            dog_stats_api.increment('cache_fill.stale', tags=[u"kind:{}".format(kind)])
+            return value
+
+    deadline = time() + wait_timeout
+    while time() < deadline:
+        sleep(poll_interval)
+        value = read() if read_filled is None else read_filled()
+        if value is not None:
+            return value
+
+    log.info(u"Timed out waiting for the fill of %s %s", kind, key)
+    dog_stats_api.increment('cache_fill.wait_timeout', tags=[u"kind:{}".format(kind)])
+    return fill()
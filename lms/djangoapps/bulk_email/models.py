@@ -15,11 +15,13 @@ import logging
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import models, transaction
+from django.dispatch import receiver
 
 from openedx.core.lib.html_to_text import html_to_text
 from openedx.core.lib.mail_utils import wrap_message
 
 from xmodule_django.models import CourseKeyField
+from student.dashboard_cache import invalidate_dashboard_snapshot
 from util.keyword_substitution import substitute_keywords_with_data
 
 log = logging.getLogger(__name__)
@@ -132,6 +134,14 @@ class Optout(models.Model):
         unique_together = ('user', 'course_id')
 
 
+@receiver(models.signals.post_save, sender=Optout)
+@receiver(models.signals.post_delete, sender=Optout)
+def invalidate_optout_dashboard_snapshot(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Invalidate the dashboard snapshot of the user, which shows their email settings. """
+    if instance.user_id is not None:
+        invalidate_dashboard_snapshot(instance.user.username)
+
+
 # Defines the tag that must appear in a template, to indicate
 # the location where the email message body is to be inserted.
 COURSE_EMAIL_MESSAGE_BODY_TAG = '{{message_body}}'
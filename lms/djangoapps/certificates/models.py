@@ -472,30 +472,80 @@ def certificate_status_for_student(student, course_id):
     try:
         generated_certificate = GeneratedCertificate.objects.get(  # pylint: disable=no-member
             user=student, course_id=course_id)
-        cert_status = {
-            'status': generated_certificate.status,
-            'mode': generated_certificate.mode,
-            'uuid': generated_certificate.verify_uuid,
+    except GeneratedCertificate.DoesNotExist:
+        return _certificate_status(None)
+
+    has_honor_mode = None
+    if generated_certificate.mode == 'audit':
+        has_honor_mode = 'honor' in [mode.slug for mode in CourseMode.modes_for_course(course_id)]
+    return _certificate_status(generated_certificate, has_honor_mode)
+
+
+def certificate_statuses_for_student(student, course_ids):
+    """
+    Returns a dict mapping each of course_ids to the status of the student's certificate in
+    the course, as returned by certificate_status_for_student. The certificates are loaded in
+    one query, rather than one per course.
+    """
+    # Import here instead of top of file since this module gets imported before
+    # the course_modes app is loaded, resulting in a Django deprecation warning.
+    from course_modes.models import CourseMode
+
+    generated_certificates = {
+        generated_certificate.course_id: generated_certificate
+        for generated_certificate in GeneratedCertificate.objects.filter(  # pylint: disable=no-member
+            user=student, course_id__in=course_ids
+        )
+    }
+    audit_course_ids = [
+        course_id for course_id, generated_certificate in generated_certificates.iteritems()
+        if generated_certificate.mode == 'audit'
+    ]
+    courses_with_honor_mode = set()
+    if audit_course_ids:
+        __, unexpired_modes = CourseMode.all_and_unexpired_modes_for_courses(audit_course_ids)
+        courses_with_honor_mode = {
+            course_id for course_id, modes in unexpired_modes.iteritems()
+            if 'honor' in [mode.slug for mode in modes]
         }
-        if generated_certificate.grade:
-            cert_status['grade'] = generated_certificate.grade
 
-        if generated_certificate.mode == 'audit':
-            course_mode_slugs = [mode.slug for mode in CourseMode.modes_for_course(course_id)]
-            # Short term fix to make sure old audit users with certs still see their certs
-            # only do this if there if no honor mode
-            if 'honor' not in course_mode_slugs:
-                cert_status['status'] = CertificateStatuses.auditing
-                return cert_status
+    return {
+        course_id: _certificate_status(
+            generated_certificates.get(course_id),
+            course_id in courses_with_honor_mode,
+        )
+        for course_id in course_ids
+    }
+
+
+def _certificate_status(generated_certificate, has_honor_mode=None):
+    """
+    Returns the status dictionary of certificate_status_for_student for generated_certificate,
+    or for a student without a certificate if it is None. has_honor_mode tells whether the
+    course has an honor mode, and is only needed for audit certificates.
+    """
+    if generated_certificate is None:
+        return {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor, 'uuid': None}
 
-        if generated_certificate.status == CertificateStatuses.downloadable:
-            cert_status['download_url'] = generated_certificate.download_url
+    cert_status = {
+        'status': generated_certificate.status,
+        'mode': generated_certificate.mode,
+        'uuid': generated_certificate.verify_uuid,
+    }
+    if generated_certificate.grade:
+        cert_status['grade'] = generated_certificate.grade
 
-        return cert_status
+    if generated_certificate.mode == 'audit':
+        # Short term fix to make sure old audit users with certs still see their certs
+        # only do this if there if no honor mode
+        if not has_honor_mode:
+            cert_status['status'] = CertificateStatuses.auditing
+            return cert_status
 
-    except GeneratedCertificate.DoesNotExist:
-        pass
-    return {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor, 'uuid': None}
+    if generated_certificate.status == CertificateStatuses.downloadable:
+        cert_status['download_url'] = generated_certificate.download_url
+
+    return cert_status
 
 
 def certificate_info_for_user(user, course_id, grade, user_is_whitelisted=None):
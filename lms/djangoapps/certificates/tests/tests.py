@@ -5,15 +5,18 @@ from ddt import ddt, data, unpack
 from mock import patch
 from django.conf import settings
 from nose.plugins.attrib import attr
+from opaque_keys.edx.locator import CourseLocator
 
 from xmodule.modulestore.tests.factories import CourseFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
+from course_modes.tests.factories import CourseModeFactory
 from student.tests.factories import UserFactory
 from certificates.models import (
     CertificateStatuses,
     GeneratedCertificate,
     certificate_status_for_student,
+    certificate_statuses_for_student,
     certificate_info_for_user
 )
 from certificates.tests.factories import GeneratedCertificateFactory
@@ -40,6 +43,32 @@ class CertificatesModelTest(ModuleStoreTestCase, MilestonesTestCaseMixin):
         self.assertEqual(certificate_status['status'], CertificateStatuses.unavailable)
         self.assertEqual(certificate_status['mode'], GeneratedCertificate.MODES.honor)
 
+    def test_certificate_statuses_for_student(self):
+        student = UserFactory()
+        course_ids = [CourseLocator('edx', 'certs{}'.format(index), 'run') for index in range(4)]
+        GeneratedCertificateFactory.create(
+            user=student, course_id=course_ids[0], status=CertificateStatuses.downloadable,
+            download_url='http://www.example.com/cert.pdf', grade='0.9',
+        )
+        GeneratedCertificateFactory.create(
+            user=student, course_id=course_ids[1], status=CertificateStatuses.downloadable, mode='audit',
+        )
+        GeneratedCertificateFactory.create(
+            user=student, course_id=course_ids[2], status=CertificateStatuses.downloadable, mode='audit',
+        )
+        CourseModeFactory.create(course_id=course_ids[2], mode_slug='honor')
+
+        # One query for the certificates, one for the modes of the courses with audit certificates
+        with self.assertNumQueries(2):
+            statuses = certificate_statuses_for_student(student, course_ids)
+        self.assertEqual(
+            statuses,
+            {course_id: certificate_status_for_student(student, course_id) for course_id in course_ids}
+        )
+        self.assertEqual(statuses[course_ids[1]]['status'], CertificateStatuses.auditing)
+        self.assertEqual(statuses[course_ids[2]]['status'], CertificateStatuses.downloadable)
+        self.assertEqual(statuses[course_ids[3]]['status'], CertificateStatuses.unavailable)
+
     @unpack
     @data(
         {'allow_certificate': False, 'whitelisted': False, 'grade': None, 'output': ['N', 'N', 'N/A']},
@@ -2,10 +2,10 @@
 Computes the data to display on the Instructor Dashboard
 """
 from util.json_request import JsonResponse
+from util.query import read_replica
 import json
 
 from courseware import models
-from django.db.models import Count
 from django.utils.translation import ugettext as _
 
 from xmodule.modulestore.django import modulestore
@@ -18,6 +18,31 @@ from opaque_keys.edx.locations import Location
 MAX_SCREEN_LIST_LENGTH = 250
 
 
+def _problem_grade_counts(course_id, problem_set=None):
+    """
+    Returns the number of students with each grade on the problems of the course, as dicts with
+    'module_state_key', 'grade', 'max_grade' and 'count'.
+
+    The counts are read from the ProblemGradeCount counters of the course, or aggregated from
+    its student modules if it isn't counted yet.
+
+    `course_id` the course ID for the course interested in
+
+    `problem_set` an optional array of UsageKeys restricting the counts to these problems
+    """
+    if models.ProblemGradeCount.is_counted(course_id):
+        db_query = models.ProblemGradeCount.objects.filter(
+            course_id=course_id,
+            count__gt=0,
+        ).values('module_state_key', 'grade', 'max_grade', 'count')
+    else:
+        db_query = models.ProblemGradeCount.aggregate(course_id)
+    if problem_set is not None:
+        db_query = db_query.filter(module_state_key__in=problem_set)
+    return db_query
+
+
+@read_replica
 def get_problem_grade_distribution(course_id):
     """
     Returns the grade distribution per problem for the course
@@ -32,12 +57,7 @@ def get_problem_grade_distribution(course_id):
         attempting the problem
     """
 
-    # Aggregate query on studentmodule table for grade data for all problems in course
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
-    ).values('module_state_key', 'grade', 'max_grade').annotate(count_grade=Count('grade'))
+    db_query = _problem_grade_counts(course_id)
 
     prob_grade_distrib = {}
     total_student_count = {}
@@ -48,7 +68,7 @@ def get_problem_grade_distribution(course_id):
 
         # Build set of grade distributions for each problem that has student responses
         if curr_problem in prob_grade_distrib:
-            prob_grade_distrib[curr_problem]['grade_distrib'].append((row['grade'], row['count_grade']))
+            prob_grade_distrib[curr_problem]['grade_distrib'].append((row['grade'], row['count']))
 
             if (prob_grade_distrib[curr_problem]['max_grade'] != row['max_grade']) and \
                     (prob_grade_distrib[curr_problem]['max_grade'] < row['max_grade']):
@@ -57,15 +77,16 @@ def get_problem_grade_distribution(course_id):
         else:
             prob_grade_distrib[curr_problem] = {
                 'max_grade': row['max_grade'],
-                'grade_distrib': [(row['grade'], row['count_grade'])]
+                'grade_distrib': [(row['grade'], row['count'])]
             }
 
         # Build set of total students attempting each problem
-        total_student_count[curr_problem] = total_student_count.get(curr_problem, 0) + row['count_grade']
+        total_student_count[curr_problem] = total_student_count.get(curr_problem, 0) + row['count']
 
     return prob_grade_distrib, total_student_count
 
 
+@read_replica
 def get_sequential_open_distrib(course_id):
     """
     Returns the number of students that opened each subsection/sequential of the course
@@ -75,21 +96,24 @@ def get_sequential_open_distrib(course_id):
     Outputs a dict mapping the 'module_id' to the number of students that have opened that subsection/sequential.
     """
 
-    # Aggregate query on studentmodule table for "opening a subsection" data
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        module_type__exact="sequential",
-    ).values('module_state_key').annotate(count_sequential=Count('module_state_key'))
+    if models.SequentialOpenCount.is_counted(course_id):
+        db_query = models.SequentialOpenCount.objects.filter(
+            course_id=course_id,
+            count__gt=0,
+        ).values('module_state_key', 'count')
+    else:
+        db_query = models.SequentialOpenCount.aggregate(course_id)
 
     # Build set of "opened" data for each subsection that has "opened" data
     sequential_open_distrib = {}
     for row in db_query:
         row_loc = course_id.make_usage_key_from_deprecated_string(row['module_state_key'])
-        sequential_open_distrib[row_loc] = row['count_sequential']
+        sequential_open_distrib[row_loc] = row['count']
 
     return sequential_open_distrib
 
 
+@read_replica
 def get_problem_set_grade_distrib(course_id, problem_set):
     """
     Returns the grade distribution for the problems specified in `problem_set`.
@@ -105,17 +129,7 @@ def get_problem_set_grade_distrib(course_id, problem_set):
       'grade_distrib' - array of tuples (`grade`,`count`) ordered by `grade`
     """
 
-    # Aggregate query on studentmodule table for grade data for set of problems in course
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
-        module_state_key__in=problem_set,
-    ).values(
-        'module_state_key',
-        'grade',
-        'max_grade',
-    ).annotate(count_grade=Count('grade')).order_by('module_state_key', 'grade')
+    db_query = _problem_grade_counts(course_id, problem_set).order_by('module_state_key', 'grade')
 
     prob_grade_distrib = {}
 
@@ -129,7 +143,7 @@ def get_problem_set_grade_distrib(course_id, problem_set):
             }
 
         curr_grade_distrib = prob_grade_distrib[row_loc]
-        curr_grade_distrib['grade_distrib'].append((row['grade'], row['count_grade']))
+        curr_grade_distrib['grade_distrib'].append((row['grade'], row['count']))
 
         if curr_grade_distrib['max_grade'] < row['max_grade']:
             curr_grade_distrib['max_grade'] = row['max_grade']
@@ -426,6 +440,7 @@ def get_array_section_has_problem(course_id):
     return b_section_has_problem
 
 
+@read_replica
 def get_students_opened_subsection(request, csv=False):
     """
     Get a list of students that opened a particular subsection.
@@ -478,6 +493,7 @@ def get_students_opened_subsection(request, csv=False):
         return response
 
 
+@read_replica
 def get_students_problem_grades(request, csv=False):
     """
     Get a list of students and grades for a particular problem.
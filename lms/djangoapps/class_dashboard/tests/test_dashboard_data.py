@@ -10,6 +10,7 @@ from mock import patch
 from nose.plugins.attrib import attr
 
 from capa.tests.response_xml_factory import StringResponseXMLFactory
+from courseware.models import STUDENT_MODULE_COUNTS
 from courseware.tests.factories import StudentModuleFactory
 from student.tests.factories import UserFactory, CourseEnrollmentFactory, AdminFactory
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
@@ -133,6 +134,22 @@ class TestGetProblemGradeDistribution(SharedModuleStoreTestCase):
                 sum_attempts += item[1]
             self.assertEquals(USER_COUNT, sum_attempts)
 
+    def test_counted_distributions(self):
+
+        def get_distributions():
+            """
+            Returns the distributions of the course, with their grades in a stable order.
+            """
+            prob_grade_distrib, total_student_count = get_problem_grade_distribution(self.course.id)
+            for problem_info in prob_grade_distrib.values():
+                problem_info['grade_distrib'].sort()
+            return prob_grade_distrib, total_student_count, get_sequential_open_distrib(self.course.id)
+
+        aggregated = get_distributions()
+        for model in STUDENT_MODULE_COUNTS:
+            model.rebuild(self.course.id)
+        self.assertEquals(aggregated, get_distributions())
+
     def test_get_d3_problem_grade_distrib(self):
 
         d3_data = get_d3_problem_grade_distrib(self.course.id)
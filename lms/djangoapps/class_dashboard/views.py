@@ -11,6 +11,7 @@ from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from courseware.courses import get_course_overview_with_access
 from courseware.access import has_access
 from class_dashboard import dashboard_data
+from util.query import read_replica
 
 
 log = logging.getLogger(__name__)
@@ -25,6 +26,7 @@ def has_instructor_access_for_class(user, course_id):
     return bool(has_access(user, 'staff', course))
 
 
+@read_replica
 def all_sequential_open_distrib(request, course_id):
     """
     Creates a json with the open distribution for all the subsections in the course.
@@ -52,6 +54,7 @@ def all_sequential_open_distrib(request, course_id):
     return HttpResponse(json.dumps(data), content_type="application/json")
 
 
+@read_replica
 def all_problem_grade_distribution(request, course_id):
     """
     Creates a json with the grade distribution for all the problems in the course.
@@ -78,6 +81,7 @@ def all_problem_grade_distribution(request, course_id):
     return HttpResponse(json.dumps(data), content_type="application/json")
 
 
+@read_replica
 def section_problem_grade_distrib(request, course_id, section):
     """
     Creates a json with the grade distribution for the problems in the specified section.
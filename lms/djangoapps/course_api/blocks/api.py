@@ -1,14 +1,27 @@
 """
 API function for retrieving course blocks data
 """
+import json
+from hashlib import md5
+
+from django.core.cache import cache
+from rest_framework.utils.encoders import JSONEncoder
 
 from lms.djangoapps.course_blocks.api import get_course_blocks, COURSE_BLOCK_ACCESS_TRANSFORMERS
+from openedx.core.djangoapps.content.course_structures.models import CourseStructure
+from openedx.core.lib.api.streaming import StreamedDict, StreamedList
 from openedx.core.lib.block_structure.transformers import BlockStructureTransformers
+from xmodule.util.cache_envelope import get_cache_envelope
 
 from .transformers.blocks_api import BlocksAPITransformer
 from .transformers.proctored_exam import ProctoredExamTransformer
 from .serializers import BlockSerializer, BlockDictSerializer
 
+# Number of seconds the serialized blocks are cached for. It bounds the time during which
+# changes which don't publish the course, such as passing start dates and changes of the
+# groups of the user, aren't reflected.
+BLOCKS_CACHE_TIMEOUT = 5 * 60
+
 
 def get_blocks(
         request,
@@ -21,6 +34,7 @@ def get_blocks(
         student_view_data=None,
         return_type='dict',
         block_types_filter=None,
+        stream=False,
 ):
     """
     Return a serialized representation of the course blocks.
@@ -47,6 +61,28 @@ def get_blocks(
             the format for returning the blocks.
         block_types_filter (list): Optional list of block type names used to filter
             the final result of returned blocks.
+        stream (boolean): Whether to serialize each block only when it is read
+            from the returned StreamedDict or StreamedList of blocks, for
+            streaming them with a StreamingJSONResponse.
+    """
+    blocks = _get_transformed_blocks(
+        usage_key, user, depth, nav_depth, block_counts, student_view_data, block_types_filter,
+    )
+    return _serialize_blocks(request, blocks, requested_fields, return_type, stream)
+
+
+def _get_transformed_blocks(
+        usage_key,
+        user,
+        depth,
+        nav_depth,
+        block_counts,
+        student_view_data,
+        block_types_filter,
+):
+    """
+    Return the transformed and filtered block structure of the blocks
+    returned by get_blocks.
     """
     # create ordered list of transformers, adding BlocksAPITransformer at end.
     transformers = BlockStructureTransformers()
@@ -74,13 +110,31 @@ def get_blocks(
         for block_key in block_keys_to_remove:
             blocks.remove_block(block_key, keep_descendants=True)
 
-    # serialize
+    return blocks
+
+
+def _serialize_blocks(request, blocks, requested_fields, return_type, stream=False):
+    """
+    Return the serialized blocks of the given block structure, as returned
+    by get_blocks.
+    """
     serializer_context = {
         'request': request,
         'block_structure': blocks,
         'requested_fields': requested_fields or [],
     }
 
+    if stream:
+        serialized_blocks = (
+            (block_key, BlockSerializer(block_key, context=serializer_context).data) for block_key in blocks
+        )
+        if return_type == 'dict':
+            return {
+                'root': unicode(blocks.root_block_usage_key),
+                'blocks': StreamedDict((unicode(block_key), data) for block_key, data in serialized_blocks),
+            }
+        return StreamedList(data for __, data in serialized_blocks)
+
     if return_type == 'dict':
         serializer = BlockDictSerializer(blocks, context=serializer_context, many=False)
     else:
@@ -88,3 +142,100 @@ def get_blocks(
 
     # return serialized data
     return serializer.data
+
+
+def get_cached_blocks(
+        request,
+        usage_key,
+        user=None,
+        depth=None,
+        nav_depth=None,
+        requested_fields=None,
+        block_counts=None,
+        student_view_data=None,
+        return_type='dict',
+        block_types_filter=None,
+        etag=None,
+):
+    """
+    Return the serialized blocks returned by get_blocks for the same arguments,
+    along with their ETag, caching them until the course is published again.
+
+    The blocks of each user are cached separately, as they depend on more than
+    the groups of the user, e.g. on the blocks selected from libraries for them.
+
+    Arguments:
+        etag (string): Optional ETag of the blocks already held by the client.
+            If they are still current, the blocks aren't read from the cache
+            and None is returned instead of them.
+
+        See get_blocks for the other arguments.
+
+    Returns:
+        (string, data): The ETag of the blocks, and the serialized blocks or
+            None. The ETag is None if the blocks can't be cached, e.g. when
+            they were built from a stale block structure.
+    """
+    get_blocks_args = (
+        request, usage_key, user, depth, nav_depth, requested_fields, block_counts, student_view_data,
+        return_type, block_types_filter,
+    )
+    version = CourseStructure.get_version(usage_key.course_key)
+    if version is None:
+        return None, get_blocks(*get_blocks_args)
+
+    cache_key = _blocks_cache_key(version, *get_blocks_args)
+    etag_cache_key = u"{}.etag".format(cache_key)
+    if etag is not None and cache.get(etag_cache_key) == etag:
+        return etag, None
+
+    envelope = get_cache_envelope('course_api_blocks')
+    cached = envelope.get(cache, cache_key)
+    if cached is None:
+        blocks = _get_transformed_blocks(
+            usage_key, user, depth, nav_depth, block_counts, student_view_data, block_types_filter,
+        )
+        data = _serialize_blocks(request, blocks, requested_fields, return_type)
+        if blocks.is_stale:
+            # The blocks were built from the block structure of a previous
+            # version of the course, while the current one is collected
+            return None, data
+        cached = (u'"{}"'.format(md5(json.dumps(data, cls=JSONEncoder, sort_keys=True)).hexdigest()), data)
+        # The blocks of large courses are larger than memcached's item size limit, so they are chunked
+        envelope.set(cache, cache_key, cached, BLOCKS_CACHE_TIMEOUT)
+        cache.set(etag_cache_key, cached[0], BLOCKS_CACHE_TIMEOUT)
+    return cached
+
+
+def _blocks_cache_key(
+        version,
+        request,
+        usage_key,
+        user,
+        depth,
+        nav_depth,
+        requested_fields,
+        block_counts,
+        student_view_data,
+        return_type,
+        block_types_filter,
+):
+    """
+    Return the cache key of the serialized blocks of the given version of the course.
+    """
+    arguments = json.dumps([
+        # The serialized blocks contain absolute URLs
+        request.build_absolute_uri('/'),
+        unicode(usage_key),
+        user.id if user is not None else None,
+        depth,
+        nav_depth,
+        sorted(requested_fields or []),
+        sorted(block_counts or []),
+        sorted(student_view_data or []),
+        return_type,
+        sorted(block_types_filter or []),
+    ])
+    return u"course_api.blocks.{}.{}.{}".format(
+        usage_key.course_key, version.isoformat(), md5(arguments).hexdigest()
+    )
@@ -25,6 +25,19 @@ class BlockSerializer(serializers.Serializer):  # pylint: disable=abstract-metho
 
         return value if (value is not None) else default
 
+    def _get_requested_supported_fields(self):
+        """
+        Return the supported fields which were requested. They are only looked
+        up once for all the blocks serialized with the same context, so that the
+        serialization of each block only goes through the requested fields.
+        """
+        if 'requested_supported_fields' not in self.context:
+            self.context['requested_supported_fields'] = [
+                supported_field for supported_field in SUPPORTED_FIELDS
+                if supported_field.requested_field_name in self.context['requested_fields']
+            ]
+        return self.context['requested_supported_fields']
+
     def to_representation(self, block_key):
         """
         Return a serializable representation of the requested block
@@ -52,17 +65,16 @@ class BlockSerializer(serializers.Serializer):  # pylint: disable=abstract-metho
             )
 
         # add additional requested fields that are supported by the various transformers
-        for supported_field in SUPPORTED_FIELDS:
-            if supported_field.requested_field_name in self.context['requested_fields']:
-                field_value = self._get_field(
-                    block_key,
-                    supported_field.transformer,
-                    supported_field.block_field_name,
-                    supported_field.default_value,
-                )
-                if field_value is not None:
-                    # only return fields that have data
-                    data[supported_field.serializer_field_name] = field_value
+        for supported_field in self._get_requested_supported_fields():
+            field_value = self._get_field(
+                block_key,
+                supported_field.transformer,
+                supported_field.block_field_name,
+                supported_field.default_value,
+            )
+            if field_value is not None:
+                # only return fields that have data
+                data[supported_field.serializer_field_name] = field_value
 
         if 'children' in self.context['requested_fields']:
             children = self.context['block_structure'].get_children(block_key)
@@ -2,7 +2,11 @@
 Tests for Blocks Views
 """
 
+import json
+
 from django.core.urlresolvers import reverse
+from django.test.utils import override_settings
+from mock import patch
 from string import join
 from urllib import urlencode
 from urlparse import urlunparse
@@ -14,6 +18,7 @@ from student.tests.factories import AdminFactory, CourseEnrollmentFactory, UserF
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import ToyCourseFactory
 
+from .. import api
 from .helpers import deserialize_usage_key
 
 
@@ -220,6 +225,69 @@ class TestBlocksView(EnableTransformerRegistryMixin, SharedModuleStoreTestCase):
         )
         self.verify_response_with_requested_fields(response)
 
+    def test_etag(self):
+        response = self.verify_response()
+        etag = response['ETag']
+
+        response = self.client.get(self.url, self.query_params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(response.status_code, 304)
+        self.assertEquals(response['ETag'], etag)
+
+        response = self.client.get(self.url, self.query_params, HTTP_IF_NONE_MATCH='"outdated"')
+        self.assertEquals(response.status_code, 200)
+        self.assertEquals(response['ETag'], etag)
+        self.verify_response_block_dict(response)
+
+    def test_stale_blocks_not_cached(self):
+        get_course_blocks = api.get_course_blocks
+
+        def get_stale_course_blocks(*args):
+            """
+            Return the course blocks as if they were built from a stale block structure.
+            """
+            blocks = get_course_blocks(*args)
+            blocks.is_stale = True
+            return blocks
+
+        with patch.object(api, 'get_course_blocks', side_effect=get_stale_course_blocks):
+            response = self.verify_response()
+        self.assertNotIn('ETag', response)
+        self.verify_response_block_dict(response)
+
+        with patch.object(api, 'get_course_blocks', wraps=get_course_blocks) as mock_get_course_blocks:
+            self.assertIn('ETag', self.verify_response())
+        self.assertTrue(mock_get_course_blocks.called)
+
+    @override_settings(CACHE_ENVELOPES={'course_api_blocks': {'chunk_size': 100}})
+    def test_large_blocks_cached(self):
+        response = self.verify_response()
+        with patch.object(api, 'get_course_blocks') as mock_get_course_blocks:
+            cached_response = self.verify_response()
+        self.assertFalse(mock_get_course_blocks.called)
+        self.assertEquals(cached_response['ETag'], response['ETag'])
+        self.assertEquals(cached_response.data, response.data)
+
+    def test_etag_of_requested_fields(self):
+        etag = self.verify_response()['ETag']
+        self.query_params['requested_fields'] = self.requested_fields
+        response = self.client.get(self.url, self.query_params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(response.status_code, 200)
+        self.assertNotEquals(response['ETag'], etag)
+        self.verify_response_with_requested_fields(response)
+
+    def test_stream(self):
+        self.query_params['requested_fields'] = self.requested_fields
+        for return_type in ('dict', 'list'):
+            self.query_params['return_type'] = return_type
+            expected_data = self.verify_response().data
+            response = self.verify_response(params={'stream': '1'})
+            self.query_params.pop('stream')
+            self.assertNotIn('ETag', response)
+            self.assertEquals(json.loads(''.join(response.streaming_content)), expected_data)
+
+    def test_stream_invalid(self):
+        self.verify_response(400, params={'stream': 'yes'})
+
     def test_with_list_field_url(self):
         query = urlencode(self.query_params.items() + [
             ('requested_fields', self.requested_fields[0]),
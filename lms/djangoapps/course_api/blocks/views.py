@@ -3,16 +3,18 @@ CourseBlocks API views
 """
 from django.core.exceptions import ValidationError
 from django.http import Http404
+from rest_framework import status
 from rest_framework.generics import ListAPIView
 from rest_framework.response import Response
 
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
+from openedx.core.lib.api.streaming import StreamingJSONResponse, is_stream_requested
 from openedx.core.lib.api.view_utils import view_auth_classes, DeveloperErrorViewMixin
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
 
-from .api import get_blocks
+from .api import get_blocks, get_cached_blocks
 from .forms import BlockListGetForm
 
 
@@ -92,6 +94,13 @@ class BlocksView(DeveloperErrorViewMixin, ListAPIView):
 
           Example: block_types_filter=vertical,html
 
+        * stream: (boolean) Whether to stream the response, serializing and
+          sending the blocks one at a time instead of all at once, to bound
+          the memory used for large courses. Streamed responses are neither
+          cached nor given an ETag.
+
+          Example: stream=true
+
     **Response Values**
 
         The following fields are returned with a successful response.
@@ -155,6 +164,11 @@ class BlocksView(DeveloperErrorViewMixin, ListAPIView):
             supported.
 
           * lti_url: The block URL for an LTI consumer.
+
+        The response has an ETag header identifying the returned blocks. When it
+        is sent back in the If-None-Match header of a later request, and the
+        blocks haven't changed since, a 304: Not Modified is returned without
+        the blocks.
     """
 
     def list(self, request, usage_key_string):  # pylint: disable=arguments-differ
@@ -174,24 +188,32 @@ class BlocksView(DeveloperErrorViewMixin, ListAPIView):
         if not params.is_valid():
             raise ValidationError(params.errors)
 
+        get_blocks_args = (
+            request,
+            params.cleaned_data['usage_key'],
+            params.cleaned_data['user'],
+            params.cleaned_data['depth'],
+            params.cleaned_data.get('nav_depth'),
+            params.cleaned_data['requested_fields'],
+            params.cleaned_data.get('block_counts', []),
+            params.cleaned_data.get('student_view_data', []),
+            params.cleaned_data['return_type'],
+            params.cleaned_data.get('block_types_filter', None),
+        )
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
         try:
-            return Response(
-                get_blocks(
-                    request,
-                    params.cleaned_data['usage_key'],
-                    params.cleaned_data['user'],
-                    params.cleaned_data['depth'],
-                    params.cleaned_data.get('nav_depth'),
-                    params.cleaned_data['requested_fields'],
-                    params.cleaned_data.get('block_counts', []),
-                    params.cleaned_data.get('student_view_data', []),
-                    params.cleaned_data['return_type'],
-                    params.cleaned_data.get('block_types_filter', None),
-                )
-            )
+            if is_stream_requested(request):
+                return StreamingJSONResponse(get_blocks(*get_blocks_args, stream=True))
+            etag, blocks = get_cached_blocks(*get_blocks_args, etag=if_none_match)
         except ItemNotFoundError as exception:
             raise Http404("Block not found: {}".format(exception.message))
 
+        if etag is None:
+            return Response(blocks)
+        if etag == if_none_match:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+        return Response(blocks, headers={'ETag': etag})
+
 
 @view_auth_classes()
 class BlocksInCourseView(BlocksView):
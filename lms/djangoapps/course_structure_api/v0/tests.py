@@ -3,6 +3,7 @@ Run these tests @ Devstack:
     paver test_system -s lms --fasttest --verbose --test_id=lms/djangoapps/course_structure_api
 """
 # pylint: disable=missing-docstring,invalid-name,maybe-no-member,attribute-defined-outside-init
+import json
 from datetime import datetime
 from mock import patch, Mock
 
@@ -374,6 +375,18 @@ class CourseStructureTests(CourseDetailTestMixin, CourseViewTestsMixin, SharedMo
         self.maxDiff = None
         self.assertDictEqual(response.data, expected)
 
+    def test_get_streamed(self):
+        """
+        The streamed course structure should be the same as the one returned at once.
+        """
+        expected = self.http_get_for_course().data
+        response = self.http_get(
+            reverse(self.view, kwargs={'course_id': self.course_id}) + '?stream=True'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.maxDiff = None
+        self.assertDictEqual(json.loads(''.join(response.streaming_content)), expected)
+
 
 class CourseGradingPolicyTests(CourseDetailTestMixin, CourseViewTestsMixin, SharedModuleStoreTestCase):
     view = 'course_structure_api:v0:grading_policy'
@@ -17,6 +17,7 @@ from course_structure_api.v0 import serializers
 from courseware import courses
 from courseware.access import has_access
 from openedx.core.djangoapps.content.course_structures.api.v0 import api, errors
+from openedx.core.lib.api.streaming import StreamingJSONResponse, is_stream_requested
 from openedx.core.lib.exceptions import CourseNotFoundError
 from student.roles import CourseInstructorRole, CourseStaffRole
 
@@ -249,11 +250,17 @@ class CourseStructure(CourseViewMixin, RetrieveAPIView):
 
           * children: If the block has child blocks, a list of IDs of the child
             blocks in the order they appear in the course.
+
+        Passing stream=true streams the response, serializing and sending the
+        blocks one at a time instead of all at once, to bound the memory used
+        for large courses.
     """
 
     @CourseViewMixin.course_check
     def get(self, request, **kwargs):
         try:
+            if is_stream_requested(request):
+                return StreamingJSONResponse(api.course_structure(self.course_key, stream=True))
             return Response(api.course_structure(self.course_key))
         except errors.CourseStructureNotAvailableError:
             # If we don't have data stored, we will try to regenerate it, so
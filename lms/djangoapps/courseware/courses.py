@@ -32,6 +32,7 @@ from courseware.date_summary import (
 from courseware.model_data import FieldDataCache
 from courseware.module_render import get_module
 from lms.djangoapps.courseware.courseware_access_exception import CoursewareAccessException
+from student.helpers import preload_course_access
 from student.models import CourseEnrollment
 import branding
 
@@ -385,6 +386,7 @@ def get_courses(user, org=None, filter_=None):
         settings.COURSE_CATALOG_VISIBILITY_PERMISSION
     )
 
+    preload_course_access(user, [c.id for c in courses])
     courses = [c for c in courses if has_access(user, permission_name, c)]
 
     return courses
@@ -0,0 +1,37 @@
+""" Command line script to rebuild the counts of student modules shown in the Metrics tab. """
+
+from util.counters import RebuildCountsCommand
+
+from courseware.models import StudentModule, STUDENT_MODULE_COUNTS
+
+
+class Command(RebuildCountsCommand):
+
+    help = """
+    Recomputes the grade distributions of problems and the number of students
+    who opened each subsection from the student modules, starting to count the
+    courses which aren't counted yet and correcting any drift of the counts
+    maintained as student modules change. Meant to be run periodically, e.g.
+    from cron.
+
+    Example:
+
+        Rebuild the counts of all courses:
+
+          $ ... rebuild_student_module_counts
+
+        Rebuild the counts of a single course:
+
+          $ ... rebuild_student_module_counts -c course-v1:edX+DemoX+Demo_Course
+
+    """
+
+    def get_course_ids(self):
+        course_ids = set(StudentModule.objects.values_list('course_id', flat=True).distinct())
+        for model in STUDENT_MODULE_COUNTS:
+            course_ids |= set(model.objects.values_list('course_id', flat=True).distinct())
+        return course_ids
+
+    def rebuild(self, course_id):
+        # Rebuild every model, rather than stopping at the first which drifted
+        return sum(model.rebuild(course_id) for model in STUDENT_MODULE_COUNTS) > 0
@@ -12,21 +12,25 @@ file and check it in at the same time as your model changes. To do that,
 ASSUMPTIONS: modules have unique IDs, even across different module_types
 
 """
+import functools
 import logging
 import itertools
 
 from django.contrib.auth.models import User
 from django.conf import settings
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver, Signal
 
 from model_utils.models import TimeStampedModel
 from student.models import user_by_anonymous_id
 from submissions.models import score_set, score_reset
+from util.counters import CourseCounterMixin
+from util.db import run_after_commit
 import coursewarehistoryextended
 
-from xmodule_django.models import CourseKeyField, LocationKeyField, BlockTypeKeyField
+from xmodule_django.models import CourseKeyField, LocationKeyField, BlockTypeKeyField, UsageKeyField
 
 log = logging.getLogger("edx.courseware")
 
@@ -116,6 +120,20 @@ class StudentModule(models.Model):
     created = models.DateTimeField(auto_now_add=True, db_index=True)
     modified = models.DateTimeField(auto_now=True, db_index=True)
 
+    def __init__(self, *args, **kwargs):
+        super(StudentModule, self).__init__(*args, **kwargs)
+
+        # The keys of the counters this module is counted in by each StudentModuleCount model, or
+        # nothing if it isn't saved yet. Updated whenever the module is saved.
+        self._counted_keys = self._counter_keys() if self.pk is not None else {}
+
+    def _counter_keys(self):
+        """
+        Returns a dict mapping each StudentModuleCount model to the key of the counter it would
+        count this module in, or None if it wouldn't count it.
+        """
+        return {model: model.counter_key(self) for model in STUDENT_MODULE_COUNTS}
+
     @classmethod
     def all_submitted_problems_read_only(cls, course_id):
         """
@@ -149,6 +167,163 @@ class StudentModule(models.Model):
         return unicode(repr(self))
 
 
+class StudentModuleCount(CourseCounterMixin, models.Model):
+    """
+    Abstract base of the counts of student modules in each course, maintained as the modules
+    are saved and deleted so that the Metrics tab of the instructor dashboard doesn't aggregate
+    all the StudentModule rows of a course.
+
+    Each counter of a course is identified by the values of its KEY_FIELDS. A course is counted
+    once its counts have been built by the `rebuild_student_module_counts` management command,
+    which is meant to be run periodically to correct any drift, e.g. from bulk updates which
+    don't send signals. Until then, the changes of its modules aren't counted.
+    """
+    course_id = CourseKeyField(max_length=255)
+    module_state_key = UsageKeyField(max_length=255, db_column='module_id')
+    count = models.IntegerField(default=0)
+
+    class Meta(object):
+        abstract = True
+
+    @classmethod
+    def counter_key(cls, student_module):
+        """
+        Returns the values of KEY_FIELDS identifying the counter of the student module, or None if
+        it isn't counted.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def aggregate(cls, course_id):
+        """
+        Returns the actual counts of the course, aggregated from its student modules, as dicts
+        of the values of KEY_FIELDS and 'count'.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def actual_counts(cls, course_id):
+        return {
+            tuple(row[field] for field in cls.KEY_FIELDS): row['count']
+            for row in cls.aggregate(course_id)
+        }
+
+    @classmethod
+    def rebuild(cls, course_id):
+        """
+        Recomputes the counts of the course from its student modules, and returns whether they had
+        drifted.
+
+        Unlike CourseCounterMixin.rebuild, the counters aren't locked while the student modules of
+        the course are aggregated, which would block grading in large courses. Instead, the counts
+        are read right before the aggregate, and each drifted counter is moved by the difference
+        between the two, keeping the changes counted while the aggregate ran. A change counted
+        between the two reads is counted twice until the next rebuild.
+        """
+        counts = {
+            tuple(row[:-1]): row[-1]
+            for row in cls.objects.filter(course_id=course_id).values_list(*(cls.KEY_FIELDS + (cls.COUNT_FIELD,)))
+        }
+        actual = cls.actual_counts(course_id)
+        drifted = 0
+        for key in set(counts) | set(actual):
+            difference = actual.get(key, 0) - counts.get(key, 0)
+            if difference:
+                cls._increment(course_id, key, difference)
+                drifted += 1
+        cls._clear_is_counted()
+        if drifted:
+            log.info(u"Rebuilt %s of course %s: %d counters had drifted", cls.__name__, course_id, drifted)
+        return bool(drifted)
+
+
+class ProblemGradeCount(StudentModuleCount):
+    """
+    The number of students with each grade on each problem of a course.
+    """
+    KEY_FIELDS = ('module_state_key', 'grade', 'max_grade')
+
+    grade = models.FloatField()
+    max_grade = models.FloatField(null=True, blank=True)
+
+    class Meta(object):
+        app_label = "courseware"
+        unique_together = (('course_id', 'module_state_key', 'grade', 'max_grade'),)
+
+    @classmethod
+    def counter_key(cls, student_module):
+        if student_module.module_type == 'problem' and student_module.grade is not None:
+            return (student_module.module_state_key, student_module.grade, student_module.max_grade)
+        return None
+
+    @classmethod
+    def aggregate(cls, course_id):
+        return StudentModule.objects.filter(
+            course_id=course_id,
+            grade__isnull=False,
+            module_type='problem',
+        ).values(*cls.KEY_FIELDS).order_by().annotate(count=Count('id'))
+
+
+class SequentialOpenCount(StudentModuleCount):
+    """
+    The number of students who opened each subsection of a course.
+    """
+    KEY_FIELDS = ('module_state_key',)
+
+    class Meta(object):
+        app_label = "courseware"
+        unique_together = (('course_id', 'module_state_key'),)
+
+    @classmethod
+    def counter_key(cls, student_module):
+        if student_module.module_type == 'sequential':
+            return (student_module.module_state_key,)
+        return None
+
+    @classmethod
+    def aggregate(cls, course_id):
+        return StudentModule.objects.filter(
+            course_id=course_id,
+            module_type='sequential',
+        ).values(*cls.KEY_FIELDS).order_by().annotate(count=Count('id'))
+
+
+STUDENT_MODULE_COUNTS = (ProblemGradeCount, SequentialOpenCount)
+
+
+@receiver(post_save, sender=StudentModule)
+def update_student_module_counts(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Moves the student module to its new counters when it is created or its grade changes.
+
+    The counters are updated once the module is committed, so that the students reaching the
+    same grade on a problem don't hold the lock of its counter for the rest of their requests.
+    """
+    counter_keys = instance._counter_keys()  # pylint: disable=protected-access
+    for model, new_key in counter_keys.iteritems():
+        old_key = instance._counted_keys.get(model)  # pylint: disable=protected-access
+        if new_key == old_key:
+            continue
+        deltas = {}
+        if old_key is not None:
+            deltas[old_key] = -1
+        if new_key is not None:
+            deltas[new_key] = 1
+        run_after_commit(functools.partial(model.add, instance.course_id, deltas))
+    instance._counted_keys = counter_keys  # pylint: disable=protected-access
+
+
+@receiver(post_delete, sender=StudentModule)
+def remove_student_module_counts(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Removes a deleted student module from its counters, once the deletion is committed.
+    """
+    for model, counted_key in instance._counted_keys.iteritems():  # pylint: disable=protected-access
+        if counted_key is not None:
+            run_after_commit(functools.partial(model.add, instance.course_id, {counted_key: -1}))
+
+
 class BaseStudentModuleHistory(models.Model):
     """Abstract class containing most fields used by any class
     storing Student Module History"""
@@ -0,0 +1,151 @@
+"""
+Tests for the counts of student modules maintained as they change.
+"""
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from mock import patch
+from opaque_keys.edx.locator import CourseLocator
+
+from courseware.models import ProblemGradeCount, SequentialOpenCount, StudentModule
+from courseware.tests.factories import StudentModuleFactory
+from request_cache.middleware import RequestCache
+
+
+class StudentModuleCountsTest(TestCase):
+    """
+    Tests for ProblemGradeCount and SequentialOpenCount.
+    """
+    def setUp(self):
+        super(StudentModuleCountsTest, self).setUp()
+        # is_counted() is memoized in the request cache
+        RequestCache.clear_request_cache()
+        self.addCleanup(RequestCache.clear_request_cache)
+        self.course_key = CourseLocator('edX', 'counts', 'course')
+        self.problem_key = self.course_key.make_usage_key('problem', 'problem')
+        self.sequential_key = self.course_key.make_usage_key('sequential', 'sequential')
+
+    def create_problem_module(self, grade):
+        """
+        Creates a student module of the problem with the given grade out of 2.
+        """
+        return StudentModuleFactory.create(
+            course_id=self.course_key, module_state_key=self.problem_key, grade=grade, max_grade=2,
+        )
+
+    def create_sequential_module(self):
+        """
+        Creates a student module of the subsection.
+        """
+        return StudentModuleFactory.create(
+            course_id=self.course_key, module_state_key=self.sequential_key, module_type='sequential',
+        )
+
+    def rebuild(self):
+        """
+        Rebuilds the counts of the course, returning whether they had drifted.
+        """
+        return [model.rebuild(self.course_key) for model in (ProblemGradeCount, SequentialOpenCount)]
+
+    def assert_grade_counts(self, expected):
+        """
+        Asserts the counts of the problem by grade.
+        """
+        counts = ProblemGradeCount.objects.filter(course_id=self.course_key, count__gt=0)
+        self.assertEqual({counter.grade: counter.count for counter in counts}, expected)
+
+    def assert_open_count(self, expected):
+        """
+        Asserts the number of students who opened the subsection.
+        """
+        counter = SequentialOpenCount.objects.get(course_id=self.course_key, module_state_key=self.sequential_key)
+        self.assertEqual(counter.count, expected)
+
+    def test_not_counted(self):
+        self.create_problem_module(1)
+        self.create_sequential_module()
+        self.assertFalse(ProblemGradeCount.is_counted(self.course_key))
+        self.assertFalse(SequentialOpenCount.is_counted(self.course_key))
+
+    def test_not_counted_without_counter_queries(self):
+        module = self.create_problem_module(None)
+        module.grade = 1
+        with CaptureQueriesContext(connection) as queries:
+            module.save()
+        table = ProblemGradeCount._meta.db_table  # pylint: disable=protected-access
+        self.assertEqual([query['sql'] for query in queries if table in query['sql']], [])
+
+    def test_rebuild(self):
+        self.create_problem_module(1)
+        self.create_problem_module(1)
+        self.create_problem_module(None)
+        self.create_sequential_module()
+        self.assertEqual(self.rebuild(), [True, True])
+        self.assert_grade_counts({1: 2})
+        self.assert_open_count(1)
+        self.assertEqual(self.rebuild(), [False, False])
+
+    def test_grade_change(self):
+        module = self.create_problem_module(None)
+        self.create_problem_module(1)
+        self.rebuild()
+
+        module.grade = 1
+        module.save()
+        self.assert_grade_counts({1: 2})
+
+        module = StudentModule.objects.get(id=module.id)
+        module.grade = 2
+        module.save()
+        self.assert_grade_counts({1: 1, 2: 1})
+
+        module.save()
+        self.assert_grade_counts({1: 1, 2: 1})
+
+    def test_create_and_delete(self):
+        self.create_problem_module(1)
+        self.create_sequential_module()
+        self.rebuild()
+
+        sequential_module = self.create_sequential_module()
+        problem_module = self.create_problem_module(2)
+        self.assert_grade_counts({1: 1, 2: 1})
+        self.assert_open_count(2)
+
+        StudentModule.objects.get(id=sequential_module.id).delete()
+        StudentModule.objects.get(id=problem_module.id).delete()
+        self.assert_grade_counts({1: 1})
+        self.assert_open_count(1)
+
+    def test_drift(self):
+        self.create_problem_module(1)
+        self.rebuild()
+        StudentModule.objects.filter(course_id=self.course_key).update(grade=2)
+        self.assert_grade_counts({1: 1})
+        self.assertEqual(self.rebuild(), [True, False])
+        self.assert_grade_counts({2: 1})
+
+    def test_command(self):
+        self.create_problem_module(1)
+        call_command('rebuild_student_module_counts', course_id=unicode(self.course_key))
+        self.assert_grade_counts({1: 1})
+
+    def test_rebuild_keeps_changes_counted_during_aggregate(self):
+        self.create_sequential_module()
+        self.rebuild()
+        # Bulk updates don't send signals
+        SequentialOpenCount.objects.filter(course_id=self.course_key).update(count=5)
+        actual_counts = SequentialOpenCount.actual_counts
+
+        def aggregate_and_open(course_id):
+            """
+            Aggregates the modules of the course, then opens the subsection as a concurrent student would.
+            """
+            counts = actual_counts(course_id)
+            self.create_sequential_module()
+            return counts
+
+        with patch.object(SequentialOpenCount, 'actual_counts', side_effect=aggregate_and_open):
+            self.assertTrue(SequentialOpenCount.rebuild(self.course_key))
+        self.assert_open_count(2)
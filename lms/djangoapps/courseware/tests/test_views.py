@@ -45,6 +45,7 @@ from openedx.core.djangoapps.self_paced.models import SelfPacedConfiguration
 from openedx.core.lib.gating import api as gating_api
 from student.models import CourseEnrollment
 from student.tests.factories import AdminFactory, UserFactory, CourseEnrollmentFactory
+from student.tests.test_preload_course_access import CourseAccessQueriesMixin
 from util.tests.test_date_utils import fake_ugettext, fake_pgettext
 from util.url import reload_django_url_config
 from util.views import ensure_valid_course_key
@@ -1440,3 +1441,29 @@ class TestRenderXBlockSelfPaced(TestRenderXBlock):
 
     def course_options(self):
         return {'self_paced': True}
+
+
+@unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+class CourseCatalogCourseAccessQueriesTest(CourseAccessQueriesMixin, ModuleStoreTestCase):
+    """
+    Tests that the course catalog checks the access of the user to the courses with a fixed
+    number of queries of the enrollments and access roles.
+    """
+    def setUp(self):
+        super(CourseCatalogCourseAccessQueriesTest, self).setUp()
+        self.student = UserFactory.create()
+        self.client.login(username=self.student.username, password='test')
+
+    def create_courses(self, num_courses):
+        """
+        Create num_courses courses, whose overviews the catalog lists, enrolling the student in them.
+        """
+        for __ in range(num_courses):
+            course = CourseFactory.create(emit_signals=True)
+            CourseEnrollmentFactory.create(user=self.student, course_id=course.id)
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_COURSE_DISCOVERY': False})
+    def test_courses(self):
+        self.create_courses(2)
+        self.assert_course_access_queries_constant(reverse('courses'), lambda: self.create_courses(3))
+        self.assertEqual(len(views.get_courses(self.student)), 5)
@@ -2,6 +2,7 @@
 Discussion API internal interface
 """
 from collections import defaultdict
+from functools import partial
 from urllib import urlencode
 from urlparse import urlunparse
 
@@ -24,7 +25,7 @@ from discussion_api.permissions import (
     get_initializable_comment_fields,
     get_initializable_thread_fields,
 )
-from discussion_api.serializers import CommentSerializer, ThreadSerializer, get_context
+from discussion_api.serializers import CommentSerializer, ThreadSerializer, get_cc_requester, get_context
 from django_comment_client.base.views import (
     track_comment_created_event,
     track_thread_created_event,
@@ -40,11 +41,11 @@ from django_comment_common.signals import (
     comment_voted,
     comment_deleted,
 )
-from django_comment_client.utils import get_accessible_discussion_modules, is_commentable_cohorted
+from django_comment_client.utils import get_accessible_discussion_topics, is_commentable_cohorted
 from lms.djangoapps.discussion_api.pagination import DiscussionAPIPagination
 from lms.lib.comment_client.comment import Comment
 from lms.lib.comment_client.thread import Thread
-from lms.lib.comment_client.utils import CommentClientRequestError
+from lms.lib.comment_client.utils import CommentClientRequestError, fan_out
 from openedx.core.djangoapps.course_groups.cohorts import get_cohort_id
 from openedx.core.lib.exceptions import CourseNotFoundError, PageNotFoundError
 
@@ -187,21 +188,21 @@ def get_course_topics(request, course_key):
     A course topic listing dictionary; see discussion_api.views.CourseTopicViews
     for more detail.
     """
-    def get_module_sort_key(module):
+    def get_topic_sort_key(topic):
         """
-        Get the sort key for the module (falling back to the discussion_target
+        Get the sort key for the topic (falling back to the discussion_target
         setting if absent)
         """
-        return module.sort_key or module.discussion_target
+        return topic["sort_key"] or topic["title"]
     course = _get_course(course_key, request.user)
-    discussion_modules = get_accessible_discussion_modules(course, request.user)
-    modules_by_category = defaultdict(list)
-    for module in discussion_modules:
-        modules_by_category[module.discussion_category].append(module)
+    discussion_topics = get_accessible_discussion_topics(course, request.user)
+    topics_by_category = defaultdict(list)
+    for topic in discussion_topics:
+        topics_by_category[topic["category"]].append(topic)
 
-    def get_sorted_modules(category):
-        """Returns key sorted modules by category"""
-        return sorted(modules_by_category[category], key=get_module_sort_key)
+    def get_sorted_topics(category):
+        """Returns key sorted topics by category"""
+        return sorted(topics_by_category[category], key=get_topic_sort_key)
 
     courseware_topics = [
         {
@@ -210,19 +211,19 @@ def get_course_topics(request, course_key):
             "thread_list_url": get_thread_list_url(
                 request,
                 course_key,
-                [item.discussion_id for item in get_sorted_modules(category)]
+                [topic["id"] for topic in get_sorted_topics(category)]
             ),
             "children": [
                 {
-                    "id": module.discussion_id,
-                    "name": module.discussion_target,
-                    "thread_list_url": get_thread_list_url(request, course_key, [module.discussion_id]),
+                    "id": topic["id"],
+                    "name": topic["title"],
+                    "thread_list_url": get_thread_list_url(request, course_key, [topic["id"]]),
                     "children": [],
                 }
-                for module in get_sorted_modules(category)
+                for topic in get_sorted_topics(category)
             ],
         }
-        for category in sorted(modules_by_category.keys())
+        for category in sorted(topics_by_category.keys())
     ]
 
     non_courseware_topics = [
@@ -306,7 +307,7 @@ def get_thread_list(
         })
 
     course = _get_course(course_key, request.user)
-    context = get_context(course, request)
+    context = get_context(course, request, retrieve_cc_requester=False)
 
     query_params = {
         "user_id": unicode(request.user.id),
@@ -332,12 +333,16 @@ def get_thread_list(
             })
 
     if following:
+        context["cc_requester"] = get_cc_requester(course, request.user)
         paginated_results = context["cc_requester"].subscribed_threads(query_params)
     else:
         query_params["course_id"] = unicode(course.id)
         query_params["commentable_ids"] = ",".join(topic_id_list) if topic_id_list else None
         query_params["text"] = text_search
-        paginated_results = Thread.search(query_params)
+        context["cc_requester"], paginated_results = fan_out(
+            partial(get_cc_requester, course, request.user),
+            partial(Thread.search, query_params),
+        )
     # The comments service returns the last page of results if the requested
     # page is beyond the last page, but we want be consistent with DRF's general
     # behavior and return a PageNotFoundError in that case
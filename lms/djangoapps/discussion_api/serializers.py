@@ -30,10 +30,23 @@ from lms.lib.comment_client.utils import CommentClientRequestError
 from openedx.core.djangoapps.course_groups.cohorts import get_cohort_names
 
 
-def get_context(course, request, thread=None):
+def get_cc_requester(course, requester):
+    """
+    Retrieves the comments service user of the requester in the course.
+    """
+    cc_requester = CommentClientUser.from_django_user(requester).retrieve()
+    cc_requester["course_id"] = course.id
+    return cc_requester
+
+
+def get_context(course, request, thread=None, retrieve_cc_requester=True):
     """
     Returns a context appropriate for use with ThreadSerializer or
     (if thread is provided) CommentSerializer.
+
+    If retrieve_cc_requester is False, the "cc_requester" of the context is
+    left for the caller to set with get_cc_requester, e.g. to retrieve it
+    concurrently with other comments service requests.
     """
     # TODO: cache staff_user_ids and ta_user_ids if we need to improve perf
     staff_user_ids = {
@@ -50,8 +63,7 @@ def get_context(course, request, thread=None):
         for user in role.users.all()
     }
     requester = request.user
-    cc_requester = CommentClientUser.from_django_user(requester).retrieve()
-    cc_requester["course_id"] = course.id
+    cc_requester = get_cc_requester(course, requester) if retrieve_cc_requester else None
     return {
         "course": course,
         "request": request,
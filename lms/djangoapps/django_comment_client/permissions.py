@@ -5,7 +5,7 @@ Module for checking permissions with the comment_client backend
 import logging
 from types import NoneType
 
-from request_cache.middleware import RequestCache
+from request_cache import request_cached
 from lms.lib.comment_client import Thread
 from opaque_keys.edx.keys import CourseKey
 
@@ -15,36 +15,34 @@ from lms.djangoapps.teams.models import CourseTeam
 
 def has_permission(user, permission, course_id=None):
     assert isinstance(course_id, (NoneType, CourseKey))
-    request_cache_dict = RequestCache.get_request_cache().data
-    cache_key = "django_comment_client.permissions.has_permission.all_permissions.{}.{}".format(
-        user.id, course_id
-    )
-    if cache_key in request_cache_dict:
-        all_permissions = request_cache_dict[cache_key]
-    else:
-        all_permissions = all_permissions_for_user_in_course(user, course_id)
-        request_cache_dict[cache_key] = all_permissions
+    return permission in _all_permissions_for_user_in_course(user, course_id)
 
-    return permission in all_permissions
+
+@request_cached()
+def _all_permissions_for_user_in_course(user, course_id):
+    """ Returns the permissions of the user in the course, memoized for the request. """
+    return all_permissions_for_user_in_course(user, course_id)
+
+
+@request_cached()
+def _is_team_member_if_applicable(user_id, commentable_id):
+    """
+    Returns whether the commentable_id is not associated with a team, or the user is a member of its team.
+    """
+    team = get_team(commentable_id)
+    return team is None or team.users.filter(id=user_id).exists()
 
 
 CONDITIONS = ['is_open', 'is_author', 'is_question_author', 'is_team_member_if_applicable']
 
 
+@request_cached()
 def get_team(commentable_id):
     """ Returns the team that the commentable_id belongs to if it exists. Returns None otherwise. """
-    request_cache_dict = RequestCache.get_request_cache().data
-    cache_key = "django_comment_client.team_commentable.{}".format(commentable_id)
-    if cache_key in request_cache_dict:
-        return request_cache_dict[cache_key]
-
     try:
-        team = CourseTeam.objects.get(discussion_topic_id=commentable_id)
+        return CourseTeam.objects.get(discussion_topic_id=commentable_id)
     except CourseTeam.DoesNotExist:
-        team = None
-
-    request_cache_dict[cache_key] = team
-    return team
+        return None
 
 
 def _check_condition(user, condition, content):
@@ -84,17 +82,7 @@ def _check_condition(user, condition, content):
         if not content:
             return False
         try:
-            commentable_id = content['commentable_id']
-            request_cache_dict = RequestCache.get_request_cache().data
-            cache_key = "django_comment_client.check_team_member.{}.{}".format(user.id, commentable_id)
-            if cache_key in request_cache_dict:
-                return request_cache_dict[cache_key]
-            team = get_team(commentable_id)
-            if team is None:
-                passes_condition = True
-            else:
-                passes_condition = team.users.filter(id=user.id).exists()
-            request_cache_dict[cache_key] = passes_condition
+            passes_condition = _is_team_member_if_applicable(user.id, content['commentable_id'])
         except KeyError:
             # We do not expect KeyError in production-- it usually indicates an improper test mock.
             logging.warning("Did not find key commentable_id in content.")
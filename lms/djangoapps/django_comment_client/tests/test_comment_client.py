@@ -0,0 +1,150 @@
+"""
+Tests for the HTTP client of the comments service, against a local stub server.
+"""
+import json
+import threading
+import time
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from functools import partial
+
+import requests
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils import translation
+from mock import Mock, patch
+
+from lms.lib.comment_client.utils import SESSION, endpoint, fan_out, perform_request
+
+# Number of seconds the stub server takes to respond
+RESPONSE_DELAY = 0.2
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """
+    Responds to GET requests with the path and the language of the request, keeping the
+    connection alive.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.server.connections += 1
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Respond with the path and the language of the request after a delay.
+        """
+        time.sleep(RESPONSE_DELAY)
+        body = json.dumps({'path': self.path.split('?')[0], 'language': self.headers.getheader('Accept-Language')})
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class StubServer(HTTPServer):
+    """
+    A comments service stub counting the connections it accepts, handling them in threads.
+    """
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), StubRequestHandler)
+        self.connections = 0
+
+    def process_request(self, request, client_address):
+        thread = threading.Thread(target=self.finish_request_and_close, args=(request, client_address))
+        thread.daemon = True
+        thread.start()
+
+    def finish_request_and_close(self, request, client_address):
+        """
+        Handle the requests of the connection until the client closes it.
+        """
+        self.finish_request(request, client_address)
+        self.shutdown_request(request)
+
+
+class CommentClientTest(TestCase):
+    """
+    Tests for perform_request and fan_out.
+    """
+    def setUp(self):
+        super(CommentClientTest, self).setUp()
+        self.server = StubServer()
+        server_thread = threading.Thread(target=self.server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        # Don't reuse the connections to the stub servers of other tests
+        self.addCleanup(SESSION.close)
+        self.url = 'http://127.0.0.1:{}/api/v1'.format(self.server.server_port)
+
+    def get(self, path):
+        """
+        Returns the response of the stub server to a GET request.
+        """
+        return perform_request('get', self.url + path)
+
+    def test_keep_alive(self):
+        self.assertEqual(self.get('/threads/1')['path'], '/api/v1/threads/1')
+        self.assertEqual(self.get('/threads/2')['path'], '/api/v1/threads/2')
+        self.assertEqual(self.server.connections, 1)
+
+    @override_settings(COMMENTS_SERVICE_FAN_OUT_THREADS=4)
+    def test_fan_out(self):
+        start = time.time()
+        with translation.override('eo'):
+            results = fan_out(partial(self.get, '/threads/1'), partial(self.get, '/users/2'))
+        self.assertLess(time.time() - start, 2 * RESPONSE_DELAY)
+        self.assertEqual(
+            results,
+            [{'path': '/api/v1/threads/1', 'language': 'eo'}, {'path': '/api/v1/users/2', 'language': 'eo'}]
+        )
+
+    @override_settings(COMMENTS_SERVICE_FAN_OUT_THREADS=0)
+    def test_fan_out_sequentially(self):
+        start = time.time()
+        results = fan_out(partial(self.get, '/threads/1'), partial(self.get, '/users/2'))
+        self.assertGreaterEqual(time.time() - start, 2 * RESPONSE_DELAY)
+        self.assertEqual([result['path'] for result in results], ['/api/v1/threads/1', '/api/v1/users/2'])
+
+    @override_settings(COMMENTS_SERVICE_FAN_OUT_THREADS=4)
+    def test_fan_out_error(self):
+        with self.assertRaises(ValueError):
+            fan_out(partial(self.get, '/threads/1'), Mock(side_effect=ValueError))
+
+    @override_settings(COMMENTS_SERVICE_MAX_RETRIES=2)
+    @patch('lms.lib.comment_client.utils.SESSION.request', autospec=True)
+    def test_retried_read(self, mock_request):
+        mock_request.side_effect = [
+            requests.exceptions.ConnectionError(),
+            requests.exceptions.ReadTimeout(),
+            Mock(status_code=200, json=Mock(return_value={})),
+        ]
+        self.assertEqual(self.get('/threads/1'), {})
+        self.assertEqual(mock_request.call_count, 3)
+
+    @override_settings(COMMENTS_SERVICE_MAX_RETRIES=2)
+    @patch('lms.lib.comment_client.utils.SESSION.request', autospec=True)
+    def test_retries_exhausted(self, mock_request):
+        mock_request.side_effect = requests.exceptions.ConnectionError()
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.get('/threads/1')
+        self.assertEqual(mock_request.call_count, 3)
+
+    @patch('lms.lib.comment_client.utils.SESSION.request', autospec=True)
+    def test_write_not_retried(self, mock_request):
+        mock_request.side_effect = requests.exceptions.ReadTimeout()
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            perform_request('post', self.url + '/threads/1/comments')
+        self.assertEqual(mock_request.call_count, 1)
+
+    def test_endpoint(self):
+        self.assertEqual(endpoint(self.url + '/threads/5684f8f2c6f18b0b5b000001'), '/api/v1/threads/*')
+        self.assertEqual(
+            endpoint(self.url + '/users/12/subscribed_threads?page=2'), '/api/v1/users/*/subscribed_threads'
+        )
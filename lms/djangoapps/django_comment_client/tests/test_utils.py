@@ -25,7 +25,7 @@ from openedx.core.djangoapps.content.course_structures.models import CourseStruc
 from openedx.core.djangoapps.util.testing import ContentGroupTestCase
 from student.roles import CourseStaffRole
 from xmodule.modulestore import ModuleStoreEnum
-from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory, check_mongo_calls
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase, TEST_DATA_MIXED_TOY_MODULESTORE
 from xmodule.modulestore.django import modulestore
 from opaque_keys.edx.locator import CourseLocator
@@ -923,6 +923,29 @@ class CategoryMapTestCase(CategoryMapTestMixin, ModuleStoreTestCase):
             ["Topic_A", "Topic_B", "Topic_C", "discussion1", "discussion2", "discussion3"]
         )
 
+    def test_topics_cached_per_publish(self):
+        self.create_discussion("Chapter 1", "Discussion 1")
+        self.assertEqual(utils.get_discussion_categories_ids(self.course, self.user), ["discussion1"])
+        with check_mongo_calls(0):
+            utils.get_discussion_category_map(self.course, self.user)
+
+        # Publishing the new discussion changes the version of the course structure
+        self.create_discussion("Chapter 1", "Discussion 2")
+        self.assertItemsEqual(
+            utils.get_discussion_categories_ids(self.course, self.user),
+            ["discussion1", "discussion2"]
+        )
+
+    def test_unstarted_topics_checked(self):
+        self.create_discussion("Chapter 1", "Discussion 1")
+        self.create_discussion("Chapter 1", "Discussion 2", start=datetime.datetime.max.replace(tzinfo=UTC))
+        student = UserFactory.create()
+        self.assertEqual(utils.get_discussion_categories_ids(self.course, student), ["discussion1"])
+        self.assertItemsEqual(
+            utils.get_discussion_categories_ids(self.course, self.instructor),
+            ["discussion1", "discussion2"]
+        )
+
 
 @attr('shard_1')
 class ContentGroupCategoryMapTestCase(CategoryMapTestMixin, ContentGroupTestCase):
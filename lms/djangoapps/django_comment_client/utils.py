@@ -3,6 +3,7 @@ from datetime import datetime
 import json
 import logging
 from django.conf import settings
+from django.core.cache import cache
 
 import pytz
 from django.contrib.auth.models import User
@@ -32,6 +33,10 @@ from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 
 log = logging.getLogger(__name__)
 
+# Seconds the topics of a course are cached for. Their keys include the version of the
+# course structure, so they never need invalidating.
+DISCUSSION_TOPICS_CACHE_TIMEOUT = 24 * 60 * 60
+
 
 def extract(dic, keys):
     """
@@ -137,6 +142,88 @@ def get_accessible_discussion_modules(course, user, include_all=False):  # pylin
     ]
 
 
+def _get_discussion_topic(module):
+    """
+    Return the user-independent data of the discussion module used to list it as a topic.
+    """
+    return {
+        "id": module.discussion_id,
+        "title": module.discussion_target,
+        "sort_key": module.sort_key,
+        "category": module.discussion_category,
+        "category_path": [level.strip() for level in module.discussion_category.split("/")],
+        # Handle case where module.start is None
+        "start_date": module.start if module.start else datetime.max.replace(tzinfo=pytz.UTC),
+        "location": module.location,
+        # Whether access to the module depends on more than its start date
+        "restricted": bool(module.visible_to_staff_only or module.merged_group_access),
+    }
+
+
+def get_discussion_topics(course):
+    """
+    Return the topics of all the valid discussion modules in this course, in
+    the order of get_accessible_discussion_modules. Each topic is a dict with
+    the following keys:
+
+        id: The discussion_id of the module.
+        title: The discussion_target of the module.
+        sort_key: The sort_key of the module.
+        category: The discussion_category of the module.
+        category_path: The stripped levels of the discussion_category.
+        start_date: The start of the module, or datetime.max if it has none.
+        location: The usage key of the module.
+        restricted: Whether the module is hidden from some users regardless
+            of its start date.
+
+    The topics are cached for each version of the course structure, so they
+    are only computed from the modulestore once per course publish.
+    """
+    def collect_topics():
+        """
+        Return the topics of the course's discussion modules, loading them from the modulestore.
+        """
+        return [_get_discussion_topic(module) for module in get_accessible_discussion_modules(course, None, True)]
+
+    version = CourseStructure.get_version(course.id)
+    if version is None:
+        return collect_topics()
+
+    cache_key = u"django_comment_client.discussion_topics.{}.{}".format(course.id, version.isoformat())
+    topics = cache.get(cache_key)
+    if topics is None:
+        topics = collect_topics()
+        cache.set(cache_key, topics, DISCUSSION_TOPICS_CACHE_TIMEOUT)
+    return topics
+
+
+def get_accessible_discussion_topics(course, user, include_all=False):
+    """
+    Return the topics of the valid discussion modules in this course that
+    are accessible to the given user. See get_discussion_topics.
+
+    Only the topics whose modules are restricted (e.g. to some content
+    groups or to staff) or haven't started yet need access checks, so the
+    modules of the other topics aren't loaded from the modulestore.
+    """
+    topics = get_discussion_topics(course)
+    if include_all:
+        return topics
+
+    now = datetime.now(UTC())
+    checked_topics = [topic for topic in topics if topic["restricted"] or topic["start_date"] > now]
+    if not checked_topics:
+        return topics
+
+    inaccessible_locations = set()
+    with modulestore().bulk_operations(course.id):
+        for topic in checked_topics:
+            module = modulestore().get_item(topic["location"])
+            if not has_access(user, 'load', module, course.id):
+                inaccessible_locations.add(topic["location"])
+    return [topic for topic in topics if topic["location"] not in inaccessible_locations]
+
+
 def get_discussion_id_map_entry(module):
     """
     Returns a tuple of (discussion_id, metadata) suitable for inclusion in the results of get_discussion_id_map().
@@ -161,13 +248,10 @@ def get_cached_discussion_key(course, discussion_id):
     map is cached but does not contain discussion_id, returns None. If the discussion id map is not cached for course,
     raises a DiscussionIdMapIsNotCached exception.
     """
-    try:
-        cached_mapping = CourseStructure.objects.get(course_id=course.id).discussion_id_map
-        if not cached_mapping:
-            raise DiscussionIdMapIsNotCached()
-        return cached_mapping.get(discussion_id)
-    except CourseStructure.DoesNotExist:
+    cached_mapping = CourseStructure.get_discussion_id_map(course.id)
+    if not cached_mapping:
         raise DiscussionIdMapIsNotCached()
+    return cached_mapping.get(discussion_id)
 
 
 def get_cached_discussion_id_map(course, discussion_ids, user):
@@ -175,19 +259,19 @@ def get_cached_discussion_id_map(course, discussion_ids, user):
     Returns a dict mapping discussion_ids to respective discussion module metadata if it is cached and visible to the
     user. If not, returns the result of get_discussion_id_map
     """
-    try:
-        entries = []
-        for discussion_id in discussion_ids:
-            key = get_cached_discussion_key(course, discussion_id)
-            if not key:
-                continue
+    cached_mapping = CourseStructure.get_discussion_id_map(course.id)
+    if not cached_mapping:
+        return get_discussion_id_map(course, user)
+
+    keys = set(cached_mapping[discussion_id] for discussion_id in discussion_ids if discussion_id in cached_mapping)
+    entries = []
+    with modulestore().bulk_operations(course.id):
+        for key in keys:
             module = modulestore().get_item(key)
             if not (has_required_keys(module) and has_access(user, 'load', module, course.id)):
                 continue
             entries.append(get_discussion_id_map_entry(module))
-        return dict(entries)
-    except DiscussionIdMapIsNotCached:
-        return get_discussion_id_map(course, user)
+    return dict(entries)
 
 
 def get_discussion_id_map(course, user):
@@ -301,23 +385,16 @@ def get_discussion_category_map(course, user, cohorted_if_in_list=False, exclude
     """
     unexpanded_category_map = defaultdict(list)
 
-    modules = get_accessible_discussion_modules(course, user)
+    topics = get_accessible_discussion_topics(course, user)
 
     course_cohort_settings = get_course_cohort_settings(course.id)
 
-    for module in modules:
-        id = module.discussion_id
-        title = module.discussion_target
-        sort_key = module.sort_key
-        category = " / ".join([x.strip() for x in module.discussion_category.split("/")])
-        # Handle case where module.start is None
-        entry_start_date = module.start if module.start else datetime.max.replace(tzinfo=pytz.UTC)
-        unexpanded_category_map[category].append({"title": title, "id": id, "sort_key": sort_key, "start_date": entry_start_date})
+    for topic in topics:
+        unexpanded_category_map[tuple(topic["category_path"])].append(topic)
 
     category_map = {"entries": defaultdict(dict), "subcategories": defaultdict(dict)}
-    for category_path, entries in unexpanded_category_map.items():
+    for path, entries in unexpanded_category_map.items():
         node = category_map["subcategories"]
-        path = [x.strip() for x in category_path.split("/")]
 
         # Find the earliest start date for the entries in this category
         category_start_date = None
@@ -416,7 +493,7 @@ def get_discussion_categories_ids(course, user, include_all=False):
 
     """
     accessible_discussion_ids = [
-        module.discussion_id for module in get_accessible_discussion_modules(course, user, include_all=include_all)
+        topic["id"] for topic in get_accessible_discussion_topics(course, user, include_all=include_all)
     ]
     return course.top_level_discussion_topic_ids + accessible_discussion_ids
 
@@ -23,6 +23,7 @@ from courseware.models import StudentModule
 from certificates.models import GeneratedCertificate
 from django.db.models import Count
 from certificates.models import CertificateStatuses
+from util.query import read_replica
 
 
 STUDENT_FEATURES = ('id', 'username', 'first_name', 'last_name', 'is_staff', 'email')
@@ -47,6 +48,7 @@ CERTIFICATE_FEATURES = ('course_id', 'mode', 'status', 'grade', 'created_date',
 UNAVAILABLE = "[unavailable]"
 
 
+@read_replica
 def sale_order_record_features(course_id, features):
     """
     Return list of sale orders features as dictionaries.
@@ -118,6 +120,7 @@ def sale_order_record_features(course_id, features):
     return csv_data
 
 
+@read_replica
 def sale_record_features(course_id, features):
     """
     Return list of sales features as dictionaries.
@@ -171,6 +174,7 @@ def sale_record_features(course_id, features):
     return [sale_records_info(sale, features) for sale in sales]
 
 
+@read_replica
 def issued_certificates(course_key, features):
     """
     Return list of issued certificates as dictionaries against the given course key.
@@ -197,6 +201,7 @@ def issued_certificates(course_key, features):
     return generated_certificates
 
 
+@read_replica
 def enrolled_students_features(course_key, features):
     """
     Return list of student features as dictionaries.
@@ -268,6 +273,7 @@ def enrolled_students_features(course_key, features):
     return [extract_student(student, features) for student in students]
 
 
+@read_replica
 def list_may_enroll(course_key, features):
     """
     Return info about students who may enroll in a course as a dict.
@@ -293,6 +299,7 @@ def list_may_enroll(course_key, features):
     return [extract_student(student, features) for student in may_enroll_and_unenrolled]
 
 
+@read_replica
 def get_proctored_exam_results(course_key, features):
     """
     Return info about proctored exam results in a course as a dict.
@@ -313,6 +320,7 @@ def get_proctored_exam_results(course_key, features):
     return [extract_student(exam_attempt, features) for exam_attempt in exam_attempts]
 
 
+@read_replica
 def coupon_codes_features(features, coupons_list, course_id):
     """
     Return list of Coupon Codes as dictionaries.
@@ -366,6 +374,7 @@ def coupon_codes_features(features, coupons_list, course_id):
     return [extract_coupon(coupon, features) for coupon in coupons_list]
 
 
+@read_replica
 def list_problem_responses(course_key, problem_location):
     """
     Return responses to a given problem as a dict.
@@ -401,6 +410,7 @@ def list_problem_responses(course_key, problem_location):
     ]
 
 
+@read_replica
 def course_registration_features(features, registration_codes, csv_type):
     """
     Return list of Course Registration Codes as dictionaries.
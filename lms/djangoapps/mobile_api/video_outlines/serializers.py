@@ -1,6 +1,12 @@
 """
 Serializer for video outline
 """
+from datetime import datetime
+from functools import partial
+
+from django.core.cache import cache
+from opaque_keys.edx.keys import UsageKey
+from pytz import UTC
 from rest_framework.reverse import reverse
 
 from xmodule.modulestore.mongo.base import BLOCK_TYPES_WITH_CHILDREN
@@ -15,6 +21,19 @@ from edxval.api import (
     get_video_info_for_course_and_profiles, ValInternalError
 )
 
+# Number of seconds the video outline skeleton of a course is cached for
+VIDEO_OUTLINE_SKELETON_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def get_course_videos(course_id, video_profiles):
+    """
+    Returns the VAL data of the videos of the course, for the given profiles.
+    """
+    try:
+        return get_video_info_for_course_and_profiles(unicode(course_id), video_profiles)
+    except ValInternalError:  # pragma: nocover
+        return {}
+
 
 class BlockOutline(object):
     """
@@ -26,13 +45,7 @@ class BlockOutline(object):
         self.block_types = block_types
         self.course_id = course_id
         self.request = request  # needed for making full URLS
-        self.local_cache = {}
-        try:
-            self.local_cache['course_videos'] = get_video_info_for_course_and_profiles(
-                unicode(course_id), video_profiles
-            )
-        except ValInternalError:  # pragma: nocover
-            self.local_cache['course_videos'] = {}
+        self.local_cache = {'course_videos': get_course_videos(course_id, video_profiles)}
 
     def __iter__(self):
         def parent_or_requested_block_type(usage_key):
@@ -167,14 +180,63 @@ def video_summary(video_profiles, course_id, video_descriptor, request, local_ca
     """
     returns summary dict for the given video module
     """
-    always_available_data = {
+    return summarize_video(
+        video_profiles, video_metadata(course_id, video_descriptor), local_cache['course_videos'], request
+    )
+
+
+def video_metadata(course_id, video_descriptor):
+    """
+    returns the data of the given video module which its summary is made from,
+    with relative transcript urls, so that it can be shared by all users
+    """
+    metadata = {
         "name": video_descriptor.display_name,
         "category": video_descriptor.category,
         "id": unicode(video_descriptor.scope_ids.usage_id),
         "only_on_web": video_descriptor.only_on_web,
     }
-
     if video_descriptor.only_on_web:
+        return metadata
+
+    # VideoDescriptor fields for video URLs, used when VAL has no encoded video
+    if video_descriptor.html5_sources:
+        fallback_video_url = video_descriptor.html5_sources[0]
+    else:
+        fallback_video_url = video_descriptor.source
+
+    # Transcripts...
+    transcripts_info = video_descriptor.get_transcripts_info()
+    transcript_langs = video_descriptor.available_translations(transcripts_info, verify_assets=False)
+
+    metadata.update({
+        "edx_video_id": video_descriptor.edx_video_id,
+        "fallback_video_url": fallback_video_url,
+        "transcripts": {
+            lang: reverse(
+                'video-transcripts-detail',
+                kwargs={
+                    'course_id': unicode(course_id),
+                    'block_id': video_descriptor.scope_ids.usage_id.block_id,
+                    'lang': lang
+                },
+            )
+            for lang in transcript_langs
+        },
+        "language": video_descriptor.get_default_transcript_language(transcripts_info),
+    })
+    return metadata
+
+
+def summarize_video(video_profiles, metadata, course_videos, request):
+    """
+    returns summary dict for the video with the given metadata
+    """
+    always_available_data = {
+        key: metadata[key] for key in ("name", "category", "id", "only_on_web")
+    }
+
+    if metadata["only_on_web"]:
         ret = {
             "video_url": None,
             "video_thumbnail_url": None,
@@ -187,7 +249,7 @@ def video_summary(video_profiles, course_id, video_descriptor, request, local_ca
         return ret
 
     # Get encoded videos
-    video_data = local_cache['course_videos'].get(video_descriptor.edx_video_id, {})
+    video_data = course_videos.get(metadata["edx_video_id"], {})
 
     # Get highest priority video to populate backwards compatible field
     default_encoded_video = {}
@@ -201,40 +263,133 @@ def video_summary(video_profiles, course_id, video_descriptor, request, local_ca
     if default_encoded_video:
         video_url = default_encoded_video['url']
     # Then fall back to VideoDescriptor fields for video URLs
-    elif video_descriptor.html5_sources:
-        video_url = video_descriptor.html5_sources[0]
     else:
-        video_url = video_descriptor.source
+        video_url = metadata["fallback_video_url"]
 
     # Get duration/size, else default
     duration = video_data.get('duration', None)
     size = default_encoded_video.get('file_size', 0)
 
-    # Transcripts...
-    transcripts_info = video_descriptor.get_transcripts_info()
-    transcript_langs = video_descriptor.available_translations(transcripts_info, verify_assets=False)
-
-    transcripts = {
-        lang: reverse(
-            'video-transcripts-detail',
-            kwargs={
-                'course_id': unicode(course_id),
-                'block_id': video_descriptor.scope_ids.usage_id.block_id,
-                'lang': lang
-            },
-            request=request,
-        )
-        for lang in transcript_langs
-    }
-
     ret = {
         "video_url": video_url,
         "video_thumbnail_url": None,
         "duration": duration,
         "size": size,
-        "transcripts": transcripts,
-        "language": video_descriptor.get_default_transcript_language(transcripts_info),
+        "transcripts": {
+            lang: request.build_absolute_uri(url) for lang, url in metadata["transcripts"].iteritems()
+        },
+        "language": metadata["language"],
         "encoded_videos": video_data.get('profiles')
     }
     ret.update(always_available_data)
     return ret
+
+
+def video_outline(course, request, video_profiles):
+    """
+    Returns the video outline of the course for the user of the request.
+
+    The outline is made from the skeleton of the outline, which is the same for
+    all users and cached until the course is edited, leaving out the videos the
+    user can't load. Only the videos which aren't available to all students are
+    read from the modulestore, to check the access of the user to them. Courses
+    with blocks whose children depend on the user, e.g. content experiments, are
+    outlined for the user by a BlockOutline.
+    """
+    skeleton = get_outline_skeleton(course)
+    if skeleton is None or skeleton['dynamic']:
+        course = modulestore().get_course(course.id, depth=None)
+        return list(BlockOutline(
+            course.id, course, {"video": partial(video_summary, video_profiles)}, request, video_profiles
+        ))
+
+    course_videos = get_course_videos(course.id, video_profiles)
+    now = datetime.now(UTC)
+    return [
+        {
+            "path": video["path"],
+            "named_path": video["named_path"],
+            "unit_url": request.build_absolute_uri(video["unit_url"]),
+            "section_url": request.build_absolute_uri(video["section_url"]),
+            "summary": summarize_video(video_profiles, video["metadata"], course_videos, request),
+        }
+        for video in skeleton['videos']
+        if _can_load_video(request.user, course.id, video, now)
+    ]
+
+
+def _can_load_video(user, course_id, video, now):
+    """
+    Returns whether the user can load the video of the outline skeleton.
+    """
+    if not video["restricted"] and video["start"] is not None and video["start"] <= now:
+        return True
+    descriptor = modulestore().get_item(UsageKey.from_string(video["metadata"]["id"]))
+    return bool(has_access(user, 'load', descriptor, course_key=course_id))
+
+
+def get_outline_skeleton(course):
+    """
+    Returns the cached video outline skeleton of the course, or None if the course
+    has no edit information to tell when it changes.
+    """
+    # check for subtree_edited_on because old XML courses don't have this attribute
+    if course.subtree_edited_on is None:
+        return None
+
+    cache_key = u"mobile_api.video_outlines.skeleton.{}.{}".format(course.id, course.subtree_edited_on.isoformat())
+    skeleton = cache.get(cache_key)
+    if skeleton is None:
+        skeleton = _build_outline_skeleton(course.id)
+        cache.set(cache_key, skeleton, VIDEO_OUTLINE_SKELETON_CACHE_TIMEOUT)
+    return skeleton
+
+
+def _build_outline_skeleton(course_id):
+    """
+    Returns the skeleton of the video outline of the course: its videos in the
+    order of the outline, with their path, relative urls, metadata, and whether
+    they are available to all students once they start. It isn't built for
+    courses with blocks whose children depend on the user, which are marked as
+    dynamic instead.
+    """
+    def parent_or_video_block_type(usage_key):
+        """
+        Returns whether the usage_key's block_type is video or a parent type.
+        """
+        return usage_key.block_type == 'video' or usage_key.block_type in BLOCK_TYPES_WITH_CHILDREN
+
+    with modulestore().bulk_operations(course_id):
+        course = modulestore().get_course(course_id, depth=None)
+        child_to_parent = {}
+        videos = []
+        stack = [course]
+        while stack:
+            curr_block = stack.pop()
+
+            # See BlockOutline for why these blocks are not traversed
+            if curr_block.hide_from_toc:
+                continue
+
+            if curr_block.location.block_type == 'video':
+                block_path = list(path(curr_block, child_to_parent, course))
+                unit_url, section_url = find_urls(course_id, curr_block, child_to_parent, None)
+                videos.append({
+                    "path": block_path,
+                    "named_path": [b["name"] for b in block_path],
+                    "unit_url": unit_url,
+                    "section_url": section_url,
+                    "metadata": video_metadata(course_id, curr_block),
+                    "start": curr_block.start,
+                    "restricted": bool(curr_block.visible_to_staff_only or curr_block.merged_group_access),
+                })
+
+            if curr_block.has_children:
+                if curr_block.has_dynamic_children():
+                    return {"dynamic": True}
+                children = curr_block.get_children(parent_or_video_block_type)
+                for block in reversed(children):
+                    stack.append(block)
+                    child_to_parent[block] = curr_block
+
+    return {"dynamic": False, "videos": videos}
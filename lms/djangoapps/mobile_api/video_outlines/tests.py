@@ -5,9 +5,13 @@ Tests for video outline API
 
 import ddt
 import itertools
+from datetime import datetime, timedelta
 from uuid import uuid4
 from collections import namedtuple
 
+from mock import patch
+from pytz import UTC
+
 from edxval import api
 from mobile_api.models import MobileApiConfig
 from xmodule.modulestore.tests.factories import ItemFactory
@@ -21,6 +25,7 @@ from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort, re
 
 from milestones.tests.utils import MilestonesTestCaseMixin
 
+from . import serializers
 from ..testutils import MobileAPITestCase, MobileAuthTestMixin, MobileCourseAccessTestMixin
 
 
@@ -798,6 +803,47 @@ class TestVideoSummaryList(TestVideoAPITestCase, MobileAuthTestMixin, MobileCour
         course_outline = self.api_response().data
         self.assertEqual(len(course_outline), 0)
 
+    def test_with_unreleased_video(self):
+        self.login_and_enroll()
+        self._create_video_with_subs()
+        ItemFactory.create(
+            parent=self.other_unit,
+            category="video",
+            edx_video_id=self.edx_video_id,
+            display_name=u"unreleased video omega \u03a9",
+            start=datetime.now(UTC) + timedelta(days=1),
+        )
+
+        # student does not see the unreleased video
+        course_outline = self.api_response().data
+        self.assertEqual(len(course_outline), 1)
+
+        # staff user sees all videos
+        self.user.is_staff = True
+        self.user.save()
+        course_outline = self.api_response().data
+        self.assertEqual(len(course_outline), 2)
+        self.assertEqual(course_outline[1]['summary']['name'], u"unreleased video omega \u03a9")
+
+    def test_outline_skeleton_cached(self):
+        self.login_and_enroll()
+        self._create_video_with_subs()
+        build_skeleton = serializers._build_outline_skeleton  # pylint: disable=protected-access
+        with patch.object(serializers, '_build_outline_skeleton', wraps=build_skeleton) as mock_build:
+            self.assertEqual(len(self.api_response().data), 1)
+            self.assertEqual(len(self.api_response().data), 1)
+            self.assertEqual(mock_build.call_count, 1)
+
+            # editing the course rebuilds the skeleton
+            ItemFactory.create(
+                parent=self.other_unit,
+                category="video",
+                edx_video_id=self.edx_video_id,
+                display_name=u"test video omega 2 \u03a9",
+            )
+            self.assertEqual(len(self.api_response().data), 2)
+            self.assertEqual(mock_build.call_count, 2)
+
     def test_language(self):
         self.login_and_enroll()
         video = ItemFactory.create(
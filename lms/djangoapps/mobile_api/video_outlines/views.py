@@ -6,8 +6,6 @@ only displayed at the course level. This is because it makes it a lot easier to
 optimize and reason about, and it avoids having to tackle the bigger problem of
 general XBlock representation in this rather specialized formatting.
 """
-from functools import partial
-
 from django.http import Http404, HttpResponse
 from mobile_api.models import MobileApiConfig
 
@@ -19,7 +17,7 @@ from xmodule.exceptions import NotFoundError
 from xmodule.modulestore.django import modulestore
 
 from ..utils import mobile_view, mobile_course_access
-from .serializers import BlockOutline, video_summary
+from .serializers import video_outline
 
 
 @mobile_view()
@@ -74,19 +72,10 @@ class VideoSummaryList(generics.ListAPIView):
               Management System.
     """
 
-    @mobile_course_access(depth=None)
+    @mobile_course_access()
     def list(self, request, course, *args, **kwargs):
         video_profiles = MobileApiConfig.get_video_profiles()
-        video_outline = list(
-            BlockOutline(
-                course.id,
-                course,
-                {"video": partial(video_summary, video_profiles)},
-                request,
-                video_profiles,
-            )
-        )
-        return Response(video_outline)
+        return Response(video_outline(course, request, video_profiles))
 
 
 @mobile_view()
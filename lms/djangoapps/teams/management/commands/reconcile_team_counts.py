@@ -0,0 +1,70 @@
+""" Management command to correct the team counts of topics and the sizes of teams. """
+
+import logging
+
+from django.db import transaction
+from django.db.models import Count
+
+from lms.djangoapps.teams.models import CourseTeam, CourseTeamMembership, CourseTopicTeamCount
+from util.counters import RebuildCountsCommand
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+
+class Command(RebuildCountsCommand):
+
+    help = """
+    Recomputes the number of teams of each topic and the size of each team,
+    correcting any drift of the counts maintained as teams and memberships
+    change. Meant to be run periodically, e.g. from cron.
+
+    Example:
+
+        Reconcile the counts of all courses:
+
+          $ ... reconcile_team_counts
+
+        Reconcile the counts of a single course:
+
+          $ ... reconcile_team_counts -c course-v1:edX+DemoX+Demo_Course
+
+    """
+
+    def get_course_ids(self):
+        course_ids = set(CourseTeam.objects.values_list('course_id', flat=True).distinct())
+        course_ids |= set(CourseTopicTeamCount.objects.values_list('course_id', flat=True).distinct())
+        return course_ids
+
+    def rebuild(self, course_id):
+        # Reconcile the team sizes too, rather than stopping when the topics drifted
+        return sum([CourseTopicTeamCount.rebuild(course_id), self.reconcile_team_sizes(course_id)]) > 0
+
+    def reconcile_team_sizes(self, course_id):
+        """
+        Resets the size of the teams of the course whose size drifted, and returns whether any did.
+        """
+        drifted = 0
+        teams = CourseTeam.objects.filter(course_id=course_id).annotate(membership_count=Count('membership'))
+        for team in teams:
+            if team.team_size != team.membership_count and self.reset_team_size(team.pk):
+                drifted += 1
+        if drifted:
+            logger.info("Reset the size of %d teams of course %s", drifted, course_id)
+        return bool(drifted)
+
+    def reset_team_size(self, team_pk):
+        """
+        Resets the size of the team to its number of members, and returns whether it had drifted.
+
+        The team is locked before its members are counted, so that a membership change made
+        meanwhile is added to the reset size rather than overwritten by it.
+        """
+        with transaction.atomic():
+            team_size = CourseTeam.objects.select_for_update().filter(pk=team_pk).values_list(
+                'team_size', flat=True
+            ).first()
+            membership_count = CourseTeamMembership.objects.filter(team_id=team_pk).count()
+            if team_size is None or team_size == membership_count:
+                return False
+            CourseTeam.objects.filter(pk=team_pk).update(team_size=membership_count)
+        return True
@@ -2,11 +2,16 @@
 from django.core.management import BaseCommand, CommandError
 from django.core.exceptions import ObjectDoesNotExist
 from django.conf import settings
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
 from optparse import make_option
 from textwrap import dedent
 
 from lms.djangoapps.teams.models import CourseTeam
 
+# Number of course teams read from the database and sent to the search index at a time
+CHUNK_SIZE = 100
+
 
 class Command(BaseCommand):
     """
@@ -16,6 +21,7 @@ class Command(BaseCommand):
 
         ./manage.py reindex_course_team team1 team2 - reindexes course teams with team_ids team1 and team2
         ./manage.py reindex_course_team --all - reindexes all available course teams
+        ./manage.py reindex_course_team --course course-v1:edX+DemoX+Demo - reindexes the course teams of a course
     """
     help = dedent(__doc__)
 
@@ -31,6 +37,14 @@ class Command(BaseCommand):
             default=False,
             help='Reindex all course teams'
         ),
+        make_option(
+            '-c',
+            '--course',
+            metavar='COURSE_ID',
+            dest='course_id',
+            default=None,
+            help='Reindex the course teams of a course'
+        ),
     )
 
     def _get_course_team(self, team_id):
@@ -42,6 +56,16 @@ class Command(BaseCommand):
 
         return result
 
+    def _get_course_team_chunks(self, course_teams):
+        """ Yields the course_teams in lists of up to CHUNK_SIZE objects, reading one list at a time. """
+        last_pk = 0
+        while True:
+            chunk = list(course_teams.filter(pk__gt=last_pk).order_by('pk')[:CHUNK_SIZE])
+            if not chunk:
+                return
+            yield chunk
+            last_pk = chunk[-1].pk
+
     def handle(self, *args, **options):
         """
         By convention set by django developers, this method actually executes command's actions.
@@ -51,16 +75,23 @@ class Command(BaseCommand):
         # happen anywhere else that I can't figure out how to avoid it :(
         from ...search_indexes import CourseTeamIndexer
 
-        if len(args) == 0 and not options.get('all', False):
+        if len(args) == 0 and not options.get('all', False) and not options.get('course_id'):
             raise CommandError(u"reindex_course_team requires one or more arguments: <course_team_id>")
         elif not settings.FEATURES.get('ENABLE_TEAMS', False):
             raise CommandError(u"ENABLE_TEAMS must be enabled to use course team indexing")
 
-        if options.get('all', False):
+        if options.get('all', False) or options.get('course_id'):
             course_teams = CourseTeam.objects.all()
+            if options.get('course_id'):
+                try:
+                    course_key = CourseKey.from_string(options['course_id'])
+                except InvalidKeyError:
+                    raise CommandError(u"Invalid course id: {}".format(options['course_id']))
+                course_teams = course_teams.filter(course_id=course_key)
+            for chunk in self._get_course_team_chunks(course_teams):
+                print "Indexing {count} teams, up to {id}".format(count=len(chunk), id=chunk[-1].team_id)
+                CourseTeamIndexer.index_many(chunk)
         else:
-            course_teams = map(self._get_course_team, args)
-
-        for course_team in course_teams:
-            print "Indexing {id}".format(id=course_team.team_id)
-            CourseTeamIndexer.index(course_team)
+            for course_team in map(self._get_course_team, args):
+                print "Indexing {id}".format(id=course_team.team_id)
+                CourseTeamIndexer.index(course_team)
@@ -0,0 +1,69 @@
+""" Tests for the reconcile_team_counts command """
+from django.core.management import call_command, CommandError
+from mock import patch
+from opaque_keys.edx.keys import CourseKey
+from student.tests.factories import CourseEnrollmentFactory, UserFactory
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
+
+from ....models import CourseTeam, CourseTopicTeamCount
+from ....tests.factories import CourseTeamFactory
+
+COURSE_KEY1 = CourseKey.from_string('edx/history/1')
+COURSE_KEY2 = CourseKey.from_string('edx/history/2')
+
+
+class ReconcileTeamCountsTest(SharedModuleStoreTestCase):
+    """Tests for the reconcile_team_counts command"""
+
+    def setUp(self):
+        """
+        Set up tests.
+        """
+        super(ReconcileTeamCountsTest, self).setUp()
+
+        self.team1 = CourseTeamFactory(course_id=COURSE_KEY1, topic_id='topic1')
+        self.team2 = CourseTeamFactory(course_id=COURSE_KEY2, topic_id='topic1')
+        user = UserFactory.create()
+        CourseEnrollmentFactory.create(user=user, course_id=COURSE_KEY1)
+        self.team1.add_user(user)
+
+        # Bulk updates don't send signals, so the counts drift
+        CourseTeam.objects.update(topic_id='topic2', team_size=0)
+
+    def assert_reconciled(self, course_id, reconciled):
+        """ Assert whether the counts of the course were reconciled. """
+        team_counts = CourseTopicTeamCount.get_team_counts(course_id, ['topic1', 'topic2'])
+        team_sizes = set(CourseTeam.objects.filter(course_id=course_id).values_list('team_size', flat=True))
+        if reconciled:
+            self.assertEqual(team_counts, {'topic1': 0, 'topic2': 1})
+        else:
+            self.assertEqual(team_counts, {'topic1': 1, 'topic2': 0})
+        if course_id == COURSE_KEY1:
+            self.assertEqual(team_sizes, {1 if reconciled else 0})
+
+    def test_reconcile_all_courses(self):
+        call_command('reconcile_team_counts')
+        self.assert_reconciled(COURSE_KEY1, True)
+        self.assert_reconciled(COURSE_KEY2, True)
+
+    def test_reconcile_course(self):
+        call_command('reconcile_team_counts', course_id=unicode(COURSE_KEY1))
+        self.assert_reconciled(COURSE_KEY1, True)
+        self.assert_reconciled(COURSE_KEY2, False)
+
+    def test_counter_created_concurrently(self):
+        CourseTopicTeamCount.objects.filter(course_id=COURSE_KEY1).delete()
+        counter_filter = CourseTopicTeamCount._counter_filter  # pylint: disable=protected-access
+
+        def create_counter(course_id, key):
+            """ Create the counter, as a concurrent team creation would, right before it is created. """
+            CourseTopicTeamCount.objects.create(course_id=course_id, topic_id=key[0], team_count=5)
+            return counter_filter(course_id, key)
+
+        with patch.object(CourseTopicTeamCount, '_counter_filter', side_effect=create_counter):
+            call_command('reconcile_team_counts', course_id=unicode(COURSE_KEY1))
+        self.assert_reconciled(COURSE_KEY1, True)
+
+    def test_invalid_course(self):
+        with self.assertRaisesRegexp(CommandError, "Invalid course id"):
+            call_command('reconcile_team_counts', course_id='invalid')
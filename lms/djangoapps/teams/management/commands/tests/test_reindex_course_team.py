@@ -11,6 +11,7 @@ from ....search_indexes import CourseTeamIndexer
 from search.search_engine_base import SearchEngine
 
 COURSE_KEY1 = CourseKey.from_string('edx/history/1')
+COURSE_KEY2 = CourseKey.from_string('edx/history/2')
 
 
 @ddt.ddt
@@ -62,11 +63,30 @@ class ReindexCourseTeamTest(SharedModuleStoreTestCase):
         mock_index.assert_any_call(self.team2)
         mock_index.reset_mock()
 
-    @patch.object(CourseTeamIndexer, 'index')
-    def test_all_teams(self, mock_index):
+    @patch.object(CourseTeamIndexer, 'index_many')
+    def test_all_teams(self, mock_index_many):
         """ Test that command indexes all teams. """
         call_command('reindex_course_team', all=True)
-        mock_index.assert_any_call(self.team1)
-        mock_index.assert_any_call(self.team2)
-        mock_index.assert_any_call(self.team3)
-        mock_index.reset_mock()
+        mock_index_many.assert_called_once_with([self.team1, self.team2, self.team3])
+
+    @patch('lms.djangoapps.teams.management.commands.reindex_course_team.CHUNK_SIZE', 2)
+    @patch.object(CourseTeamIndexer, 'index_many')
+    def test_all_teams_in_chunks(self, mock_index_many):
+        """ Test that command indexes all teams, a chunk at a time. """
+        call_command('reindex_course_team', all=True)
+        self.assertEqual(
+            mock_index_many.call_args_list,
+            [mock.call([self.team1, self.team2]), mock.call([self.team3])]
+        )
+
+    def test_course_teams(self):
+        """ Test that command indexes the teams of a course. """
+        team4 = CourseTeamFactory(course_id=COURSE_KEY2, team_id='team4')
+        with patch.object(CourseTeamIndexer, 'index_many') as mock_index_many:
+            call_command('reindex_course_team', course_id=unicode(COURSE_KEY2))
+        mock_index_many.assert_called_once_with([team4])
+
+    def test_invalid_course_raises_command_error(self):
+        """ Test that raises CommandError for an invalid course id. """
+        with self.assertRaisesRegexp(CommandError, "Invalid course id"):
+            call_command('reindex_course_team', course_id='invalid')
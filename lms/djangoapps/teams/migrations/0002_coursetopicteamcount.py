@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.db.models import Count
+import xmodule_django.models
+
+
+def count_teams(apps, schema_editor):
+    """Count the existing teams of each topic."""
+    CourseTeam = apps.get_model("teams", "CourseTeam")
+    CourseTopicTeamCount = apps.get_model("teams", "CourseTopicTeamCount")
+
+    team_counts = CourseTeam.objects.exclude(topic_id='').values('course_id', 'topic_id').annotate(
+        team_count=Count('id')
+    )
+    CourseTopicTeamCount.objects.bulk_create(
+        CourseTopicTeamCount(**team_count) for team_count in team_counts
+    )
+
+
+def uncount_teams(apps, schema_editor):
+    """Do nothing, the counts are dropped with their table."""
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseTopicTeamCount',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('course_id', xmodule_django.models.CourseKeyField(max_length=255)),
+                ('topic_id', models.CharField(max_length=255)),
+                ('team_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='coursetopicteamcount',
+            unique_together=set([('course_id', 'topic_id')]),
+        ),
+        migrations.RunPython(count_teams, uncount_teams),
+    ]
@@ -8,6 +8,8 @@ from model_utils import FieldTracker
 from django.core.exceptions import ObjectDoesNotExist
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models import Count, F
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy
 from django_countries.fields import CountryField
@@ -24,6 +26,7 @@ from django_comment_common.signals import (
     comment_endorsed
 )
 from xmodule_django.models import CourseKeyField
+from util.counters import CourseCounterMixin
 from util.model_utils import slugify
 from student.models import LanguageField, CourseEnrollment
 from .errors import AlreadyOnTeamInCourse, NotEnrolledInCourseForTeam, ImmutableMembershipFieldException
@@ -152,6 +155,13 @@ class CourseTeam(models.Model):
         self.team_size = CourseTeamMembership.objects.filter(team=self).count()
         self.save()
 
+    def add_to_team_size(self, delta):
+        """Add delta to team_size in the database, without counting the
+        memberships of the team, and to the team_size of this instance.
+        """
+        CourseTeam.objects.filter(pk=self.pk).update(team_size=F('team_size') + delta)
+        self.team_size += delta
+
 
 class CourseTeamMembership(models.Model):
     """This model represents the membership of a single user in a single team."""
@@ -192,22 +202,22 @@ class CourseTeamMembership(models.Model):
 
     def save(self, *args, **kwargs):
         """Customize save method to set the last_activity_at if it does not
-        currently exist. Also resets the team's size if this model is
+        currently exist. Also increments the team's size if this model is
         being created.
         """
-        should_reset_team_size = False
+        should_increment_team_size = False
         if self.pk is None:
-            should_reset_team_size = True
+            should_increment_team_size = True
         if not self.last_activity_at:
             self.last_activity_at = datetime.utcnow().replace(tzinfo=pytz.utc)
         super(CourseTeamMembership, self).save(*args, **kwargs)
-        if should_reset_team_size:
-            self.team.reset_team_size()
+        if should_increment_team_size:
+            self.team.add_to_team_size(1)
 
     def delete(self, *args, **kwargs):
-        """Recompute the related team's team_size after deleting a membership"""
+        """Decrement the related team's team_size after deleting a membership"""
         super(CourseTeamMembership, self).delete(*args, **kwargs)
-        self.team.reset_team_size()
+        self.team.add_to_team_size(-1)
 
     @classmethod
     def get_memberships(cls, username=None, course_ids=None, team_id=None):
@@ -265,3 +275,71 @@ class CourseTeamMembership(models.Model):
         emit_team_event('edx.team.activity_updated', membership.team.course_id, {
             'team_id': membership.team_id,
         })
+
+
+class CourseTopicTeamCount(CourseCounterMixin, models.Model):
+    """
+    The number of teams of each topic of a course, maintained as teams are
+    created, moved between topics and deleted, so that listing and sorting
+    topics doesn't count the teams of the course.
+
+    The `reconcile_team_counts` management command corrects any drift, e.g.
+    from bulk updates which don't send signals.
+    """
+    KEY_FIELDS = ('topic_id',)
+    COUNT_FIELD = 'team_count'
+    COUNTS_ALL_COURSES = True
+
+    class Meta(object):
+        app_label = "teams"
+        unique_together = (('course_id', 'topic_id'),)
+
+    course_id = CourseKeyField(max_length=255)
+    topic_id = models.CharField(max_length=255)
+    team_count = models.IntegerField(default=0)
+
+    @classmethod
+    def get_team_counts(cls, course_id, topic_ids):
+        """
+        Returns a dict mapping the given topic ids to their number of teams.
+        """
+        counts = dict(
+            cls.objects.filter(course_id=course_id, topic_id__in=topic_ids).values_list('topic_id', 'team_count')
+        )
+        return {topic_id: counts.get(topic_id, 0) for topic_id in topic_ids}
+
+    @classmethod
+    def actual_counts(cls, course_id):
+        return {
+            (topic_id,): team_count
+            for topic_id, team_count in CourseTeam.objects.filter(course_id=course_id).exclude(topic_id='').values(
+                'topic_id'
+            ).annotate(team_count=Count('id')).values_list('topic_id', 'team_count')
+        }
+
+
+@receiver(post_save, sender=CourseTeam, dispatch_uid='teams.models.count_saved_team')
+def count_saved_team(sender, instance, created, **kwargs):  # pylint: disable=unused-argument
+    """
+    Counts new teams, and teams moved to another topic, in the team counts of
+    their topics.
+    """
+    if created:
+        previous_topic_id = ''
+    elif instance.field_tracker.has_changed('topic_id'):
+        previous_topic_id = instance.field_tracker.previous('topic_id')
+    else:
+        return
+    if previous_topic_id:
+        CourseTopicTeamCount.add(instance.course_id, {(previous_topic_id,): -1})
+    if instance.topic_id:
+        CourseTopicTeamCount.add(instance.course_id, {(instance.topic_id,): 1})
+
+
+@receiver(post_delete, sender=CourseTeam, dispatch_uid='teams.models.uncount_deleted_team')
+def uncount_deleted_team(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Removes deleted teams from the team counts of their topics.
+    """
+    if instance.topic_id:
+        CourseTopicTeamCount.add(instance.course_id, {(instance.topic_id,): -1})
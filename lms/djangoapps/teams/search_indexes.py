@@ -4,6 +4,7 @@ import logging
 from elasticsearch.exceptions import ConnectionError
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import translation
@@ -11,10 +12,67 @@ from functools import wraps
 
 from search.search_engine_base import SearchEngine
 from request_cache import get_request_or_stub
+from util.db import run_after_commit
 
 from .errors import ElasticSearchConnectionError
 from lms.djangoapps.teams.models import CourseTeam
-from .serializers import CourseTeamSerializer
+from .serializers import CourseTeamSerializerWithoutMembership
+
+# Number of seconds saves of the teams of a course are coalesced for before they are reindexed
+INDEX_DELAY = 5
+# Number of seconds after which a team is queued again, in case its queued reindexing was lost
+INDEX_PENDING_TIMEOUT = 5 * 60
+
+
+def pending_index_key(team_pk):
+    """
+    Return the cache key marking the team as queued for reindexing.
+    """
+    return u"teams.search_indexes.pending.{}".format(team_pk)
+
+
+def scheduled_index_key(course_id):
+    """
+    Return the cache key marking the reindexing of the teams queued in the course as scheduled.
+    """
+    return u"teams.search_indexes.scheduled.{}".format(course_id)
+
+
+def _index_queue_key(course_id, suffix):
+    """
+    Return the cache key of the queue of the teams of the course to reindex with the given suffix.
+    """
+    return u"teams.search_indexes.queue.{}.{}".format(course_id, suffix)
+
+
+def _push_index_queue(course_id, team_pk):
+    """
+    Queue the team in the teams of the course to reindex.
+
+    The queue is made of a cache entry per team, numbered with an atomic counter of the teams
+    queued, so that concurrent saves don't overwrite each other.
+    """
+    length_key = _index_queue_key(course_id, 'length')
+    cache.add(length_key, 0, None)
+    position = cache.incr(length_key)
+    cache.set(_index_queue_key(course_id, position), team_pk, INDEX_PENDING_TIMEOUT)
+
+
+def drain_index_queue(course_id):
+    """
+    Return the primary keys of the teams queued in the course since the queue was last drained,
+    and let them be queued again.
+    """
+    length = cache.get(_index_queue_key(course_id, 'length'), 0)
+    drained = cache.get(_index_queue_key(course_id, 'drained'), 0)
+    if drained > length:
+        # The counter was evicted and started over
+        drained = 0
+    entry_keys = [_index_queue_key(course_id, position) for position in range(drained + 1, length + 1)]
+    team_pks = cache.get_many(entry_keys).values()
+    cache.set(_index_queue_key(course_id, 'drained'), length, None)
+    cache.delete_many(entry_keys + [pending_index_key(team_pk) for team_pk in team_pks])
+    return team_pks
 
 
 def if_search_enabled(f):
@@ -43,9 +101,9 @@ class CourseTeamIndexer(object):
 
     def data(self):
         """
-        Uses the CourseTeamSerializer to create a serialized course_team object.
+        Uses the CourseTeamSerializerWithoutMembership to create a serialized
+        course_team object, without the membership relation.
         Adds in additional text and pk fields.
-        Removes membership relation.
 
         Returns serialized object with additional search fields.
         """
@@ -56,12 +114,10 @@ class CourseTeamIndexer(object):
             "request": get_request_or_stub()
         }
 
-        serialized_course_team = CourseTeamSerializer(self.course_team, context=context).data
+        serialized_course_team = CourseTeamSerializerWithoutMembership(self.course_team, context=context).data
 
         # Save the primary key so we can load the full objects easily after we search
         serialized_course_team['pk'] = self.course_team.pk
-        # Don't save the membership relations in elasticsearch
-        serialized_course_team.pop('membership', None)
 
         # add generally searchable content
         serialized_course_team['content'] = {
@@ -103,6 +159,42 @@ class CourseTeamIndexer(object):
         serialized_course_team = CourseTeamIndexer(course_team).data()
         search_engine.index(cls.DOCUMENT_TYPE_NAME, [serialized_course_team])
 
+    @classmethod
+    @if_search_enabled
+    def index_many(cls, course_teams):
+        """
+        Update index with course_team objects in a single bulk request (if feature is enabled).
+        """
+        serialized_course_teams = [CourseTeamIndexer(course_team).data() for course_team in course_teams]
+        if serialized_course_teams:
+            cls.engine().index(cls.DOCUMENT_TYPE_NAME, serialized_course_teams)
+
+    @classmethod
+    @if_search_enabled
+    def queue(cls, course_team):
+        """
+        Queue course_team to be reindexed asynchronously (if feature is enabled).
+
+        The team is queued once the current transaction commits, in the teams of its course
+        to reindex. A single task reindexes all the teams of the course queued until it starts
+        in one bulk request, so that the saves of the teams made meanwhile are coalesced.
+        """
+        course_id = unicode(course_team.course_id)
+        run_after_commit(lambda: cls._enqueue(course_id, course_team.pk))
+
+    @classmethod
+    def _enqueue(cls, course_id, team_pk):
+        """
+        Queue the team for reindexing, and schedule the reindexing of the course if needed.
+        """
+        # Imported here, as the task module depends on this one
+        from .tasks import index_course_teams
+        if not cache.add(pending_index_key(team_pk), True, INDEX_PENDING_TIMEOUT):
+            return
+        _push_index_queue(course_id, team_pk)
+        if cache.add(scheduled_index_key(course_id), True, INDEX_PENDING_TIMEOUT):
+            index_course_teams.apply_async(args=[course_id], countdown=INDEX_DELAY)
+
     @classmethod
     @if_search_enabled
     def remove(cls, course_team):
@@ -134,12 +226,9 @@ class CourseTeamIndexer(object):
 @receiver(post_save, sender=CourseTeam, dispatch_uid='teams.signals.course_team_post_save_callback')
 def course_team_post_save_callback(**kwargs):
     """
-    Reindex object after save.
+    Queue object for reindexing after save.
     """
-    try:
-        CourseTeamIndexer.index(kwargs['instance'])
-    except ElasticSearchConnectionError:
-        pass
+    CourseTeamIndexer.queue(kwargs['instance'])
 
 
 @receiver(post_delete, sender=CourseTeam, dispatch_uid='teams.signals.course_team_post_delete_callback')
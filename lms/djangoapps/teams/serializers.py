@@ -1,7 +1,6 @@
 """Defines serializers used by the Team API."""
 from copy import deepcopy
 from django.contrib.auth.models import User
-from django.db.models import Count
 from django.conf import settings
 
 from django_countries import countries
@@ -11,7 +10,7 @@ from openedx.core.lib.api.serializers import CollapsedReferenceSerializer
 from openedx.core.lib.api.fields import ExpandableField
 from openedx.core.djangoapps.user_api.accounts.serializers import UserReadOnlySerializer
 
-from lms.djangoapps.teams.models import CourseTeam, CourseTeamMembership
+from lms.djangoapps.teams.models import CourseTeam, CourseTeamMembership, CourseTopicTeamCount
 
 
 class CountryField(serializers.Field):
@@ -173,8 +172,8 @@ class BaseTopicSerializer(serializers.Serializer):
 class TopicSerializer(BaseTopicSerializer):
     """
     Adds team_count to the basic topic serializer, checking if team_count
-    is already present in the topic data, and if not, querying the CourseTeam
-    model to get the count. Requires that `context` is provided with a valid course_id
+    is already present in the topic data, and if not, querying the
+    CourseTopicTeamCount model to get the count. Requires that `context` is provided with a valid course_id
     in order to filter teams within the course.
     """
     team_count = serializers.SerializerMethodField()
@@ -185,7 +184,7 @@ class TopicSerializer(BaseTopicSerializer):
         if 'team_count' in topic:
             return topic['team_count']
         else:
-            return CourseTeam.objects.filter(course_id=self.context['course_id'], topic_id=topic['id']).count()
+            return CourseTopicTeamCount.get_team_counts(self.context['course_id'], [topic['id']])[topic['id']]
 
 
 class BulkTeamCountTopicListSerializer(serializers.ListSerializer):  # pylint: disable=abstract-method
@@ -212,14 +211,8 @@ class BulkTeamCountTopicSerializer(BaseTopicSerializer):  # pylint: disable=abst
 def add_team_count(topics, course_id):
     """
     Helper method to add team_count for a list of topics.
-    This allows for a more efficient single query.
+    This reads the maintained team counts of the topics in a single query.
     """
-    topic_ids = [topic['id'] for topic in topics]
-    teams_per_topic = CourseTeam.objects.filter(
-        course_id=course_id,
-        topic_id__in=topic_ids
-    ).values('topic_id').annotate(team_count=Count('topic_id'))
-
-    topics_to_team_count = {d['topic_id']: d['team_count'] for d in teams_per_topic}
+    topics_to_team_count = CourseTopicTeamCount.get_team_counts(course_id, [topic['id'] for topic in topics])
     for topic in topics:
-        topic['team_count'] = topics_to_team_count.get(topic['id'], 0)
+        topic['team_count'] = topics_to_team_count[topic['id']]
@@ -0,0 +1,32 @@
+"""
+Asynchronous tasks of the teams app.
+"""
+import logging
+
+from celery.task import task
+from django.core.cache import cache
+
+from lms.djangoapps.teams.models import CourseTeam
+from lms.djangoapps.teams.search_indexes import CourseTeamIndexer, drain_index_queue, scheduled_index_key
+from lms.djangoapps.teams.errors import ElasticSearchConnectionError
+
+log = logging.getLogger('edx.celery.task')
+
+
+@task(name=u'lms.djangoapps.teams.tasks.index_course_teams')
+def index_course_teams(course_id):
+    """
+    Update the search index with the current state of the teams queued in the course, in one
+    bulk request.
+
+    Arguments:
+        course_id (unicode): The id of the course. Teams which were deleted since they were
+            queued are skipped, as they were removed from the index.
+    """
+    # Teams queued from now on schedule another reindexing, since they may not be drained below
+    cache.delete(scheduled_index_key(course_id))
+    team_pks = drain_index_queue(course_id)
+    try:
+        CourseTeamIndexer.index_many(CourseTeam.objects.filter(pk__in=team_pks))
+    except ElasticSearchConnectionError:
+        log.warning(u"Could not index the course teams %s of course %s", team_pks, course_id)
@@ -24,7 +24,7 @@ from opaque_keys.edx.keys import CourseKey
 from student.tests.factories import CourseEnrollmentFactory, UserFactory
 
 from lms.djangoapps.teams.tests.factories import CourseTeamFactory, CourseTeamMembershipFactory
-from lms.djangoapps.teams.models import CourseTeam, CourseTeamMembership
+from lms.djangoapps.teams.models import CourseTeam, CourseTeamMembership, CourseTopicTeamCount
 from lms.djangoapps.teams import TEAM_DISCUSSION_CONTEXT
 from util.testing import EventTestMixin
 
@@ -87,6 +87,14 @@ class TeamMembershipTest(SharedModuleStoreTestCase):
         team = CourseTeam.objects.get(id=self.team1.id)
         self.assertEqual(team.team_size, 3)
 
+    def test_team_size_without_counting(self):
+        """Test that the team size is updated without counting the
+        memberships of the team.
+        """
+        with self.assertNumQueries(1):
+            self.team1.add_to_team_size(1)
+        self.assertEqual(CourseTeam.objects.get(id=self.team1.id).team_size, 3)
+
     @ddt.data(
         (None, None, None, 3),
         ('user1', None, None, 2),
@@ -0,0 +1,79 @@
+"""Tests for the asynchronous indexing of course teams."""
+from django.core.cache import cache
+from django.test.client import RequestFactory
+from mock import patch
+from opaque_keys.edx.keys import CourseKey
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
+
+from lms.djangoapps.teams.search_indexes import CourseTeamIndexer, pending_index_key
+from lms.djangoapps.teams.tasks import index_course_teams
+from lms.djangoapps.teams.tests.factories import CourseTeamFactory
+from util.db import AfterCommitMiddleware
+
+COURSE_KEY1 = CourseKey.from_string('edx/history/1')
+
+
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_TEAMS': True})
+class CourseTeamIndexerTest(SharedModuleStoreTestCase):
+    """Tests for queueing course teams to be indexed."""
+
+    def setUp(self):
+        super(CourseTeamIndexerTest, self).setUp()
+        self.team = CourseTeamFactory(course_id=COURSE_KEY1, team_id='team1')
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    @patch.object(index_course_teams, 'apply_async')
+    def test_saves_coalesced(self, mock_apply_async):
+        self.team.name = 'Renamed once'
+        self.team.save()
+        self.team.name = 'Renamed twice'
+        self.team.save()
+        CourseTeamFactory(course_id=COURSE_KEY1, team_id='team2')
+        mock_apply_async.assert_called_once_with(args=[unicode(COURSE_KEY1)], countdown=5)
+
+    @patch.object(CourseTeamIndexer, 'index_many')
+    def test_teams_of_course_indexed_together(self, mock_index_many):
+        with patch.object(index_course_teams, 'apply_async'):
+            self.team.save()
+            other_team = CourseTeamFactory(course_id=COURSE_KEY1, team_id='team2')
+        index_course_teams(unicode(COURSE_KEY1))
+        self.assertEqual(mock_index_many.call_count, 1)
+        self.assertEqual(set(mock_index_many.call_args[0][0]), {self.team, other_team})
+
+    @patch.object(CourseTeamIndexer, 'index_many')
+    def test_queued_again_once_indexed(self, mock_index_many):
+        self.team.save()
+        self.team.save()
+        self.assertEqual(mock_index_many.call_count, 2)
+        self.assertIsNone(cache.get(pending_index_key(self.team.pk)))
+
+    @patch.object(CourseTeamIndexer, 'index_many')
+    def test_deleted_team_skipped(self, mock_index_many):
+        with patch.object(index_course_teams, 'apply_async'):
+            self.team.save()
+        self.team.delete()
+        index_course_teams(unicode(COURSE_KEY1))
+        self.assertEqual(list(mock_index_many.call_args[0][0]), [])
+
+    @patch.object(index_course_teams, 'apply_async')
+    def test_queued_after_commit(self, mock_apply_async):
+        middleware = AfterCommitMiddleware()
+        request = RequestFactory().get('/')
+        # Tests run in an atomic block, like the views with ATOMIC_REQUESTS
+        middleware.process_request(request)
+        self.team.save()
+        self.assertFalse(mock_apply_async.called)
+        middleware.process_response(request, None)
+        self.assertTrue(mock_apply_async.called)
+
+    @patch.object(index_course_teams, 'apply_async')
+    def test_not_queued_after_rollback(self, mock_apply_async):
+        middleware = AfterCommitMiddleware()
+        request = RequestFactory().get('/')
+        middleware.process_request(request)
+        self.team.save()
+        middleware.process_exception(request, Exception())
+        middleware.process_response(request, None)
+        self.assertFalse(mock_apply_async.called)
+        self.assertIsNone(cache.get(pending_index_key(self.team.pk)))
@@ -61,6 +61,13 @@ DISCUSSION_SETTINGS = {
     'MAX_COMMENT_DEPTH': 2,
 }
 
+# Number of connections to each comments service host kept alive between requests
+COMMENTS_SERVICE_MAX_CONNECTIONS = 10
+# Number of retries of comments service reads after a connection error or a timeout
+COMMENTS_SERVICE_MAX_RETRIES = 2
+# Number of threads making concurrent comments service requests, or 0 to make them one after the other
+COMMENTS_SERVICE_FAN_OUT_THREADS = 4
+
 
 # Features
 FEATURES = {
@@ -426,6 +433,7 @@ STATUS_MESSAGE_PATH = ENV_ROOT / "status_message.json"
 
 DATABASE_ROUTERS = [
     'openedx.core.lib.django_courseware_routers.StudentModuleHistoryExtendedRouter',
+    'util.query.ReadReplicaRouter',
 ]
 
 ############################ OpenID Provider  ##################################
@@ -1075,6 +1083,21 @@ FOOTER_BROWSER_CACHE_MAX_AGE = 5 * 60
 # Credit api notification cache timeout
 CREDIT_NOTIFICATION_CACHE_TIMEOUT = 5 * 60 * 60
 
+# Cache expiration for the per-user parts of the learner dashboard (credit
+# statuses, programs, email opt-outs). They are also invalidated when
+# the underlying data changes, so this only bounds the staleness of the programs.
+# Set to 0 to disable the cache.
+DASHBOARD_SNAPSHOT_CACHE_TIMEOUT = 15 * 60
+
+# Seconds for which ConfigurationModel values are also kept in a process-local cache
+# in front of the 'configuration' cache. Saving any configuration invalidates the local
+# copies in all processes from their next request. Set to 0 to disable the local cache.
+CONFIGURATION_MODEL_LOCAL_CACHE_TIMEOUT = 60
+
+# Log the hit/miss/size statistics of the functions memoized in the request cache
+# for each request, and report them in the X-Request-Cache-Stats response header.
+REQUEST_CACHE_STATS_ENABLED = False
+
 ################################# Deprecation warnings #####################
 
 # Ignore deprecation warnings (so we don't clutter Jenkins builds/production)
@@ -1153,6 +1176,9 @@ MIDDLEWARE_CLASSES = (
 
     'course_wiki.middleware.WikiAccessMiddleware',
 
+    # calls the functions passed to util.db.run_after_commit once the request is committed
+    'util.db.AfterCommitMiddleware',
+
     # This must be last
     'microsite_configuration.middleware.MicrositeSessionCookieDomainMiddleware',
 )
@@ -60,6 +60,9 @@ FEATURES['DISABLE_START_DATES'] = True
 # the one in cms/envs/test.py
 FEATURES['ENABLE_DISCUSSION_SERVICE'] = False
 
+# Make the comments service requests in a predictable order, which the tests check
+COMMENTS_SERVICE_FAN_OUT_THREADS = 0
+
 FEATURES['ENABLE_SERVICE_STATUS'] = True
 
 FEATURES['ENABLE_SHOPPING_CART'] = True
@@ -235,6 +238,12 @@ CACHES = {
     },
 }
 
+# Tests which mock the sources of the learner dashboard expect them to be called on every request
+DASHBOARD_SNAPSHOT_CACHE_TIMEOUT = 0
+
+# The process-local configuration cache would outlive the database rollback between tests
+CONFIGURATION_MODEL_LOCAL_CACHE_TIMEOUT = 0
+
 # Dummy secret key for dev
 SECRET_KEY = '85920908f28904ed733fe576320db18cabd7b6cd'
 
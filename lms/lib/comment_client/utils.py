@@ -1,15 +1,60 @@
 """" Common utilities for comment client wrapper """
 from contextlib import contextmanager
+from cookielib import DefaultCookiePolicy
 import dogstats_wrapper as dog_stats_api
 import logging
+import re
 import requests
 from django.conf import settings
+from multiprocessing.pool import ThreadPool
+from requests.adapters import HTTPAdapter
+from threading import Lock
 from time import time
 from uuid import uuid4
+from django.utils import translation
 from django.utils.translation import get_language
+from request_cache.context import propagate_context
 
 log = logging.getLogger(__name__)
 
+# Requests which can be retried safely after a connection error or a timeout. Other requests are
+# only retried when the connection couldn't be established.
+RETRIED_METHODS = ('get',)
+
+# Path segments of comments service urls which are ids, replaced in the endpoint metric tags
+ID_SEGMENT_RE = re.compile(r'/(?!v\d+(/|$))[^/]*\d[^/]*')
+
+
+class _RejectCookiesPolicy(DefaultCookiePolicy):
+    """
+    A cookie policy rejecting all cookies.
+    """
+    def set_ok(self, cookie, request):
+        return False
+
+
+def create_session():
+    """
+    Returns a session keeping up to settings.COMMENTS_SERVICE_MAX_CONNECTIONS connections to each
+    host of the comments service alive between requests.
+
+    The session is shared by the requests made for all users, so it doesn't keep cookies.
+    """
+    session = requests.Session()
+    session.cookies.set_policy(_RejectCookiesPolicy())
+    max_connections = getattr(settings, 'COMMENTS_SERVICE_MAX_CONNECTIONS', 10)
+    adapter = HTTPAdapter(pool_maxsize=max_connections)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# The session shared by all requests to the comments service, from any thread
+SESSION = create_session()
+
+_FAN_OUT_POOL = None
+_FAN_OUT_POOL_LOCK = Lock()
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -32,9 +77,18 @@ def merge_dict(dic1, dic2):
     return dict(dic1.items() + dic2.items())
 
 
+def endpoint(url):
+    """
+    Returns the path of the url with its ids replaced, identifying its comments service endpoint.
+    """
+    path = url.split('://', 1)[-1].partition('/')[2].partition('?')[0]
+    return ID_SEGMENT_RE.sub('/*', '/' + path)
+
+
 @contextmanager
 def request_timer(request_id, method, url, tags=None):
     start = time()
+    tags = (tags or []) + [u'endpoint:{}'.format(endpoint(url))]
     with dog_stats_api.timer('comment_client.request.time', tags=tags):
         yield
     end = time()
@@ -76,15 +130,27 @@ def perform_request(method, url, data_or_params=None, raw=False,
     else:
         data = None
         params = merge_dict(data_or_params, request_id_dict)
-    with request_timer(request_id, method, url, metric_tags):
-        response = requests.request(
-            method,
-            url,
-            data=data,
-            params=params,
-            headers=headers,
-            timeout=5
-        )
+    max_retries = getattr(settings, 'COMMENTS_SERVICE_MAX_RETRIES', 2)
+    for attempt in xrange(max_retries + 1):
+        try:
+            with request_timer(request_id, method, url, metric_tags + [u'attempt:{}'.format(attempt)]):
+                response = SESSION.request(
+                    method,
+                    url,
+                    data=data,
+                    params=params,
+                    headers=headers,
+                    timeout=5
+                )
+            break
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as error:
+            retriable = method in RETRIED_METHODS or isinstance(error, requests.exceptions.ConnectTimeout)
+            if attempt == max_retries or not retriable:
+                raise
+            log.warning(
+                u"Retrying comments service request %s after %s: %s %s", request_id, error, method, url
+            )
+            dog_stats_api.increment('comment_client.request.retry', tags=metric_tags)
 
     metric_tags.append(u'status_code:{}'.format(response.status_code))
     if response.status_code > 200:
@@ -133,6 +199,57 @@ def perform_request(method, url, data_or_params=None, raw=False,
             return data
 
 
+def _get_fan_out_pool(size):
+    """
+    Returns the pool of threads making concurrent comments service requests, creating it if needed.
+    """
+    global _FAN_OUT_POOL  # pylint: disable=global-statement
+    with _FAN_OUT_POOL_LOCK:
+        if _FAN_OUT_POOL is None:
+            _FAN_OUT_POOL = ThreadPool(size)
+        return _FAN_OUT_POOL
+
+
+def fan_out(*calls):
+    """
+    Makes independent comments service calls concurrently, and returns their results in order.
+    For example:
+
+        cc_user, threads = fan_out(cc_user.retrieve, partial(Thread.search, query_params))
+
+    The calls run in the threads of a pool of settings.COMMENTS_SERVICE_FAN_OUT_THREADS threads,
+    or one after the other in the current thread if it is 0. They run with the language and the
+    context variables (request cache, tracking context) of the caller. They shouldn't access the
+    database, which would open a connection in each thread.
+
+    Raises the error of the first failed call, after all the calls are finished.
+    """
+    size = getattr(settings, 'COMMENTS_SERVICE_FAN_OUT_THREADS', 4)
+    if size == 0 or len(calls) < 2:
+        return [call() for call in calls]
+
+    language = get_language()
+
+    def _call(call):
+        """
+        Makes the call in the language of the caller.
+        """
+        with translation.override(language):
+            return call()
+
+    pending = [_get_fan_out_pool(size).apply_async(propagate_context(_call), (call,)) for call in calls]
+    errors = []
+    results = []
+    for result in pending:
+        try:
+            results.append(result.get())
+        except Exception as error:  # pylint: disable=broad-except
+            errors.append(error)
+    if errors:
+        raise errors[0]
+    return results
+
+
 class CommentClientError(Exception):
     def __init__(self, msg):
         self.message = msg
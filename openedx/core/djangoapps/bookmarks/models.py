@@ -154,6 +154,10 @@ class Bookmark(TimeStampedModel):
         extend it to check which of the paths, the user has access to
         and return its data.
 
+        The display names of the ancestors are read from their XBlockCache
+        rows, in one query, and only the ancestors which aren't cached yet
+        are fetched from the modulestore.
+
         Arguments:
             block (XBlock): The block whose path is required.
 
@@ -170,16 +174,22 @@ class Bookmark(TimeStampedModel):
                 log.error(u'No path to block with usage_key: %s.', usage_key)
                 return []
 
+            ancestor_usage_keys = [
+                ancestor for ancestor in path
+                if ancestor != usage_key and ancestor.block_type != 'course'  # pylint: disable=no-member
+            ]
+            display_names = XBlockCache.get_display_names(ancestor_usage_keys)
+
             path_data = []
-            for ancestor_usage_key in path:
-                if ancestor_usage_key != usage_key and ancestor_usage_key.block_type != 'course':  # pylint: disable=no-member
+            for ancestor_usage_key in ancestor_usage_keys:
+                display_name = display_names.get(unicode(ancestor_usage_key))
+                if display_name is None:
                     try:
                         block = modulestore().get_item(ancestor_usage_key)
                     except ItemNotFoundError:
                         return []  # No valid path can be found.
-                    path_data.append(
-                        PathItem(usage_key=block.location, display_name=block.display_name_with_default)
-                    )
+                    ancestor_usage_key, display_name = block.location, block.display_name_with_default
+                path_data.append(PathItem(usage_key=ancestor_usage_key, display_name=display_name))
 
         return path_data
 
@@ -220,6 +230,26 @@ class XBlockCache(TimeStampedModel):
         """
         self._paths = [prepare_path_for_serialization(path) for path in value] if value else value
 
+    @classmethod
+    def get_display_names(cls, usage_keys):
+        """
+        Return the cached display names of the blocks, in one query.
+
+        Arguments:
+            usage_keys (list of UsageKey): The usage keys of the blocks.
+
+        Returns:
+            Dict mapping the usage ids of the cached blocks to their display names.
+        """
+        if not usage_keys:
+            return {}
+        return {
+            unicode(usage_key): display_name
+            for usage_key, display_name in cls.objects.filter(
+                usage_key__in=usage_keys
+            ).values_list('usage_key', 'display_name')
+        }
+
     @classmethod
     def create(cls, data):
         """
@@ -15,6 +15,7 @@ from . import DEFAULT_FIELDS, api
 log = logging.getLogger(__name__)
 
 CACHE_KEY_TEMPLATE = u"bookmarks.list.{}.{}"
+USAGE_IDS_CACHE_KEY_TEMPLATE = u"bookmarks.usage_ids.{}.{}"
 
 
 class BookmarksService(object):
@@ -27,6 +28,8 @@ class BookmarksService(object):
     get bookmark status during a request (for, example when
     rendering courseware and getting bookmarks status for search
     results) will not cause repeated queries to the database.
+    is_bookmarked() only fetches the usage ids of the bookmarks,
+    as a set, in one query.
     """
 
     def __init__(self, user, **kwargs):
@@ -56,6 +59,33 @@ class BookmarksService(object):
 
         return bookmarks_cache
 
+    def _usage_ids_cache(self, course_key, fetch=False):
+        """
+        Return the set of the usage ids of the user's bookmarks for a particular course.
+
+        Arguments:
+            course_key (CourseKey): course_key of the course whose bookmarked usage ids should be returned.
+            fetch (Bool): if the usage ids should be fetched and cached if they already aren't.
+        """
+        course_key = modulestore().fill_in_run(course_key)
+        if course_key.run is None:
+            return set()
+        cache_key = USAGE_IDS_CACHE_KEY_TEMPLATE.format(self._user.id, course_key)
+
+        usage_ids_cache = RequestCache.get_request_cache().data.get(cache_key, None)
+        if usage_ids_cache is None and fetch is True:
+            bookmarks_cache = self._bookmarks_cache(course_key)
+            if bookmarks_cache is not None:
+                usage_ids_cache = set(bookmark['usage_id'] for bookmark in bookmarks_cache)
+            else:
+                bookmarks = api.get_bookmarks(self._user, course_key=course_key, serialized=False)
+                usage_ids_cache = set(
+                    unicode(usage_key) for usage_key in bookmarks.values_list('usage_key', flat=True)
+                )
+            RequestCache.get_request_cache().data[cache_key] = usage_ids_cache
+
+        return usage_ids_cache
+
     def bookmarks(self, course_key):
         """
         Return a list of bookmarks for the course for the current user.
@@ -78,13 +108,7 @@ class BookmarksService(object):
         Returns:
             Bool
         """
-        usage_id = unicode(usage_key)
-        bookmarks_cache = self._bookmarks_cache(usage_key.course_key, fetch=True)
-        for bookmark in bookmarks_cache:
-            if bookmark['usage_id'] == usage_id:
-                return True
-
-        return False
+        return unicode(usage_key) in self._usage_ids_cache(usage_key.course_key, fetch=True)
 
     def set_bookmarked(self, usage_key):
         """
@@ -106,6 +130,10 @@ class BookmarksService(object):
         if bookmarks_cache is not None:
             bookmarks_cache.append(bookmark)
 
+        usage_ids_cache = self._usage_ids_cache(usage_key.course_key)
+        if usage_ids_cache is not None:
+            usage_ids_cache.add(bookmark['usage_id'])
+
         return True
 
     def unset_bookmarked(self, usage_key):
@@ -135,4 +163,8 @@ class BookmarksService(object):
             if deleted_bookmark_index is not None:
                 bookmarks_cache.pop(deleted_bookmark_index)
 
+        usage_ids_cache = self._usage_ids_cache(usage_key.course_key)
+        if usage_ids_cache is not None:
+            usage_ids_cache.discard(unicode(usage_key))
+
         return True
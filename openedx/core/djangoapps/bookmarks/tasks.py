@@ -2,7 +2,7 @@
 Tasks for bookmarks.
 """
 import logging
-from django.db import transaction
+from django.db import IntegrityError, transaction
 
 from celery.task import task  # pylint: disable=import-error,no-name-in-module
 from opaque_keys.edx.keys import CourseKey
@@ -126,6 +126,26 @@ def _update_xblocks_cache(course_key):
             if block_data:
                 update_block_cache_if_needed(block_cache, block_data)
 
+    if not blocks_data:
+        return
+
+    # Create the missing rows in bulk, unless some of them were created meanwhile, e.g. by bookmarking their blocks.
+    try:
+        with transaction.atomic():
+            log.info(u'Creating %d XBlockCaches for course_key: %s', len(blocks_data), unicode(course_key))
+            XBlockCache.objects.bulk_create([
+                XBlockCache(
+                    usage_key=block_data['usage_key'],
+                    course_key=course_key,
+                    display_name=block_data['display_name'],
+                    paths=_paths_from_data(block_data['paths']),
+                )
+                for block_data in blocks_data.values()
+            ])
+        return
+    except IntegrityError:
+        log.info(u'Some XBlockCaches of course_key: %s already exist, creating them one by one', unicode(course_key))
+
     for block_data in blocks_data.values():
         with transaction.atomic():
             paths = _paths_from_data(block_data['paths'])
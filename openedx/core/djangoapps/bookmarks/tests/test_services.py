@@ -58,6 +58,17 @@ class BookmarksServiceTests(BookmarksTestsBase):
         with self.assertNumQueries(1):
             self.assertFalse(bookmark_service.is_bookmarked(usage_key=self.sequential_1.location))
 
+    def test_is_bookmarked_after_get_bookmarks(self):
+        """
+        Verifies is_bookmarked uses the bookmarks already fetched during the request.
+        """
+        with self.assertNumQueries(1):
+            self.bookmark_service.bookmarks(course_key=self.course.id)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(self.bookmark_service.is_bookmarked(usage_key=self.sequential_1.location))
+            self.assertFalse(self.bookmark_service.is_bookmarked(usage_key=self.vertical_2.location))
+
     def test_set_bookmarked(self):
         """
         Verifies set_bookmarked returns Bool as expected.
@@ -68,7 +79,7 @@ class BookmarksServiceTests(BookmarksTestsBase):
                 self.bookmark_service.set_bookmarked(usage_key=UsageKey.from_string("i4x://ed/ed/ed/interactive"))
             )
 
-        with self.assertNumQueries(9):
+        with self.assertNumQueries(10):
             self.assertTrue(self.bookmark_service.set_bookmarked(usage_key=self.vertical_2.location))
 
     def test_unset_bookmarked(self):
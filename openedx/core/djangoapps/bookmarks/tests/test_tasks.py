@@ -2,6 +2,9 @@
 Tests for tasks.
 """
 import ddt
+import mock
+
+from django.db import IntegrityError
 
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.tests.factories import check_mongo_calls, ItemFactory
@@ -140,8 +143,8 @@ class XBlockCacheTaskTests(BookmarksTestsBase):
                     )
 
     @ddt.data(
-        ('course', 47),
-        ('other_course', 34)
+        ('course', 8),
+        ('other_course', 7)
     )
     @ddt.unpack
     def test_update_xblocks_cache(self, course_attr, expected_sql_queries):
@@ -165,6 +168,22 @@ class XBlockCacheTaskTests(BookmarksTestsBase):
         with self.assertNumQueries(3):
             _update_xblocks_cache(course.id)
 
+    def test_update_xblocks_cache_with_concurrently_created_rows(self):
+        """
+        Test that the xblocks data is persisted one block at a time when the bulk creation conflicts.
+        """
+        with mock.patch.object(XBlockCache.objects, 'bulk_create', side_effect=IntegrityError):
+            _update_xblocks_cache(self.course.id)
+
+        for usage_key, __ in self.course_expected_cache_data.items():
+            xblock_cache = XBlockCache.objects.get(usage_key=usage_key)
+            for path_index, path in enumerate(xblock_cache.paths):
+                for path_item_index, path_item in enumerate(path):
+                    self.assertEqual(
+                        path_item.usage_key,
+                        self.course_expected_cache_data[usage_key][path_index][path_item_index + 1]
+                    )
+
     def test_update_xblocks_cache_with_display_name_none(self):
         """
         Test that the xblocks data is persisted correctly with display_name=None.
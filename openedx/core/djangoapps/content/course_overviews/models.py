@@ -5,6 +5,7 @@ import json
 import logging
 from urlparse import urlunparse
 
+from django.core.cache import cache
 from django.db import models, transaction
 from django.db.models.fields import BooleanField, DateTimeField, DecimalField, TextField, FloatField, IntegerField
 from django.db.utils import IntegrityError
@@ -24,6 +25,7 @@ from xmodule import course_metadata_utils
 from xmodule.course_module import CourseDescriptor, DEFAULT_START_DATE
 from xmodule.error_module import ErrorDescriptor
 from xmodule.modulestore.django import modulestore
+from xmodule.util.cache_fill import get_or_fill
 from xmodule_django.models import CourseKeyField, UsageKeyField
 
 log = logging.getLogger(__name__)
@@ -47,6 +49,10 @@ class CourseOverview(TimeStampedModel):
     # IMPORTANT: Bump this whenever you modify this model and/or add a migration.
     VERSION = 3
 
+    # Number of seconds the overviews loaded by get_from_id are shared in the
+    # cache for, long enough for the transaction saving them to commit.
+    FILLED_CACHE_TIMEOUT = 60
+
     # Cache entry versioning.
     version = IntegerField()
 
@@ -243,7 +249,10 @@ class CourseOverview(TimeStampedModel):
         First, we try to load the CourseOverview from the database. If it
         doesn't exist, we load the entire course from the modulestore, create a
         CourseOverview object from it, and then cache it in the database for
-        future use.
+        future use. Only one worker at a time loads a given course, the others
+        wait for its overview. The overview is saved in the transaction of the
+        loading worker's request, which the others can't see until it commits,
+        so they get the overview from the cache instead.
 
         Arguments:
             course_id (CourseKey): the ID of the course overview to be loaded.
@@ -257,11 +266,52 @@ class CourseOverview(TimeStampedModel):
             - IOError if some other error occurs while trying to load the
                 course from the module store.
         """
+        filled_key = cls._filled_cache_key(course_id)
+
+        def _fill():
+            """
+            Load the overview, and share it with the waiting workers.
+            """
+            course_overview = cls.load_from_module_store(course_id)
+            cache.set(filled_key, course_overview, cls.FILLED_CACHE_TIMEOUT)
+            return course_overview
+
+        return get_or_fill(
+            cache,
+            'course_overview',
+            unicode(course_id),
+            read=lambda: cls._get_from_db(course_id),
+            fill=_fill,
+            read_filled=lambda: cache.get(filled_key),
+        )
+
+    @classmethod
+    def _filled_cache_key(cls, course_id):
+        """
+        Return the cache key of the overview of the course last loaded by get_from_id.
+        """
+        return u"course_overview.filled.{}.{}".format(cls.VERSION, course_id)
+
+    @classmethod
+    def clear_filled_cache(cls, course_id):
+        """
+        Remove the overview of the course last loaded by get_from_id from the
+        cache, e.g. once the course is published.
+        """
+        cache.delete(cls._filled_cache_key(course_id))
+
+    @classmethod
+    def _get_from_db(cls, course_id):
+        """
+        Load the up to date CourseOverview of the course from the database, or
+        return None if there isn't one.
+        """
         try:
             course_overview = cls.objects.select_related('image_set').get(id=course_id)
             if course_overview.version < cls.VERSION:
                 # Throw away old versions of CourseOverview, as they might contain stale data.
                 course_overview.delete()
+                cls.clear_filled_cache(course_id)
                 course_overview = None
         except cls.DoesNotExist:
             course_overview = None
@@ -272,7 +322,7 @@ class CourseOverview(TimeStampedModel):
         if course_overview and not hasattr(course_overview, 'image_set'):
             CourseOverviewImageSet.create_for_course(course_overview)
 
-        return course_overview or cls.load_from_module_store(course_id)
+        return course_overview
 
     def clean_id(self, padding_char='='):
         """
@@ -8,6 +8,8 @@ import itertools
 import math
 import mock
 import pytz
+import threading
+import time
 
 from django.conf import settings
 from django.test.utils import override_settings
@@ -32,6 +34,7 @@ from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, check_mongo_calls, check_mongo_calls_range
+from xmodule.util.cache_fill import DEFAULT_WAIT_TIMEOUT
 
 from .models import CourseOverview, CourseOverviewImageSet, CourseOverviewImageConfig
 
@@ -416,6 +419,40 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
                         for _ in range(2):
                             self.assertIsInstance(CourseOverview.get_from_id(course.id), CourseOverview)
 
+    def test_course_overview_concurrent_load(self):
+        """
+        Tests that a request asking for a CourseOverview while another request
+        loads it gets the loaded overview, even though the overview is saved in
+        the loading request's transaction, which isn't committed yet.
+        """
+        course = CourseFactory.create()
+        load_from_module_store = CourseOverview.load_from_module_store
+        waiters = []
+        waiter_results = []
+
+        def load_while_waited_for(course_id):
+            """
+            Load the overview while a concurrent request waits for it.
+            """
+            waiter = threading.Thread(target=lambda: waiter_results.append(CourseOverview.get_from_id(course_id)))
+            waiters.append(waiter)
+            waiter.start()
+            return load_from_module_store(course_id)
+
+        # Neither request can see the overview saved by the uncommitted transaction
+        with mock.patch.object(CourseOverview, '_get_from_db', return_value=None):
+            with mock.patch.object(
+                CourseOverview, 'load_from_module_store', side_effect=load_while_waited_for
+            ) as mock_load:
+                start = time.time()
+                course_overview = CourseOverview.get_from_id(course.id)
+                waiters[0].join()
+
+        # The waiter neither timed out nor loaded the overview itself
+        self.assertLess(time.time() - start, DEFAULT_WAIT_TIMEOUT)
+        self.assertEqual(mock_load.call_count, 1)
+        self.assertEqual([overview.id for overview in waiter_results], [course_overview.id])
+
     def test_course_overview_version_update(self):
         """
         Test that when we are running in a partially deployed state (where both
@@ -5,9 +5,9 @@ Note: The course list and course detail functionality isn't currently supported
 of the tricky interactions between DRF and the code.
 Most of that information is available by accessing the course objects directly.
 """
-from collections import OrderedDict
+from openedx.core.lib.api.streaming import StreamedDict
 from openedx.core.lib.exceptions import CourseNotFoundError
-from .serializers import GradingPolicySerializer, CourseStructureSerializer
+from .serializers import BlockSerializer, GradingPolicySerializer, CourseStructureSerializer
 from .errors import CourseStructureNotAvailableError
 from openedx.core.djangoapps.content.course_structures import models, tasks
 from util.cache import cache
@@ -32,7 +32,28 @@ def _retrieve_course(course_key):
     return course
 
 
-def course_structure(course_key, block_types=None):
+def _retrieve_structure(course, block_types):
+    """Retrieves the stored structure of the course, restricted to the blocks of the given types.
+
+    Args:
+        course: The course whose structure we'd like to retrieve.
+        block_types: list of required block types, or None for all the blocks.
+    Returns:
+        the structure of the course, or None if it isn't stored
+
+    """
+    if block_types is None:
+        try:
+            return models.CourseStructure.objects.get(course_id=course.id).structure
+        except models.CourseStructure.DoesNotExist:
+            return None
+
+    # Only read the blocks of the requested types
+    blocks = models.CourseStructure.get_blocks(course.id, block_types)
+    return {"root": unicode(course.location), "blocks": blocks} if blocks is not None else None
+
+
+def course_structure(course_key, block_types=None, stream=False):
     """
     Retrieves the entire course structure, including information about all the blocks used in the
     course if `block_types` is None else information about `block_types` will be returned only.
@@ -43,6 +64,9 @@ def course_structure(course_key, block_types=None):
         block_types: list of required block types. Possible values include sequential,
                      vertical, html, problem, video, and discussion. The type can also be
                      the name of a custom type of block used for the course.
+        stream: whether to serialize each block only when it is read from the returned
+                StreamedDict of blocks, for streaming them with a StreamingJSONResponse.
+                Streamed structures aren't cached.
     Returns:
         The serialized output of the course structure:
             * root: The ID of the root node of the course structure.
@@ -72,30 +96,25 @@ def course_structure(course_key, block_types=None):
     """
     course = _retrieve_course(course_key)
 
-    modified_timestamp = models.CourseStructure.objects.filter(course_id=course_key).values('modified')
-    if modified_timestamp.exists():
+    version = models.CourseStructure.get_version(course_key)
+    if version is not None:
         cache_key = 'openedx.content.course_structures.api.v0.api.course_structure.{}.{}.{}'.format(
-            course_key, modified_timestamp[0]['modified'], '_'.join(block_types or [])
+            course_key, version, '_'.join(block_types or [])
         )
-        data = cache.get(cache_key)  # pylint: disable=maybe-no-member
-        if data is not None:
-            return data
-
-        try:
-            requested_course_structure = models.CourseStructure.objects.get(course_id=course.id)
-        except models.CourseStructure.DoesNotExist:
-            pass
-        else:
-            structure = requested_course_structure.structure
-            if block_types is not None:
-                blocks = requested_course_structure.ordered_blocks
-                required_blocks = OrderedDict()
-                for usage_id, block_data in blocks.iteritems():
-                    if block_data['block_type'] in block_types:
-                        required_blocks[usage_id] = block_data
-
-                structure['blocks'] = required_blocks
-
+        if not stream:
+            data = cache.get(cache_key)  # pylint: disable=maybe-no-member
+            if data is not None:
+                return data
+
+        structure = _retrieve_structure(course, block_types)
+        if structure is not None:
+            if stream:
+                return {
+                    'root': structure['root'],
+                    'blocks': StreamedDict(
+                        (key, BlockSerializer(block).data) for key, block in structure['blocks'].iteritems()
+                    ),
+                }
             data = CourseStructureSerializer(structure).data
             cache.set(cache_key, data, None)  # pylint: disable=maybe-no-member
             return data
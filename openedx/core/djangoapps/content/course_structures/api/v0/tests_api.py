@@ -100,7 +100,7 @@ class CourseStructureApiTests(ModuleStoreTestCase):
         Verify that course_structure returns info for entire course.
         """
         with mock.patch(self.MOCK_CACHE, cache.caches['default']):
-            with self.assertNumQueries(3):
+            with self.assertNumQueries(2):
                 structure = course_structure(self.course.id)
 
         expected = {
@@ -111,7 +111,7 @@ class CourseStructureApiTests(ModuleStoreTestCase):
         self.assertDictEqual(structure, expected)
 
         with mock.patch(self.MOCK_CACHE, cache.caches['default']):
-            with self.assertNumQueries(2):
+            with self.assertNumQueries(1):
                 course_structure(self.course.id)
 
     def test_course_structure_with_block_types(self):
@@ -121,7 +121,7 @@ class CourseStructureApiTests(ModuleStoreTestCase):
         block_types = ['html', 'video']
 
         with mock.patch(self.MOCK_CACHE, cache.caches['default']):
-            with self.assertNumQueries(3):
+            with self.assertNumQueries(2):
                 structure = course_structure(self.course.id, block_types=block_types)
 
         expected = {
@@ -132,7 +132,7 @@ class CourseStructureApiTests(ModuleStoreTestCase):
         self.assertDictEqual(structure, expected)
 
         with mock.patch(self.MOCK_CACHE, cache.caches['default']):
-            with self.assertNumQueries(2):
+            with self.assertNumQueries(1):
                 course_structure(self.course.id, block_types=block_types)
 
     def test_course_structure_with_non_existed_block_types(self):
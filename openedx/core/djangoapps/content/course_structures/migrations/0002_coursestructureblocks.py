@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import util.models
+import xmodule_django.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_structures', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseStructureBlocks',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('course_id', xmodule_django.models.CourseKeyField(max_length=255, verbose_name=b'Course ID', db_index=True)),
+                ('block_type', models.CharField(max_length=255)),
+                ('blocks_json', util.models.CompressedTextField(null=True, verbose_name=b'Blocks JSON', blank=True)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='coursestructureblocks',
+            unique_together=set([('course_id', 'block_type')]),
+        ),
+    ]
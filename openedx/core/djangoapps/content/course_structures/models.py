@@ -5,14 +5,31 @@ import json
 import logging
 
 from collections import OrderedDict
+from operator import itemgetter
+
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from model_utils.models import TimeStampedModel
 
+import request_cache
 from util.models import CompressedTextField
 from xmodule_django.models import CourseKeyField, UsageKey
 
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
+VERSION_CACHE_NAME = 'course_structures.version'
+# Seconds decoded discussion id maps are kept in the shared cache. Their keys include the
+# version of the structure, so they never need invalidating.
+DISCUSSION_ID_MAP_CACHE_TIMEOUT = 24 * 60 * 60
+# Number of courses whose decoded discussion id maps are kept in each process
+DISCUSSION_ID_MAP_LOCAL_CACHE_SIZE = 100
+
+# Process-local copies of decoded discussion id maps, mapping course keys to (version, map)
+_discussion_id_maps = {}  # pylint: disable=invalid-name
+
 
 class CourseStructure(TimeStampedModel):
     """
@@ -24,11 +41,8 @@ class CourseStructure(TimeStampedModel):
 
     course_id = CourseKeyField(max_length=255, db_index=True, unique=True, verbose_name='Course ID')
 
-    # Right now the only thing we do with the structure doc is store it and
-    # send it on request. If we need to store a more complex data model later,
-    # we can do so and build a migration. The only problem with a normalized
-    # data model for this is that it will likely involve hundreds of rows, and
-    # we'd have to be careful about caching.
+    # The whole structure, as returned by the course structure API. The blocks are also stored
+    # by type in CourseStructureBlocks, so that subsets of them can be read without decoding it.
     structure_json = CompressedTextField(verbose_name='Structure JSON', blank=True, null=True)
 
     # JSON mapping of discussion ids to usage keys for the corresponding discussion modules
@@ -37,42 +51,158 @@ class CourseStructure(TimeStampedModel):
     @property
     def structure(self):
         """
-        Deserializes a course structure JSON object
+        Deserializes a course structure JSON object. It is decoded once per instance, so it must
+        not be modified.
         """
-        if self.structure_json:
-            return json.loads(self.structure_json)
-        return None
+        return self._memoize('structure', 'structure_json', lambda: json.loads(self.structure_json))
 
     @property
     def ordered_blocks(self):
         """
         Return the blocks in the order with which they're seen in the courseware. Parents are ordered before children.
+        They are computed once per instance, so they must not be modified.
         """
-        if self.structure:
+        def order_blocks():
+            """
+            Return the blocks of the structure in course order, with their parents.
+            """
             ordered_blocks = OrderedDict()
             self._traverse_tree(self.structure['root'], self.structure['blocks'], ordered_blocks)
             return ordered_blocks
+        return self._memoize('ordered_blocks', 'structure_json', order_blocks)
 
     @property
     def discussion_id_map(self):
         """
         Return a mapping of discussion ids to usage keys of the corresponding discussion modules.
+        It is decoded once per instance, so it must not be modified.
         """
-        if self.discussion_id_map_json:
+        def decode():
+            """
+            Return the decoded discussion id map.
+            """
             result = json.loads(self.discussion_id_map_json)
             for discussion_id in result:
                 # Usage key strings might not include the course run, so we add it back in with map_into_course
                 result[discussion_id] = UsageKey.from_string(result[discussion_id]).map_into_course(self.course_id)
             return result
-        return None
+        return self._memoize('discussion_id_map', 'discussion_id_map_json', decode)
+
+    def _memoize(self, name, field_name, decode):
+        """
+        Return the value computed by decode() from the JSON field, or None if the field is empty.
+        The value is memoized on the instance until the field is assigned another value.
+        """
+        raw_value = getattr(self, field_name)
+        if not raw_value:
+            return None
+        memo = self.__dict__.setdefault('_decoded', {})
+        if name not in memo or memo[name][0] is not raw_value:
+            memo[name] = (raw_value, decode())
+        return memo[name][1]
+
+    @classmethod
+    def get_blocks(cls, course_key, block_types):
+        """
+        Return an OrderedDict mapping the usage ids of the blocks of the given types in the course
+        to their data, in the order of ordered_blocks, or None if the structure hasn't been
+        generated. Only the blocks of the given types are read and decoded.
+        """
+        block_type_rows = CourseStructureBlocks.objects.filter(course_id=course_key, block_type__in=block_types)
+        positioned_blocks = []
+        for block_type_row in block_type_rows:
+            positioned_blocks.extend(block_type_row.blocks)
+
+        if not positioned_blocks and not CourseStructureBlocks.objects.filter(course_id=course_key).exists():
+            # The structure was generated before its blocks were stored by type, or not at all
+            try:
+                ordered_blocks = cls.objects.get(course_id=course_key).ordered_blocks
+            except cls.DoesNotExist:
+                return None
+            if ordered_blocks is None:
+                return None
+            return OrderedDict(
+                (usage_id, block) for usage_id, block in ordered_blocks.iteritems()
+                if block['block_type'] in block_types
+            )
+
+        return OrderedDict(
+            (block['usage_key'], block) for __, block in sorted(positioned_blocks, key=itemgetter(0))
+        )
+
+    @classmethod
+    def get_discussion_id_map(cls, course_key):
+        """
+        Return the discussion_id_map of the structure of the course, or None if the structure
+        or its map haven't been generated.
+
+        The decoded map is cached in the process and in the shared cache for each version of
+        the structure, so that looking up discussion ids only costs a query for the version,
+        made once per request.
+        """
+        version = cls.get_version(course_key)
+        if version is None:
+            return None
+
+        entry = _discussion_id_maps.get(course_key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        cache_key = cls._discussion_id_map_cache_key(course_key, version)
+        id_map = cache.get(cache_key)
+        if id_map is None:
+            try:
+                # Skip the structure, which is much larger than the map
+                structure = cls.objects.only('course_id', 'discussion_id_map_json').get(course_id=course_key)
+            except cls.DoesNotExist:
+                return None
+            id_map = structure.discussion_id_map
+            if id_map is None:
+                return None
+            cache.set(cache_key, id_map, DISCUSSION_ID_MAP_CACHE_TIMEOUT)
+
+        if len(_discussion_id_maps) >= DISCUSSION_ID_MAP_LOCAL_CACHE_SIZE:
+            _discussion_id_maps.clear()
+        _discussion_id_maps[course_key] = (version, id_map)
+        return id_map
+
+    @classmethod
+    def get_version(cls, course_key):
+        """
+        Return the version of the structure of the course, or None if there is none. It changes
+        whenever the course is published, so it can key caches of data derived from the course's
+        published content. It is only queried once per request.
+        """
+        if request_cache.get_request() is None:
+            return cls._query_version(course_key)
+        versions = request_cache.get_cache(VERSION_CACHE_NAME)
+        if course_key not in versions:
+            versions[course_key] = cls._query_version(course_key)
+        return versions[course_key]
+
+    @classmethod
+    def _query_version(cls, course_key):
+        """
+        Return the modification time of the structure of the course, which changes whenever
+        the course is published, as its discussion id map is cleared and then regenerated.
+        """
+        return cls.objects.filter(course_id=course_key).values_list('modified', flat=True).first()
+
+    @staticmethod
+    def _discussion_id_map_cache_key(course_key, version):
+        """
+        Return the shared cache key of the decoded discussion id map of the given version of
+        the structure of the course.
+        """
+        return u'course_structures.discussion_id_map.{}.{}'.format(course_key, version.isoformat())
 
     def _traverse_tree(self, block, unordered_structure, ordered_blocks, parent=None):
         """
         Traverses the tree and fills in the ordered_blocks OrderedDict with the blocks in
         the order that they appear in the course.
         """
-        # find the dictionary entry for the current node
-        cur_block = unordered_structure[block]
+        # copy the dictionary entry for the current node, leaving the structure unchanged
+        cur_block = dict(unordered_structure[block])
 
         if parent:
             cur_block['parent'] = parent
@@ -81,3 +211,65 @@ class CourseStructure(TimeStampedModel):
 
         for child_node in cur_block['children']:
             self._traverse_tree(child_node, unordered_structure, ordered_blocks, parent=block)
+
+
+class CourseStructureBlocks(models.Model):
+    """
+    The blocks of one type in the structure of a course, stored separately so that the blocks
+    of a few types can be read without decoding the whole structure.
+    """
+
+    class Meta(object):
+        app_label = 'course_structures'
+        unique_together = (('course_id', 'block_type'),)
+
+    course_id = CourseKeyField(max_length=255, db_index=True, verbose_name='Course ID')
+    block_type = models.CharField(max_length=255)
+
+    # JSON list of [position, block] pairs, where the position of a block is its index in
+    # the ordered blocks of the structure, and the block has the data of ordered_blocks
+    blocks_json = CompressedTextField(verbose_name='Blocks JSON', blank=True, null=True)
+
+    @property
+    def blocks(self):
+        """
+        Return the [position, block] pairs of the blocks of this type.
+        """
+        return json.loads(self.blocks_json) if self.blocks_json else []
+
+    @classmethod
+    def update_for_structure(cls, structure):
+        """
+        Replace the stored blocks of the course of the given saved CourseStructure with its blocks.
+
+        The blocks are rewritten in one transaction holding the lock of the row of the structure,
+        so that concurrent rewrites of the blocks of the course don't interleave.
+        """
+        positioned_blocks_by_type = OrderedDict()
+        for position, block in enumerate((structure.ordered_blocks or {}).itervalues()):
+            positioned_blocks_by_type.setdefault(block['block_type'], []).append([position, block])
+
+        with transaction.atomic():
+            structure_rows = CourseStructure.objects.select_for_update().filter(pk=structure.pk)
+            list(structure_rows.values_list('pk', flat=True))  # Evaluated to lock the row
+            cls.objects.filter(course_id=structure.course_id).delete()
+            cls.objects.bulk_create([
+                cls(course_id=structure.course_id, block_type=block_type, blocks_json=json.dumps(positioned_blocks))
+                for block_type, positioned_blocks in positioned_blocks_by_type.iteritems()
+            ])
+
+
+@receiver(post_save, sender=CourseStructure)
+def invalidate_discussion_id_map(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drop the cached discussion id map of the saved structure. Its new version normally
+    differs from the cached ones, but the database may truncate modification times to
+    the second.
+    """
+    _discussion_id_maps.pop(instance.course_id, None)
+    request_cache.get_cache(VERSION_CACHE_NAME).pop(instance.course_id, None)
+    version = CourseStructure._query_version(instance.course_id)  # pylint: disable=protected-access
+    if version is not None:
+        cache.delete(CourseStructure._discussion_id_map_cache_key(  # pylint: disable=protected-access
+            instance.course_id, version
+        ))
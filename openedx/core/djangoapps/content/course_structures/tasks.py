@@ -5,6 +5,7 @@ import json
 import logging
 
 from celery.task import task
+from django.db import transaction
 from opaque_keys.edx.keys import CourseKey
 from xmodule.modulestore.django import modulestore
 
@@ -66,7 +67,7 @@ def update_course_structure(course_key):
     Regenerates and updates the course structure (in the database) for the specified course.
     """
     # Import here to avoid circular import.
-    from .models import CourseStructure
+    from .models import CourseStructure, CourseStructureBlocks
 
     # Ideally we'd like to accept a CourseLocator; however, CourseLocator is not JSON-serializable (by default) so
     # Celery's delayed tasks fail to start. For this reason, callers should pass the course key as a Unicode string.
@@ -84,15 +85,22 @@ def update_course_structure(course_key):
     structure_json = json.dumps(structure['structure'])
     discussion_id_map_json = json.dumps(structure['discussion_id_map'])
 
-    structure_model, created = CourseStructure.objects.get_or_create(
-        course_id=course_key,
-        defaults={
-            'structure_json': structure_json,
-            'discussion_id_map_json': discussion_id_map_json
-        }
-    )
-
-    if not created:
-        structure_model.structure_json = structure_json
-        structure_model.discussion_id_map_json = discussion_id_map_json
-        structure_model.save()
+    with transaction.atomic():
+        # Locking the structure row serializes concurrent updates of the course, and a locking
+        # read sees the row of a concurrent creation which made get_or_create's insert fail
+        structure_model, created = CourseStructure.objects.select_for_update().get_or_create(
+            course_id=course_key,
+            defaults={
+                'structure_json': structure_json,
+                'discussion_id_map_json': discussion_id_map_json
+            }
+        )
+        if not created:
+            structure_model.structure_json = structure_json
+            structure_model.discussion_id_map_json = discussion_id_map_json
+
+        # Store the blocks by type before saving the structure changes its version, so that
+        # readers never cache the previous blocks under the new version
+        CourseStructureBlocks.update_for_structure(structure_model)
+        if not created:
+            structure_model.save()
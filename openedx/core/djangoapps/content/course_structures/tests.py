@@ -7,7 +7,7 @@ from xmodule_django.models import UsageKey
 from xmodule.modulestore.django import SignalHandler
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
-from openedx.core.djangoapps.content.course_structures.models import CourseStructure
+from openedx.core.djangoapps.content.course_structures.models import CourseStructure, CourseStructureBlocks
 from openedx.core.djangoapps.content.course_structures.signals import listen_for_course_publish
 from openedx.core.djangoapps.content.course_structures.tasks import _generate_course_structure, update_course_structure
 
@@ -41,6 +41,7 @@ class CourseStructureTaskTests(ModuleStoreTestCase):
             discussion_id='test_discussion_id_2'
         )
         CourseStructure.objects.all().delete()
+        CourseStructureBlocks.objects.all().delete()
 
     def test_generate_course_structure(self):
         blocks = {}
@@ -216,6 +217,32 @@ class CourseStructureTaskTests(ModuleStoreTestCase):
         structure = CourseStructure.objects.create(course_id=self.course.id)
         self.assertIsNone(structure.discussion_id_map)
 
+    def test_get_discussion_id_map(self):
+        id_map_json = json.dumps({'discussion_id_1': unicode(self.discussion_module_1.location)})
+        structure = CourseStructure.objects.create(course_id=self.course.id, discussion_id_map_json=id_map_json)
+        expected_id_map = {'discussion_id_1': self.discussion_module_1.location}
+        self.assertEqual(CourseStructure.get_discussion_id_map(self.course.id), expected_id_map)
+
+        # Only the version is queried once the map is cached
+        with self.assertNumQueries(1):
+            self.assertEqual(CourseStructure.get_discussion_id_map(self.course.id), expected_id_map)
+
+        structure.discussion_id_map_json = None
+        structure.save()
+        self.assertIsNone(CourseStructure.get_discussion_id_map(self.course.id))
+
+        structure.discussion_id_map_json = json.dumps({'discussion_id_2': unicode(self.discussion_module_2.location)})
+        structure.save()
+        self.assertEqual(
+            CourseStructure.get_discussion_id_map(self.course.id),
+            {'discussion_id_2': self.discussion_module_2.location}
+        )
+
+    def test_get_discussion_id_map_missing(self):
+        self.assertIsNone(CourseStructure.get_discussion_id_map(self.course.id))
+        CourseStructure.objects.create(course_id=self.course.id)
+        self.assertIsNone(CourseStructure.get_discussion_id_map(self.course.id))
+
     def test_update_course_structure(self):
         """
         Test the actual task that orchestrates data generation and updating the database.
@@ -235,3 +262,45 @@ class CourseStructureTaskTests(ModuleStoreTestCase):
             [unicode(value) for value in structure.discussion_id_map.values()],
             expected_structure['discussion_id_map'].values()
         )
+
+    def test_update_existing_course_structure(self):
+        update_course_structure(unicode(self.course.id))
+        ItemFactory.create(parent=self.course, category='chapter', display_name='New Section')
+        update_course_structure(unicode(self.course.id))
+
+        self.assertEqual(CourseStructure.objects.filter(course_id=self.course.id).count(), 1)
+        self.assertEqual(
+            CourseStructureBlocks.objects.filter(course_id=self.course.id, block_type='chapter').count(), 1
+        )
+        self.assertEqual(len(CourseStructure.get_blocks(self.course.id, ['chapter'])), 2)
+
+    def test_decoded_once(self):
+        update_course_structure(unicode(self.course.id))
+        structure = CourseStructure.objects.get(course_id=self.course.id)
+        self.assertIs(structure.structure, structure.structure)
+        self.assertIs(structure.ordered_blocks, structure.ordered_blocks)
+        self.assertIs(structure.discussion_id_map, structure.discussion_id_map)
+        # Ordering the blocks leaves the structure unchanged
+        self.assertNotIn('parent', structure.structure['blocks'][unicode(self.section.location)])
+
+        structure.discussion_id_map_json = json.dumps({})
+        self.assertEqual(structure.discussion_id_map, {})
+        structure.structure_json = None
+        self.assertIsNone(structure.structure)
+        self.assertIsNone(structure.ordered_blocks)
+
+    def test_get_blocks(self):
+        self.assertIsNone(CourseStructure.get_blocks(self.course.id, ['discussion']))
+
+        update_course_structure(unicode(self.course.id))
+        ordered_blocks = CourseStructure.objects.get(course_id=self.course.id).ordered_blocks
+        expected_blocks = [
+            (usage_id, block) for usage_id, block in ordered_blocks.iteritems()
+            if block['block_type'] in ('chapter', 'discussion')
+        ]
+        self.assertEqual(CourseStructure.get_blocks(self.course.id, ['chapter', 'discussion']).items(), expected_blocks)
+        self.assertEqual(CourseStructure.get_blocks(self.course.id, ['phantom']), {})
+
+        # Structures generated before the blocks were stored by type are still readable
+        CourseStructureBlocks.objects.all().delete()
+        self.assertEqual(CourseStructure.get_blocks(self.course.id, ['chapter', 'discussion']).items(), expected_blocks)
@@ -24,6 +24,8 @@ from model_utils.models import TimeStampedModel
 from xmodule_django.models import CourseKeyField
 from django.utils.translation import ugettext_lazy
 
+from student.dashboard_cache import invalidate_dashboard_snapshot
+
 
 CREDIT_PROVIDER_ID_REGEX = r"[a-z,A-Z,0-9,\-]+"
 log = logging.getLogger(__name__)
@@ -709,3 +711,12 @@ class CreditRequest(TimeStampedModel):
             provider=self.provider.provider_id,
             status=self.status,
         )
+
+
+@receiver(models.signals.post_save, sender=CreditEligibility)
+@receiver(models.signals.post_delete, sender=CreditEligibility)
+@receiver(models.signals.post_save, sender=CreditRequest)
+@receiver(models.signals.post_delete, sender=CreditRequest)
+def invalidate_credit_dashboard_snapshot(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Invalidate the dashboard snapshot of the user, which shows their credit eligibilities and requests. """
+    invalidate_dashboard_snapshot(instance.username)
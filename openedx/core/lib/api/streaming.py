@@ -0,0 +1,138 @@
+"""
+Streaming of large JSON responses.
+
+Views whose responses hold many items, such as all the blocks of a course, can return a
+:class:`StreamingJSONResponse`. The items of the :class:`StreamedDict` and :class:`StreamedList`
+values in its data are then produced and encoded one at a time while the response is sent,
+rather than all built and encoded before it is sent, so that the memory used is bounded by the
+size of an item rather than by the size of the response:
+
+    return StreamingJSONResponse({
+        'root': root,
+        'blocks': StreamedDict((unicode(key), serialize(key)) for key in block_keys),
+    })
+
+As the items are produced after the view returns, producing them must not depend on state
+which is torn down at the end of the view, such as the request cache.
+"""
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.encoders import JSONEncoder
+
+# Number of bytes of encoded JSON sent at a time
+CHUNK_SIZE = 64 * 1024
+
+# Encodes values as DRF's JSONRenderer does by default
+_ENCODER = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+class StreamedDict(object):
+    """
+    A JSON object whose members are produced by an iterable of (key, value) pairs,
+    as they are encoded.
+    """
+    def __init__(self, items):
+        self.items = items
+
+
+class StreamedList(object):
+    """
+    A JSON array whose elements are produced by an iterable, as they are encoded.
+    """
+    def __init__(self, items):
+        self.items = items
+
+
+def iter_json(value):
+    """
+    Yield the JSON encoding of value in pieces, producing and encoding the items of the
+    StreamedDicts and StreamedLists it holds one at a time. These can be nested in
+    StreamedDicts, StreamedLists, and the dicts and lists directly holding them.
+    """
+    if isinstance(value, (StreamedDict, dict)):
+        items = value.items if isinstance(value, StreamedDict) else value.iteritems()
+        yield u'{'
+        for index, (key, item) in enumerate(items):
+            if index:
+                yield u','
+            yield _ENCODER.encode(unicode(key))
+            yield u':'
+            for piece in _iter_item(item):
+                yield piece
+        yield u'}'
+    elif isinstance(value, (StreamedList, list)):
+        items = value.items if isinstance(value, StreamedList) else value
+        yield u'['
+        for index, item in enumerate(items):
+            if index:
+                yield u','
+            for piece in _iter_item(item):
+                yield piece
+        yield u']'
+    else:
+        yield _ENCODER.encode(value)
+
+
+def _iter_item(item):
+    """
+    Yield the JSON encoding of an item of a dict or list, in one piece unless it is streamed.
+    """
+    if isinstance(item, (StreamedDict, StreamedList)) or _holds_streamed(item):
+        return iter_json(item)
+    return iter([_ENCODER.encode(item)])
+
+
+def _holds_streamed(value):
+    """
+    Return whether value is a dict or list directly holding a StreamedDict or StreamedList.
+    """
+    if isinstance(value, dict):
+        value = value.itervalues()
+    elif not isinstance(value, list):
+        return False
+    return any(isinstance(item, (StreamedDict, StreamedList)) for item in value)
+
+
+def _iter_chunks(pieces, chunk_size):
+    """
+    Yield the UTF-8 encoding of the pieces, joined into chunks of about chunk_size bytes.
+    """
+    chunk = []
+    size = 0
+    for piece in pieces:
+        chunk.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield u''.join(chunk).encode('utf-8')
+            chunk = []
+            size = 0
+    if chunk:
+        yield u''.join(chunk).encode('utf-8')
+
+
+class StreamingJSONResponse(StreamingHttpResponse):
+    """
+    A response whose content is the JSON encoding of data, produced and sent in chunks.
+    """
+    def __init__(self, data, status=200):
+        super(StreamingJSONResponse, self).__init__(
+            _iter_chunks(iter_json(data), CHUNK_SIZE),
+            content_type='application/json',
+            status=status,
+        )
+
+
+def is_stream_requested(request):
+    """
+    Return whether the client asked for the response to be streamed, with the `stream`
+    query parameter. Like other boolean parameters, it may be true, True or 1, and false,
+    False, 0 or empty.
+
+    Raises ParseError if the parameter has any other value.
+    """
+    value = request.query_params.get('stream', '')
+    if value in ('true', 'True', '1'):
+        return True
+    if value in ('false', 'False', '0', ''):
+        return False
+    raise ParseError(u"Invalid value of the stream parameter: {}".format(value))
@@ -0,0 +1,100 @@
+"""
+Tests for the streaming of JSON responses.
+"""
+import json
+from datetime import datetime
+
+import ddt
+from django.test import TestCase
+from mock import patch
+from rest_framework.exceptions import ParseError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from openedx.core.lib.api import streaming
+from openedx.core.lib.api.streaming import (
+    StreamedDict, StreamedList, StreamingJSONResponse, is_stream_requested
+)
+
+
+class StreamingJSONResponseTest(TestCase):
+    """
+    Tests for StreamingJSONResponse.
+    """
+    def get_content(self, response):
+        """
+        Return the decoded JSON content of the response.
+        """
+        return json.loads(''.join(response.streaming_content))
+
+    def test_nested(self):
+        data = {
+            'root': u'bl\xf6ck',
+            'blocks': StreamedDict(
+                (key, {'children': StreamedList(iter([1, 2])), 'date': datetime(2016, 1, 1)})
+                for key in ['a', 'b']
+            ),
+            'empty': StreamedList([]),
+            'list': [StreamedDict([]), {'a': [1]}],
+        }
+        self.assertEqual(self.get_content(StreamingJSONResponse(data)), {
+            'root': u'bl\xf6ck',
+            'blocks': {
+                'a': {'children': [1, 2], 'date': '2016-01-01T00:00:00'},
+                'b': {'children': [1, 2], 'date': '2016-01-01T00:00:00'},
+            },
+            'empty': [],
+            'list': [{}, {'a': [1]}],
+        })
+
+    def test_items_produced_when_sent(self):
+        produced = []
+
+        def items():
+            """
+            Produce items, recording them.
+            """
+            for index in range(3):
+                produced.append(index)
+                yield index
+
+        response = StreamingJSONResponse(StreamedList(items()))
+        self.assertEqual(produced, [])
+        self.assertEqual(self.get_content(response), [0, 1, 2])
+        self.assertEqual(produced, [0, 1, 2])
+
+    @patch.object(streaming, 'CHUNK_SIZE', 4)
+    def test_chunks(self):
+        response = StreamingJSONResponse(StreamedList(['abc', 'def']))
+        self.assertEqual(list(response.streaming_content), ['["abc"', ',"def"', ']'])
+
+
+@ddt.ddt
+class IsStreamRequestedTest(TestCase):
+    """
+    Tests for is_stream_requested.
+    """
+    def get_request(self, params):
+        """
+        Return a DRF request with the given query parameters.
+        """
+        return Request(APIRequestFactory().get('/', params))
+
+    @ddt.data(
+        ({'stream': 'true'}, True),
+        ({'stream': 'True'}, True),
+        ({'stream': '1'}, True),
+        ({'stream': 'false'}, False),
+        ({'stream': 'False'}, False),
+        ({'stream': '0'}, False),
+        ({'stream': ''}, False),
+        ({}, False),
+    )
+    @ddt.unpack
+    def test_values(self, params, expected):
+        self.assertEqual(is_stream_requested(self.get_request(params)), expected)
+
+    @ddt.data('TRUE', 'yes', '2')
+    def test_invalid_value(self, value):
+        with self.assertRaises(ParseError):
+            is_stream_requested(self.get_request({'stream': value}))
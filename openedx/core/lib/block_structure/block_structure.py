@@ -55,6 +55,11 @@ class BlockStructure(object):
         # UsageKey
         self.root_block_usage_key = root_block_usage_key
 
+        # Whether this structure is the stale one, served while the
+        # current one is being collected by another worker.
+        # bool
+        self.is_stale = False
+
         # Map of a block's usage key to its block relations. The
         # existence of a block in the structure is determined by its
         # presence in this map.
@@ -4,7 +4,8 @@ Module for the Cache class for BlockStructure objects.
 # pylint: disable=protected-access
 from logging import getLogger
 
-from openedx.core.lib.cache_utils import zpickle, zunpickle
+from xmodule.util.cache_envelope import get_cache_envelope
+from xmodule.util.cache_fill import mark_stale, stale_key
 
 from .block_structure import BlockStructureModulestoreData
 
@@ -24,6 +25,7 @@ class BlockStructureCache(object):
                 is to be serialized.
         """
         self._cache = cache
+        self._envelope = get_cache_envelope('block_structure')
 
     def add(self, block_structure):
         """
@@ -43,18 +45,17 @@ class BlockStructureCache(object):
             block_structure._transformer_data,
             block_structure._block_data_map
         )
-        zp_data_to_cache = zpickle(data_to_cache)
-        self._cache.set(
+        self._envelope.set(
+            self._cache,
             self._encode_root_cache_key(block_structure.root_block_usage_key),
-            zp_data_to_cache
+            data_to_cache
         )
         logger.debug(
-            "Wrote BlockStructure %s to cache, size: %s",
+            "Wrote BlockStructure %s to cache",
             block_structure.root_block_usage_key,
-            len(zp_data_to_cache),
         )
 
-    def get(self, root_block_usage_key):
+    def get(self, root_block_usage_key, stale=False):
         """
         Deserializes and returns the block structure starting at
         root_block_usage_key from the given cache, if it's found in the cache.
@@ -67,6 +68,9 @@ class BlockStructureCache(object):
                 of the block structure that is to be deserialized from
                 the given cache.
 
+            stale (bool) - Whether to return the block structure that was
+                cached before the last call to delete, if any.
+
         Returns:
             BlockStructure - The deserialized block structure starting
             at root_block_usage_key, if found in the cache.
@@ -75,8 +79,11 @@ class BlockStructureCache(object):
         """
 
         # Find root_block_usage_key in the cache.
-        zp_data_from_cache = self._cache.get(self._encode_root_cache_key(root_block_usage_key))
-        if not zp_data_from_cache:
+        cache_key = self._encode_root_cache_key(root_block_usage_key)
+        if stale:
+            cache_key = stale_key(cache_key)
+        data_from_cache = self._envelope.get(self._cache, cache_key)
+        if data_from_cache is None:
             logger.debug(
                 "Did not find BlockStructure %r in the cache.",
                 root_block_usage_key,
@@ -84,13 +91,12 @@ class BlockStructureCache(object):
             return None
         else:
             logger.debug(
-                "Read BlockStructure %r from cache, size: %s",
+                "Read BlockStructure %r from cache",
                 root_block_usage_key,
-                len(zp_data_from_cache),
             )
 
-        # Deserialize and construct the block structure.
-        block_relations, transformer_data, block_data_map = zunpickle(zp_data_from_cache)
+        # Construct the block structure.
+        block_relations, transformer_data, block_data_map = data_from_cache
         block_structure = BlockStructureModulestoreData(root_block_usage_key)
         block_structure._block_relations = block_relations
         block_structure._transformer_data = transformer_data
@@ -101,14 +107,15 @@ class BlockStructureCache(object):
     def delete(self, root_block_usage_key):
         """
         Deletes the block structure for the given root_block_usage_key
-        from the given cache.
+        from the given cache. It is kept as the stale block structure until
+        a new one is cached.
 
         Arguments:
             root_block_usage_key (UsageKey) - The usage_key for the root
                 of the block structure that is to be removed from
                 the cache.
         """
-        self._cache.delete(self._encode_root_cache_key(root_block_usage_key))
+        mark_stale(self._cache, self._encode_root_cache_key(root_block_usage_key))
         logger.debug(
             "Deleted BlockStructure %r from the cache.",
             root_block_usage_key,
@@ -2,11 +2,17 @@
 Top-level module for the Block Structure framework with a class for managing
 BlockStructures.
 """
+from xmodule.util.cache_fill import get_or_fill
+
 from .cache import BlockStructureCache
 from .factory import BlockStructureFactory
 from .exceptions import UsageKeyNotInBlockStructure
 from .transformers import BlockStructureTransformers
 
+# Number of seconds after which the lock of a collect expires. Collecting the
+# block structure of a large course takes minutes.
+COLLECT_LOCK_TIMEOUT = 10 * 60
+
 
 class BlockStructureManager(object):
     """
@@ -29,6 +35,7 @@ class BlockStructureManager(object):
         """
         self.root_block_usage_key = root_block_usage_key
         self.modulestore = modulestore
+        self.cache = cache
         self.block_structure_cache = BlockStructureCache(cache)
 
     def get_transformed(self, transformers, starting_block_usage_key=None):
@@ -74,25 +81,59 @@ class BlockStructureManager(object):
 
         Details: The cache is updated if needed (if outdated or empty),
         the modulestore is accessed if needed (at cache miss), and the
-        transformers data is collected if needed.
+        transformers data is collected if needed. Only one worker at a
+        time updates the cache, the others get the stale block structure,
+        flagged with is_stale, if there is one, or wait for the update.
 
         Returns:
             BlockStructureBlockData - A collected block structure,
                 starting at root_block_usage_key, with collected data
                 from each registered transformer.
         """
+        return get_or_fill(
+            self.cache,
+            'block_structure',
+            unicode(self.root_block_usage_key),
+            read=self._get_cached,
+            fill=self._collect,
+            read_stale=self._get_stale,
+            lock_timeout=COLLECT_LOCK_TIMEOUT,
+        )
+
+    def _get_cached(self, stale=False):
+        """
+        Returns the collected Block Structure from the cache, or None if
+        it isn't cached or its collected data is outdated.
+        """
         block_structure = BlockStructureFactory.create_from_cache(
             self.root_block_usage_key,
-            self.block_structure_cache
+            self.block_structure_cache,
+            stale=stale,
+        )
+        if block_structure is None or BlockStructureTransformers.is_collected_outdated(block_structure):
+            return None
+        return block_structure
+
+    def _get_stale(self):
+        """
+        Returns the stale Block Structure from the cache, flagged as such,
+        or None if there is none.
+        """
+        block_structure = self._get_cached(stale=True)
+        if block_structure is not None:
+            block_structure.is_stale = True
+        return block_structure
+
+    def _collect(self):
+        """
+        Collects the Block Structure from the modulestore and caches it.
+        """
+        block_structure = BlockStructureFactory.create_from_modulestore(
+            self.root_block_usage_key,
+            self.modulestore
         )
-        cache_miss = block_structure is None
-        if cache_miss or BlockStructureTransformers.is_collected_outdated(block_structure):
-            block_structure = BlockStructureFactory.create_from_modulestore(
-                self.root_block_usage_key,
-                self.modulestore
-            )
-            BlockStructureTransformers.collect(block_structure)
-            self.block_structure_cache.add(block_structure)
+        BlockStructureTransformers.collect(block_structure)
+        self.block_structure_cache.add(block_structure)
         return block_structure
 
     def update_collected(self):
@@ -103,7 +144,7 @@ class BlockStructureManager(object):
         data from the modulestore.
         """
         self.clear()
-        self.get_collected()
+        self._collect()
 
     def clear(self):
         """
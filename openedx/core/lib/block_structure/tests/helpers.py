@@ -79,7 +79,7 @@ class MockCache(object):
         self.map = {}
         self.set_call_count = 0
 
-    def set(self, key, val):
+    def set(self, key, val, timeout=None):  # pylint: disable=unused-argument
         """
         Associates the given key with the given value in the cache.
         """
@@ -93,6 +93,29 @@ class MockCache(object):
         """
         return self.map.get(key, default)
 
+    def set_many(self, data, timeout=None):  # pylint: disable=unused-argument
+        """
+        Associates each of the given keys with its value in the cache.
+        """
+        self.map.update(data)
+
+    def get_many(self, keys):
+        """
+        Returns a dict of the values associated with the given keys found
+        in the cache.
+        """
+        return {key: self.map[key] for key in keys if key in self.map}
+
+    def add(self, key, val, timeout=None):  # pylint: disable=unused-argument
+        """
+        Associates the given key with the given value in the cache if it
+        isn't in the cache yet, and returns whether it was added.
+        """
+        if key in self.map:
+            return False
+        self.map[key] = val
+        return True
+
     def delete(self, key):
         """
         Deletes the given key from the cache.
@@ -3,6 +3,8 @@ Tests for block_structure/cache.py
 """
 from unittest import TestCase
 
+from django.test.utils import override_settings
+
 from ..cache import BlockStructureCache
 from .helpers import ChildrenMapTestMixin, MockCache, MockTransformer
 
@@ -47,3 +49,21 @@ class TestBlockStructureCache(ChildrenMapTestMixin, TestCase):
         self.assertIsNone(
             self.cache.get(self.block_structure.root_block_usage_key)
         )
+
+    def test_delete_keeps_stale(self):
+        self.add_transformers()
+        self.cache.add(self.block_structure)
+        self.cache.delete(self.block_structure.root_block_usage_key)
+        stale_value = self.cache.get(self.block_structure.root_block_usage_key, stale=True)
+        self.assert_block_structure(stale_value, self.children_map)
+
+    @override_settings(CACHE_ENVELOPES={'block_structure': {'chunk_size': 10}})
+    def test_delete_keeps_stale_chunked(self):
+        self.cache = BlockStructureCache(MockCache())
+        self.add_transformers()
+        self.cache.add(self.block_structure)
+        self.assert_block_structure(self.cache.get(self.block_structure.root_block_usage_key), self.children_map)
+        self.cache.delete(self.block_structure.root_block_usage_key)
+        self.assertIsNone(self.cache.get(self.block_structure.root_block_usage_key))
+        stale_value = self.cache.get(self.block_structure.root_block_usage_key, stale=True)
+        self.assert_block_structure(stale_value, self.children_map)
@@ -120,6 +120,7 @@ class TestBlockStructureManager(TestCase, ChildrenMapTestMixin):
         else:
             self.assertEquals(self.modulestore.get_items_call_count, 0)
         self.assertEquals(self.cache.set_call_count, 1 if expect_cache_updated else 0)
+        return block_structure
 
     def test_get_transformed(self):
         with mock_registered_transformers(self.registered_transformers):
@@ -157,3 +158,13 @@ class TestBlockStructureManager(TestCase, ChildrenMapTestMixin):
         self.bs_manager.clear()
         self.collect_and_verify(expect_modulestore_called=True, expect_cache_updated=True)
         self.assertEquals(TestTransformer1.collect_call_count, 2)
+
+    def test_stale_while_collecting(self):
+        block_structure = self.collect_and_verify(expect_modulestore_called=True, expect_cache_updated=True)
+        self.assertFalse(block_structure.is_stale)
+        self.bs_manager.clear()
+        # Another worker is collecting the block structure
+        self.cache.add(u"fill_lock/block_structure/0", 'other')
+        block_structure = self.collect_and_verify(expect_modulestore_called=False, expect_cache_updated=False)
+        self.assertTrue(block_structure.is_stale)
+        self.assertEquals(TestTransformer1.collect_call_count, 1)
@@ -1,10 +1,9 @@
 """
 Utilities related to caching.
 """
-import cPickle as pickle
 import functools
-import zlib
 from xblock.core import XBlock
+from xmodule.util.cache_envelope import CacheEnvelope
 
 
 def memoize_in_request_cache(request_cache_attr_name=None):
@@ -50,11 +49,17 @@ def hashvalue(arg):
         return unicode(arg)
 
 
+ZPICKLE_ENVELOPE = CacheEnvelope('zpickle', codec='zlib', chunk_size=None)
+
+
 def zpickle(data):
-    """Given any data structure, returns a zlib compressed pickled serialization."""
-    return zlib.compress(pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+    """Given any data structure, returns a zlib compressed pickled serialization in a cache envelope."""
+    return ZPICKLE_ENVELOPE.dumps(data)
 
 
 def zunpickle(zdata):
-    """Given a zlib compressed pickled serialization, returns the deserialized data."""
-    return pickle.loads(zlib.decompress(zdata))
+    """
+    Given a zlib compressed pickled serialization in a cache envelope, returns the deserialized data.
+    Raises xmodule.util.cache_envelope.EnvelopeError if it can't be read.
+    """
+    return ZPICKLE_ENVELOPE.loads(zdata)